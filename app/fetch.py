@@ -1,7 +1,12 @@
 # app/app/fetch.py
 import os
+import re
+import html as html_lib
+import codecs
 import asyncio
-from typing import Tuple, List, Dict, Optional
+from functools import lru_cache
+from itertools import chain
+from typing import Any, AsyncIterator, Callable, Iterable, Iterator, Tuple, List, Dict, Optional, NamedTuple, Union
 from urllib.parse import urlparse, urljoin
 
 import httpx
@@ -49,31 +54,132 @@ def _robots_for(url: str) -> robotparser.RobotFileParser:
     _robot_cache[host] = rp
     return rp
 
-async def _read_capped(resp: httpx.Response, byte_cap: int) -> str:
-    """Lee la respuesta hasta byte_cap y corta (más rápido que cargar todo)."""
+_ASCII = bytes(range(128))
+
+
+@lru_cache(maxsize=64)
+def _ascii_compatible(encoding: str) -> bool:
+    """
+    True si los matchers pueden trabajar sobre los bytes crudos: utf-8 o un
+    charset de un byte por carácter que deja ASCII tal cual (latin-1, cp1252...).
+    No: utf-16/utf-7/EBCDIC (ASCII codificado distinto) ni los multibyte
+    heredados (Shift-JIS, GBK, Big5...), cuyos caracteres pueden contener bytes
+    ASCII y dar matches falsos en medio de un carácter.
+    """
+    try:
+        name = codecs.lookup(encoding).name
+    except LookupError:
+        return False
+    if name == "utf-8":
+        return True
+    try:
+        if _ASCII.decode(name) != _ASCII.decode("ascii"):
+            return False
+    except UnicodeError:
+        return False
+    # Un byte, un carácter: ningún byte queda esperando al siguiente (ni escapes
+    # de cambio de juego de caracteres como los de iso-2022 o hz)
+    return all(
+        len(codecs.getincrementaldecoder(name)(errors="replace").decode(bytes([b]))) == 1
+        for b in range(256)
+    )
+
+
+def _encoding_of(resp: httpx.Response) -> str:
+    encoding = resp.encoding or "utf-8"
+    try:
+        codecs.lookup(encoding)
+    except LookupError:
+        encoding = "utf-8"
+    return encoding
+
+
+async def _read_capped(resp: httpx.Response, byte_cap: int, sink: Any = None) -> Tuple[str, Optional[bytes], int]:
+    """
+    Lee la respuesta en streaming hasta byte_cap y corta (no descarga el resto).
+    Devuelve (html, bytes crudos, nº de bytes); los bytes son None si el charset
+    no es compatible con ASCII (los matchers de bytes no servirían).
+    Si hay `sink`, cada trozo va a sink.feed(...) según llega (bytes crudos,
+    o texto decodificado si el charset no es ASCII); si devuelve True se deja
+    de leer (el sink ya tiene lo que buscaba).
+    """
+    encoding = _encoding_of(resp)
+    raw_ok = _ascii_compatible(encoding)
+    decoder = None
+    if sink is not None and not raw_ok:
+        decoder = codecs.getincrementaldecoder(encoding)(errors="ignore")
     chunks = []
     total = 0
+    stopped = False
     async for chunk in resp.aiter_bytes():
+        chunk = chunk[:byte_cap - total]  # el sink nunca recibe más que el tope
         chunks.append(chunk)
         total += len(chunk)
+        if sink is not None and chunk and sink.feed(chunk if decoder is None else decoder.decode(chunk)):
+            stopped = True
+            break
         if total >= byte_cap:
             break
-    try:
-        content = b"".join(chunks)
-        # httpx hace autodetect del encoding si usás .text, pero ya tenemos bytes
-        return content.decode(resp.encoding or "utf-8", errors="ignore")
-    except Exception:
-        return ""
+    if decoder is not None and not stopped:
+        # Lo que el decoder aún retiene al terminar (p.ej. el final de un bloque utf-7)
+        tail = decoder.decode(b"", final=True)
+        if tail:
+            sink.feed(tail)
+    content = b"".join(chunks)
+    # Una sola decodificación al final: solo para los parsers que necesitan str
+    return content.decode(encoding, errors="ignore"), (content if raw_ok else None), len(content)
 
-async def fetch_html(
+class FetchedPage(NamedTuple):
+    """
+    Resultado de un fetch: html + cabeceras (nombres en minúscula) + nombres de cookies.
+    `body` es el buffer crudo (mismo tope) para los matchers de bytes; None si
+    el charset no es compatible con ASCII. `size` son los bytes descargados
+    (con el mismo tope), sin volver a codificar el html. `encoding` es el
+    charset de la página, para decodificar lo que se extraiga de `body`.
+    """
+    url: str
+    html: Optional[str]
+    headers: Dict[str, str] = {}
+    cookies: List[str] = []
+    body: Optional[bytes] = None
+    size: int = 0
+    encoding: str = "utf-8"
+
+
+def _headers_of(resp: httpx.Response) -> Tuple[Dict[str, str], List[str]]:
+    """Cabeceras de la respuesta final y nombres de cookies de toda la cadena de redirects."""
+    headers: Dict[str, str] = {}
+    for name, value in resp.headers.multi_items():
+        name = name.lower()
+        if name == "set-cookie":
+            continue
+        headers[name] = f"{headers[name]}, {value}" if name in headers else value
+    cookies: List[str] = []
+    for r in (*resp.history, resp):
+        for raw in r.headers.get_list("set-cookie"):
+            cookie_name = raw.split("=", 1)[0].strip()
+            if cookie_name and cookie_name not in cookies:
+                cookies.append(cookie_name)
+    return headers, cookies
+
+
+async def fetch_page(
     client: httpx.AsyncClient,
     url: str,
     respect_robots: bool = True,
     timeout: float = 10.0,
-) -> Tuple[str, Optional[str]]:
+    sink: Any = None,
+    byte_cap: int = MAX_HTML_BYTES,
+) -> FetchedPage:
     """
-    Devuelve (url, html) o (url, None) si no se pudo obtener.
-    Tope de bytes + timeouts agresivos + follow_redirects.
+    Como fetch_html pero conserva cabeceras y cookies de la respuesta.
+    Devuelve FetchedPage(url, None) si no se pudo obtener.
+
+    `sink` (opcional) procesa la página mientras se descarga:
+    sink.headers(headers, cookies) al llegar la respuesta, sink.feed(trozo)
+    por trozo (True = dejar de leer) y sink.close(documento) al terminar,
+    con bytes crudos o str según el charset (ver _read_capped).
+    `byte_cap` limita lo descargado (p.ej. solo el prefijo de un script).
     """
     try:
         if respect_robots:
@@ -81,55 +187,178 @@ async def fetch_html(
             try:
                 ua = DEFAULT_HEADERS.get("User-Agent", "*")
                 if hasattr(rp, "can_fetch") and not (rp.can_fetch(ua, url) or rp.can_fetch("*", url)):
-                    return (url, None)
+                    return FetchedPage(url, None)
             except Exception:
                 pass
 
-        resp = await client.get(url, timeout=timeout)
-        resp.raise_for_status()
-        html = await _read_capped(resp, MAX_HTML_BYTES)
-        return (url, html if html else None)
+        async with client.stream("GET", url, timeout=timeout) as resp:
+            resp.raise_for_status()
+            headers, cookies = _headers_of(resp)
+            if sink is not None:
+                sink.headers(headers, cookies)
+            encoding = _encoding_of(resp)
+            html, body, size = await _read_capped(resp, byte_cap, sink)
+        if sink is not None:
+            sink.close(body if body is not None else html)
+        return FetchedPage(url, html if html else None, headers, cookies, body, size, encoding)
     except Exception:
-        return (url, None)
+        return FetchedPage(url, None)
 
-async def fetch_many(
-    urls: List[str],
+async def fetch_html(
+    client: httpx.AsyncClient,
+    url: str,
     respect_robots: bool = True,
     timeout: float = 10.0,
-) -> List[Tuple[str, Optional[str]]]:
+) -> Tuple[str, Optional[str]]:
     """
-    Ejecuta peticiones en paralelo y devuelve [(url, html|None), ...].
+    Devuelve (url, html) o (url, None) si no se pudo obtener.
+    Tope de bytes + timeouts agresivos + follow_redirects.
     """
+    page = await fetch_page(client, url, respect_robots=respect_robots, timeout=timeout)
+    return (page.url, page.html)
+
+def _client() -> httpx.AsyncClient:
     limits = httpx.Limits(max_connections=MAX_CONNS, max_keepalive_connections=MAX_KEEPALIVE)
     timeouts = httpx.Timeout(connect=CONNECT_TIMEOUT, read=READ_TIMEOUT, write=WRITE_TIMEOUT, pool=POOL_TIMEOUT)
-    async with httpx.AsyncClient(
+    return httpx.AsyncClient(
         http2=HTTP2,
         headers=DEFAULT_HEADERS,
         follow_redirects=True,
         limits=limits,
         timeout=timeouts,
-    ) as client:
-        tasks = [fetch_html(client, u, respect_robots=respect_robots, timeout=timeout) for u in urls]
+    )
+
+async def fetch_many(
+    urls: List[str],
+    respect_robots: bool = True,
+    timeout: float = 10.0,
+) -> List[Tuple[str, Optional[str]]]:
+    """
+    Ejecuta peticiones en paralelo y devuelve [(url, html|None), ...].
+    """
+    pages = await fetch_pages(urls, respect_robots=respect_robots, timeout=timeout)
+    return [(p.url, p.html) for p in pages]
+
+async def fetch_pages(
+    urls: List[str],
+    respect_robots: bool = True,
+    timeout: float = 10.0,
+    sink_factory: Optional[Callable[[str], Any]] = None,
+    byte_cap: int = MAX_HTML_BYTES,
+) -> List[FetchedPage]:
+    """
+    Igual que fetch_many pero devuelve FetchedPage (con cabeceras y cookies).
+    `sink_factory(url)` da el sink de cada página (ver fetch_page) o None.
+    """
+    async with _client() as client:
+        tasks = [
+            fetch_page(client, u, respect_robots=respect_robots, timeout=timeout,
+                       sink=sink_factory(u) if sink_factory else None, byte_cap=byte_cap)
+            for u in urls
+        ]
         return await asyncio.gather(*tasks)
 
-def discover_feeds_from_html(base_url: str, html: str) -> List[str]:
-    feeds = set()
+async def iter_pages(
+    urls: List[str],
+    respect_robots: bool = True,
+    timeout: float = 10.0,
+    sink_factory: Optional[Callable[[str], Any]] = None,
+) -> AsyncIterator[FetchedPage]:
+    """
+    Lanza todas las peticiones en paralelo y entrega cada FetchedPage según
+    termina. Si el consumidor corta (usar contextlib.aclosing), las peticiones
+    pendientes se cancelan.
+    """
+    async with _client() as client:
+        tasks = [
+            asyncio.ensure_future(fetch_page(
+                client, u, respect_robots=respect_robots, timeout=timeout,
+                sink=sink_factory(u) if sink_factory else None,
+            ))
+            for u in urls
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for t in tasks:
+                t.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+_LINK_TAG_RE = re.compile(r"<link\b[^>]*>", re.I)
+_LINK_TAG_RE_B = re.compile(_LINK_TAG_RE.pattern.encode(), re.I)
+_ATTR = r"""\b{}\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'>]+))"""
+_FEED_TYPE_RE = re.compile(_ATTR.format("type"), re.I)
+_HREF_ATTR_RE = re.compile(_ATTR.format("href"), re.I)
+FEED_TYPES = ("application/rss+xml", "application/atom+xml")
+
+
+def _attr(regex: re.Pattern, tag: str) -> Optional[str]:
+    m = regex.search(tag)
+    if m is None:
+        return None
+    return next(v for v in m.groups() if v is not None)
+
+
+def discover_feeds_from_html(base_url: str, html: Union[str, bytes], encoding: str = "utf-8") -> List[str]:
+    """
+    URLs de feeds RSS/Atom (<link type="application/rss+xml|atom+xml">) en orden
+    de aparición. Solo mira las etiquetas <link>, sin parsear la página;
+    acepta el html o los bytes crudos del fetch (con su `encoding`).
+    """
     if not html:
         return []
-    soup = BeautifulSoup(html, "lxml")
-    for link in soup.find_all("link", attrs={"type": ["application/rss+xml", "application/atom+xml"]}):
-        href = link.get("href")
-        if href:
-            feeds.add(urljoin(base_url, href))
+    feeds: Dict[str, None] = {}
+    regex = _LINK_TAG_RE_B if isinstance(html, bytes) else _LINK_TAG_RE
+    for m in regex.finditer(html):
+        tag = m.group()
+        if isinstance(tag, bytes):
+            tag = tag.decode(encoding, errors="ignore")
+        feed_type = _attr(_FEED_TYPE_RE, tag)
+        href = _attr(_HREF_ATTR_RE, tag)
+        if href and feed_type and feed_type.strip().lower() in FEED_TYPES:
+            feeds.setdefault(urljoin(base_url, html_lib.unescape(href.strip())), None)
     return list(feeds)
 
-def extract_internal_links(base_url: str, html: str, max_links: int = 200) -> List[str]:
-    """Extract internal links with priority for tech-rich pages"""
+# href de <a> sin parsear la página: el descubrimiento de links no necesita árbol DOM
+_A_HREF = r"""<a\s[^>]*?\bhref\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'>]+))"""
+_A_HREF_RE = re.compile(_A_HREF, re.I)
+_A_HREF_RE_B = re.compile(_A_HREF.encode(), re.I)
+
+
+def iter_hrefs(html: Union[str, bytes], encoding: str = "utf-8") -> Iterator[str]:
+    """
+    href de cada <a> del html o del buffer crudo (solo se decodifica el valor,
+    con el charset de la página, y se resuelven las entidades).
+    """
+    regex = _A_HREF_RE_B if isinstance(html, bytes) else _A_HREF_RE
+    for m in regex.finditer(html):
+        value = m.group(1) if m.group(1) is not None else m.group(2) if m.group(2) is not None else m.group(3)
+        if value:
+            if isinstance(value, bytes):
+                value = value.decode(encoding, errors="ignore")
+            yield html_lib.unescape(value) if "&" in value else value
+
+
+def extract_internal_links(base_url: str, html: Union[str, bytes], max_links: int = 200,
+                           extra_hrefs: Iterable[str] = (), encoding: str = "utf-8") -> List[str]:
+    """
+    Extract internal links with priority for tech-rich pages.
+    `html` puede ser el str o los bytes crudos (FetchedPage.body, con su
+    `encoding`): con bytes se escanean los href directamente sin parsear la página.
+    `extra_hrefs`: rutas que no están en <a> (p.ej. las de las data islands de un SPA).
+    """
     if not html:
         return []
     base = httpx.URL(base_url)
     host = base.host
-    soup = BeautifulSoup(html, "lxml")
+    if isinstance(html, bytes):
+        hrefs = iter_hrefs(html, encoding)
+    else:
+        soup = BeautifulSoup(html, "lxml")
+        hrefs = (a.get("href") for a in soup.find_all("a", href=True))
+    if extra_hrefs:
+        hrefs = chain(hrefs, extra_hrefs)
     
     # Priority keywords for tech detection
     HIGH_PRIORITY = ["contact", "contacto", "booking", "demo", "login", "dashboard", "admin", "checkout", "cart", "shop", "api", "developer"]
@@ -140,8 +369,7 @@ def extract_internal_links(base_url: str, html: str, max_links: int = 200) -> Li
     regular_links = []
     seen = set()
     
-    for a in soup.find_all("a", href=True):
-        href = a.get("href")
+    for href in hrefs:
         try:
             abs_url = str(base.join(href))
         except Exception:
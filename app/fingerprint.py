@@ -0,0 +1,577 @@
+# app/fingerprint.py
+"""
+Motor de fingerprints: literales requeridos + Aho-Corasick + confirmación regex.
+
+Cada patrón se descompone en los literales que cualquier match debe contener
+(uno por alternativa). Todos los literales van a un único autómata que recorre
+la página una sola vez; solo se ejecuta la regex completa de los patrones cuyos
+literales aparecieron. Los patrones sin literal extraíble se evalúan siempre.
+
+Acepta `str` o `bytes`: con el buffer crudo del fetch (charset compatible con
+ASCII) se trabaja sin decodificar, con `bytes.lower()` (solo ASCII, sin la
+tabla Unicode) y regex de bytes. Benchmark: `python -m benchmarks.fingerprint [pagina.html]`.
+"""
+import re
+import time
+from typing import Dict, Hashable, Iterable, List, Optional, Sequence, Set, Tuple, Union
+
+try:
+    import ahocorasick  # pyahocorasick
+    HAS_AHOCORASICK = True
+except ImportError:
+    HAS_AHOCORASICK = False
+
+# Literales más cortos que esto no filtran nada útil
+MIN_LITERAL_LEN = 2
+
+# Escaneo por trozos: contexto del trozo anterior con el que se reintentan las
+# regex pendientes (un match más largo se confirma al cerrar con el texto entero)
+REGEX_OVERLAP = 4096
+
+_QUANTIFIER_RE = re.compile(r"\{\d*(,\d*)?\}\??")
+# Escapes de carácter por código: letra -> nº de dígitos hex
+_HEX_ESCAPES = {"x": 2, "u": 4, "U": 8}
+_HEX_DIGITS_RE = re.compile(r"[0-9a-fA-F]+")
+_STR_ONLY_ESCAPE_RE = re.compile(r"\\[uUN]")
+
+
+class CostProfile:
+    """
+    Coste por fingerprint (clave + patrón): regex ejecutadas, matches, tiempo
+    y bytes recorridos, más la pasada compartida de literales. Se agrega por
+    patrón y no por índice, así sobrevive a recargas de la base.
+    """
+
+    def __init__(self):
+        # (clave, patrón) -> [evaluaciones, matches, ns, bytes]
+        self.patterns: Dict[Tuple[Hashable, str], List[int]] = {}
+        self.literal_pass = {"calls": 0, "ns": 0, "bytes": 0}
+        self.documents = 0
+
+    def _row(self, key: Hashable, pattern: str) -> List[int]:
+        row = self.patterns.get((key, pattern))
+        if row is None:
+            row = self.patterns[(key, pattern)] = [0, 0, 0, 0]
+        return row
+
+    def record_literals(self, elapsed_ns: int, nbytes: int) -> None:
+        self.literal_pass["calls"] += 1
+        self.literal_pass["ns"] += elapsed_ns
+        self.literal_pass["bytes"] += nbytes
+
+    def record_regex(self, key: Hashable, pattern: str, elapsed_ns: int, nbytes: int, hit: bool) -> None:
+        row = self._row(key, pattern)
+        row[0] += 1
+        row[1] += hit
+        row[2] += elapsed_ns
+        row[3] += nbytes
+
+    def record_literal_hit(self, key: Hashable, pattern: str) -> None:
+        """Match confirmado solo con el literal (patrón puro): sin coste propio."""
+        self._row(key, pattern)[1] += 1
+
+    def reset(self) -> None:
+        self.__init__()
+
+    def report(self, top: int = 20, sort: str = "time") -> dict:
+        """Ranking de fingerprints por coste (`time`, `evaluations`, `bytes` o `per_eval`)."""
+        rows = []
+        for (key, pattern), (evals, hits, ns, nbytes) in self.patterns.items():
+            rows.append({
+                "key": list(key) if isinstance(key, tuple) else key,
+                "pattern": pattern,
+                "evaluations": evals,
+                "matches": hits,
+                "time_ms": round(ns / 1e6, 3),
+                "us_per_eval": round(ns / evals / 1e3, 2) if evals else 0.0,
+                "bytes_scanned": nbytes,
+                "hit_rate": round(hits / self.documents, 3) if self.documents else 0.0,
+            })
+        sort_key = {
+            "time": "time_ms", "evaluations": "evaluations", "bytes": "bytes_scanned", "per_eval": "us_per_eval",
+        }.get(sort, "time_ms")
+        rows.sort(key=lambda r: r[sort_key], reverse=True)
+        total_regex_ns = sum(r[2] for r in self.patterns.values())
+        return {
+            "documents": self.documents,
+            "literal_pass": {**self.literal_pass, "time_ms": round(self.literal_pass["ns"] / 1e6, 3)},
+            "regex_time_ms": round(total_regex_ns / 1e6, 3),
+            "fingerprints": rows[:top] if top else rows,
+        }
+
+
+def _split_top_level(pattern: str) -> List[str]:
+    """Divide un patrón por los '|' de nivel 0 (fuera de grupos y clases)."""
+    parts, buf, depth, i, in_class = [], [], 0, 0, False
+    while i < len(pattern):
+        c = pattern[i]
+        if c == "\\" and i + 1 < len(pattern):
+            buf.append(pattern[i:i + 2])
+            i += 2
+            continue
+        if in_class:
+            if c == "]":
+                in_class = False
+        elif c == "[":
+            in_class = True
+        elif c == "(":
+            depth += 1
+        elif c == ")":
+            depth -= 1
+        elif c == "|" and depth == 0:
+            parts.append("".join(buf))
+            buf = []
+            i += 1
+            continue
+        buf.append(c)
+        i += 1
+    parts.append("".join(buf))
+    return parts
+
+
+def _skip_group(branch: str, i: int) -> int:
+    """Devuelve el índice justo después del ')' que cierra el grupo abierto en i."""
+    depth, in_class = 0, False
+    while i < len(branch):
+        c = branch[i]
+        if c == "\\":
+            i += 2
+            continue
+        if in_class:
+            if c == "]":
+                in_class = False
+        elif c == "[":
+            in_class = True
+        elif c == "(":
+            depth += 1
+        elif c == ")":
+            depth -= 1
+            if depth == 0:
+                return i + 1
+        i += 1
+    return i
+
+
+def _skip_class(branch: str, i: int) -> int:
+    """Devuelve el índice justo después del ']' que cierra la clase abierta en i."""
+    i += 1
+    if i < len(branch) and branch[i] == "^":
+        i += 1
+    if i < len(branch) and branch[i] == "]":
+        i += 1
+    while i < len(branch):
+        if branch[i] == "\\":
+            i += 2
+            continue
+        if branch[i] == "]":
+            return i + 1
+        i += 1
+    return i
+
+
+def _quantifier_at(branch: str, i: int) -> Tuple[Optional[str], int]:
+    """Si hay un cuantificador en i devuelve (cuantificador, índice siguiente)."""
+    if i >= len(branch):
+        return None, i
+    c = branch[i]
+    if c in "*+?":
+        end = i + 1
+        if end < len(branch) and branch[end] in "?+":
+            end += 1
+        return c, end
+    if c == "{":
+        m = _QUANTIFIER_RE.match(branch, i)
+        if m:
+            return m.group(0), m.end()
+    return None, i
+
+
+def _branch_runs(branch: str) -> Optional[Tuple[List[str], bool]]:
+    """
+    Devuelve (runs, puro) con las secuencias literales obligatorias de una rama.
+    `puro` indica que la rama entera es un literal (el match del literal basta).
+    None si la rama usa sintaxis que no sabemos analizar.
+    """
+    runs: List[str] = []
+    cur: List[str] = []
+    pure = True
+    i = 0
+    while i < len(branch):
+        c = branch[i]
+        literal = None
+        if c == "\\":
+            if i + 1 >= len(branch):
+                return None
+            nxt = branch[i + 1]
+            if nxt in _HEX_ESCAPES:
+                # \xNN, \uNNNN, \UNNNNNNNN: el literal es el carácter, no los dígitos
+                digits = branch[i + 2:i + 2 + _HEX_ESCAPES[nxt]]
+                if len(digits) != _HEX_ESCAPES[nxt] or not _HEX_DIGITS_RE.fullmatch(digits):
+                    return None
+                literal = chr(int(digits, 16))
+                i += 2 + len(digits)
+            elif nxt.isdigit() or nxt == "N":
+                return None  # octales, backreferences y \N{...}: sin literal fiable
+            elif nxt.isalnum():
+                pure = False
+                runs.append("".join(cur)); cur = []
+                i += 2
+                _, i = _quantifier_at(branch, i)
+                continue
+            else:
+                literal = nxt
+                i += 2
+        elif c == "(":
+            if branch.startswith("(?", i) and not branch.startswith(("(?:", "(?=", "(?!", "(?<=", "(?<!"), i):
+                return None  # flags inline, grupos con nombre, etc.
+            pure = False
+            runs.append("".join(cur)); cur = []
+            i = _skip_group(branch, i)
+            _, i = _quantifier_at(branch, i)
+            continue
+        elif c == "[":
+            pure = False
+            runs.append("".join(cur)); cur = []
+            i = _skip_class(branch, i)
+            _, i = _quantifier_at(branch, i)
+            continue
+        elif c in ".^$":
+            pure = False
+            runs.append("".join(cur)); cur = []
+            i += 1
+            _, i = _quantifier_at(branch, i)
+            continue
+        elif c in "*+?)":
+            return None
+        else:
+            literal = c
+            i += 1
+
+        quant, i = _quantifier_at(branch, i)
+        if quant is None:
+            cur.append(literal.lower())
+            continue
+        pure = False
+        if quant[0] == "+" or (quant[0] == "{" and not quant.startswith(("{0", "{,"))):
+            # El carácter aparece al menos una vez: cierra el run incluyéndolo
+            cur.append(literal.lower())
+        runs.append("".join(cur)); cur = []
+    runs.append("".join(cur))
+    return [r for r in runs if r], pure
+
+
+def _unwrap_group(branch: str) -> Optional[str]:
+    """Si la rama es exactamente '(...)' o '(?:...)' devuelve su interior."""
+    if not branch.startswith("(") or _skip_group(branch, 0) != len(branch):
+        return None
+    if branch.startswith("(?:"):
+        return branch[3:-1]
+    if branch.startswith("(?"):
+        return None
+    return branch[1:-1]
+
+
+def required_literals(pattern: str) -> Tuple[Optional[List[str]], bool]:
+    """
+    Extrae los literales requeridos de un patrón (en minúsculas).
+    Devuelve (literales, puro): cualquier match contiene al menos uno de los
+    literales; `puro` significa que encontrar el literal equivale al match.
+    Devuelve (None, False) si el patrón no tiene un literal útil por rama.
+    """
+    literals: List[str] = []
+    pure = True
+    for branch in _split_top_level(pattern):
+        inner = _unwrap_group(branch)
+        if inner is not None:
+            sub, sub_pure = required_literals(inner)
+            if sub is None:
+                return None, False
+            literals.extend(sub)
+            pure = pure and sub_pure
+            continue
+        parsed = _branch_runs(branch)
+        if parsed is None:
+            return None, False
+        runs, branch_pure = parsed
+        best = max(runs, key=len, default="")
+        if len(best) < MIN_LITERAL_LEN:
+            return None, False
+        literals.append(best)
+        pure = pure and branch_pure
+    return list(dict.fromkeys(literals)), pure
+
+
+class FingerprintEngine:
+    """
+    Conjunto compilado de fingerprints (clave, patrón).
+    Reutilizable por techstack, competitors y jobs.
+    """
+
+    def __init__(self, entries: Iterable[Tuple[Hashable, str]], flags: int = re.I):
+        self.keys: List[Hashable] = []
+        self.patterns: List[str] = []
+        self._flags = flags
+        # Las regex se compilan al confirmar el primer candidato (carga instantánea)
+        self._regexes: List[Optional["re.Pattern"]] = []
+        self._bregexes: List[Optional["re.Pattern"]] = []
+        self._pure: List[bool] = []
+        self._always: List[int] = []
+        literal_owners: Dict[str, List[int]] = {}
+
+        for idx, (key, pattern) in enumerate(entries):
+            self.keys.append(key)
+            self.patterns.append(pattern)
+            self._regexes.append(None)
+            self._bregexes.append(None)
+            literals, pure = required_literals(pattern)
+            # Sin re.I el atajo en minúsculas no equivale al match
+            self._pure.append(pure and bool(flags & re.I))
+            if not literals:
+                self._always.append(idx)
+                continue
+            for lit in literals:
+                literal_owners.setdefault(lit, []).append(idx)
+
+        self._literals: List[str] = list(literal_owners)
+        # Camino bytes solo si todo es ASCII (re.I de bytes solo pliega ASCII)
+        # (y sin \u, \U ni \N{...}, que las regex de bytes no aceptan)
+        self._ascii = (all(p.isascii() and not _STR_ONLY_ESCAPE_RE.search(p) for p in self.patterns)
+                       and all(l.isascii() for l in literal_owners))
+        self._bliterals: List[bytes] = [l.encode("ascii") for l in self._literals] if self._ascii else []
+        self._owners: List[Tuple[int, ...]] = [tuple(literal_owners[l]) for l in self._literals]
+        self._automaton = None
+        if HAS_AHOCORASICK and self._literals:
+            automaton = ahocorasick.Automaton()
+            for lit_id, lit in enumerate(self._literals):
+                automaton.add_word(lit, lit_id)
+            automaton.make_automaton()
+            self._automaton = automaton
+
+    @classmethod
+    def from_literals(cls, hints: Dict[Hashable, Sequence[str]]) -> "FingerprintEngine":
+        """Construye un motor a partir de listas de substrings literales por clave."""
+        return cls((key, "|".join(re.escape(h) for h in values)) for key, values in hints.items())
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __getstate__(self) -> dict:
+        # Las regex compiladas no aportan al snapshot: se recompilan bajo demanda
+        state = self.__dict__.copy()
+        state["_regexes"] = [None] * len(self.patterns)
+        state["_bregexes"] = [None] * len(self.patterns)
+        return state
+
+    def regex(self, idx: int) -> "re.Pattern":
+        compiled = self._regexes[idx]
+        if compiled is None:
+            compiled = self._regexes[idx] = re.compile(self.patterns[idx], self._flags)
+        return compiled
+
+    def bregex(self, idx: int) -> "re.Pattern":
+        """Versión bytes de regex(idx), para buffers sin decodificar."""
+        compiled = self._bregexes[idx]
+        if compiled is None:
+            compiled = self._bregexes[idx] = re.compile(self.patterns[idx].encode("ascii"), self._flags)
+        return compiled
+
+    def _literal_hits(self, low: str) -> Set[int]:
+        """IDs de literales presentes en el texto ya en minúsculas (una pasada)."""
+        if self._automaton is not None:
+            return {lit_id for _, lit_id in self._automaton.iter(low)}
+        return {lit_id for lit_id, lit in enumerate(self._literals) if lit in low}
+
+    def _literal_hits_bytes(self, low: bytes) -> Set[int]:
+        """Como _literal_hits sobre bytes en minúsculas ASCII."""
+        if self._automaton is not None:
+            # latin-1 es una copia byte a byte (str de 1 byte por carácter); los
+            # bytes >= 0x80 nunca coinciden con literales ASCII
+            return {lit_id for _, lit_id in self._automaton.iter(low.decode("latin-1"))}
+        return {lit_id for lit_id, lit in enumerate(self._bliterals) if lit in low}
+
+    def _lower_hits(self, data: Union[str, bytes]) -> Set[int]:
+        if isinstance(data, bytes):
+            if not self._ascii:
+                return self._literal_hits(data.decode("utf-8", errors="ignore").lower())
+            return self._literal_hits_bytes(data.lower())
+        return self._literal_hits(data.lower())
+
+    def candidates(self, text: Union[str, bytes], skip: Optional[Set[int]] = None) -> Tuple[Set[int], Set[int]]:
+        """
+        Devuelve (confirmados, pendientes): índices cuyo literal puro ya basta
+        y los que necesitan confirmación con la regex completa.
+        Los índices en `skip` (ya resueltos por otra vía) se descartan.
+        """
+        confirmed: Set[int] = set()
+        pending: Set[int] = set(self._always)
+        for lit_id in self._lower_hits(text):
+            for idx in self._owners[lit_id]:
+                if self._pure[idx]:
+                    confirmed.add(idx)
+                else:
+                    pending.add(idx)
+        if skip:
+            confirmed -= skip
+            pending -= skip
+        return confirmed, pending - confirmed
+
+    def scan(self, text: Union[str, bytes], skip: Optional[Set[int]] = None,
+             stats: Optional[Dict[str, int]] = None, profile: Optional[CostProfile] = None) -> List[int]:
+        """
+        Índices de los fingerprints que matchean, en orden de declaración.
+        `text` puede ser el buffer crudo en bytes (charset compatible con ASCII).
+        Si se pasa `stats` acumula candidatos por literal y regex ejecutadas;
+        con `profile` mide el coste de cada fingerprint evaluado.
+        """
+        if not text:
+            return []
+        if isinstance(text, bytes) and not self._ascii:
+            text = text.decode("utf-8", errors="ignore")
+        if profile is not None:
+            profile.documents += 1
+            started = time.perf_counter_ns()
+        confirmed, pending = self.candidates(text, skip)
+        if profile is not None:
+            profile.record_literals(time.perf_counter_ns() - started, len(text))
+            for idx in confirmed:
+                profile.record_literal_hit(self.keys[idx], self.patterns[idx])
+        if stats is not None:
+            stats["literal_confirmations"] = stats.get("literal_confirmations", 0) + len(confirmed)
+            stats["regex_confirmations"] = stats.get("regex_confirmations", 0) + len(pending)
+        regex = self.bregex if isinstance(text, bytes) else self.regex
+        for idx in pending:
+            if profile is None:
+                if regex(idx).search(text):
+                    confirmed.add(idx)
+                continue
+            started = time.perf_counter_ns()
+            hit = regex(idx).search(text) is not None
+            profile.record_regex(self.keys[idx], self.patterns[idx], time.perf_counter_ns() - started, len(text), hit)
+            if hit:
+                confirmed.add(idx)
+        return sorted(confirmed)
+
+    def stream(self, skip: Optional[Set[int]] = None, stats: Optional[Dict[str, int]] = None,
+               profile: Optional[CostProfile] = None) -> "StreamScan":
+        """Escaneo incremental para alimentar trozos según se descargan."""
+        return StreamScan(self, skip, stats, profile)
+
+    def matches(self, text: Union[str, bytes]) -> List[Hashable]:
+        """Claves de los fingerprints que matchean, en orden de declaración."""
+        return [self.keys[idx] for idx in self.scan(text)]
+
+
+class StreamScan:
+    """
+    Escaneo de un documento que llega por trozos (ver FingerprintEngine.stream).
+
+    Cada trozo pasa por el autómata junto con la cola del anterior (largo del
+    literal más largo - 1), así ningún literal se pierde en el corte. Los
+    literales puros confirman al instante; las regex pendientes se prueban
+    sobre el trozo más REGEX_OVERLAP caracteres previos. `finish(texto)` hace
+    la última pasada sobre el documento completo para los matches más largos
+    que la ventana, con lo que el resultado es el mismo que `scan`.
+
+    Los trozos pueden ser `str` o `bytes` (todos del mismo tipo por documento).
+
+    `skip` es un set vivo: lo que otro escaneo confirme mientras tanto (otras
+    páginas del mismo detector) deja de evaluarse aquí.
+    """
+
+    def __init__(self, engine: FingerprintEngine, skip: Optional[Set[int]] = None,
+                 stats: Optional[Dict[str, int]] = None, profile: Optional[CostProfile] = None):
+        self.engine = engine
+        self.skip = skip if skip is not None else set()
+        self.stats = stats
+        self.profile = profile
+        if profile is not None:
+            profile.documents += 1
+        self.confirmed: Set[int] = set()
+        self._pending: Set[int] = set()
+        self._chunks = 0
+        self._literal_overlap = max((len(l) for l in engine._literals), default=1) - 1
+        self._literal_tail = None
+        self._regex_tail = None
+
+    def _count(self, key: str, n: int) -> None:
+        if self.stats is not None and n:
+            self.stats[key] = self.stats.get(key, 0) + n
+
+    def _search(self, regex, idx: int, text: Union[str, bytes], start: int = 0) -> bool:
+        if self.profile is None:
+            return regex(idx).search(text, start) is not None
+        started = time.perf_counter_ns()
+        hit = regex(idx).search(text, start) is not None
+        self.profile.record_regex(self.engine.keys[idx], self.engine.patterns[idx],
+                                  time.perf_counter_ns() - started, len(text) - start, hit)
+        return hit
+
+    def feed(self, text: Union[str, bytes]) -> List[int]:
+        """Procesa un trozo y devuelve los índices confirmados en él."""
+        if not text:
+            return []
+        engine = self.engine
+        if isinstance(text, bytes) and not engine._ascii:
+            text = text.decode("utf-8", errors="ignore")
+        if self._literal_tail is None:
+            self._literal_tail = self._regex_tail = text[:0]
+        is_bytes = isinstance(text, bytes)
+        newly: Set[int] = set()
+        new_pending: Set[int] = set(engine._always) - self.skip if self._chunks == 0 else set()
+        self._chunks += 1
+
+        if self.profile is not None:
+            started = time.perf_counter_ns()
+        hay = self._literal_tail + text.lower()
+        hits = engine._literal_hits_bytes(hay) if is_bytes else engine._literal_hits(hay)
+        if self.profile is not None:
+            self.profile.record_literals(time.perf_counter_ns() - started, len(hay))
+        for lit_id in hits:
+            for idx in engine._owners[lit_id]:
+                if idx in self.confirmed or idx in self.skip or idx in newly:
+                    continue
+                if engine._pure[idx]:
+                    newly.add(idx)
+                elif idx not in self._pending:
+                    new_pending.add(idx)
+        self._count("literal_confirmations", len(newly))
+        self._count("regex_confirmations", len(new_pending))
+        if self.profile is not None:
+            for idx in newly:
+                self.profile.record_literal_hit(engine.keys[idx], engine.patterns[idx])
+        self._pending |= new_pending
+        self._pending -= newly
+
+        # El primer carácter de la cola solo da contexto (\b, lookbehind)
+        regex = engine.bregex if is_bytes else engine.regex
+        window = self._regex_tail + text
+        start = 1 if self._regex_tail else 0
+        for idx in list(self._pending):
+            if idx in self.skip:
+                self._pending.discard(idx)
+            elif self._search(regex, idx, window, start):
+                self._pending.discard(idx)
+                newly.add(idx)
+
+        self._literal_tail = hay[-self._literal_overlap:] if self._literal_overlap else hay[:0]
+        self._regex_tail = window[-(REGEX_OVERLAP + 1):]
+        self.confirmed |= newly
+        return sorted(newly)
+
+    def finish(self, full_text: Union[str, bytes, None] = None) -> List[int]:
+        """
+        Cierra el escaneo. Con el texto completo (mismo tipo que los trozos)
+        confirma las regex cuyo match excede la ventana; con un único trozo la
+        ventana ya fue el texto entero.
+        """
+        newly: Set[int] = set()
+        if full_text and self._chunks > 1:
+            if isinstance(full_text, bytes) and not self.engine._ascii:
+                full_text = full_text.decode("utf-8", errors="ignore")
+            regex = self.engine.bregex if isinstance(full_text, bytes) else self.engine.regex
+            for idx in self._pending - self.skip:
+                if self._search(regex, idx, full_text):
+                    newly.add(idx)
+        self._pending.clear()
+        self.confirmed |= newly
+        return sorted(newly)
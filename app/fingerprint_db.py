@@ -0,0 +1,370 @@
+# app/fingerprint_db.py
+"""
+Base de datos de fingerprints de tecnologías.
+
+- Fuente versionada en JSON (app/data/fingerprints.json o FINGERPRINTS_PATH)
+- Validación: esquema, duplicados, compilación regex y lint de backtracking
+- Snapshot binario (pickle del motor ya construido) para carga instantánea
+- Hot reload: cada worker relee el archivo si cambió, sin reiniciar
+"""
+import hashlib
+import json
+import logging
+import os
+import pickle
+import re
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from .fingerprint import FingerprintEngine, HAS_AHOCORASICK
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_PATH = os.path.join(os.path.dirname(__file__), "data", "fingerprints.json")
+FINGERPRINTS_PATH = os.getenv("FINGERPRINTS_PATH", _DEFAULT_PATH)
+FINGERPRINTS_SNAPSHOT = os.getenv("FINGERPRINTS_SNAPSHOT", os.path.splitext(FINGERPRINTS_PATH)[0] + ".pkl")
+RELOAD_CHECK_SEC = float(os.getenv("FINGERPRINTS_RELOAD_SEC", "30"))
+
+# Subir si cambia la estructura del motor serializado
+SNAPSHOT_FORMAT = 3
+
+REQUIRED_FIELDS = ("category", "tool")
+# Al menos una fuente de evidencia: cuerpo (pattern), cabeceras o cookies
+EVIDENCE_FIELDS = ("pattern", "headers", "cookies")
+
+
+class FingerprintDBError(ValueError):
+    """El archivo de fingerprints no pasa la validación."""
+
+    def __init__(self, errors: List[str]):
+        self.errors = errors
+        super().__init__("; ".join(errors[:5]) + (f" (+{len(errors) - 5} más)" if len(errors) > 5 else ""))
+
+
+# ---------------------------
+# Validación
+# ---------------------------
+
+# Grupo cuantificado cuyo cuerpo ya tiene un cuantificador no acotado: (a+)+, (\w*)*, (x+){2,}
+_UNBOUNDED = r"(?:[*+]|\{\d+,\})"
+_NESTED_QUANTIFIER_RE = re.compile(r"\((?:[^()\\]|\\.)*" + _UNBOUNDED + r"(?:[^()\\]|\\.)*\)" + _UNBOUNDED)
+# Comodines no acotados consecutivos: .*.*, .+.*, .*\w*
+_ADJACENT_WILDCARDS_RE = re.compile(r"\.[*+]\??(?:\.|\\[wWsSdD]|\[[^\]]*\])[*+]")
+# Hosts con puntos sin escapar (js.stripe.com matchea también "jsXstripeYcom")
+_UNESCAPED_HOST_DOT_RE = re.compile(r"(?<!\\)[a-z0-9]\.(?:com|net|io|org|js|css|co|app|ai)\b", re.I)
+
+
+def lint_pattern(pattern: str) -> Tuple[List[str], List[str]]:
+    """Devuelve (errores, avisos) para un patrón individual."""
+    errors, warnings = [], []
+    try:
+        re.compile(pattern, re.I)
+    except re.error as e:
+        errors.append(f"regex inválida: {e}")
+        return errors, warnings
+    if _NESTED_QUANTIFIER_RE.search(pattern):
+        errors.append("cuantificadores anidados (backtracking catastrófico)")
+    if _ADJACENT_WILDCARDS_RE.search(pattern):
+        errors.append("comodines no acotados consecutivos (backtracking catastrófico)")
+    if pattern.startswith((".*", ".+")):
+        warnings.append("comodín inicial: escanea toda la página por cada posición")
+    if _UNESCAPED_HOST_DOT_RE.search(pattern):
+        warnings.append("punto sin escapar en host (matchea cualquier carácter)")
+    return errors, warnings
+
+
+def validate_fingerprints(data: Any) -> Tuple[List[str], List[str]]:
+    """
+    Valida el contenido del archivo de fingerprints.
+    Devuelve (errores, avisos); con errores el archivo no se carga.
+    """
+    errors: List[str] = []
+    warnings: List[str] = []
+    if not isinstance(data, dict):
+        return ["la raíz debe ser un objeto"], warnings
+    if not isinstance(data.get("version"), str) or not data["version"].strip():
+        errors.append("falta 'version' (string)")
+    entries = data.get("fingerprints")
+    if not isinstance(entries, list) or not entries:
+        errors.append("'fingerprints' debe ser una lista no vacía")
+        return errors, warnings
+
+    seen: Dict[Tuple[str, str], int] = {}
+    for i, entry in enumerate(entries):
+        where = f"fingerprints[{i}]"
+        if not isinstance(entry, dict):
+            errors.append(f"{where}: debe ser un objeto")
+            continue
+        missing = [f for f in REQUIRED_FIELDS if not isinstance(entry.get(f), str) or not entry[f].strip()]
+        if missing:
+            errors.append(f"{where}: faltan campos {missing}")
+            continue
+        if not any(entry.get(f) for f in EVIDENCE_FIELDS):
+            errors.append(f"{where}: necesita 'pattern', 'headers' o 'cookies'")
+            continue
+        unknown = set(entry) - set(REQUIRED_FIELDS) - set(EVIDENCE_FIELDS) - {"source"}
+        if unknown:
+            warnings.append(f"{where}: campos desconocidos {sorted(unknown)}")
+
+        key = (entry["category"], entry["tool"])
+        if key in seen:
+            errors.append(f"{where}: duplicado de fingerprints[{seen[key]}] ({key[0]} / {key[1]})")
+        else:
+            seen[key] = i
+
+        patterns = []
+        if "pattern" in entry:
+            if not isinstance(entry["pattern"], str) or not entry["pattern"].strip():
+                errors.append(f"{where}: 'pattern' debe ser un string no vacío")
+            else:
+                patterns.append(entry["pattern"])
+        headers = entry.get("headers", {})
+        if not isinstance(headers, dict) or not all(isinstance(k, str) and isinstance(v, str) for k, v in headers.items()):
+            errors.append(f"{where}: 'headers' debe ser un objeto nombre -> regex ('' = presencia)")
+        else:
+            patterns.extend(v for v in headers.values() if v)
+        cookies = entry.get("cookies", [])
+        if not isinstance(cookies, list) or not all(isinstance(c, str) and c for c in cookies):
+            errors.append(f"{where}: 'cookies' debe ser una lista de nombres")
+
+        for pattern in patterns:
+            pattern_errors, pattern_warnings = lint_pattern(pattern)
+            errors.extend(f"{where} ({key[1]}): {e}" for e in pattern_errors)
+            warnings.extend(f"{where} ({key[1]}): {w}" for w in pattern_warnings)
+    return errors, warnings
+
+
+# ---------------------------
+# Carga, snapshot y hot reload
+# ---------------------------
+
+def _header_rule_pattern(entry: Dict[str, Any]) -> Optional[str]:
+    """
+    Traduce las reglas de cabeceras/cookies de una entrada a un patrón sobre
+    headers_text(): una línea 'nombre: valor' por cabecera y 'set-cookie: nombre'
+    por cookie.
+    """
+    branches = []
+    for name, value in entry.get("headers", {}).items():
+        prefix = "^" + re.escape(name.lower()) + ": "
+        if not value:
+            branches.append(prefix)
+        elif "|" in value:
+            branches.append(prefix + "[^\n]*(?:" + value + ")")
+        else:
+            branches.append(prefix + "[^\n]*" + value)
+    for cookie in entry.get("cookies", []):
+        branches.append("^set-cookie: " + re.escape(cookie) + "$")
+    return "|".join(branches) or None
+
+
+def _header_rule_label(entry: Dict[str, Any]) -> str:
+    parts = []
+    if entry.get("headers"):
+        parts.append("headers: " + ", ".join(
+            f"{k}: {v}" if v else k for k, v in entry["headers"].items()
+        ))
+    if entry.get("cookies"):
+        parts.append("cookies: " + ", ".join(entry["cookies"]))
+    return "; ".join(parts)
+
+
+def headers_text(headers: Dict[str, str], cookies: List[str]) -> str:
+    """Vista de texto de cabeceras + cookies sobre la que corren las reglas."""
+    lines = [f"{name.lower()}: {value}" for name, value in headers.items()]
+    lines.extend(f"set-cookie: {c}" for c in cookies)
+    return "\n".join(lines)
+
+
+def _category_index(engine: FingerprintEngine) -> Dict[str, frozenset]:
+    index: Dict[str, set] = {}
+    for idx, (category, _) in enumerate(engine.keys):
+        index.setdefault(category, set()).add(idx)
+    return {cat: frozenset(idxs) for cat, idxs in index.items()}
+
+
+class FingerprintDB:
+    """Versión cargada de la base: motores (cuerpo y cabeceras) + metadatos."""
+
+    def __init__(self, version: str, source_hash: str, entries: List[Dict[str, Any]], warnings: List[str]):
+        self.version = version
+        self.source_hash = source_hash
+        self.warnings = warnings
+        self.loaded_at = time.time()
+        self.engine = FingerprintEngine(
+            ((e["category"], e["tool"]), e["pattern"]) for e in entries if e.get("pattern")
+        )
+        header_entries = [e for e in entries if e.get("headers") or e.get("cookies")]
+        self.header_engine = FingerprintEngine(
+            (((e["category"], e["tool"]), _header_rule_pattern(e)) for e in header_entries),
+            flags=re.I | re.M,
+        )
+        self.header_evidence = [_header_rule_label(e) for e in header_entries]
+        self.category_index = _category_index(self.engine)
+
+    @property
+    def categories(self) -> List[str]:
+        return list(dict.fromkeys(
+            cat for cat, _ in (*self.engine.keys, *self.header_engine.keys)
+        ))
+
+    def indices_for(self, categories) -> frozenset:
+        """Índices del motor de cuerpo que pertenecen a esas categorías."""
+        return frozenset().union(*(self.category_index.get(c, ()) for c in categories))
+
+    def info(self) -> Dict[str, Any]:
+        return {
+            "version": self.version,
+            "source_hash": self.source_hash[:12],
+            "fingerprints": len(self.engine),
+            "header_fingerprints": len(self.header_engine),
+            "categories": len(self.categories),
+            "warnings": len(self.warnings),
+            "loaded_at": self.loaded_at,
+        }
+
+
+def _read_source(path: str) -> Tuple[bytes, str]:
+    with open(path, "rb") as f:
+        raw = f.read()
+    return raw, hashlib.sha256(raw).hexdigest()
+
+
+def build_db(raw: bytes, source_hash: str) -> FingerprintDB:
+    """Valida el JSON y construye el motor. Lanza FingerprintDBError si no es válido."""
+    try:
+        data = json.loads(raw)
+    except ValueError as e:
+        raise FingerprintDBError([f"JSON inválido: {e}"])
+    errors, warnings = validate_fingerprints(data)
+    if errors:
+        raise FingerprintDBError(errors)
+    return FingerprintDB(data["version"], source_hash, data["fingerprints"], warnings)
+
+
+def _load_snapshot(snapshot_path: str, source_hash: str) -> Optional[FingerprintDB]:
+    try:
+        with open(snapshot_path, "rb") as f:
+            snap = pickle.load(f)
+    except Exception:
+        return None
+    if (
+        not isinstance(snap, dict)
+        or snap.get("format") != SNAPSHOT_FORMAT
+        or snap.get("source_hash") != source_hash
+        or snap.get("ahocorasick") != HAS_AHOCORASICK
+    ):
+        return None
+    return snap["db"]
+
+
+def write_snapshot(db: FingerprintDB, snapshot_path: str) -> bool:
+    """Escribe el snapshot de forma atómica. Best-effort: False si no se pudo."""
+    tmp = f"{snapshot_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "wb") as f:
+            pickle.dump(
+                {"format": SNAPSHOT_FORMAT, "source_hash": db.source_hash,
+                 "ahocorasick": HAS_AHOCORASICK, "db": db},
+                f, protocol=pickle.HIGHEST_PROTOCOL,
+            )
+        os.replace(tmp, snapshot_path)
+        return True
+    except Exception as e:
+        logger.warning(f"No se pudo escribir el snapshot de fingerprints: {e}")
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        return False
+
+
+def load_db(path: str = None, snapshot_path: str = None) -> FingerprintDB:
+    """
+    Carga la base: usa el snapshot si corresponde al hash del JSON actual,
+    si no valida + construye y regenera el snapshot.
+    """
+    path = path or FINGERPRINTS_PATH
+    snapshot_path = snapshot_path or FINGERPRINTS_SNAPSHOT
+    raw, source_hash = _read_source(path)
+    db = _load_snapshot(snapshot_path, source_hash)
+    if db is not None:
+        db.loaded_at = time.time()
+        return db
+    db = build_db(raw, source_hash)
+    write_snapshot(db, snapshot_path)
+    return db
+
+
+_lock = threading.Lock()
+_current: Optional[FingerprintDB] = None
+_source_mtime: Optional[float] = None
+_last_check = 0.0
+
+
+def _mtime(path: str) -> Optional[float]:
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+
+def reload_db(force: bool = False) -> FingerprintDB:
+    """
+    Relee el archivo si cambió (o siempre con force). Si la nueva versión no
+    valida se conserva la anterior y se loguea el error; sin versión previa,
+    el error se propaga.
+    """
+    global _current, _source_mtime, _last_check
+    with _lock:
+        _last_check = time.time()
+        mtime = _mtime(FINGERPRINTS_PATH)
+        if _current is not None and not force and mtime == _source_mtime:
+            return _current
+        try:
+            db = load_db()
+        except (OSError, FingerprintDBError) as e:
+            if _current is None:
+                raise
+            logger.error(f"Fingerprints no recargados, se mantiene v{_current.version}: {e}")
+            _source_mtime = mtime
+            return _current
+        if _current is None or db.source_hash != _current.source_hash:
+            logger.info(f"Fingerprints v{db.version} cargados ({len(db.engine)} patrones)")
+        _current, _source_mtime = db, mtime
+        return db
+
+
+def get_db() -> FingerprintDB:
+    """Base actual; comprueba cambios en disco como mucho cada RELOAD_CHECK_SEC."""
+    if _current is None or (RELOAD_CHECK_SEC > 0 and time.time() - _last_check >= RELOAD_CHECK_SEC):
+        return reload_db()
+    return _current
+
+
+def get_engine() -> FingerprintEngine:
+    return get_db().engine
+
+
+if __name__ == "__main__":
+    # python -m app.fingerprint_db [validate|build] [ruta.json]
+    import sys
+
+    command = sys.argv[1] if len(sys.argv) > 1 else "build"
+    path = sys.argv[2] if len(sys.argv) > 2 else FINGERPRINTS_PATH
+    raw, source_hash = _read_source(path)
+    try:
+        db = build_db(raw, source_hash)
+    except FingerprintDBError as e:
+        for err in e.errors:
+            print(f"❌ {err}")
+        sys.exit(1)
+    for w in db.warnings:
+        print(f"⚠️ {w}")
+    print(f"✅ v{db.version}: {len(db.engine)} fingerprints de cuerpo + {len(db.header_engine)} de cabeceras en {len(db.categories)} categorías")
+    if command == "build":
+        snapshot_path = FINGERPRINTS_SNAPSHOT if path == FINGERPRINTS_PATH else os.path.splitext(path)[0] + ".pkl"
+        if not write_snapshot(db, snapshot_path):
+            sys.exit(1)
+        print(f"📦 Snapshot escrito en {snapshot_path}")
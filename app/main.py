@@ -1,10 +1,10 @@
 # app/app/main.py
 from fastapi import FastAPI, HTTPException, Body
-from typing import List, Dict, Any
-from bs4 import BeautifulSoup
+from typing import List, Dict, Any, Union
 import httpx
 import time
 import logging
+from contextlib import aclosing
 
 from .schemas import *
 from .util import (
@@ -16,14 +16,21 @@ from .util import (
     normalize_company_name,
     keyword_score,
 )
-from .fetch import fetch_many
-from .parsers.techstack import detect_tech
-from .parsers.news import extract_news_from_html
+from .fetch import fetch_pages, iter_pages, discover_feeds_from_html
+from .parsers.techstack import TechDetector, tech_profile, PROFILE_SAMPLE_RATE
+from .parsers.news import MAX_NEWS_ITEMS, extract_news_from_html, fetch_feed_news, is_news_page
 from .parsers.emails import extract_emails
-from .parsers.industry import detectar_principal_y_secundaria
+from .parsers.social import extract_socials
+from .parsers.industry import IndustryAccumulator, page_kind
 from .parsers.company_name import extract_company_name_from_html
-from .parsers.seo_metrics import extract_seo_metrics
+from .parsers.data_islands import extract_island_content, island_stats, island_text
+from .parsers.seo_metrics import SEOAccumulator, extract_seo_metrics
+from .parsers.jobs import board_cache, collect_jobs
+from .parsers.linkedin import fetch_linkedin_company, linkedin_cache
 from .enrichment import get_enrichment_data
+from .fingerprint_db import get_db, reload_db, FingerprintDBError
+from .third_party import fingerprint_scripts, script_cache
+from .memo import memo
 
 # Logger setup
 logger = logging.getLogger(__name__)
@@ -264,61 +271,32 @@ _cache_max_size = 100
 # Utilidades locales
 # ---------------------------
 
-def _socials_from_html(html: str) -> dict:
-    """Extract social networks from HTML - improved to avoid wrong URLs"""
-    out = {}
-    if not html:
-        return out
-    soup = BeautifulSoup(html, "lxml")
+# Subir si cambia la salida (invalida el memo por contenido)
+SOCIALS_VERSION = "3"
+# Redes que devuelve el escaneo
+SCAN_SOCIAL_PLATFORMS = ("linkedin", "facebook", "twitter", "instagram", "youtube", "tiktok", "github")
 
-    # Find social links with improved filtering
-    all_links = soup.find_all("a", href=True)
-    
-    for link in all_links:
-        href = link["href"].strip()
-        if not href:
-            continue
-        
-        href_lower = href.lower()
-        
-        # Skip obvious non-social pages - enhanced filtering
-        if any(skip in href_lower for skip in [
-            "privacy", "privacidad", "terms", "condiciones", 
-            "cookies", "legal", "contact", "contacto", "notices",
-            "policy", "politica", "about/legal", "support", 
-            "help", "ayuda", "faq", "aviso", "disclaimer"
-        ]):
-            continue
-            
-        # Skip obviously wrong URLs (too long, weird parameters)
-        if len(href) > 200 or "?" in href and len(href.split("?")[1]) > 50:
-            continue
+
+def _socials_from_html(html: Union[str, bytes], platforms=SCAN_SOCIAL_PLATFORMS, encoding: str = "utf-8") -> dict:
+    """Redes sociales de la página (links, meta y JSON-LD), memoizadas por contenido"""
+    if not html:
+        return {}
+    platforms = tuple(platforms)
+    return memo.memoize("socials", SOCIALS_VERSION, html,
+                        lambda: extract_socials(html, platforms, encoding=encoding), platforms, encoding)
+
+
+def _merge_tech(tech_by_category: dict, tech: List[dict]) -> None:
+    """Acumula resultados de detect_tech* en {categoría: {"tools": set, "evidence": [...]}}"""
+    for tech_item in tech:
+        category = tech_item.get("category", "other")
+        if category not in tech_by_category:
+            tech_by_category[category] = {"tools": set(), "evidence": []}
         
-        # Detect social networks with better filtering
-        if "linkedin.com/company" in href_lower and "linkedin" not in out:
-            out["linkedin"] = href
-        elif "facebook.com" in href_lower and "facebook" not in out:
-            # Only valid Facebook pages
-            if "/pages/" in href_lower or (href_lower.count("/") >= 3 and not any(x in href_lower for x in ["sharer", "login", "help"])):
-                out["facebook"] = href
-        elif ("twitter.com" in href_lower or "x.com" in href_lower) and "twitter" not in out:
-            # Skip Twitter share/login links
-            if not any(x in href_lower for x in ["share", "login", "oauth", "auth"]):
-                out["twitter"] = href
-        elif "instagram.com" in href_lower and "instagram" not in out:
-            if not any(x in href_lower for x in ["share", "login", "oauth"]):
-                out["instagram"] = href
-        elif "youtube.com" in href_lower and "youtube" not in out:
-            if any(x in href_lower for x in ["/channel/", "/c/", "/user/", "/@"]):
-                out["youtube"] = href
-        elif "tiktok.com" in href_lower and "tiktok" not in out:
-            if not any(x in href_lower for x in ["share", "login"]):
-                out["tiktok"] = href
-        elif "github.com" in href_lower and "github" not in out:
-            if not any(x in href_lower for x in ["login", "signup"]):
-                out["github"] = href
-
-    return out
+        tech_by_category[category]["tools"].update(tech_item.get("tools", []))
+        evidence = tech_item.get("evidence", "")
+        if evidence:
+            tech_by_category[category]["evidence"].append(evidence)
 
 
 # ---------------------------
@@ -333,6 +311,49 @@ def health():
     return {"ok": True}
 
 
+@app.on_event("startup")
+async def _load_fingerprints():
+    # Cargar (snapshot o JSON) al arrancar: un archivo inválido debe fallar aquí
+    db = get_db()
+    logger.info(f"Fingerprints v{db.version}: {len(db.engine)} patrones")
+
+
+@app.on_event("shutdown")
+def _save_memo():
+    # Con MEMO_CACHE_PATH, el próximo arranque reutiliza los resultados por contenido
+    memo.save()
+
+
+@app.get("/fingerprints")
+def fingerprints_info():
+    """Versión de la base de fingerprints cargada en este worker"""
+    db = get_db()
+    return {**db.info(), "warnings_sample": db.warnings[:10]}
+
+
+@app.post("/fingerprints/reload")
+def fingerprints_reload():
+    """Fuerza la relectura del archivo de fingerprints en este worker"""
+    try:
+        db = reload_db(force=True)
+    except FingerprintDBError as e:
+        raise HTTPException(status_code=422, detail={"error": "Invalid fingerprints", "errors": e.errors})
+    return db.info()
+
+
+@app.get("/fingerprints/profile")
+def fingerprints_profile(top: int = 20, sort: str = "time"):
+    """Fingerprints más costosos en las páginas muestreadas de este worker (TECH_PROFILE_SAMPLE)"""
+    return {"sample_rate": PROFILE_SAMPLE_RATE, **tech_profile.report(top=top, sort=sort)}
+
+
+@app.delete("/fingerprints/profile")
+def fingerprints_profile_reset():
+    """Reinicia el perfil acumulado"""
+    tech_profile.reset()
+    return {"ok": True}
+
+
 @app.post("/scan", response_model=ScanResponse, summary="Escanear información de empresa")
 async def scan(req: ScanRequest):
     """
@@ -469,6 +490,10 @@ async def _single_scan(req: ScanRequest) -> ScanResponse:
         from .fetch import extract_internal_links
         
         home_html = None
+        home_page = None
+        # Detector incremental: conserva lo encontrado y solo evalúa lo pendiente en cada página.
+        # Se alimenta por trozos durante la descarga (la detección termina con el fetch)
+        tech_detector = TechDetector(target_categories=req.tech_targets)
         fetch_attempts = [
             {"timeout": TIMEOUT_ULTRA_FAST, "name": "ultra-fast"},
             {"timeout": TIMEOUT_FAST, "name": "fast"}, 
@@ -480,8 +505,11 @@ async def _single_scan(req: ScanRequest) -> ScanResponse:
         for i, attempt in enumerate(fetch_attempts):
             try:
                 print(f"⚡ Intento {i+1}: {attempt['name']} ({attempt['timeout']}s)")
-                result = await fetch_many([base], respect_robots=False, timeout=attempt['timeout'])
-                home_html = result[0][1] if result and result[0] else None
+                # La home se lee entera aunque tech_targets se cubran: nombre, emails, redes, SEO y links salen de ella
+                result = await fetch_pages([base], respect_robots=False, timeout=attempt['timeout'],
+                                           sink_factory=lambda _: tech_detector.stream_page(may_stop=False))
+                home_page = result[0] if result else None
+                home_html = home_page.html if home_page else None
                 
                 if home_html:
                     print(f"✅ HTML obtenido en intento {i+1}")
@@ -524,18 +552,28 @@ async def _single_scan(req: ScanRequest) -> ScanResponse:
             error_details.append(f"Company name extraction failed: {str(e)}")
             timings["company_name"] = time.time() - step_start
 
+        # 🏝️ DATA ISLANDS (SPA): contenido de __NEXT_DATA__/__NUXT__... para los extractores
+        # (parseado bajo demanda con tope MAX_ISLAND_BYTES; el blob ya no pasa por las regex de tech)
+        home_islands = None
+        try:
+            home_islands = extract_island_content(home_html)
+            if home_islands:
+                print(f"🏝️ Data islands {home_islands['frameworks']}: {home_islands['bytes'] // 1024}KB, "
+                      f"{len(home_islands['titles'])} títulos, {len(home_islands['links'])} links")
+        except Exception as e:
+            error_details.append(f"Data island extraction failed: {str(e)}")
+
         # 🏭 ETAPA 4: INDUSTRY DETECTION ULTRA-OPTIMIZADA
+        # Contadores por industria acumulados página a página (home ahora, crawl después)
         step_start = time.time()
+        industry_acc = IndustryAccumulator(req.domain)
         try:
-            # Solo usar contenido más relevante (título + meta + primeros 3000 chars)
-            texto_optimizado = home_html[:3000].lower()
-            if company_name:
-                texto_optimizado += " " + company_name.lower()
-            
-            principal, secundaria = detectar_principal_y_secundaria(texto_optimizado, req.domain)
+            industry_acc.add_page(base, home_html, extra_text=f"{company_name or ''} {island_text(home_islands)}")
+            principal, secundaria = industry_acc.principal_y_secundaria()
             timings["industry_detection"] = time.time() - step_start
-            print(f"🏭 Industry: '{principal}' en {timings['industry_detection']:.3f}s")
+            print(f"🏭 Industry (home): '{principal}' en {timings['industry_detection']:.3f}s")
         except Exception as e:
+            industry_acc = None  # sin agregado del crawl: se queda "No determinada"
             principal = "No determinada"
             secundaria = None
             error_details.append(f"Industry detection failed: {str(e)}")
@@ -545,42 +583,35 @@ async def _single_scan(req: ScanRequest) -> ScanResponse:
         # 💻 ETAPA 5: TECH STACK DETECTION OPTIMIZADA - MEJORADO PARA MÚLTIPLES PÁGINAS
         step_start = time.time()
         tech_stack = {}
-        try:
-            # Analizar tech stack de la homepage
-            tech = detect_tech(base, home_html)
-            tech_by_category = {}
-            
-            for tech_item in tech:
-                category = tech_item.get("category", "other")
-                if category not in tech_by_category:
-                    tech_by_category[category] = {"tools": set(), "evidence": []}
-                
-                tech_by_category[category]["tools"].update(tech_item.get("tools", []))
-                evidence = tech_item.get("evidence", "")
-                if evidence:
-                    tech_by_category[category]["evidence"].append(evidence)
-
-            # ⚠️ NO construir tech_stack aquí - esperar a procesar todas las páginas
-            
-            timings["tech_stack"] = time.time() - step_start
-            print(f"💻 Tech: análisis inicial en {timings['tech_stack']:.3f}s")
-            
-        except Exception as e:
-            error_details.append(f"Tech stack detection failed: {str(e)}")
-            timings["tech_stack"] = time.time() - step_start
+        tech_by_category = {}
+        # La homepage ya se analizó mientras se descargaba (cabeceras/cookies primero:
+        # CMS, CDN, ecommerce resueltos sin mirar el cuerpo)
+        # ⚠️ NO construir tech_stack aquí - esperar a procesar todas las páginas
+        timings["tech_stack"] = time.time() - step_start
+        print(f"💻 Tech: análisis inicial durante la descarga "
+              f"({tech_detector.stats['literal_confirmations'] + tech_detector.stats['regex_confirmations']} candidatos)")
 
         # 🔗 ETAPA 6: PÁGINAS ADICIONALES (ULTRA-OPTIMIZADO)
         step_start = time.time()
         additional_pages = []
+        seo_site = SEOAccumulator()
+        crawl_seo_time = 0.0
         social = {}
         emails = []
         news_items = []
+        links = []
+        include_jobs = req.include_jobs or bool(req.careers_overrides)
+        careers_pages = {}  # url -> html de las páginas de empleo ya crawleadas (include_jobs)
+        feed_urls = (discover_feeds_from_html(base, home_page.body or home_html, home_page.encoding)
+                     if req.include_feeds else [])
         
         # Solo buscar páginas adicionales si el request lo permite
         if req.max_pages > 1:  # Removemos la restricción de timeout
             try:
                 # Discovery mejorado para encontrar páginas con CRM/tech
-                links = extract_internal_links(base, home_html, max_links=MAX_INTERNAL_LINKS)  # Usa config
+                links = extract_internal_links(base, home_page.body or home_html, max_links=MAX_INTERNAL_LINKS,  # Usa config; bytes crudos si hay
+                                               extra_hrefs=home_islands["links"] if home_islands else (),
+                                               encoding=home_page.encoding)
                 scored = [(keyword_score(httpx.URL(u).path), u) for u in links if not looks_blocklisted(u)]
                 scored.sort(reverse=True, key=lambda x: x[0])
                 
@@ -597,36 +628,47 @@ async def _single_scan(req: ScanRequest) -> ScanResponse:
                 
                 print(f"🔗 Explorando {len(candidates)} páginas candidatas para {req.domain}")
                 
-                # Fetch adicional con timeout optimizado
-                fetched = await fetch_many(candidates, respect_robots=req.respect_robots, timeout=TIMEOUT_FAST)  # Usa config
-                
-                for final_url, html in fetched:
-                    if html and final_url != base:
+                # Fetch adicional con timeout optimizado: tech por trozos durante la descarga.
+                # Los cuerpos se leen enteros (industria, SEO, noticias y empleo los usan);
+                # con tech_targets cubiertos solo se deja de escanear tech
+                page_sink = lambda u: None if u == base else tech_detector.stream_page(may_stop=False)
+                async with aclosing(iter_pages(candidates, respect_robots=req.respect_robots, timeout=TIMEOUT_FAST,
+                                               sink_factory=page_sink)) as pages:  # Usa config
+                    async for page in pages:
+                        final_url, html = page.url, page.html
+                        if not html or final_url == base:
+                            continue
                         additional_pages.append(final_url)
                         
-                        # ✅ NUEVO: Analizar tech stack en páginas adicionales
-                        try:
-                            additional_tech = detect_tech(final_url, html)
-                            for tech_item in additional_tech:
-                                category = tech_item.get("category", "other")
-                                if category not in tech_by_category:
-                                    tech_by_category[category] = {"tools": set(), "evidence": []}
-                                
-                                tech_by_category[category]["tools"].update(tech_item.get("tools", []))
-                                evidence = tech_item.get("evidence", "")
-                                if evidence:
-                                    tech_by_category[category]["evidence"].append(evidence)
-                        except Exception as e:
-                            print(f"⚠️ Error analyzing tech stack for {final_url}: {str(e)}")
-                        
                         # Extracciones ultra-limitadas para no perder tiempo
                         if len(social) < 2:
-                            s = _socials_from_html(html)
-                            social.update({k: v for k, v in s.items() if k not in social})
+                            # Solo las redes que faltan: el extractor corta en cuanto las tiene
+                            missing = [p for p in SCAN_SOCIAL_PLATFORMS if p not in social]
+                            social.update(_socials_from_html(page.body or html, missing, page.encoding))
                         
                         if len(emails) < 2:  # Reducido de 3 a 2
-                            page_emails = extract_emails(html)
+                            page_emails = extract_emails(page.body or html)
                             emails.extend(page_emails[:1])  # Solo 1 email por página
+                        
+                        if include_jobs and page_kind(final_url) == "careers":
+                            careers_pages[final_url] = html
+                        
+                        # Noticias: feeds enlazados desde la página y, en páginas de blog/news, la heurística
+                        if req.include_feeds:
+                            feed_urls.extend(discover_feeds_from_html(final_url, page.body or html, page.encoding))
+                        if len(news_items) < MAX_NEWS_ITEMS and is_news_page(final_url):
+                            news_items.extend(extract_news_from_html(final_url, html, max_items=MAX_NEWS_ITEMS))
+                        
+                        # SEO de la página para el agregado del sitio (una pasada, memoizada)
+                        seo_start = time.time()
+                        seo_site.add(extract_seo_metrics(html, final_url, page_bytes=page.size))
+                        crawl_seo_time += time.time() - seo_start
+                        
+                        # Industria: suma los scores de esta página (about/product pesan más)
+                        if industry_acc is not None:
+                            industry_start = time.time()
+                            industry_acc.add_page(final_url, html, extra_text=island_text(extract_island_content(html)))
+                            timings["industry_detection"] += time.time() - industry_start
                             
             except Exception as e:
                 error_details.append(f"Additional pages processing failed: {str(e)}")
@@ -635,15 +677,40 @@ async def _single_scan(req: ScanRequest) -> ScanResponse:
         
         timings["additional_processing"] = time.time() - step_start
 
+        # 🏭 Industria final con todas las páginas procesadas
+        if additional_pages and industry_acc is not None:
+            try:
+                principal, secundaria = industry_acc.principal_y_secundaria()
+                print(f"🏭 Industry agregada: '{principal}' / '{secundaria}' "
+                      f"({sum(industry_acc.pages.values())} páginas: {industry_acc.pages})")
+            except Exception as e:
+                error_details.append(f"Industry aggregation failed: {str(e)}")
+
+        # 📜 SCRIPTS DE TERCEROS (opcional): fingerprints dentro de los bundles JS, cacheados entre dominios
+        script_stats = None
+        if req.scan_scripts and not tech_detector.targets_filled():
+            step_start = time.time()
+            try:
+                script_found, script_stats = await fingerprint_scripts(base, home_page.body or home_html)
+                tech_detector.add_matches(script_found)
+                print(f"📜 Scripts: {script_stats['scripts']} de terceros, {script_stats['cache_hits']} desde cache, "
+                      f"{script_stats['bytes_fetched'] // 1024}KB descargados")
+            except Exception as e:
+                error_details.append(f"Third-party script scan failed: {str(e)}")
+            timings["third_party_scripts"] = time.time() - step_start
+
         # � CONSTRUIR TECH_STACK FINAL después de analizar todas las páginas
         try:
+            _merge_tech(tech_by_category, tech_detector.results())
             for cat, data in tech_by_category.items():
                 if data["tools"]:  # Solo incluir categorías con tools
                     tech_stack[cat] = TechFingerprint(
                         tools=list(data["tools"]),
                         evidence=" | ".join(data["evidence"][:2])  # Max 2 evidencias
                     )
-            print(f"🔧 Tech Stack final: {len(tech_stack)} categorías")
+            print(f"🔧 Tech Stack final: {len(tech_stack)} categorías "
+                  f"({tech_detector.stats['pages_scanned']} páginas, "
+                  f"{tech_detector.stats['evaluations_saved']} evaluaciones ahorradas)")
         except Exception as e:
             error_details.append(f"Tech stack final construction failed: {str(e)}")
 
@@ -652,15 +719,49 @@ async def _single_scan(req: ScanRequest) -> ScanResponse:
         seo_metrics = None
         try:
             home_load_time = int(timings.get("html_fetch", 0) * 1000)
-            seo_metrics = extract_seo_metrics(home_html, base, request_time_ms=home_load_time)
+            seo_metrics = extract_seo_metrics(home_html, base, request_time_ms=home_load_time,
+                                              page_bytes=home_page.size if home_page else None)
+            if seo_metrics:
+                seo_site.add(seo_metrics)
+                seo_metrics["site"] = seo_site.summary()
         except Exception as e:
             error_details.append(f"SEO metrics extraction failed: {str(e)}")
-        timings["seo_metrics"] = time.time() - step_start
+        timings["seo_metrics"] = time.time() - step_start + crawl_seo_time
+
+        # 📰 NOTICIAS: feeds RSS/Atom primero (descarga con tope y corte temprano), si no la heurística
+        if feed_urls:
+            step_start = time.time()
+            try:
+                feed_news = await fetch_feed_news(list(dict.fromkeys(feed_urls)), respect_robots=req.respect_robots,
+                                                  timeout=TIMEOUT_FAST)
+                if feed_news:
+                    news_items = feed_news
+                print(f"📰 Feeds: {len(feed_urls)} descubiertos, {len(feed_news)} noticias")
+            except Exception as e:
+                error_details.append(f"News feed extraction failed: {str(e)}")
+            timings["news_feeds"] = time.time() - step_start
+
+        # 💼 EMPLEO (opcional): página de careers (o careers_overrides) + boards de ATS (Greenhouse, Lever, Ashby)
+        jobs_summary = None
+        if include_jobs:
+            step_start = time.time()
+            try:
+                jobs_summary = await collect_jobs(home_page.body or home_html, links=links, careers_pages=careers_pages,
+                                                  overrides=req.careers_overrides, respect_robots=req.respect_robots,
+                                                  timeout=TIMEOUT_FAST)
+                if jobs_summary:
+                    print(f"💼 Jobs: {jobs_summary['jobs_count']} ofertas ({jobs_summary['hiring_volume']}), "
+                          f"boards {jobs_summary['ats_boards']}")
+            except Exception as e:
+                error_details.append(f"Jobs extraction failed: {str(e)}")
+            timings["jobs"] = time.time() - step_start
 
         # 📧 SOCIAL Y EMAILS DEL HOME
         try:
-            home_social = _socials_from_html(home_html)
+            home_social = _socials_from_html(home_page.body or home_html, encoding=home_page.encoding)
             social.update(home_social)
+            # La home no pasa por el bucle del crawl: su email se suma aquí
+            emails.extend(extract_emails(home_page.body or home_html)[:1])
             
             if emails:
                 unique_emails = list(set(emails))
@@ -668,6 +769,21 @@ async def _single_scan(req: ScanRequest) -> ScanResponse:
         except Exception as e:
             error_details.append(f"Social/email extraction failed: {str(e)}")
 
+        # 🔗 LINKEDIN: página de empresa (company_linkedin o la del home), cacheada por slug
+        linkedin_info = None
+        linkedin_url = str(req.company_linkedin) if req.company_linkedin else social.get("linkedin")
+        if (req.include_linkedin or req.company_linkedin) and linkedin_url:
+            step_start = time.time()
+            try:
+                linkedin_info = await fetch_linkedin_company(linkedin_url, respect_robots=req.respect_robots)
+                if linkedin_info:
+                    employees = linkedin_info.get("employee_count") or linkedin_info.get("employee_range")
+                    print(f"🔗 LinkedIn {linkedin_info['slug']}: {employees} empleados, "
+                          f"{linkedin_info.get('linkedin_industry')}")
+            except Exception as e:
+                error_details.append(f"LinkedIn extraction failed: {str(e)}")
+            timings["linkedin"] = time.time() - step_start
+
         # 📊 TIMING FINAL
         timings["total_time"] = time.time() - total_start
         
@@ -749,9 +865,25 @@ async def _single_scan(req: ScanRequest) -> ScanResponse:
             response_data["seo_metrics"] = seo_metrics
         if enrichment_data:
             response_data["enrichment"] = enrichment_data
+        if jobs_summary:
+            response_data["jobs"] = jobs_summary
+        if linkedin_info:
+            response_data["linkedin"] = linkedin_info
+        response_data["scan_stats"] = {"tech": tech_detector.stats}
+        if script_stats:
+            response_data["scan_stats"]["scripts"] = script_stats
+        if home_islands:
+            response_data["scan_stats"]["data_islands"] = island_stats(home_islands)
         
-        # News removido para optimización
-        response_data["recent_news"] = []
+        recent_news = []
+        for item in news_items:
+            try:
+                recent_news.append(NewsItem(**item))
+            except Exception:
+                continue  # URL no válida para el esquema
+            if len(recent_news) >= MAX_NEWS_ITEMS:
+                break
+        response_data["recent_news"] = recent_news
 
         return ScanResponse(**response_data)
 
@@ -791,6 +923,10 @@ async def get_system_status():
         "active_connections": len(_http_clients),
         "semaphore_available": _global_semaphore._value,
         "cache_size": len(_domain_cache),
+        "script_cache": script_cache.info(),
+        "ats_board_cache": board_cache.info(),
+        "linkedin_cache": linkedin_cache.info(),
+        "extractor_memo": memo.info(),
         "uptime": "running",
         "optimization_tips": [
             f"Current profile: {SYSTEM_CONFIG['profile']}",
@@ -0,0 +1,143 @@
+# app/memo.py
+"""
+Memo de resultados de extractores por hash de contenido.
+
+Clave: extractor + versión del extractor (p.ej. la versión de la base de
+fingerprints) + hash del cuerpo ya recortado + argumentos que cambian la
+salida. Un rescan de una página sin cambios, o la misma página de plantilla
+en otro dominio (muros de cookies, intersticiales de Cloudflare), no vuelve
+a parsear nada.
+
+- LRU en memoria (MEMO_CACHE_SIZE entradas, 0 = desactivado)
+- Persistencia opcional en disco: MEMO_CACHE_PATH (pickle atómico, se
+  guarda cada MEMO_SAVE_EVERY altas y al apagar el servidor)
+"""
+import copy
+import hashlib
+import logging
+import os
+import pickle
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Union
+
+logger = logging.getLogger(__name__)
+
+MEMO_CACHE_SIZE = int(os.getenv("MEMO_CACHE_SIZE", "2000"))
+MEMO_CACHE_PATH = os.getenv("MEMO_CACHE_PATH", "")
+MEMO_SAVE_EVERY = int(os.getenv("MEMO_SAVE_EVERY", "200"))
+
+# Subir si cambia la estructura de lo que se guarda en disco
+MEMO_FORMAT = 1
+
+
+def content_hash(content: Union[str, bytes], *extra: Any) -> str:
+    """Hash del contenido (str o bytes) + argumentos extra."""
+    h = hashlib.blake2b(digest_size=16)
+    if isinstance(content, str):
+        h.update(b"s")
+        h.update(content.encode("utf-8", errors="surrogatepass"))
+    else:
+        h.update(b"b")
+        h.update(content)
+    if extra:
+        h.update(repr(extra).encode("utf-8"))
+    return h.hexdigest()
+
+
+class MemoCache:
+    """LRU de (extractor, versión, hash) -> resultado (copiado al entrar y al salir)."""
+
+    def __init__(self, max_size: int = MEMO_CACHE_SIZE, path: str = MEMO_CACHE_PATH):
+        self.max_size = max_size
+        self.path = path
+        # (extractor, versión, hash) -> (resultado, segundos que costó calcularlo)
+        self._entries: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._dirty = 0
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0, "cpu_saved_ms": 0.0}
+        if path:
+            self.load()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0
+
+    def memoize(self, name: str, version: str, content: Union[str, bytes],
+                compute: Callable[[], Any], *extra: Any) -> Any:
+        """Resultado de `compute()` para este contenido, desde el memo si ya se calculó."""
+        if not self.enabled or not content:
+            return compute()
+        key = (name, str(version), content_hash(content, *extra))
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+            self.stats["cpu_saved_ms"] += entry[1] * 1000
+            return copy.deepcopy(entry[0])
+        self.stats["misses"] += 1
+        started = time.perf_counter()
+        result = compute()
+        self.put(key, result, time.perf_counter() - started)
+        return result
+
+    def put(self, key: tuple, result: Any, cost: float = 0.0) -> None:
+        self._entries[key] = (copy.deepcopy(result), cost)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.stats["evictions"] += 1
+        self._dirty += 1
+        if self.path and self._dirty >= MEMO_SAVE_EVERY:
+            self.save()
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._dirty = 0
+
+    def load(self) -> bool:
+        """Carga el memo de disco. Best-effort: False si no hay archivo válido."""
+        try:
+            with open(self.path, "rb") as f:
+                snap = pickle.load(f)
+        except Exception:
+            return False
+        if not isinstance(snap, dict) or snap.get("format") != MEMO_FORMAT:
+            return False
+        self._entries = OrderedDict(snap["entries"])
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+        return True
+
+    def save(self) -> bool:
+        """Escribe el memo de forma atómica. Best-effort: False si no se pudo."""
+        if not self.path:
+            return False
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp, "wb") as f:
+                pickle.dump({"format": MEMO_FORMAT, "entries": list(self._entries.items())},
+                            f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, self.path)
+            self._dirty = 0
+            return True
+        except Exception as e:
+            logger.warning(f"No se pudo escribir el memo de extractores: {e}")
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            return False
+
+    def info(self) -> dict:
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {
+            **self.stats,
+            "cpu_saved_ms": round(self.stats["cpu_saved_ms"], 1),
+            "hit_ratio": round(self.stats["hits"] / lookups, 3) if lookups else 0.0,
+            "entries": len(self._entries),
+            "max_size": self.max_size,
+            "persistent": bool(self.path),
+        }
+
+
+memo = MemoCache()
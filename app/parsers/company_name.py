@@ -4,10 +4,17 @@ from bs4 import BeautifulSoup
 from urllib.parse import urlparse
 from typing import Optional
 
+from .structured_data import extract_structured_data
+
 
 def extract_company_name_from_html(html: str, domain: str, fallback_name: Optional[str] = None) -> Optional[str]:
     """Extract company name from HTML using multiple methods."""
     try:
+        # Method 0: Organization del JSON-LD/microdata (ya decodificado y memoizado), sin construir el árbol
+        structured_name = _clean_company_name(extract_structured_data(html).company_name() or "")
+        if structured_name:
+            return structured_name
+        
         soup = BeautifulSoup(html, 'html.parser')
         
         # Method 1: og:site_name
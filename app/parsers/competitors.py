@@ -2,6 +2,7 @@
 import re
 from typing import List, Set
 from bs4 import BeautifulSoup
+from ..fingerprint import FingerprintEngine
 
 # Mapeo de industrias a competitors conocidos
 INDUSTRY_COMPETITORS = {
@@ -26,6 +27,25 @@ INDUSTRY_COMPETITORS = {
     ]
 }
 
+def _domain_base(competitor: str) -> str:
+    # Buscar menciones del dominio (sin .com para ser más flexible)
+    return competitor.replace(".com", "").replace(".io", "").replace(".co", "")
+
+# Grandes players tecnológicos -> dominio más probable
+BIG_TECH_DOMAINS = {
+    "salesforce.com": ["salesforce"],
+    "hubspot.com": ["hubspot"],
+    "shopify.com": ["shopify"],
+    # Agregar más mappings según necesidad
+}
+
+# Un motor por industria + uno general, compilados al importar
+_INDUSTRY_ENGINES = {
+    industry: FingerprintEngine.from_literals({c: [_domain_base(c)] for c in competitors})
+    for industry, competitors in INDUSTRY_COMPETITORS.items()
+}
+_BIG_TECH_ENGINE = FingerprintEngine.from_literals(BIG_TECH_DOMAINS)
+
 def detect_competitors_from_content(html: str, detected_industry: str = None) -> List[str]:
     """
     Detecta competidores mencionados en el contenido de la página.
@@ -38,30 +58,11 @@ def detect_competitors_from_content(html: str, detected_industry: str = None) ->
     competitors_found = set()
     
     # Si conocemos la industria, buscar competitors específicos
-    if detected_industry and detected_industry in INDUSTRY_COMPETITORS:
-        industry_competitors = INDUSTRY_COMPETITORS[detected_industry]
-        for competitor in industry_competitors:
-            # Buscar menciones del dominio (sin .com para ser más flexible)
-            domain_base = competitor.replace(".com", "").replace(".io", "").replace(".co", "")
-            if domain_base in text:
-                competitors_found.add(competitor)
+    if detected_industry and detected_industry in _INDUSTRY_ENGINES:
+        competitors_found.update(_INDUSTRY_ENGINES[detected_industry].matches(text))
     
     # Buscar menciones generales de grandes players tecnológicos
-    big_tech = [
-        "salesforce", "hubspot", "slack", "zoom", "microsoft", "google", 
-        "amazon", "oracle", "sap", "adobe", "shopify", "stripe"
-    ]
-    
-    for tech in big_tech:
-        if tech in text:
-            # Intentar reconstruir el dominio más probable
-            if "salesforce" in tech:
-                competitors_found.add("salesforce.com")
-            elif "hubspot" in tech:
-                competitors_found.add("hubspot.com")
-            elif "shopify" in tech:
-                competitors_found.add("shopify.com")
-            # Agregar más mappings según necesidad
+    competitors_found.update(_BIG_TECH_ENGINE.matches(text))
     
     return list(competitors_found)[:5]  # Máximo 5 para no sobrecargar
 
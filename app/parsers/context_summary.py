@@ -2,11 +2,221 @@
 """
 Context Summary Parser - Clean implementation
 Extrae un resumen inteligente del contenido de la página para outbound sales
+
+Los selectores de about/hero/main se compilan una vez al importar y se
+evalúan en un solo recorrido del parser de eventos de lxml (sin árbol de
+BeautifulSoup), guardando el texto del primer match de cada uno. En un
+SPA sin texto renderizado valen las descripciones de sus data islands; el
+último recurso usa el texto visible compartido con industria (visible_text).
+Benchmark: python -m benchmarks.context_summary
 """
 
-from bs4 import BeautifulSoup
 import re
-from typing import Optional
+from typing import Dict, List, NamedTuple, Optional
+
+from lxml import etree
+
+from .data_islands import extract_island_content
+from .industry import visible_text
+
+# PRIORIDAD 3: About sections (muy específico para empresas)
+ABOUT_SELECTORS = [
+    'section[class*="about"]',
+    'div[class*="about"]',
+    'section[class*="company"]',
+    'div[class*="company"]',
+    'section[id*="about"]',
+    'div[id*="about"]',
+    '.hero-description',
+    '.company-description',
+    '.intro-text'
+]
+
+# PRIORIDAD 4: Hero sections y main content
+HERO_SELECTORS = [
+    '.hero',
+    '.hero-content',
+    '.banner-content',
+    '.intro',
+    '.main-content p:first-of-type',
+    'main p:first-of-type',
+    '.content p:first-of-type'
+]
+
+# Etiquetas cuyo texto no cuenta (como get_text de BeautifulSoup)
+_HIDDEN_TAGS = frozenset({"script", "style", "template"})
+# Trozos del html que se van dando al parser: se deja de leer en cuanto la meta description vale
+_FEED_CHUNK = 16 * 1024
+
+_SELECTOR_RE = re.compile(
+    r'^(?:(?P<ancestor>\.?[\w-]+)\s+)?'
+    r'(?P<tag>[a-z][a-z0-9]*)?'
+    r'(?:\.(?P<klass>[\w-]+))?'
+    r'(?:\[(?P<attr>[\w-]+)\*="(?P<value>[^"]*)"\])?'
+    r'(?P<first_of_type>:first-of-type)?$'
+)
+
+
+class _Selector(NamedTuple):
+    """Subconjunto de CSS que usan los selectores de arriba."""
+    tag: Optional[str]                 # "section" o None (cualquiera)
+    klass: Optional[str]               # ".hero" -> "hero" (token de class)
+    attr: Optional[str]                # '[class*="about"]' -> ("class", "about")
+    value: Optional[str]
+    first_of_type: bool
+    ancestor: Optional[str]            # ".main-content" / "main" (ancestro, no padre)
+
+
+def _compile_selector(selector: str) -> _Selector:
+    m = _SELECTOR_RE.match(selector)
+    if m is None or not (m.group("tag") or m.group("klass")):
+        raise ValueError(f"Selector no soportado: {selector!r}")
+    return _Selector(m.group("tag"), m.group("klass"), m.group("attr"), m.group("value"),
+                     bool(m.group("first_of_type")), m.group("ancestor"))
+
+
+_ABOUT = [_compile_selector(s) for s in ABOUT_SELECTORS]
+_HERO = [_compile_selector(s) for s in HERO_SELECTORS]
+_SELECTORS = _ABOUT + _HERO
+_ANCESTORS = tuple(dict.fromkeys(s.ancestor for s in _SELECTORS if s.ancestor))
+_ANCESTOR_TAGS = frozenset(key for key in _ANCESTORS if not key.startswith("."))
+# Índices de selector por etiqueta; los de solo clase se miran si el elemento tiene class
+_BY_TAG: Dict[str, List[int]] = {}
+for _i, _sel in enumerate(_SELECTORS):
+    if _sel.tag is not None:
+        _BY_TAG.setdefault(_sel.tag, []).append(_i)
+del _i, _sel
+_BY_CLASS = [i for i, sel in enumerate(_SELECTORS) if sel.tag is None]
+
+
+def _is_ancestor(key: str, tag: str, classes: List[str]) -> bool:
+    return key[1:] in classes if key.startswith(".") else key == tag
+
+
+class _ContextCollector:
+    """
+    Target del parser de lxml: meta descriptions, texto del primer match de
+    cada selector y primer párrafo que sirve, en un solo recorrido.
+    """
+
+    def __init__(self):
+        self.meta_description: Optional[str] = None
+        self.og_description: Optional[str] = None
+        self.texts: Dict[int, List[str]] = {}    # índice de selector -> textos del primer match
+        self.paragraph: Optional[str] = None     # primer <p> significativo
+        self._pending: List[str] = []            # texto del nodo actual (lxml lo puede dar a trozos)
+        # Pila de elementos abiertos: (tag, ancestros que cumple, tags de hijos vistos, capturas abiertas)
+        self._stack: List[tuple] = []
+        self._open_ancestors = dict.fromkeys(_ANCESTORS, 0)
+        self._capturing: Dict[int, List[str]] = {}
+        self._paragraphs: List[List[str]] = []
+        self._hidden = 0
+        self._root_children: set = set()
+
+    def _flush(self):
+        if not self._pending:
+            return
+        text = "".join(self._pending)
+        self._pending = []
+        if self._hidden:
+            return
+        stripped = text.strip()
+        if stripped:
+            for parts in self._capturing.values():
+                parts.append(stripped)
+            for parts in self._paragraphs:
+                parts.append(stripped)
+
+    def _matches(self, sel: _Selector, tag: str, attrib, classes: List[str], first_of_type: bool) -> bool:
+        if sel.tag is not None and sel.tag != tag:
+            return False
+        if sel.klass is not None and sel.klass not in classes:
+            return False
+        if sel.attr is not None and sel.value not in attrib.get(sel.attr, ""):
+            return False
+        if sel.first_of_type and not first_of_type:
+            return False
+        return sel.ancestor is None or self._open_ancestors[sel.ancestor] > 0
+
+    def start(self, tag, attrib):
+        self._flush()
+        if tag == "meta":
+            if self.meta_description is None and attrib.get("name") == "description":
+                self.meta_description = attrib.get("content", "")
+            elif self.og_description is None and attrib.get("property") == "og:description":
+                self.og_description = attrib.get("content", "")
+        siblings = self._stack[-1][2] if self._stack else self._root_children
+        first_of_type = tag not in siblings
+        siblings.add(tag)
+        classes = attrib.get("class", "").split()
+        opened = []
+        candidates = _BY_TAG.get(tag, ())
+        if classes:
+            candidates = (*candidates, *_BY_CLASS)
+        for i in candidates:
+            if i not in self.texts and self._matches(_SELECTORS[i], tag, attrib, classes, first_of_type):
+                self.texts[i] = self._capturing[i] = []
+                opened.append(i)
+        ancestors = ([key for key in _ANCESTORS if _is_ancestor(key, tag, classes)]
+                     if classes or tag in _ANCESTOR_TAGS else ())
+        for key in ancestors:
+            self._open_ancestors[key] += 1
+        if tag == "p" and self.paragraph is None:
+            self._paragraphs.append([])
+            opened.append(-1)
+        if tag in _HIDDEN_TAGS:
+            self._hidden += 1
+        self._stack.append((tag, ancestors, set(), opened))
+
+    def end(self, tag):
+        self._flush()
+        if not self._stack:
+            return
+        tag, ancestors, _, opened = self._stack.pop()
+        for key in ancestors:
+            self._open_ancestors[key] -= 1
+        for i in opened:
+            if i == -1:
+                text = "".join(self._paragraphs.pop())
+                if self.paragraph is None and _is_good_paragraph(text):
+                    self.paragraph = text
+            else:
+                del self._capturing[i]
+        if tag in _HIDDEN_TAGS:
+            self._hidden -= 1
+
+    def data(self, text):
+        self._pending.append(text)
+
+    def close(self):
+        self._flush()
+        return self
+
+
+def _is_good_paragraph(text: str) -> bool:
+    # Filtrar párrafos de navegación o muy cortos
+    return bool(text and len(text) > 50 and
+                not _is_navigation_text(text) and
+                not _is_cookie_text(text))
+
+
+def _description(desc: Optional[str], max_length: int) -> Optional[str]:
+    desc = (desc or "").strip()
+    if desc and len(desc) > 20:  # Descartar descripciones muy cortas
+        return _clean_and_truncate(desc, max_length)  # None si la limpieza no deja nada
+    return None
+
+
+def _collect(html: str, max_length: int) -> _ContextCollector:
+    """Recorre el html; corta en cuanto la meta description ya decide el resumen."""
+    collector = _ContextCollector()
+    parser = etree.HTMLParser(target=collector)
+    for pos in range(0, len(html), _FEED_CHUNK):
+        parser.feed(html[pos:pos + _FEED_CHUNK])
+        if collector.meta_description is not None and _description(collector.meta_description, max_length):
+            break
+    parser.close()
+    return collector
 
 
 def extract_context_summary(html: str, company_name: str = "", max_length: int = 200) -> Optional[str]:
@@ -18,83 +228,41 @@ def extract_context_summary(html: str, company_name: str = "", max_length: int =
         return None
     
     try:
-        soup = BeautifulSoup(html, 'lxml')
+        page = _collect(html, max_length)
         
         # PRIORIDAD 1: Meta description (más confiable)
-        meta_desc = soup.find('meta', attrs={'name': 'description'})
-        if meta_desc:
-            desc = meta_desc.get('content', '').strip()
-            if desc and len(desc) > 20:  # Descartar descripciones muy cortas
-                cleaned = _clean_and_truncate(desc, max_length)
-                if cleaned:  # Solo devolver si la limpieza fue exitosa
-                    return cleaned
-        
         # PRIORIDAD 2: Open Graph description
-        og_desc = soup.find('meta', attrs={'property': 'og:description'})
-        if og_desc:
-            desc = og_desc.get('content', '').strip()
-            if desc and len(desc) > 20:
-                cleaned = _clean_and_truncate(desc, max_length)
-                if cleaned:
-                    return cleaned
-        
-        # PRIORIDAD 3: About sections (muy específico para empresas)
-        about_selectors = [
-            'section[class*="about"]',
-            'div[class*="about"]',
-            'section[class*="company"]',
-            'div[class*="company"]',
-            'section[id*="about"]',
-            'div[id*="about"]',
-            '.hero-description',
-            '.company-description',
-            '.intro-text'
-        ]
+        for desc in (page.meta_description, page.og_description):
+            cleaned = _description(desc, max_length)
+            if cleaned:
+                return cleaned
         
-        for selector in about_selectors:
-            about_section = soup.select_one(selector)
-            if about_section:
-                text = about_section.get_text(separator=' ', strip=True)
-                if text and len(text) > 30:
+        # PRIORIDADES 3 y 4: primer match de cada selector, en orden
+        for i in range(len(_SELECTORS)):
+            parts = page.texts.get(i)
+            if parts:
+                text = " ".join(parts)
+                if len(text) > 30:
                     # Buscar primer párrafo significativo
                     sentences = _split_into_sentences(text)
                     summary = _build_summary_from_sentences(sentences, max_length)
                     if summary:
                         return summary
         
-        # PRIORIDAD 4: Hero sections y main content
-        hero_selectors = [
-            '.hero',
-            '.hero-content',
-            '.banner-content',
-            '.intro',
-            '.main-content p:first-of-type',
-            'main p:first-of-type',
-            '.content p:first-of-type'
-        ]
-        
-        for selector in hero_selectors:
-            hero_section = soup.select_one(selector)
-            if hero_section:
-                text = hero_section.get_text(separator=' ', strip=True)
-                if text and len(text) > 30:
-                    sentences = _split_into_sentences(text)
-                    summary = _build_summary_from_sentences(sentences, max_length)
-                    if summary:
-                        return summary
-        
         # PRIORIDAD 5: Primer párrafo significativo del body
-        paragraphs = soup.find_all('p')
-        for p in paragraphs:
-            text = p.get_text(strip=True)
-            # Filtrar párrafos de navegación o muy cortos
-            if (text and len(text) > 50 and 
-                not _is_navigation_text(text) and
-                not _is_cookie_text(text)):
-                return _clean_and_truncate(text, max_length)
+        if page.paragraph:
+            return _clean_and_truncate(page.paragraph, max_length)
+        
+        # PRIORIDAD 5b: SPA (Next/Nuxt...): descripciones de las data islands, parseadas bajo demanda
+        islands = extract_island_content(html)
+        if islands:
+            for desc in islands["descriptions"]:
+                cleaned = _description(desc, max_length)
+                if cleaned:
+                    return cleaned
         
-        # PRIORIDAD 6: Fallback - primer texto significativo
-        all_text = soup.get_text(separator=' ', strip=True)
+        # PRIORIDAD 6: Fallback - primer texto significativo (texto visible compartido con industria)
+        all_text = visible_text(html, meta=False)
         if all_text:
             sentences = _split_into_sentences(all_text)
             # Buscar primer frase que mencione la empresa o sea descriptiva
@@ -194,4 +362,4 @@ def _is_cookie_text(text: str) -> bool:
     """
     cookie_keywords = ['cookie', 'privacy policy', 'terms of service', 'gdpr', 'consent']
     text_lower = text.lower()
-    return any(keyword in text_lower for keyword in cookie_keywords)
\ No newline at end of file
+    return any(keyword in text_lower for keyword in cookie_keywords)
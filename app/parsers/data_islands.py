@@ -0,0 +1,391 @@
+# app/parsers/data_islands.py
+"""
+Data islands de sitios SPA: el JSON que Next.js, Nuxt, Remix y compañía
+incrustan en la página (__NEXT_DATA__, __NUXT_DATA__, window.__NUXT__...).
+
+En un sitio renderizado en el cliente el contenido (títulos, descripciones,
+rutas) está dentro de esos blobs y no en el HTML visible, mientras que las
+regex de tech recorrían el blob entero byte a byte. Aquí:
+
+- Se localizan con find() por marcador (sin regex sobre la página) y se
+  confirman en su posición; localizar no parsea nada.
+- El contenido se parsea bajo demanda con un presupuesto de bytes por página
+  (MAX_ISLAND_BYTES): json.loads del blob si cabe, y si no (o si es JS y no
+  JSON, como el __NUXT__ de Nuxt 2) una regex por clave sobre el prefijo.
+- Se exponen títulos, descripciones y links para industria, contexto y el
+  descubrimiento de páginas; `strip_islands` / `IslandFilter` quitan el blob
+  (no el marcador: el framework se sigue detectando) antes de las regex.
+
+Gatsby genera HTML estático (su page-data va en archivos aparte): del
+inline solo se excluye el ___chunkMapping.
+Benchmark: python -m benchmarks.data_islands
+"""
+import html as html_lib
+import json
+import os
+import re
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple, Union
+
+from ..memo import memo
+from .structured_data import loads_lenient
+
+# Subir si cambia la salida (invalida el memo por contenido)
+ISLANDS_VERSION = "1"
+
+MAX_ISLAND_BYTES = int(os.getenv("MAX_ISLAND_BYTES", "1048576"))  # presupuesto de parseo por página
+MAX_ISLAND_TITLES = 30
+MAX_ISLAND_DESCRIPTIONS = 30
+MAX_ISLAND_LINKS = 200
+# Nodos JSON visitados como mucho por página (blobs con catálogos enteros)
+MAX_ISLAND_NODES = 200_000
+MAX_DEPTH = 40
+
+
+class IslandKind(NamedTuple):
+    framework: str
+    marker: str
+    script_id: bool  # True: <script id="marker">blob</script>; False: marker = blob</script>
+
+
+ISLAND_KINDS = (
+    IslandKind("next", "__NEXT_DATA__", True),
+    IslandKind("nuxt", "__NUXT_DATA__", True),  # Nuxt 3 (formato devalue)
+    IslandKind("nuxt", "window.__NUXT__", False),  # Nuxt 2 (a menudo una función JS)
+    IslandKind("next", "self.__next_f.push(", False),  # App Router: payload RSC por trozos
+    IslandKind("remix", "window.__remixContext", False),
+    IslandKind("gatsby", "window.___chunkMapping", False),
+    IslandKind("apollo", "window.__APOLLO_STATE__", False),
+    IslandKind("redux", "window.__INITIAL_STATE__", False),
+    IslandKind("redux", "window.__PRELOADED_STATE__", False),
+)
+
+# Claves (en minúscula) cuyo valor string interesa a los extractores
+TITLE_KEYS = frozenset({"title", "headline", "heading", "pagetitle", "seotitle", "metatitle", "ogtitle"})
+DESCRIPTION_KEYS = frozenset({
+    "description", "excerpt", "summary", "subtitle", "tagline", "intro", "lead",
+    "seodescription", "metadescription", "ogdescription",
+})
+LINK_KEYS = frozenset({"href", "url", "path", "pathname", "link", "canonical", "as"})
+_META_DESCRIPTION_NAMES = frozenset({"description", "og:description", "twitter:description"})
+
+# Fallback por clave (JSON o literal JS: title:"..." / "title":"...") sobre el prefijo del blob:
+# cada clave se busca con find() y el valor se confirma con una regex anclada detrás de ella
+_SCAN_KEYS = tuple(sorted(TITLE_KEYS | DESCRIPTION_KEYS | LINK_KEYS))
+_VALUE_RE = re.compile(r"""["']?\s*:\s*"((?:[^"\\]|\\.){1,2000})\"""")
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_SPACES_RE = re.compile(r"\s+")
+_ASSIGN_RE = {False: re.compile(r"\s*=\s*"), True: re.compile(rb"\s*=\s*")}
+
+# Contexto de la etiqueta <script ...> alrededor del marcador (id="__NEXT_DATA__")
+_TAG_WINDOW = 300
+# Cola que IslandFilter retiene entre trozos: marcador partido + su etiqueta
+_HOLD = max(len(kind.marker) for kind in ISLAND_KINDS) + _TAG_WINDOW
+
+
+class Island(NamedTuple):
+    framework: str
+    start: int  # inicio del blob (después de la etiqueta o del "=")
+    end: int    # fin del blob (antes de </script>, o fin del documento si llegó cortado)
+
+
+def _markers(as_bytes: bool) -> List[Tuple[IslandKind, Union[str, bytes]]]:
+    return [(kind, kind.marker.encode() if as_bytes else kind.marker) for kind in ISLAND_KINDS]
+
+
+_MARKERS = {as_bytes: _markers(as_bytes) for as_bytes in (False, True)}
+_TOKENS = {
+    as_bytes: tuple(t.encode() if as_bytes else t for t in ("<script", ">", "</script"))
+    for as_bytes in (False, True)
+}
+
+
+def _blob_start(doc: Union[str, bytes], kind: IslandKind, pos: int, marker_len: int) -> int:
+    """Inicio del blob para el marcador en `pos`; -1 si no es una island; -2 si falta texto para decidir."""
+    as_bytes = isinstance(doc, bytes)
+    script, gt, _ = _TOKENS[as_bytes]
+    after = pos + marker_len
+    if kind.script_id:
+        tag = doc.rfind(script, max(0, pos - _TAG_WINDOW), pos)
+        if tag == -1 or doc.find(gt, tag, pos) != -1:
+            return -1  # el marcador no está dentro de la etiqueta <script ...>
+        close = doc.find(gt, after, after + _TAG_WINDOW)
+        if close == -1:
+            return -2 if len(doc) - after < _TAG_WINDOW else -1
+        return close + 1
+    if kind.marker.endswith("("):
+        return after
+    if len(doc) - after < 8 and not doc[after:].strip():
+        return -2
+    m = _ASSIGN_RE[as_bytes].match(doc, after)
+    return m.end() if m else -1
+
+
+def _next_island(doc: Union[str, bytes], pos: int) -> Tuple[Optional[IslandKind], int, int]:
+    """
+    Primera island a partir de `pos`: (tipo, posición del marcador, inicio del blob).
+    Sin island: (None, -1, -1). Si el final del documento corta la etiqueta
+    de una posible island: (None, posición del marcador, -2).
+    """
+    best = None
+    for kind, marker in _MARKERS[isinstance(doc, bytes)]:
+        at = doc.find(marker, pos)
+        while at != -1 and (best is None or at < best[0]):
+            start = _blob_start(doc, kind, at, len(marker))
+            if start == -2:
+                if best is None or at < best[0]:
+                    best = (at, None, -2)
+                break
+            if start != -1:
+                best = (at, kind, start)
+                break
+            at = doc.find(marker, at + 1)
+    if best is None:
+        return None, -1, -1
+    at, kind, start = best
+    # El marcador se conserva (el fingerprint del framework lo necesita); lo excluido es el blob
+    return kind, at, start
+
+
+def find_islands(doc: Union[str, bytes]) -> List[Island]:
+    """Data islands del documento (str o bytes), en orden; no parsea nada."""
+    if not doc:
+        return []
+    close = _TOKENS[isinstance(doc, bytes)][2]
+    islands, pos = [], 0
+    while True:
+        kind, _, start = _next_island(doc, pos)
+        if kind is None:
+            return islands
+        end = doc.find(close, start)
+        if end == -1:
+            end = len(doc)
+        islands.append(Island(kind.framework, start, end))
+        pos = end
+
+
+def strip_islands(doc: Union[str, bytes], islands: Optional[List[Island]] = None) -> Union[str, bytes]:
+    """El documento sin el contenido de las islands (marcadores y etiquetas se conservan)."""
+    islands = find_islands(doc) if islands is None else islands
+    if not islands:
+        return doc
+    parts, pos = [], 0
+    for island in islands:
+        parts.append(doc[pos:island.start])
+        pos = island.end
+    parts.append(doc[pos:])
+    return doc[:0].join(parts)
+
+
+class IslandFilter:
+    """
+    Sink de fetch_page que reenvía la página al sink envuelto sin el
+    contenido de las islands, según llegan los trozos (str o bytes).
+    Se retiene una cola corta por si un marcador o </script> queda partido.
+    """
+
+    def __init__(self, sink):
+        self.sink = sink
+        self.skipped = 0  # bytes/caracteres de blob no reenviados
+        self._tail = None
+        self._inside = False
+
+    def headers(self, headers, cookies) -> None:
+        self.sink.headers(headers, cookies)
+
+    def feed(self, chunk) -> bool:
+        if not chunk:
+            return False
+        buf = chunk if self._tail is None else self._tail + chunk
+        close = _TOKENS[isinstance(buf, bytes)][2]
+        out, pos = [], 0
+        while True:
+            if self._inside:
+                end = buf.find(close, pos)
+                if end == -1:
+                    keep = max(pos, len(buf) - len(close) + 1)
+                    self.skipped += keep - pos
+                    self._tail = buf[keep:]
+                    break
+                self.skipped += end - pos
+                pos, self._inside = end, False
+                continue
+            kind, at, start = _next_island(buf, pos)
+            if kind is None:
+                # Sin island completa: se reenvía todo menos lo que aún podría ser un marcador
+                # (la etiqueta <script ...> de un marcador cortado también, para poder confirmarlo)
+                hold = at - _TAG_WINDOW if start == -2 else len(buf) - _HOLD
+                keep = max(pos, min(hold, len(buf)))
+                out.append(buf[pos:keep])
+                self._tail = buf[keep:]
+                break
+            out.append(buf[pos:start])
+            pos, self._inside = start, True
+        data = buf[:0].join(out)
+        return self.sink.feed(data) if data else False
+
+    def close(self, doc=None) -> None:
+        if self._tail and not self._inside:
+            self.sink.feed(self._tail)
+        self._tail = None
+        self.sink.close(strip_islands(doc) if doc else doc)
+
+
+# ---------- Contenido ----------
+
+def _clean_text(value: str) -> str:
+    if "<" in value:
+        value = _TAG_RE.sub(" ", value)
+    if "&" in value:
+        value = html_lib.unescape(value)
+    return _SPACES_RE.sub(" ", value).strip()
+
+
+class _IslandContent:
+    """Títulos, descripciones y links en orden, sin repetir y con tope."""
+
+    def __init__(self):
+        self.titles: Dict[str, None] = {}
+        self.descriptions: Dict[str, None] = {}
+        self.links: Dict[str, None] = {}
+        self.nodes = 0
+
+    def add(self, key: str, value: str) -> None:
+        key = key.lower()
+        if key in LINK_KEYS:
+            value = value.strip()
+            if value.startswith(("/", "http://", "https://")) and not value.startswith("//") and len(value) <= 300 \
+                    and len(self.links) < MAX_ISLAND_LINKS:
+                self.links[value] = None
+            return
+        if key in TITLE_KEYS:
+            bucket, low, high, limit = self.titles, 3, 150, MAX_ISLAND_TITLES
+        elif key in DESCRIPTION_KEYS:
+            bucket, low, high, limit = self.descriptions, 20, 1000, MAX_ISLAND_DESCRIPTIONS
+        else:
+            return
+        if len(bucket) >= limit or "://" in value[:12]:
+            return
+        text = _clean_text(value)
+        if low <= len(text) <= high:
+            bucket[text] = None
+
+    def walk(self, data: Any, table: Optional[list] = None) -> None:
+        """Recorre el JSON; con `table` (devalue de Nuxt 3) los enteros son índices a la tabla."""
+        stack = [(data, 0)]
+        while stack:
+            node, depth = stack.pop()
+            self.nodes += 1
+            if self.nodes > MAX_ISLAND_NODES:
+                return
+            children = []
+            if isinstance(node, dict):
+                if isinstance(node.get("content"), str) and node.get("name", node.get("property")) in _META_DESCRIPTION_NAMES:
+                    self.add("description", node["content"])
+                for key, value in node.items():
+                    if table is not None and isinstance(value, int) and not isinstance(value, bool) \
+                            and 0 <= value < len(table):
+                        value = table[value]
+                    if isinstance(value, str):
+                        self.add(key, value)
+                    elif isinstance(value, (dict, list)) and table is None:
+                        # En devalue la tabla ya es plana: no hace falta bajar desde los objetos
+                        children.append(value)
+            elif isinstance(node, list):
+                children = [item for item in node if isinstance(item, (dict, list))]
+            if depth < MAX_DEPTH:
+                # Preorden: los hijos se apilan al revés para salir en orden de documento
+                stack.extend((child, depth + 1) for child in reversed(children))
+
+    def scan(self, text: str) -> None:
+        """Fallback por clave sobre texto que no es JSON (o excede el presupuesto)."""
+        low = text.lower()
+        hits = []
+        for key in _SCAN_KEYS:
+            pos = low.find(key)
+            while pos != -1:
+                before = low[pos - 1] if pos else " "
+                if not (before.isalnum() or before == "_"):
+                    m = _VALUE_RE.match(text, pos + len(key))
+                    if m is not None:
+                        hits.append((pos, key, m.group(1)))
+                pos = low.find(key, pos + 1)
+        hits.sort()
+        for _, key, value in hits:
+            if "\\" in value:
+                try:
+                    value = json.loads(f'"{value}"')
+                except ValueError:
+                    continue
+            self.add(key, value)
+
+
+def extract_island_content(html: str) -> Optional[Dict[str, Any]]:
+    """
+    Contenido de las data islands de la página o None si no tiene.
+    {"frameworks", "islands", "bytes", "parsed_bytes", "titles", "descriptions", "links"}
+    """
+    if not html:
+        return None
+    islands = find_islands(html)
+    if not islands:
+        return None
+    return memo.memoize("islands", ISLANDS_VERSION, html, lambda: _extract_island_content(html, islands))
+
+
+def _extract_island_content(html: str, islands: List[Island]) -> Dict[str, Any]:
+    content = _IslandContent()
+    budget = MAX_ISLAND_BYTES
+    parsed = 0
+    for island in islands:
+        size = island.end - island.start
+        if budget <= 0:
+            break
+        blob = html[island.start:island.start + budget]
+        budget -= len(blob)
+        parsed += len(blob)
+        data = loads_lenient(blob.rstrip().rstrip(";").rstrip(")")) if size <= len(blob) else None
+        if data is None:
+            content.scan(blob)
+            continue
+        if island.framework == "nuxt" and isinstance(data, list):
+            content.walk(data, table=data)
+        elif isinstance(data, list) and any(isinstance(item, str) and len(item) > 40 for item in data):
+            # Payload RSC (self.__next_f): strings con líneas JSON dentro
+            content.walk(data)
+            for item in data:
+                if isinstance(item, str):
+                    content.scan(item)
+        else:
+            content.walk(data)
+    return {
+        "frameworks": list(dict.fromkeys(island.framework for island in islands)),
+        "islands": len(islands),
+        "bytes": sum(island.end - island.start for island in islands),
+        "parsed_bytes": parsed,
+        "titles": list(content.titles),
+        "descriptions": list(content.descriptions),
+        "links": list(content.links),
+    }
+
+
+def island_text(content: Optional[Dict[str, Any]]) -> str:
+    """Títulos y descripciones como texto para los extractores (industria, contexto)."""
+    if not content:
+        return ""
+    return " ".join([*content["titles"], *content["descriptions"]])
+
+
+def island_stats(content: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Resumen para scan_stats (sin el contenido)."""
+    if not content:
+        return None
+    return {
+        "frameworks": content["frameworks"],
+        "islands": content["islands"],
+        "bytes": content["bytes"],
+        "parsed_bytes": content["parsed_bytes"],
+        "titles": len(content["titles"]),
+        "descriptions": len(content["descriptions"]),
+        "links": len(content["links"]),
+    }
@@ -1,32 +1,155 @@
 # app/app/parsers/emails.py
+"""
+Emails de una página en una sola pasada anclada en los '@'.
+
+En vez de probar una regex sin ancla en cada posición del HTML, se salta
+de ancla en ancla ('@' y sus formas ofuscadas: [at], (at), &#64;, &commat;,
+%40) y se expande la parte local hacia atrás y el dominio hacia delante.
+Los mailto: y las entidades salen de la misma pasada, así que ya no hace
+falta recortar la página (antes 300KB, perdiendo los emails del footer).
+
+Acepta str o los bytes crudos del fetch: solo se decodifican los matches.
+Benchmark: python -m benchmarks.emails [pagina.html]
+"""
 import re
-from typing import List
+from typing import Dict, Iterator, List, Tuple, Union
+
+from ..memo import memo
 
+# Subir si cambia la salida (invalida el memo por contenido)
+EMAILS_VERSION = "3"
+
+# Regex de referencia (una pasada sin ancla por cada una); se mantienen para comparar
 MAILTO_RE = re.compile(r'href=["\']mailto:([^"\']+)["\']', re.I)
 PLAIN_RE  = re.compile(r'[A-Z0-9._%+-]+@[A-Z0-9.-]+\.[A-Z]{2,}', re.I)
 
+# Caracteres máximos de la parte local que se miran hacia atrás desde el ancla
+MAX_LOCAL_CHARS = 256
+
+# Formas ofuscadas del '@', buscadas con find() como el '@' (una regex sin
+# ancla volvería a probarse en cada posición de la página): cada marcador es
+# una pasada memchr y se confirma con una regex anclada en su posición.
+# "&#" cubre &#64; / &#064; / &#x40;; "at]" / "at)" cubren "[at]", "( at)"
+_ENTITY_MARKERS = ("%40", "&#", "&commat;")
+_ENTITY_AT = r"%40|&#0*64;|&#[xX]0*40;|&commat;"
+_BRACKET_MARKERS = ("at]", "at)", "AT]", "AT)")
+_BRACKET_AT = r"[\[(]\s*[aA][tT][\])]"
+_DOMAIN = r"[A-Z0-9.-]+\.[A-Z]{2,}"
+# Dominio ofuscado: "acme [dot] com", "acme(dot)es"
+_OBFUSCATED_DOMAIN = r"\s*([A-Z0-9-]+(?:(?:\s*[\[(]\s*dot\s*[\])]\s*|\.)[A-Z0-9-]+)+)"
+_DOT = r"\s*[\[(]\s*dot\s*[\])]\s*"
+_LOCAL_CHARS = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789._%+-"
+
+
+def _compile(pattern: str, as_bytes: bool, flags: int = re.I):
+    return re.compile(pattern.encode() if as_bytes else pattern, flags)
+
+
+# Por tipo (str/bytes): dominio, dominio ofuscado, [dot], entidad, "[at]",
+# marcadores (entidades, corchetes), caracteres de la parte local y de espacio
+_PATTERNS = {
+    as_bytes: (
+        _compile(_DOMAIN, as_bytes),
+        _compile(_OBFUSCATED_DOMAIN, as_bytes),
+        _compile(_DOT, as_bytes),
+        _compile(_ENTITY_AT, as_bytes, 0),
+        _compile(_BRACKET_AT, as_bytes, 0),
+        tuple(m.encode() if as_bytes else m for m in _ENTITY_MARKERS),
+        tuple(m.encode() if as_bytes else m for m in _BRACKET_MARKERS),
+        frozenset(_LOCAL_CHARS.encode() if as_bytes else _LOCAL_CHARS),
+        frozenset(b" \t\r\n" if as_bytes else " \t\r\n"),
+    )
+    for as_bytes in (False, True)
+}
+
 # Filtrar “basura” común
 BLACKLIST_DOMAINS = {"example.com", "email.com", "test.com"}
 BLACKLIST_LOCAL = {"example", "test"}
+# "TLD" que en realidad es la extensión de un asset (logo@2x.png, icon@3x.webp)
+ASSET_EXTENSIONS = {"png", "jpg", "jpeg", "gif", "svg", "webp", "avif", "ico", "bmp", "css", "js"}
+MAX_EMAILS = 10
+
 
-def extract_emails(html: str) -> List[str]:
+def _find_all(html: Union[str, bytes], needle) -> Iterator[int]:
+    pos = html.find(needle)
+    while pos != -1:
+        yield pos
+        pos = html.find(needle, pos + 1)
+
+
+def _anchors(html: Union[str, bytes], at, entity_at_re, bracket_at_re,
+             entities, brackets, spaces) -> List[Tuple[int, int, bool]]:
+    """(inicio, fin, es '@' literal) de cada ancla, en orden."""
+    anchors = [(pos, pos + 1, True) for pos in _find_all(html, at)]
+    obfuscated = len(anchors)
+    for marker in entities:
+        for pos in _find_all(html, marker):
+            entity = entity_at_re.match(html, pos)
+            if entity is not None:
+                anchors.append((pos, entity.end(), False))
+    for marker in brackets:
+        for pos in _find_all(html, marker):
+            # Retroceder por los espacios hasta el "[" / "("
+            start = pos
+            while start > 0 and html[start - 1] in spaces:
+                start -= 1
+            start -= 1
+            if start >= 0 and bracket_at_re.match(html, start, pos + len(marker)):
+                anchors.append((start, pos + len(marker), False))
+    if len(anchors) > obfuscated:
+        anchors.sort()
+    return anchors
+
+
+def scan_emails(html: Union[str, bytes]) -> Iterator[str]:
+    """Candidatos (local@dominio) en orden de aparición, sin filtrar."""
+    as_bytes = isinstance(html, bytes)
+    (domain_re, obfuscated_re, dot_re, entity_at_re, bracket_at_re,
+     entities, brackets, local_chars, spaces) = _PATTERNS[as_bytes]
+    at, dot = (b"@", b".") if as_bytes else ("@", ".")
+    last_end = 0
+    for start, end, plain in _anchors(html, at, entity_at_re, bracket_at_re, entities, brackets, spaces):
+        if start < last_end:
+            continue
+        # Parte local: hacia atrás desde el ancla (las formas ofuscadas admiten espacios)
+        lo = max(last_end, start - MAX_LOCAL_CHARS)
+        local_end = start
+        if not plain:
+            while local_end > lo and html[local_end - 1] in spaces:
+                local_end -= 1
+        local_start = local_end
+        while local_start > lo and html[local_start - 1] in local_chars:
+            local_start -= 1
+        if local_start == local_end:
+            continue
+        if plain:
+            domain = domain_re.match(html, end)
+            if domain is None:
+                continue
+            domain_text, last_end = domain.group(), domain.end()
+        else:
+            obfuscated = obfuscated_re.match(html, end)
+            if obfuscated is None:
+                continue
+            domain = domain_re.fullmatch(dot_re.sub(dot, obfuscated.group(1)))
+            if domain is None:
+                continue
+            domain_text, last_end = domain.group(), obfuscated.end()
+        email = html[local_start:local_end] + at + domain_text
+        yield email.decode("ascii") if as_bytes else email
+
+
+def extract_emails(html: Union[str, bytes]) -> List[str]:
+    """Acepta el html o los bytes crudos (FetchedPage.body); solo se decodifican los matches."""
     if not html:
         return []
-    
-    # Limitar HTML para performance
-    if len(html) > 300_000:  # 300KB max
-        html = html[:300_000]
-    
-    out = set()
-
-    for m in MAILTO_RE.findall(html):
-        out.add(m.strip())
+    return memo.memoize("emails", EMAILS_VERSION, html, lambda: _extract_emails(html))
 
-    for m in PLAIN_RE.findall(html):
-        out.add(m.strip())
 
-    cleaned = []
-    for e in out:
+def _extract_emails(html: Union[str, bytes]) -> List[str]:
+    # Primeros MAX_EMAILS válidos en orden de aparición (sin repetir)
+    cleaned: Dict[str, None] = {}
+    for e in scan_emails(html):
         local, _, domain = e.partition("@")
         if not local or not domain:
             continue
@@ -34,9 +157,11 @@ def extract_emails(html: str) -> List[str]:
             continue
         if local.lower() in BLACKLIST_LOCAL:
             continue
-        cleaned.append(e)
+        if domain.rpartition(".")[2].lower() in ASSET_EXTENSIONS:
+            continue
+        cleaned[e] = None
         # Límite para evitar spam
-        if len(cleaned) >= 10:
+        if len(cleaned) >= MAX_EMAILS:
             break
-    
-    return sorted(set(cleaned))
+
+    return sorted(cleaned)
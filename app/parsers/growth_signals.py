@@ -1,85 +1,230 @@
 # app/parsers/growth_signals.py
+"""
+Señales de crecimiento, partnerships, lanzamientos y urgencia de una página.
+
+Todos los patrones se compilan una vez en un único matcher: el prefijo
+literal de cada patrón ("financiaci[oó]n" -> "financiacion", "financiación")
+entra en un autómata Aho-Corasick (o un find() por prefijo sin
+pyahocorasick), el texto se recorre una vez y cada candidato se confirma con
+la regex del patrón anclada en su posición. Los snippets son la frase
+completa que contiene el match (índice de frases con bisect), recortada
+alrededor del match si la frase es muy larga.
+
+Benchmark contra la implementación anterior: python -m benchmarks.growth_signals
+"""
 import re
-from typing import List, Dict, Optional
-from bs4 import BeautifulSoup
-from datetime import datetime, timedelta
+from bisect import bisect_right
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
 
-def detect_growth_signals(html: str, url: str) -> Dict[str, any]:
-    """
-    Detecta señales de crecimiento que son oro para GTM:
-    - Funding announcements
-    - New office openings
-    - Team expansion mentions
-    - Product launches
-    - Partnership announcements
-    """
-    if not html:
-        return {}
-    
-    text = BeautifulSoup(html, "lxml").get_text().lower()
-    signals = {}
-    
+from ..memo import memo
+from .industry import visible_text
+
+try:
+    import ahocorasick  # pyahocorasick
+    HAS_AHOCORASICK = True
+except ImportError:
+    HAS_AHOCORASICK = False
+
+# Subir si cambian patrones o snippets (invalida el memo por contenido)
+SIGNALS_VERSION = "1"
+
+# Texto visible analizado por página
+MAX_SIGNAL_TEXT_CHARS = 200_000
+# Frases más largas se recortan a ±context caracteres alrededor del match
+MAX_SNIPPET_CHARS = 200
+
+
+class SignalGroup(NamedTuple):
+    patterns: List[str]
+    limit: int      # menciones que se devuelven
+    context: int    # caracteres a cada lado si la frase es demasiado larga
+
+
+SIGNAL_GROUPS: Dict[str, SignalGroup] = {
     # Funding signals (súper valioso)
-    funding_keywords = [
-        r'series [a-z]\b', r'seed round', r'funding', r'investment', 
+    "funding_signals": SignalGroup([
+        r'series [a-z]\b', r'seed round', r'funding', r'investment',
         r'raised \$[\d.]+[mk]', r'venture capital', r'vc funding',
         r'ronda serie [a-z]', r'financiaci[oó]n', r'inversi[oó]n'
-    ]
-    
-    funding_mentions = []
-    for pattern in funding_keywords:
-        matches = re.findall(f'.{{0,50}}{pattern}.{{0,50}}', text, re.I)
-        funding_mentions.extend(matches)
-    
-    if funding_mentions:
-        signals["funding_signals"] = funding_mentions[:3]  # Top 3
-    
+    ], 3, 50),
     # Growth keywords
-    growth_patterns = [
+    "growth_mentions": SignalGroup([
         r'new office', r'expanding to', r'hiring.{0,20}people',
         r'team.{0,10}grow', r'scale.{0,10}operation',
         r'nueva oficina', r'expansion', r'contratando',
         r'crecimiento', r'escalando'
-    ]
-    
-    growth_mentions = []
-    for pattern in growth_patterns:
-        matches = re.findall(f'.{{0,50}}{pattern}.{{0,50}}', text, re.I)
-        growth_mentions.extend(matches)
-    
-    if growth_mentions:
-        signals["growth_mentions"] = growth_mentions[:3]
-    
+    ], 3, 50),
     # Partnership signals
-    partnership_patterns = [
+    "partnership_signals": SignalGroup([
         r'partnership with', r'strategic alliance', r'collaboration',
         r'integration with', r'partner.{0,20}announce',
         r'alianza con', r'colaboraci[oó]n', r'integraci[oó]n'
-    ]
-    
-    partnership_mentions = []
-    for pattern in partnership_patterns:
-        matches = re.findall(f'.{{0,50}}{pattern}.{{0,50}}', text, re.I)
-        partnership_mentions.extend(matches)
-    
-    if partnership_mentions:
-        signals["partnership_signals"] = partnership_mentions[:2]
-    
+    ], 2, 50),
     # Product launch signals
-    launch_patterns = [
+    "product_launches": SignalGroup([
         r'launch', r'introducing', r'new product', r'new feature',
         r'beta', r'coming soon', r'lanzamiento', r'nuevo producto'
-    ]
-    
-    launch_mentions = []
-    for pattern in launch_patterns:
-        matches = re.findall(f'.{{0,50}}{pattern}.{{0,50}}', text, re.I)
-        launch_mentions.extend(matches)
-    
-    if launch_mentions:
-        signals["product_launches"] = launch_mentions[:3]
-    
-    return signals
+    ], 3, 50),
+    # Urgency keywords
+    "urgency_signals": SignalGroup([
+        r'urgent.{0,20}hire', r'immediate.{0,20}start', r'asap',
+        r'rapid.{0,20}growth', r'aggressive.{0,20}expansion',
+        r'urgente', r'inmediato', r'r[aá]pido crecimiento'
+    ], 2, 30),
+}
+GROWTH_CATEGORIES = ("funding_signals", "growth_mentions", "partnership_signals", "product_launches")
+
+# Multiple job postings (indicates growth): solo se cuentan
+JOB_ROLES = ("developer", "engineer", "sales", "marketing", "manager")
+HIGH_HIRING_MIN_MENTIONS = 5
+
+_SENTENCE_END_RE = re.compile(r"[.!?]+(?=\s|$)")
+_CLASS_RE = re.compile(r"\[([^\]\\-]+)\]")
+_META = set(".^$*+?{}[]|()\\")
+
+
+def literal_prefixes(pattern: str) -> List[str]:
+    """
+    Variantes del prefijo literal de un patrón: se expanden las clases de
+    caracteres sueltos ([oó]) y se corta en el primer metacarácter.
+    """
+    variants = [""]
+    i = 0
+    while i < len(pattern):
+        ch = pattern[i]
+        if ch == "\\" and i + 1 < len(pattern) and not pattern[i + 1].isalnum():
+            variants = [v + pattern[i + 1] for v in variants]  # \$ -> $
+            i += 2
+            continue
+        if ch == "[":
+            m = _CLASS_RE.match(pattern, i)
+            if m is None:
+                break
+            variants = [v + c for v in variants for c in m.group(1)]
+            i = m.end()
+            continue
+        if ch in _META or (i + 1 < len(pattern) and pattern[i + 1] in "?*{"):
+            break
+        variants = [v + ch for v in variants]
+        i += 1
+    if not variants[0]:
+        raise ValueError(f"Patrón sin prefijo literal: {pattern!r}")
+    return variants
+
+
+class SignalMatcher:
+    """Todos los patrones de todas las categorías en un solo recorrido del texto."""
+
+    def __init__(self, groups: Dict[str, SignalGroup], counted: Tuple[str, ...] = ()):
+        # prefijo -> [(categoría, regex anclada)]
+        self._by_prefix: Dict[str, List[Tuple[str, re.Pattern]]] = {}
+        for category, group in groups.items():
+            for pattern in group.patterns:
+                regex = re.compile(pattern, re.I)
+                for prefix in literal_prefixes(pattern):
+                    self._by_prefix.setdefault(prefix, []).append((category, regex))
+        self.counted = counted
+        for word in counted:
+            self._by_prefix.setdefault(word, []).append((word, re.compile(re.escape(word))))
+        self._automaton = None
+        if HAS_AHOCORASICK:
+            self._automaton = ahocorasick.Automaton()
+            for prefix in self._by_prefix:
+                self._automaton.add_word(prefix, prefix)
+            self._automaton.make_automaton()
+
+    def _candidates(self, text: str) -> Iterator[Tuple[int, str]]:
+        if self._automaton is not None:
+            for end, prefix in self._automaton.iter(text):
+                yield end - len(prefix) + 1, prefix
+            return
+        for prefix in self._by_prefix:
+            pos = text.find(prefix)
+            while pos != -1:
+                yield pos, prefix
+                pos = text.find(prefix, pos + 1)
+
+    def matches(self, text: str) -> List[Tuple[int, int, str]]:
+        """(inicio, fin, categoría) de cada match, ordenados por posición."""
+        found = set()
+        for pos, prefix in self._candidates(text):
+            for category, regex in self._by_prefix[prefix]:
+                m = regex.match(text, pos)
+                if m is not None:
+                    found.add((pos, m.end(), category))
+        return sorted(found)
+
+
+class SentenceIndex:
+    """Límites de frase del texto, calculados una vez; snippet(inicio, fin) por bisect."""
+
+    def __init__(self, text: str):
+        self.text = text
+        self._ends = [m.end() for m in _SENTENCE_END_RE.finditer(text)]
+
+    def snippet(self, start: int, end: int, context: int) -> str:
+        i = bisect_right(self._ends, start)
+        lo = self._ends[i - 1] if i else 0
+        j = bisect_right(self._ends, end - 1)
+        hi = self._ends[j] if j < len(self._ends) else len(self.text)
+        if hi - lo > MAX_SNIPPET_CHARS:
+            # Frase demasiado larga (menús, texto sin puntuar): ventana alrededor del match, en palabras completas
+            lo = max(lo, start - context)
+            hi = min(hi, end + context)
+            if lo > 0 and self.text[lo - 1] != " ":
+                space = self.text.find(" ", lo, start)
+                if space != -1:
+                    lo = space + 1
+            if hi < len(self.text) and self.text[hi] != " ":
+                space = self.text.rfind(" ", end, hi)
+                if space != -1:
+                    hi = space
+        return self.text[lo:hi].strip()
+
+
+_MATCHER = SignalMatcher(SIGNAL_GROUPS, JOB_ROLES)
+
+
+def scan_signals(html: str) -> Dict[str, any]:
+    """Snippets por categoría (todas) + menciones de puestos, en una pasada; memoizado por contenido."""
+    if not html:
+        return {}
+    return memo.memoize("signals", SIGNALS_VERSION, html, lambda: _scan_signals(html))
+
+
+def _scan_signals(html: str) -> Dict[str, any]:
+    text = visible_text(html, max_chars=MAX_SIGNAL_TEXT_CHARS, meta=False).lower()
+    snippets: Dict[str, List[str]] = {}
+    job_mentions = 0
+    sentences: Optional[SentenceIndex] = None
+    for start, end, category in _MATCHER.matches(text):
+        if category in JOB_ROLES:
+            job_mentions += 1
+            continue
+        found = snippets.setdefault(category, [])
+        if len(found) >= SIGNAL_GROUPS[category].limit:
+            continue
+        if sentences is None:
+            sentences = SentenceIndex(text)
+        snippet = sentences.snippet(start, end, SIGNAL_GROUPS[category].context)
+        if snippet not in found:
+            found.append(snippet)
+    return {"snippets": snippets, "job_mentions": job_mentions}
+
+
+def detect_growth_signals(html: str, url: str) -> Dict[str, any]:
+    """
+    Detecta señales de crecimiento que son oro para GTM:
+    - Funding announcements
+    - New office openings
+    - Team expansion mentions
+    - Product launches
+    - Partnership announcements
+    """
+    if not html:
+        return {}
+    snippets = scan_signals(html)["snippets"]
+    return {category: snippets[category] for category in GROWTH_CATEGORIES if snippets.get(category)}
 
 def detect_urgency_indicators(html: str) -> Dict[str, any]:
     """
@@ -91,28 +236,14 @@ def detect_urgency_indicators(html: str) -> Dict[str, any]:
     if not html:
         return {}
     
-    text = BeautifulSoup(html, "lxml").get_text().lower()
+    scan = scan_signals(html)
     indicators = {}
-    
-    # Urgency keywords
-    urgency_patterns = [
-        r'urgent.{0,20}hire', r'immediate.{0,20}start', r'asap',
-        r'rapid.{0,20}growth', r'aggressive.{0,20}expansion',
-        r'urgente', r'inmediato', r'r[aá]pido crecimiento'
-    ]
-    
-    urgency_mentions = []
-    for pattern in urgency_patterns:
-        matches = re.findall(f'.{{0,30}}{pattern}.{{0,30}}', text, re.I)
-        urgency_mentions.extend(matches)
-    
-    if urgency_mentions:
-        indicators["urgency_signals"] = urgency_mentions[:2]
+    if scan["snippets"].get("urgency_signals"):
+        indicators["urgency_signals"] = scan["snippets"]["urgency_signals"]
     
     # Multiple job postings (indicates growth)
-    job_count = len(re.findall(r'(developer|engineer|sales|marketing|manager)', text, re.I))
-    if job_count >= 5:
-        indicators["high_hiring_volume"] = f"~{job_count} job-related mentions found"
+    if scan["job_mentions"] >= HIGH_HIRING_MIN_MENTIONS:
+        indicators["high_hiring_volume"] = f"~{scan['job_mentions']} job-related mentions found"
     
     return indicators
 
@@ -163,4 +294,4 @@ def calculate_growth_score(signals: Dict, urgency: Dict, employee_count: Optiona
         "growth_score": round(min(1.0, score), 2),
         "score_factors": factors,
         "priority_level": "High" if score >= 0.6 else "Medium" if score >= 0.3 else "Low"
-    }
\ No newline at end of file
+    }
@@ -1,11 +1,29 @@
 # app/parsers/industry.py
+import hashlib
+import html as html_lib
+import re
+import unicodedata
+from bisect import bisect_left
+from collections import Counter
 from typing import List, Dict, Tuple, Optional
+from urllib.parse import urlparse
+
+from ..memo import memo
+from ..util import PRIORITY_KEYWORDS
+from .industry_domains import load_domain_rules
+
+try:
+    import ahocorasick  # pyahocorasick
+    HAS_AHOCORASICK = True
+except ImportError:
+    HAS_AHOCORASICK = False
 
 # ============================================================
 # DICCIONARIO DE INDUSTRIAS (títulos en español) -> keywords ES/EN
 # - Mantén títulos concisos, en español
-# - Keywords generosas (ES/EN), minúsculas, sin tildes no es necesario
-# - Coincidimos por substring en texto normalizado a lower
+# - Keywords generosas (ES/EN), minúsculas; con o sin tildes da igual:
+#   keywords y texto se pliegan a minúsculas sin tildes y se deduplican al cargar
+# - Coincidimos por substring en texto normalizado
 # ============================================================
 
 INDUSTRIAS: Dict[str, List[str]] = {
@@ -377,57 +395,72 @@ INDUSTRIAS: Dict[str, List[str]] = {
 # - También devuelve keywords que matchearon (útil para debug)
 # ============================================================
 
+# Palabras que SIEMPRE deben usar word boundaries para evitar falsos positivos
+WORD_BOUNDARY_REQUIRED = {
+    "car", "cars", "auto", "autos", "vehicle", "vehicles", "motor", "battery", 
+    "engine", "tire", "tires", "api", "app", "data", "web", "tech", "digital",
+    "online", "internet", "software", "hardware", "system", "network", "cloud",
+    "mobile", "phone", "email", "mail", "shop", "store", "market", "service",
+    "services", "product", "products", "business", "company", "enterprise"
+}
+
+# Palabras que son muy ambiguas y necesitan contexto específico para evitar falsos positivos
+HIGHLY_AMBIGUOUS = {"auto", "car", "cars", "motor", "battery", "engine", "data", "app", "api"}
+
+# Si aparecen a ±50 caracteres de una palabra ambigua, el match es técnico/CSS/HTML
+TECH_CONTEXT_TERMS = [
+    "width:", "height:", "size=", "auto-", "-auto", "margin-", 
+    "padding-", "flex:", "grid-", "overflow:", "css", "style",
+    "px", "rem", "vh", "vw", "auto;", "auto,", "auto }", "auto)", 
+    "sizes=", "generated", "preset", "wp-", "elementor",
+    # Para 'data': contextos técnicos
+    "data-", "-data", "dataset", "metadata", "data:", "data=",
+    "data{", "data}", "data[", "data]", "json", "javascript",
+    "script", "<script", "element_type", "data_id", "data_element"
+]
+
+
+# Ventana de contexto técnico alrededor de una palabra ambigua (en caracteres)
+TECH_CONTEXT_WINDOW = 50
+
+
+def _uses_word_boundary(kw_lower: str) -> bool:
+    """Usar word boundaries si la palabra está en la lista de ambiguas O es muy corta"""
+    return kw_lower in WORD_BOUNDARY_REQUIRED or len(kw_lower) <= 3
+
+
 def _score_text(text: str, keywords: List[str]) -> Tuple[int, List[str]]:
     """
     Improved scoring function that considers word boundaries and keyword weights.
     Uses word boundaries for potentially ambiguous words to avoid false positives.
     Filters out technical/CSS contexts for ambiguous automotive terms.
+
+    Implementación de referencia (una regex por keyword): detectar_industrias
+    usa KeywordIndex, que debe dar exactamente los mismos scores sobre el
+    texto y las keywords normalizados (lo verifica tests/test_industry.py).
     """
-    import re
     low = text.lower()
     hits = []
     score = 0
     
-    # Palabras que SIEMPRE deben usar word boundaries para evitar falsos positivos
-    word_boundary_required = {
-        "car", "cars", "auto", "autos", "vehicle", "vehicles", "motor", "battery", 
-        "engine", "tire", "tires", "api", "app", "data", "web", "tech", "digital",
-        "online", "internet", "software", "hardware", "system", "network", "cloud",
-        "mobile", "phone", "email", "mail", "shop", "store", "market", "service",
-        "services", "product", "products", "business", "company", "enterprise"
-    }
-    
-    # Palabras que son muy ambiguas y necesitan contexto específico para evitar falsos positivos
-    highly_ambiguous = {"auto", "car", "cars", "motor", "battery", "engine", "data", "app", "api"}
-    
     for kw in keywords:
         kw_lower = kw.lower()
         
-        # Usar word boundaries si la palabra está en la lista de ambiguas O es muy corta
-        if kw_lower in word_boundary_required or len(kw_lower) <= 3:
+        if _uses_word_boundary(kw_lower):
             pattern = r'\b' + re.escape(kw_lower) + r'\b'
             matches = re.finditer(pattern, low)
             
             valid_matches = 0
             for match in matches:
                 # Para palabras muy ambiguas, verificar que no estén en contexto técnico
-                if kw_lower in highly_ambiguous:
+                if kw_lower in HIGHLY_AMBIGUOUS:
                     # Obtener contexto alrededor del match
-                    start = max(0, match.start() - 50)
-                    end = min(len(low), match.end() + 50)
+                    start = max(0, match.start() - TECH_CONTEXT_WINDOW)
+                    end = min(len(low), match.end() + TECH_CONTEXT_WINDOW)
                     context = low[start:end]
                     
                     # Skipear si está en contexto técnico/CSS/HTML
-                    if any(tech_term in context for tech_term in [
-                        "width:", "height:", "size=", "auto-", "-auto", "margin-", 
-                        "padding-", "flex:", "grid-", "overflow:", "css", "style",
-                        "px", "rem", "vh", "vw", "auto;", "auto,", "auto }", "auto)", 
-                        "sizes=", "generated", "preset", "wp-", "elementor",
-                        # Para 'data': contextos técnicos
-                        "data-", "-data", "dataset", "metadata", "data:", "data=",
-                        "data{", "data}", "data[", "data]", "json", "javascript",
-                        "script", "<script", "element_type", "data_id", "data_element"
-                    ]):
+                    if any(tech_term in context for tech_term in TECH_CONTEXT_TERMS):
                         continue
                 
                 valid_matches += 1
@@ -451,144 +484,249 @@ def _score_text(text: str, keywords: List[str]) -> Tuple[int, List[str]]:
     return int(score), hits
 
 
-def _apply_domain_specific_rules(domain: str, texto: str, resultados: List[Dict]) -> List[Dict]:
+# ============================================================
+# ÍNDICE PRECOMPILADO DE KEYWORDS
+# - Palabras con word boundary: un Counter de tokens (\w+) del texto
+# - Keywords por substring: un único autómata Aho-Corasick
+# - El texto se recorre una vez para todas las industrias
+# ============================================================
+
+_TOKEN_RE = re.compile(r"\w+")
+# Marcas diacríticas que deja NFKD ("ó" -> "o" + U+0301)
+_COMBINING_RE = re.compile(r"[\u0300-\u036f]")
+
+
+def fold_accents(text: str) -> str:
+    """Minúsculas sin tildes ni diacríticos ("Automóvil" -> "automovil", "España" -> "espana")."""
+    return _COMBINING_RE.sub("", unicodedata.normalize("NFKD", text.lower()))
+
+
+def normalize_industrias(industrias: Dict[str, List[str]]) -> Tuple[Dict[str, List[str]], Dict[str, int]]:
     """
-    Aplica reglas específicas basadas en el dominio para mejorar la precisión
+    Pliega tildes y colapsa duplicados dentro de cada industria (se queda la
+    primera aparición, con su peso). Devuelve (industrias normalizadas, stats).
     """
-    domain_lower = domain.lower()
-    
-    # Reglas específicas para bancos españoles
-    banking_domains = [
-        'santander', 'bbva', 'caixabank', 'bankinter', 'sabadell', 'unicaja', 
-        'ibercaja', 'kutxabank', 'abanca', 'openbank', 'evo'
-    ]
-    
-    if any(bank in domain_lower for bank in banking_domains):
-        # Forzar clasificación bancaria si es un dominio bancario conocido
-        banking_score = 100  # Score muy alto para forzar
-        resultados.insert(0, {
-            "industria": "Servicios Financieros (Banca)", 
-            "score": banking_score, 
-            "keywords": ["domain_rule"]
-        })
-    
-    # Reglas para energía
-    energy_domains = ['endesa', 'iberdrola', 'naturgy', 'repsol', 'eon', 'edp']
-    if any(energy in domain_lower for energy in energy_domains):
-        energy_score = 100
-        resultados.insert(0, {
-            "industria": "Energía y Utilities", 
-            "score": energy_score, 
-            "keywords": ["domain_rule"]
-        })
-    
-    # Reglas para telecomunicaciones
-    telecom_domains = ['telefonica', 'vodafone', 'orange', 'movistar', 'jazztel']
-    if any(telecom in domain_lower for telecom in telecom_domains):
-        telecom_score = 100
-        resultados.insert(0, {
-            "industria": "Telecomunicaciones e ISP", 
-            "score": telecom_score, 
-            "keywords": ["domain_rule"]
-        })
-    
-    # Reglas para retail/fashion
-    retail_domains = ['zara', 'mango', 'inditex', 'corteingles', 'mercadona', 'carrefour']
-    if any(retail in domain_lower for retail in retail_domains):
-        retail_score = 100
-        resultados.insert(0, {
-            "industria": "Retail y E-commerce", 
-            "score": retail_score, 
-            "keywords": ["domain_rule"]
-        })
-    
-    # Reglas para medios
-    media_domains = ['atresmedia', 'mediaset', 'prisa', 'planeta']
-    if any(media in domain_lower for media in media_domains):
-        media_score = 100
-        resultados.insert(0, {
-            "industria": "Medios, Publicidad y Marketing", 
-            "score": media_score, 
-            "keywords": ["domain_rule"]
-        })
-    
-    return resultados
-
-
-def _detectar_industria_por_dominio(domain: str) -> Optional[str]:
-    """Mapeo directo de dominios conocidos a industrias"""
-    domain_mappings = {
-        # Bancos españoles
-        "santander.com": "Servicios Financieros (Banca)",
-        "bbva.com": "Servicios Financieros (Banca)",
-        "caixabank.es": "Servicios Financieros (Banca)",
-        "bankinter.com": "Servicios Financieros (Banca)",
-        "sabadell.com": "Servicios Financieros (Banca)",
-        "bankia.es": "Servicios Financieros (Banca)",
-        
-        # Energía españolas
-        "endesa.com": "Energía y Utilities",
-        "iberdrola.es": "Energía y Utilities",
-        "naturgy.com": "Energía y Utilities",
-        "repsol.com": "Energía y Utilities",
-        "cepsa.com": "Energía y Utilities",
-        
-        # Telecomunicaciones
-        "telefonica.com": "Telecomunicaciones e ISP",
-        "vodafone.es": "Telecomunicaciones e ISP",
-        "orange.es": "Telecomunicaciones e ISP",
-        "movistar.es": "Telecomunicaciones e ISP",
-        
-        # Retail/Fashion
-        "zara.com": "Retail y E-commerce",
-        "inditex.com": "Retail y E-commerce",
-        "elcorteingles.es": "Retail y E-commerce",
-        "mercadona.es": "Retail y E-commerce",
-        
-        # Medios
-        "atresmedia.com": "Medios, Publicidad y Marketing",
-        "mediaset.es": "Medios, Publicidad y Marketing",
-        
-        # Construcción
-        "acs.es": "Construcción e Inmobiliaria",
-        "ferrovial.com": "Construcción e Inmobiliaria",
-        
-        # Aerolíneas
-        "iberia.com": "Turismo y Viajes",
-        "vueling.com": "Turismo y Viajes",
-    }
-    
-    # Buscar coincidencia exacta
-    if domain in domain_mappings:
-        return domain_mappings[domain]
-    
-    # Buscar sin www
-    clean_domain = domain.replace("www.", "")
-    if clean_domain in domain_mappings:
-        return domain_mappings[clean_domain]
-    
-    return None
-
-
-def _apply_domain_specific_rules(domain: str, texto: str, resultados: List[Dict]) -> List[Dict]:
-    """Aplica reglas específicas basadas en el dominio"""
-    # Primero intentar mapeo directo
-    direct_industry = _detectar_industria_por_dominio(domain)
-    if direct_industry:
-        # Si encontramos mapeo directo, priorizarlo
-        for result in resultados:
-            if result["industria"] == direct_industry:
-                result["score"] += 10  # Boost significativo
-                break
+    normalized: Dict[str, List[str]] = {}
+    stats = {"keywords": 0, "unique": 0, "accent_variants": 0, "exact_duplicates": 0}
+    for industria, keywords in industrias.items():
+        seen: Dict[str, str] = {}
+        for kw in keywords:
+            stats["keywords"] += 1
+            folded = fold_accents(kw)
+            if folded in seen:
+                stats["exact_duplicates" if seen[folded] == kw.lower() else "accent_variants"] += 1
+                continue
+            seen[folded] = kw.lower()
+        normalized[industria] = list(seen)
+        stats["unique"] += len(seen)
+    return normalized, stats
+
+
+def keyword_collisions(industrias: Dict[str, List[str]]) -> Dict[str, List[str]]:
+    """Keywords (ya normalizadas) que puntúan en más de una industria."""
+    owners: Dict[str, List[str]] = {}
+    for industria, keywords in industrias.items():
+        for kw in keywords:
+            owners.setdefault(kw, []).append(industria)
+    return {kw: inds for kw, inds in owners.items() if len(inds) > 1}
+
+
+def _is_word_char(c: str) -> bool:
+    # Misma definición que \w de `re` en str
+    return c.isalnum() or c == "_"
+
+
+def _at_boundary(low: str, pos: int) -> bool:
+    """Equivalente a \\b en la posición `pos`."""
+    left = pos > 0 and _is_word_char(low[pos - 1])
+    right = pos < len(low) and _is_word_char(low[pos])
+    return left != right
+
+
+class _TechMask:
+    """
+    Regiones técnicas (atributos data-, CSS, scripts) de un texto, buscadas
+    una sola vez: todas las apariciones de TECH_CONTEXT_TERMS ordenadas por
+    inicio + el fin mínimo de las que empiezan a partir de cada una. Un match
+    [start, end) es técnico si algún término cabe entero en su ventana de
+    ±TECH_CONTEXT_WINDOW, lo mismo que `term in low[start-50:end+50]`.
+    """
+
+    def __init__(self, low: str, automaton=None):
+        spans: List[Tuple[int, int]] = []
+        if automaton is not None:
+            for end, length in automaton.iter(low):
+                spans.append((end + 1 - length, end + 1))
+            spans.sort()
         else:
-            # Si no estaba en los resultados, agregarlo
-            resultados.append({
-                "industria": direct_industry,
-                "score": 15,  # Score alto para domain mapping
-                "keywords": ["domain_mapping"]
-            })
-    
-    return resultados
+            for term in _TECH_TERMS:
+                pos = low.find(term)
+                while pos != -1:
+                    spans.append((pos, pos + len(term)))
+                    pos = low.find(term, pos + 1)
+            spans.sort()
+        self._starts = [start for start, _ in spans]
+        # _min_end[i] = fin más cercano entre los términos que empiezan en _starts[i] o después
+        self._min_end = [end for _, end in spans]
+        for i in range(len(self._min_end) - 2, -1, -1):
+            if self._min_end[i + 1] < self._min_end[i]:
+                self._min_end[i] = self._min_end[i + 1]
+
+    def is_technical(self, start: int, end: int) -> bool:
+        i = bisect_left(self._starts, start - TECH_CONTEXT_WINDOW)
+        return i < len(self._starts) and self._min_end[i] <= end + TECH_CONTEXT_WINDOW
+
+
+_TECH_TERMS = tuple(dict.fromkeys(TECH_CONTEXT_TERMS))
+_TECH_AUTOMATON = None
+if HAS_AHOCORASICK:
+    _TECH_AUTOMATON = ahocorasick.Automaton()
+    for _term in _TECH_TERMS:
+        _TECH_AUTOMATON.add_word(_term, len(_term))
+    _TECH_AUTOMATON.make_automaton()
+
+
+class KeywordIndex:
+    """
+    INDUSTRIAS compilado una vez: cada keyword se registra como
+    (industria, posición en su lista, peso, keyword) para sumar los scores
+    en el mismo orden que _score_text (el int() final trunca floats).
+    Keywords y texto se pliegan con fold_accents; `keywords` guarda las
+    listas normalizadas y `normalization` cuántos duplicados se colapsaron.
+    """
+
+    def __init__(self, industrias: Dict[str, List[str]]):
+        industrias, self.normalization = normalize_industrias(industrias)
+        self.keywords: Dict[str, List[str]] = industrias
+        self.industries: List[str] = list(industrias)
+        # token -> reglas con word boundary (cuentan cada aparición)
+        self.token_rules: Dict[str, List[Tuple[int, int, float, str]]] = {}
+        # keyword -> reglas por substring (+0.5 si además es palabra completa)
+        self.substring_rules: Dict[str, List[Tuple[int, int, float, str]]] = {}
+        self._ambiguous_res: Dict[str, "re.Pattern"] = {}
+        self._bonus_res: Dict[str, "re.Pattern"] = {}
+
+        for ind_idx, keywords in enumerate(industrias.values()):
+            for pos, kw in enumerate(keywords):
+                kw_lower = kw.lower()
+                if _uses_word_boundary(kw_lower) and _TOKEN_RE.fullmatch(kw_lower):
+                    weight = max(0.5, min(2.0, len(kw_lower) / 4.0))
+                    self.token_rules.setdefault(kw_lower, []).append((ind_idx, pos, weight, kw))
+                    if kw_lower in HIGHLY_AMBIGUOUS:
+                        self._ambiguous_res[kw_lower] = re.compile(r"\b" + re.escape(kw_lower) + r"\b")
+                elif _uses_word_boundary(kw_lower):
+                    raise ValueError(f"Keyword con word boundary de varios tokens no soportada: {kw!r}")
+                else:
+                    weight = min(2.0, len(kw_lower) / 5.0)
+                    self.substring_rules.setdefault(kw_lower, []).append((ind_idx, pos, weight, kw))
+
+        self._substrings: List[str] = list(self.substring_rules)
+        # Keywords de un solo token: el bonus de palabra completa es mirar el Counter
+        self._single_token: List[bool] = [bool(_TOKEN_RE.fullmatch(kw)) for kw in self._substrings]
+        self._automaton = None
+        if HAS_AHOCORASICK and self._substrings:
+            automaton = ahocorasick.Automaton()
+            for kw_id, kw_lower in enumerate(self._substrings):
+                automaton.add_word(kw_lower, kw_id)
+            automaton.make_automaton()
+            self._automaton = automaton
+
+    def _valid_ambiguous(self, low: str, token: str, mask: _TechMask) -> int:
+        """Apariciones de una palabra ambigua fuera de contexto técnico."""
+        return sum(
+            1 for match in self._ambiguous_res[token].finditer(low)
+            if not mask.is_technical(match.start(), match.end())
+        )
+
+    def _substring_hits(self, low: str, tokens: Counter) -> Dict[str, bool]:
+        """keyword -> si alguna aparición es palabra completa (bonus)."""
+        found: Dict[str, bool] = {}
+        if self._automaton is not None:
+            for end, kw_id in self._automaton.iter(low):
+                kw_lower = self._substrings[kw_id]
+                if self._single_token[kw_id]:
+                    if kw_lower not in found:
+                        found[kw_lower] = kw_lower in tokens
+                    continue
+                if found.get(kw_lower):
+                    continue
+                start = end - len(kw_lower) + 1
+                if _at_boundary(low, start) and _at_boundary(low, end + 1):
+                    found[kw_lower] = True
+                else:
+                    found.setdefault(kw_lower, False)
+            return found
+        for kw_id, kw_lower in enumerate(self._substrings):
+            if kw_lower not in low:
+                continue
+            if self._single_token[kw_id]:
+                found[kw_lower] = kw_lower in tokens
+                continue
+            bonus_re = self._bonus_res.get(kw_lower)
+            if bonus_re is None:
+                bonus_re = self._bonus_res[kw_lower] = re.compile(r"\b" + re.escape(kw_lower) + r"\b")
+            found[kw_lower] = bonus_re.search(low) is not None
+        return found
+
+    def analyze(self, text: str) -> Tuple[Dict[str, int], Dict[str, bool]]:
+        """
+        Una pasada sobre el texto: (apariciones válidas por token con word
+        boundary, keywords por substring encontradas -> bonus).
+        """
+        low = fold_accents(text)
+        tokens = Counter(_TOKEN_RE.findall(low))
+        token_hits: Dict[str, int] = {}
+        mask = None
+        for token, count in tokens.items():
+            if token not in self.token_rules:
+                continue
+            if token in self._ambiguous_res:
+                if mask is None:  # solo si el texto tiene alguna palabra ambigua
+                    mask = _TechMask(low, _TECH_AUTOMATON)
+                count = self._valid_ambiguous(low, token, mask)
+                if not count:
+                    continue
+            token_hits[token] = count
+        return token_hits, self._substring_hits(low, tokens)
+
+    def score(self, text: str) -> List[Tuple[int, List[str]]]:
+        """(score, keywords) por industria, en el orden de INDUSTRIAS."""
+        token_hits, substring_hits = self.analyze(text)
+        contributions: Dict[int, List[Tuple[int, Tuple[float, ...], str]]] = {}
+
+        for token, count in token_hits.items():
+            for ind_idx, pos, weight, kw in self.token_rules[token]:
+                contributions.setdefault(ind_idx, []).append((pos, (weight * count,), kw))
+
+        for kw_lower, bonus in substring_hits.items():
+            for ind_idx, pos, weight, kw in self.substring_rules[kw_lower]:
+                contributions.setdefault(ind_idx, []).append((pos, (weight, 0.5) if bonus else (weight,), kw))
+
+        scores: List[Tuple[int, List[str]]] = [(0, []) for _ in self.industries]
+        for ind_idx, items in contributions.items():
+            items.sort(key=lambda item: item[0])
+            score = 0
+            for _, adds, _kw in items:
+                for add in adds:
+                    score += add
+            scores[ind_idx] = (int(score), [kw for _, _, kw in items])
+        return scores
+
+
+_INDEX = KeywordIndex(INDUSTRIAS)
+# Reglas por dominio (app/data/industry_domains.json): se consultan antes del scoring
+DOMAIN_RULES = load_domain_rules(INDUSTRIAS)
+# Score de una industria fijada por dominio
+DOMAIN_RULE_SCORE = 15
+
+
+# Cambia con el diccionario normalizado: invalida el memo por contenido
+INDUSTRY_VERSION = hashlib.sha1(repr(sorted(_INDEX.keywords.items())).encode("utf-8")).hexdigest()[:12]
+
+
+def industry_for_domain(domain: str) -> Optional[Tuple[str, str]]:
+    """(industria, regla) si el dominio es conocido, si no None."""
+    return DOMAIN_RULES.match(domain) if domain else None
 
 
 def detectar_industrias(texto: str, domain: str = "", top_k: int = 2, min_score: int = 1) -> List[Dict[str, object]]:
@@ -602,16 +740,21 @@ def detectar_industrias(texto: str, domain: str = "", top_k: int = 2, min_score:
     """
     if not texto:
         return []
+    # Dominio conocido: no hace falta puntuar keywords
+    known = industry_for_domain(domain)
+    if known is not None and top_k >= 1:
+        industria, rule = known
+        return [{"industria": industria, "score": DOMAIN_RULE_SCORE, "keywords": [rule]}]
+    return memo.memoize("industry", INDUSTRY_VERSION, texto,
+                        lambda: _rank_industrias(texto, top_k, min_score), top_k, min_score)
+
+
+def _rank_industrias(texto: str, top_k: int, min_score: int) -> List[Dict[str, object]]:
     resultados = []
-    for industria, kws in INDUSTRIAS.items():
-        s, hits = _score_text(texto, kws)
+    for industria, (s, hits) in zip(_INDEX.industries, _INDEX.score(texto)):
         if s >= min_score:
             resultados.append({"industria": industria, "score": s, "keywords": hits})
     
-    # Aplicar reglas específicas de dominio
-    if domain:
-        resultados = _apply_domain_specific_rules(domain, texto, resultados)
-    
     resultados.sort(key=lambda x: x["score"], reverse=True)
     return resultados[:top_k]
 
@@ -626,3 +769,92 @@ def detectar_principal_y_secundaria(texto: str, domain: str = "") -> Tuple[Optio
     if len(top) == 1:
         return top[0]["industria"], None
     return top[0]["industria"], top[1]["industria"]
+
+
+
+# ============================================================
+# Industria agregada sobre las páginas del crawl
+# ============================================================
+
+# Peso de cada página según su tipo (buckets de util.PRIORITY_KEYWORDS por path)
+PAGE_WEIGHTS = {"home": 1.5, "about": 2.0, "product": 2.0, "careers": 0.5, "news": 0.5, "blog": 0.5, "support": 0.5}
+# Texto visible analizado por página
+MAX_VISIBLE_CHARS = 20_000
+
+_INVISIBLE_RE = re.compile(r"<(script|style|noscript|template|svg)\b.*?</\1\s*>|<!--.*?-->", re.I | re.S)
+_TAG_RE = re.compile(r"<[^>]+>")
+_SPACES_RE = re.compile(r"\s+")
+_META_DESCRIPTION_RE = re.compile(
+    r"<meta\b(?=[^>]*\bname\s*=\s*[\"']?description)[^>]*\bcontent\s*=\s*(?:\"([^\"]*)\"|'([^']*)')", re.I
+)
+
+
+def visible_text(html: str, max_chars: int = MAX_VISIBLE_CHARS, meta: bool = True) -> str:
+    """Meta description (si `meta`) + texto visible (sin scripts, estilos ni etiquetas), recortado."""
+    if not html:
+        return ""
+    meta = _META_DESCRIPTION_RE.search(html) if meta else None
+    text = _TAG_RE.sub(" ", _INVISIBLE_RE.sub(" ", html))
+    if meta:
+        text = (meta.group(1) or meta.group(2) or "") + " " + text
+    return _SPACES_RE.sub(" ", html_lib.unescape(text)).strip()[:max_chars]
+
+
+def page_kind(url: str) -> str:
+    """'home', un bucket de PRIORITY_KEYWORDS ('about', 'product', ...) u 'other'."""
+    path = urlparse(url).path.lower().rstrip("/")
+    if not path:
+        return "home"
+    for kind in PAGE_WEIGHTS:
+        if any(word in path for word in PRIORITY_KEYWORDS.get(kind, ())):
+            return kind
+    return "other"
+
+
+class IndustryAccumulator:
+    """
+    Scores por industria acumulados página a página (ponderados por
+    PAGE_WEIGHTS), sin concatenar textos: la clasificación está lista en
+    cuanto termina el crawl. Un dominio conocido no puntúa nada.
+    """
+
+    def __init__(self, domain: str = ""):
+        self.known = industry_for_domain(domain)
+        self._totals = [0.0] * len(_INDEX.industries)
+        self._keywords: List[Dict[str, None]] = [{} for _ in _INDEX.industries]
+        self.pages: Dict[str, int] = {}
+
+    def add_page(self, url: str, html: str, extra_text: str = "") -> None:
+        kind = page_kind(url)
+        self.pages[kind] = self.pages.get(kind, 0) + 1
+        if self.known is None:
+            self.add_text(f"{visible_text(html)} {extra_text}", PAGE_WEIGHTS.get(kind, 1.0))
+
+    def add_text(self, text: str, weight: float = 1.0) -> None:
+        if self.known is not None or not text.strip():
+            return
+        scores = memo.memoize("industry_page", INDUSTRY_VERSION, text, lambda: _INDEX.score(text))
+        for ind_idx, (score, hits) in enumerate(scores):
+            if score:
+                self._totals[ind_idx] += score * weight
+                self._keywords[ind_idx].update(dict.fromkeys(hits))
+
+    def results(self, top_k: int = 2, min_score: int = 1) -> List[Dict[str, object]]:
+        """Mismo formato que detectar_industrias."""
+        if self.known is not None:
+            industria, rule = self.known
+            return [{"industria": industria, "score": DOMAIN_RULE_SCORE, "keywords": [rule]}][:top_k]
+        resultados = [
+            {"industria": industria, "score": int(total), "keywords": list(keywords)}
+            for industria, total, keywords in zip(_INDEX.industries, self._totals, self._keywords)
+            if int(total) >= min_score
+        ]
+        resultados.sort(key=lambda x: x["score"], reverse=True)
+        return resultados[:top_k]
+
+    def principal_y_secundaria(self) -> Tuple[Optional[str], Optional[str]]:
+        top = self.results(top_k=2, min_score=1)
+        return (
+            top[0]["industria"] if top else None,
+            top[1]["industria"] if len(top) > 1 else None,
+        )
@@ -0,0 +1,208 @@
+# app/parsers/industry_batch.py
+"""
+Clasificación de industria por lotes (uso offline: miles de páginas escaneadas).
+
+Cada texto pasa una vez por KeywordIndex.analyze y queda como una fila de una
+matriz dispersa documento x feature (conteo por token, presencia y bonus de
+palabra completa por keyword). Un único producto contra la matriz
+feature x industria de pesos da todos los scores de todos los documentos.
+
+Los pesos se guardan en vigésimos (todos son múltiplos de 0.05), así el
+producto es entero y exacto. detectar_industrias suma floats y trunca con
+int(): cuando el total exacto es un entero justo, la suma float puede quedar
+en 2.9999… y truncar a 2. Esas celdas, si pueden afectar al top_k, se
+resuman en float en el orden original. El resultado es idéntico al de
+detectar_principal_y_secundaria.
+
+Limitación: solo la suma está vectorizada. Plegar acentos, tokenizar y
+KeywordIndex.analyze (Aho-Corasick, contexto técnico de las palabras
+ambiguas) siguen corriendo en Python documento a documento, y en lotes
+grandes ese paso es la mayor parte del tiempo.
+
+Requiere numpy + scipy (opcionales, requirements-batch.txt); sin ellos se
+clasifica texto a texto.
+Benchmark: python -m benchmarks.industry_batch [n_documentos]
+"""
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .industry import (
+    _INDEX,
+    KeywordIndex,
+    detectar_industrias,
+    industry_for_domain,
+)
+
+try:
+    import numpy as np
+    from scipy import sparse
+    HAS_SCIPY = True
+except ImportError:
+    HAS_SCIPY = False
+
+# Documentos por bloque: acota la memoria de la matriz dispersa
+BATCH_CHUNK = 5000
+UNITS = 20  # pesos en vigésimos
+
+
+class _BatchModel:
+    """Matriz de pesos feature x industria derivada de un KeywordIndex."""
+
+    def __init__(self, index: KeywordIndex):
+        self.index = index
+        self.token_cols: Dict[str, int] = {}
+        self.present_cols: Dict[str, int] = {}
+        self.bonus_cols: Dict[str, int] = {}
+        rows, cols, vals = [], [], []
+        # Por industria, las reglas en el orden de su lista para resumar en float:
+        # (posición, columna, peso, columna de bonus o -1, keyword)
+        self.rules: List[List[Tuple[int, int, float, int, str]]] = [[] for _ in index.industries]
+
+        for token, rules in index.token_rules.items():
+            col = self.token_cols[token] = len(self.token_cols) + len(self.present_cols) + len(self.bonus_cols)
+            for ind_idx, pos, weight, kw in rules:
+                rows.append(col); cols.append(ind_idx); vals.append(round(weight * UNITS))
+                self.rules[ind_idx].append((pos, col, weight, -1, kw))
+        for kw_lower, rules in index.substring_rules.items():
+            n = len(self.token_cols) + len(self.present_cols) + len(self.bonus_cols)
+            present, bonus = self.present_cols[kw_lower], self.bonus_cols[kw_lower] = n, n + 1
+            for ind_idx, pos, weight, kw in rules:
+                rows.append(present); cols.append(ind_idx); vals.append(round(weight * UNITS))
+                rows.append(bonus); cols.append(ind_idx); vals.append(UNITS // 2)
+                self.rules[ind_idx].append((pos, present, weight, bonus, kw))
+        for rules in self.rules:
+            rules.sort(key=lambda rule: rule[0])
+
+        self.n_features = len(self.token_cols) + len(self.present_cols) + len(self.bonus_cols)
+        # KeywordIndex ya colapsa duplicados; si quedara alguno se sumaría, como en _score_text
+        self.weights = sparse.csr_matrix(
+            (np.array(vals, dtype=np.int64), (rows, cols)),
+            shape=(self.n_features, len(index.industries)),
+        )
+
+    def features(self, texts: Sequence[str]):
+        """Matriz dispersa documento x feature (CSR) y las filas como dicts."""
+        indptr, indices, data, row_dicts = [0], [], [], []
+        for text in texts:
+            row: Dict[int, int] = {}
+            if text:
+                token_hits, substring_hits = self.index.analyze(text)
+                for token, count in token_hits.items():
+                    row[self.token_cols[token]] = count
+                for kw_lower, bonus in substring_hits.items():
+                    row[self.present_cols[kw_lower]] = 1
+                    if bonus:
+                        row[self.bonus_cols[kw_lower]] = 1
+            indices.extend(row)
+            data.extend(row.values())
+            indptr.append(len(indices))
+            row_dicts.append(row)
+        matrix = sparse.csr_matrix(
+            (np.array(data, dtype=np.int64), np.array(indices, dtype=np.int64), np.array(indptr, dtype=np.int64)),
+            shape=(len(texts), self.n_features),
+        )
+        return matrix, row_dicts
+
+    def float_score(self, row: Dict[int, int], ind_idx: int) -> int:
+        """Score de una celda sumado en float en el orden de KeywordIndex.score."""
+        score = 0
+        for _, col, weight, bonus_col, _kw in self.rules[ind_idx]:
+            value = row.get(col)
+            if not value:
+                continue
+            if bonus_col < 0:
+                score += weight * value
+            else:
+                score += weight
+                if row.get(bonus_col):
+                    score += 0.5
+        return int(score)
+
+    def keywords(self, row: Dict[int, int], ind_idx: int) -> List[str]:
+        return [kw for _, col, _w, _b, kw in self.rules[ind_idx] if row.get(col)]
+
+
+_model: Optional[_BatchModel] = None
+
+
+def _get_model() -> _BatchModel:
+    global _model
+    if _model is None or _model.index is not _INDEX:
+        _model = _BatchModel(_INDEX)
+    return _model
+
+
+def _scores_for_chunk(model: _BatchModel, units, rows: List[Dict[int, int]], top_k: int, min_score: int):
+    """
+    Scores enteros del bloque. Solo las filas donde una celda de truncado
+    dudoso (total exacto entero) llega al umbral del top_k se resuman en float.
+    """
+    scores = units // UNITS
+    at_risk = (units % UNITS == 0) & (units > 0)
+    k = min(top_k, scores.shape[1])
+    qualifying = np.where(scores >= min_score, scores, -1)
+    kth = -np.partition(-qualifying, k - 1, axis=1)[:, k - 1]
+    threshold = np.maximum(kth, min_score)
+    for r in np.flatnonzero((at_risk & (scores >= threshold[:, None])).any(axis=1)):
+        for ind_idx in np.flatnonzero(at_risk[r]):
+            scores[r, ind_idx] = model.float_score(rows[r], ind_idx)
+    return scores
+
+
+def detectar_industrias_batch(
+    textos: Sequence[str],
+    domains: Optional[Sequence[str]] = None,
+    top_k: int = 2,
+    min_score: int = 1,
+    with_keywords: bool = True,
+) -> List[List[Dict[str, object]]]:
+    """
+    detectar_industrias para una lista de textos (mismo formato por texto).
+    Con with_keywords=False se omite la lista de keywords de cada resultado.
+    """
+    domains = domains or [""] * len(textos)
+    if not HAS_SCIPY or top_k < 1:
+        return [detectar_industrias(t, d, top_k=top_k, min_score=min_score) for t, d in zip(textos, domains)]
+
+    model = _get_model()
+    names = model.index.industries
+    results: List[List[Dict[str, object]]] = []
+    for start in range(0, len(textos), BATCH_CHUNK):
+        chunk = textos[start:start + BATCH_CHUNK]
+        matrix, rows = model.features(chunk)
+        scores = _scores_for_chunk(model, (matrix @ model.weights).toarray(), rows, top_k, min_score)
+        # Orden estable: a igual score gana el orden de INDUSTRIAS, como en detectar_industrias
+        order = np.argsort(-scores, axis=1, kind="stable")[:, :top_k]
+        for offset, text in enumerate(chunk):
+            domain = domains[start + offset]
+            if not text:
+                results.append([])
+            elif domain and industry_for_domain(domain):
+                # Dominio conocido: detectar_industrias no puntúa el texto
+                results.append(detectar_industrias(text, domain, top_k=top_k, min_score=min_score))
+            else:
+                row_scores = scores[offset]
+                results.append([
+                    {
+                        "industria": names[i],
+                        "score": int(row_scores[i]),
+                        "keywords": model.keywords(rows[offset], i) if with_keywords else [],
+                    }
+                    for i in order[offset] if row_scores[i] >= min_score
+                ])
+    return results
+
+
+def detectar_principal_y_secundaria_batch(
+    textos: Sequence[str],
+    domains: Optional[Sequence[str]] = None,
+) -> List[Tuple[Optional[str], Optional[str]]]:
+    """detectar_principal_y_secundaria para una lista de textos."""
+    out = []
+    for top in detectar_industrias_batch(textos, domains, top_k=2, min_score=1, with_keywords=False):
+        if not top:
+            out.append((None, None))
+        elif len(top) == 1:
+            out.append((top[0]["industria"], None))
+        else:
+            out.append((top[0]["industria"], top[1]["industria"]))
+    return out
@@ -0,0 +1,134 @@
+# app/parsers/industry_domains.py
+"""
+Reglas de industria por dominio (app/data/industry_domains.json o
+INDUSTRY_DOMAINS_PATH), compiladas una vez al importar:
+
+- "domains": host o dominio registrable -> industria (índice hash)
+- "brands": industria -> marcas, en un trie por carácter sobre los segmentos
+  del dominio registrable ("santander-consumer.es" -> santander)
+
+Las marcas cortas (< BRAND_PREFIX_MIN) solo cuentan como segmento completo:
+"evo.es" es Banca, "evolution.com" no.
+"""
+import json
+import os
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from ..util import domain_of
+
+_DEFAULT_PATH = os.path.join(os.path.dirname(__file__), "..", "data", "industry_domains.json")
+INDUSTRY_DOMAINS_PATH = os.getenv("INDUSTRY_DOMAINS_PATH", _DEFAULT_PATH)
+
+# Longitud mínima para que una marca valga como prefijo de segmento
+BRAND_PREFIX_MIN = 6
+
+_END = ""  # clave de fin de marca en el trie (ningún carácter real es "")
+
+
+class DomainRulesError(ValueError):
+    """El archivo de reglas de dominio no pasa la validación."""
+
+    def __init__(self, errors: List[str]):
+        self.errors = errors
+        super().__init__("; ".join(errors[:5]) + (f" (+{len(errors) - 5} más)" if len(errors) > 5 else ""))
+
+
+def _clean_host(domain: str) -> str:
+    host = domain.strip().lower()
+    for prefix in ("https://", "http://"):
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+    host = host.split("/", 1)[0].split(":", 1)[0].rstrip(".")
+    return host[4:] if host.startswith("www.") else host
+
+
+class DomainRules:
+    """Índice de dominios + trie de marcas. `match` devuelve (industria, regla)."""
+
+    def __init__(self, version: str, domains: Dict[str, str], brands: Dict[str, List[str]]):
+        self.version = version
+        self.domains: Dict[str, str] = {_clean_host(d): ind for d, ind in domains.items()}
+        self.brands = brands
+        self._trie: dict = {}
+        for industria, marcas in brands.items():
+            for brand in marcas:
+                node = self._trie
+                for ch in brand:
+                    node = node.setdefault(ch, {})
+                node[_END] = industria
+
+    def _brand_in_segment(self, segment: str) -> Optional[str]:
+        """Marca más larga que empieza el segmento (entera si es corta)."""
+        node, best = self._trie, None
+        for i, ch in enumerate(segment):
+            node = node.get(ch)
+            if node is None:
+                break
+            industria = node.get(_END)
+            if industria is not None and (i + 1 == len(segment) or i + 1 >= BRAND_PREFIX_MIN):
+                best = industria
+        return best
+
+    def match(self, domain: str) -> Optional[Tuple[str, str]]:
+        """
+        (industria, "domain_mapping" | "domain_rule") para un dominio o URL:
+        host exacto (sin www), dominio registrable y, si no, marcas.
+        """
+        if not domain:
+            return None
+        host = _clean_host(domain)
+        industria = self.domains.get(host)
+        if industria is None:
+            registrable = domain_of(host)
+            industria = self.domains.get(registrable)
+            if industria is None:
+                label = registrable.split(".", 1)[0]
+                for segment in label.split("-"):
+                    industria = self._brand_in_segment(segment)
+                    if industria is not None:
+                        return industria, "domain_rule"
+                return None
+        return industria, "domain_mapping"
+
+
+def validate_domain_rules(data: dict, industries: Iterable[str]) -> List[str]:
+    """Errores de esquema, industrias desconocidas y marcas repetidas."""
+    if not isinstance(data, dict) or not isinstance(data.get("version"), str):
+        return ["falta 'version'"]
+    known = set(industries)
+    errors = []
+    domains = data.get("domains", {})
+    brands = data.get("brands", {})
+    if not isinstance(domains, dict) or not isinstance(brands, dict):
+        return ["'domains' y 'brands' deben ser objetos"]
+    for domain, industria in domains.items():
+        if industria not in known:
+            errors.append(f"domains[{domain}]: industria desconocida {industria!r}")
+        if domain != domain.lower() or "/" in domain:
+            errors.append(f"domains[{domain}]: usar el host en minúsculas")
+    owners: Dict[str, str] = {}
+    for industria, marcas in brands.items():
+        if industria not in known:
+            errors.append(f"brands[{industria}]: industria desconocida")
+        for brand in marcas:
+            if not brand or brand != brand.lower() or not brand.isalnum():
+                errors.append(f"brands[{industria}]: marca inválida {brand!r}")
+            elif brand in owners:
+                errors.append(f"marca {brand!r} repetida en {owners[brand]!r} y {industria!r}")
+            else:
+                owners[brand] = industria
+    return errors
+
+
+def load_domain_rules(industries: Iterable[str], path: str = None) -> DomainRules:
+    """Carga y valida el archivo; lanza DomainRulesError si no es válido."""
+    path = path or INDUSTRY_DOMAINS_PATH
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        raise DomainRulesError([f"{path}: {e}"])
+    errors = validate_domain_rules(data, industries)
+    if errors:
+        raise DomainRulesError(errors)
+    return DomainRules(data["version"], data.get("domains", {}), data.get("brands", {}))
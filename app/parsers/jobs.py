@@ -1,11 +1,40 @@
+# app/parsers/jobs.py
+"""
+Etapa de empleo: página de careers + boards de ATS.
+
+- La página de empleo sale de careers_overrides, de las páginas ya
+  crawleadas o de los links internos (PRIORITY_KEYWORDS["careers"]); se
+  descargan como mucho MAX_CAREERS_PAGES, con tope de bytes.
+- Ofertas: JobPosting en JSON-LD y boards reconocidos (Greenhouse, Lever,
+  Ashby) enlazados o embebidos en careers/home, leídos de su API pública de
+  postings (ATS_BOARDS; endpoints configurables para probar contra un
+  servidor local) con tope de bytes y cache por board entre escaneos.
+- Sin nada de eso, títulos sueltos de la página de empleo.
+
+Stand-in local con respuestas grabadas de cada ATS: tests/test_jobs.py
+"""
 import json, re
-from typing import List, Dict, Any
+import os
+import time
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+from urllib.parse import urlparse
 from bs4 import BeautifulSoup
 from ..schemas import JobPosting, JobsSignalsSummary
-from ..util import looks_blocklisted
+from ..util import looks_blocklisted, PRIORITY_KEYWORDS
+from ..fetch import fetch_pages
+from ..fingerprint import FingerprintEngine
+from .structured_data import extract_structured_data
 from datetime import datetime, timezone
 from dateutil import parser as dtp
 
+MAX_CAREERS_PAGES = int(os.getenv("MAX_CAREERS_PAGES", "2"))
+MAX_ATS_BOARDS = int(os.getenv("MAX_ATS_BOARDS", "3"))
+MAX_ATS_BYTES = int(os.getenv("MAX_ATS_BYTES", "1048576"))  # 1MB por board
+ATS_TIMEOUT = float(os.getenv("ATS_TIMEOUT", "4"))
+ATS_CACHE_SIZE = int(os.getenv("ATS_CACHE_SIZE", "1000"))
+ATS_CACHE_TTL = float(os.getenv("ATS_CACHE_TTL", "21600"))  # 6h: los boards cambian a diario
+MAX_JOBS_RETURNED = 10
+
 PLATFORM_HINTS = {
     "greenhouse": ["boards.greenhouse.io", "gh-src"],
     "lever":      ["jobs.lever.co"],
@@ -15,61 +44,309 @@ PLATFORM_HINTS = {
     "ashby":      ["jobs.ashbyhq.com"],
 }
 
+_PLATFORM_ENGINE = FingerprintEngine.from_literals(PLATFORM_HINTS)
+
 def _platform_from_html(html: str) -> str|None:
-    h = html.lower()
-    for k, hints in PLATFORM_HINTS.items():
-        if any(s in h for s in hints):
-            return k
+    found = _PLATFORM_ENGINE.matches(html)
+    return found[0] if found else None
+
+_JOB_TITLE_RE = re.compile(r"\b(engineer|developer|marketing|sales|account|designer|data|product|success|support|finance|hr|talent|recruit)", re.I)
+
+
+def _locality(location) -> Optional[str]:
+    if isinstance(location, list):
+        location = location[0] if location else None
+    if isinstance(location, dict):
+        address = location.get("address") or {}
+        return address.get("addressLocality") if isinstance(address, dict) else None
     return None
 
+
+def _as_text(value) -> Optional[str]:
+    if isinstance(value, list):
+        value = ", ".join(str(v) for v in value if v)
+    if not value:
+        return None
+    return str(value).strip() or None
+
+
 def parse_job_jsonld(url: str, html: str) -> List[JobPosting]:
     out: List[JobPosting] = []
     if not html or looks_blocklisted(url):
         return out
-    soup = BeautifulSoup(html, "lxml")
+    platform = _platform_from_html(html)
 
-    # JSON-LD
-    for s in soup.find_all("script", type="application/ld+json"):
-        try:
-            data = json.loads(s.string)
-        except Exception:
+    # JSON-LD (extractor compartido: la página se decodifica una vez para todos)
+    for it in extract_structured_data(html).job_postings():
+        title = _as_text(it.get("title"))
+        if not title:
             continue
-        items = data if isinstance(data, list) else [data]
-        for it in items:
-            if isinstance(it, dict) and (it.get("@type") == "JobPosting" or "JobPosting" in str(it.get("@type"))):
-                title = (it.get("title") or "").strip()
-                if not title:
-                    continue
-                loc = None
-                locData = it.get("jobLocation")
-                if isinstance(locData, dict):
-                    loc = (locData.get("address",{}) or {}).get("addressLocality")
-                if isinstance(locData, list) and locData and isinstance(locData[0], dict):
-                    loc = (locData[0].get("address",{}) or {}).get("addressLocality")
-                out.append(JobPosting(
-                    title=title,
-                    location=loc,
-                    employment_type=(it.get("employmentType") or None),
-                    department=(it.get("hiringOrganization",{}) or {}).get("department"),
-                    date_posted=it.get("datePosted"),
-                    valid_through=it.get("validThrough"),
-                    apply_url=(it.get("hiringOrganization",{}) or {}).get("sameAs") or url,
-                    platform_hint=_platform_from_html(html),
-                    source_url=url
-                ))
-
-    # Fallback: regex títulos
-    if not out:
-        titles = []
-        for tag in soup.select("a, h2, h3, li"):
-            txt = " ".join(tag.get_text(" ").split())
-            if 5 <= len(txt) <= 120 and re.search(r"(engineer|developer|marketing|sales|account|designer|data|product|success|support|finance|hr|talent|recruit)", txt, re.I):
-                titles.append(txt)
-        titles = list(dict.fromkeys(titles))[:20]
-        out = [JobPosting(title=t, source_url=url) for t in titles]
+        org = it.get("hiringOrganization") or {}
+        out.append(JobPosting(
+            title=title,
+            location=_locality(it.get("jobLocation")),
+            employment_type=_as_text(it.get("employmentType")),
+            department=org.get("department") if isinstance(org, dict) else None,
+            date_posted=_as_text(it.get("datePosted")),
+            valid_through=_as_text(it.get("validThrough")),
+            apply_url=it.get("url") if isinstance(it.get("url"), str) else url,
+            platform_hint=platform,
+            source_url=url
+        ))
+
+    return out
+
 
+def guess_job_titles(url: str, html: str) -> List[JobPosting]:
+    """Fallback: títulos con pinta de puesto en links y encabezados de la página de empleo."""
+    if not html or looks_blocklisted(url):
+        return []
+    soup = BeautifulSoup(html, "lxml")
+    titles = []
+    for tag in soup.select("a, h2, h3, li"):
+        txt = " ".join(tag.get_text(" ").split())
+        if 5 <= len(txt) <= 120 and _JOB_TITLE_RE.search(txt):
+            titles.append(txt)
+    titles = list(dict.fromkeys(titles))[:20]
+    return [JobPosting(title=t, source_url=url) for t in titles]
+
+
+# ---------- Boards de ATS ----------
+
+def _greenhouse_jobs(data: Any, board_url: str) -> List[dict]:
+    return [{
+        "title": job.get("title"),
+        "location": (job.get("location") or {}).get("name"),
+        "department": ((job.get("departments") or [{}])[0] or {}).get("name"),
+        "date_posted": job.get("first_published") or job.get("updated_at"),
+        "apply_url": job.get("absolute_url") or board_url,
+    } for job in (data or {}).get("jobs", [])]
+
+
+def _lever_jobs(data: Any, board_url: str) -> List[dict]:
+    out = []
+    for job in data if isinstance(data, list) else []:
+        categories = job.get("categories") or {}
+        created = job.get("createdAt")
+        out.append({
+            "title": job.get("text"),
+            "location": categories.get("location"),
+            "employment_type": categories.get("commitment"),
+            "department": categories.get("department") or categories.get("team"),
+            "date_posted": (datetime.fromtimestamp(created / 1000, timezone.utc).isoformat()
+                            if isinstance(created, (int, float)) else None),
+            "apply_url": job.get("hostedUrl") or job.get("applyUrl") or board_url,
+        })
     return out
 
+
+def _ashby_jobs(data: Any, board_url: str) -> List[dict]:
+    return [{
+        "title": job.get("title"),
+        "location": job.get("location"),
+        "employment_type": job.get("employmentType"),
+        "department": job.get("department") or job.get("team"),
+        "date_posted": job.get("publishedAt"),
+        "apply_url": job.get("jobUrl") or job.get("applyUrl") or board_url,
+    } for job in (data or {}).get("jobs", []) if job.get("isListed", True)]
+
+
+class AtsBoard(NamedTuple):
+    pattern: re.Pattern     # link/embed del board en el html -> token de la empresa
+    endpoint: str           # API pública de postings ({token})
+    parse: Callable[[Any, str], List[dict]]
+
+
+ATS_BOARDS: Dict[str, AtsBoard] = {
+    "greenhouse": AtsBoard(
+        re.compile(r"(?:job-)?boards(?:\.eu)?\.greenhouse\.io/(?:embed/job_board(?:/js)?\?for=)?([A-Za-z0-9_-]+)", re.I),
+        os.getenv("GREENHOUSE_BOARD_API", "https://boards-api.greenhouse.io/v1/boards/{token}/jobs"),
+        _greenhouse_jobs,
+    ),
+    "lever": AtsBoard(
+        re.compile(r"jobs\.lever\.co/([A-Za-z0-9_.-]+)", re.I),
+        os.getenv("LEVER_BOARD_API", "https://api.lever.co/v0/postings/{token}?mode=json"),
+        _lever_jobs,
+    ),
+    "ashby": AtsBoard(
+        re.compile(r"jobs\.ashbyhq\.com/([A-Za-z0-9_.%-]+)", re.I),
+        os.getenv("ASHBY_BOARD_API", "https://api.ashbyhq.com/posting-api/job-board/{token}"),
+        _ashby_jobs,
+    ),
+}
+# Segmentos que no son el token de una empresa
+_NOT_TOKENS = frozenset({"embed", "js", "api", "v1", "jobs"})
+
+
+def find_ats_boards(html: Union[str, bytes]) -> List[Tuple[str, str]]:
+    """(ats, token) de los boards enlazados o embebidos (links, iframes, scripts), en orden."""
+    if not html:
+        return []
+    text = html.decode("utf-8", errors="ignore") if isinstance(html, bytes) else html
+    boards: Dict[Tuple[str, str], None] = {}
+    for ats, board in ATS_BOARDS.items():
+        for m in board.pattern.finditer(text):
+            token = m.group(1).lower()
+            if token not in _NOT_TOKENS:
+                boards.setdefault((ats, token), None)
+    return list(boards)
+
+
+class BoardCache:
+    """Ofertas por board (ats, token), compartidas entre escaneos; FIFO + TTL como ScriptCache."""
+
+    def __init__(self, max_size: int = ATS_CACHE_SIZE, ttl: float = ATS_CACHE_TTL):
+        self.max_size = max_size
+        self.ttl = ttl
+        # (ats, token) -> (timestamp, ofertas)
+        self._boards: Dict[Tuple[str, str], Tuple[float, Tuple[dict, ...]]] = {}
+        self.stats = {"lookups": 0, "hits": 0, "misses": 0, "fetched": 0, "bytes_fetched": 0}
+
+    def get(self, key: Tuple[str, str]) -> Optional[Tuple[dict, ...]]:
+        self.stats["lookups"] += 1
+        entry = self._boards.get(key)
+        if entry is not None and time.time() - entry[0] < self.ttl:
+            self.stats["hits"] += 1
+            return entry[1]
+        self.stats["misses"] += 1
+        return None
+
+    def put(self, key: Tuple[str, str], jobs: Tuple[dict, ...], size: int) -> None:
+        self.stats["fetched"] += 1
+        self.stats["bytes_fetched"] += size
+        if key not in self._boards and len(self._boards) >= self.max_size:
+            self._boards.pop(next(iter(self._boards)))
+        self._boards[key] = (time.time(), jobs)
+
+    def info(self) -> dict:
+        lookups = self.stats["lookups"]
+        return {**self.stats, "hit_ratio": round(self.stats["hits"] / lookups, 3) if lookups else 0.0,
+                "boards_cached": len(self._boards)}
+
+
+board_cache = BoardCache()
+
+
+def _postings(ats: str, jobs: Iterable[dict], source_url: str) -> List[JobPosting]:
+    return [JobPosting(platform_hint=ats, source_url=source_url,
+                       **{k: (_as_text(v) if k != "apply_url" else v) for k, v in job.items()})
+            for job in jobs if job.get("title")]
+
+
+async def fetch_board_jobs(boards: List[Tuple[str, str]], respect_robots: bool = True,
+                           timeout: float = ATS_TIMEOUT) -> Tuple[List[JobPosting], List[Tuple[str, str]]]:
+    """
+    (ofertas, boards leídos) de los primeros MAX_ATS_BOARDS boards: cache por
+    board; los que faltan se piden en paralelo, con tope de bytes. Los boards
+    bloqueados por robots.txt, fallidos o fuera del tope no cuentan como leídos.
+    """
+    out: List[JobPosting] = []
+    read: List[Tuple[str, str]] = []
+    pending: Dict[str, Tuple[str, str]] = {}
+    for key in boards[:MAX_ATS_BOARDS]:
+        ats, token = key
+        endpoint = ATS_BOARDS[ats].endpoint.format(token=token)
+        cached = board_cache.get(key)
+        if cached is not None:
+            out.extend(_postings(ats, cached, endpoint))
+            read.append(key)
+        else:
+            pending[endpoint] = key
+    if pending:
+        pages = await fetch_pages(list(pending), respect_robots=respect_robots, timeout=timeout,
+                                  byte_cap=MAX_ATS_BYTES)
+        for endpoint, page in zip(pending, pages):
+            ats, _ = key = pending[endpoint]
+            content = page.body if page.body is not None else page.html
+            if not content:
+                continue  # los fallos no se cachean: se reintentan en otro escaneo
+            try:
+                jobs = tuple(ATS_BOARDS[ats].parse(json.loads(content), endpoint))
+            except (ValueError, AttributeError, TypeError):
+                continue  # respuesta cortada por el tope o con otro formato
+            board_cache.put(key, jobs, len(content))
+            out.extend(_postings(ats, jobs, endpoint))
+            read.append(key)
+    # En el orden en que se encontraron
+    return out, [key for key in boards if key in read]
+
+
+# ---------- Etapa completa ----------
+
+def careers_candidates(links: Iterable[str]) -> List[str]:
+    """Links internos con pinta de página de empleo, en orden."""
+    words = PRIORITY_KEYWORDS["careers"]
+    return [u for u in links if any(w in urlparse(u).path.lower() for w in words) and not looks_blocklisted(u)]
+
+
+async def collect_jobs(
+    home_html: Union[str, bytes, None],
+    links: Iterable[str] = (),
+    careers_pages: Optional[Dict[str, str]] = None,
+    overrides: Iterable[str] = (),
+    respect_robots: bool = True,
+    timeout: float = 10.0,
+) -> Optional[Dict[str, Any]]:
+    """
+    Resumen de empleo (JobsSignalsSummary) o None si no hay página de empleo ni board.
+    `careers_pages`: {url: html} ya descargadas en el crawl (no se vuelven a pedir).
+    `overrides` (careers_overrides del request) sustituyen a la búsqueda de la página.
+    """
+    overrides = [str(u) for u in overrides]
+    pages: Dict[str, str] = {} if overrides else dict(careers_pages or {})
+    wanted = overrides or careers_candidates(links)
+    to_fetch = [u for u in wanted if u not in pages][:max(0, MAX_CAREERS_PAGES - len(pages))]
+    if to_fetch:
+        for page in await fetch_pages(to_fetch, respect_robots=respect_robots, timeout=timeout):
+            if page.html:
+                pages[page.url] = page.html
+
+    boards = find_ats_boards(home_html) if home_html else []
+    jobs: List[JobPosting] = []
+    for url, html in pages.items():
+        jobs.extend(parse_job_jsonld(url, html))
+        boards.extend(b for b in find_ats_boards(html) if b not in boards)
+    if not pages and not boards:
+        return None
+
+    board_jobs, boards = await fetch_board_jobs(boards, respect_robots=respect_robots)
+    jobs.extend(board_jobs)
+    if not jobs:
+        for url, html in pages.items():
+            jobs.extend(guess_job_titles(url, html))
+
+    # La misma oferta en JSON-LD y en el board cuenta una vez
+    unique: Dict[Tuple[str, str], JobPosting] = {}
+    for job in jobs:
+        unique.setdefault((job.title.lower(), (job.location or "").lower()), job)
+    return build_jobs_summary(list(unique.values()), next(iter(pages), None), boards)
+
+
+def hiring_volume(jobs_count: int) -> str:
+    if jobs_count == 0:
+        return "none"
+    return "low" if jobs_count <= 3 else "medium" if jobs_count <= 10 else "high"
+
+
+def build_jobs_summary(jobs: List[JobPosting], careers_url: Optional[str] = None,
+                       boards: Iterable[Tuple[str, str]] = ()) -> Dict[str, Any]:
+    summary = summarize_jobs(jobs)
+    usefulness = usefulness_score(jobs)
+    return JobsSignalsSummary(
+        jobs_count=len(jobs),
+        hiring_volume=hiring_volume(len(jobs)),
+        careers_url=careers_url,
+        ats_boards=[f"{ats}:{token}" for ats, token in boards],
+        hiring_focus=summary["hiring_focus"],
+        seniority_mix=summary["seniority_mix"],
+        functions_count=summary["functions_count"],
+        platforms=usefulness["velocity"]["platforms"],
+        score=usefulness["score"],
+        tags=usefulness["tags"],
+        freshness_days_p50=usefulness["freshness_days_p50"],
+        jobs=jobs[:MAX_JOBS_RETURNED],
+    ).model_dump()
+
 def guess_function(title: str) -> str:
     t = title.lower()
     mapping = {
@@ -1,73 +1,252 @@
 # app/parsers/linkedin.py
+"""
+Página de empresa de LinkedIn (etapa opcional del escaneo).
+
+- La URL sale de `company_linkedin` o de las redes detectadas; se normaliza
+  a /company/<slug>/ y se descarga con tope MAX_LINKEDIN_BYTES
+  (LINKEDIN_COMPANY_URL es configurable para probar contra un servidor local).
+- Solo se leen los nodos que interesan (data-test-id="about-us__*", la
+  cabecera con nombre y seguidores) en una pasada del parser de eventos de
+  lxml, cortando en cuanto están todos, más la Organization del JSON-LD
+  (structured_data). Nada de get_text() sobre la página entera.
+- Resultado cacheado por slug con TTL largo (LINKEDIN_CACHE_TTL); las
+  páginas sin datos (authwall) con uno corto.
+
+Stand-in local con páginas grabadas: tests/test_linkedin.py
+"""
+import os
 import re
-from typing import Dict, Optional, List
+import time
+from typing import Any, Dict, Optional, List, Tuple
+from itertools import chain
+from urllib.parse import unquote, urlsplit
 from bs4 import BeautifulSoup
+from lxml import etree
+
+from ..fetch import fetch_pages, iter_hrefs
+from .structured_data import extract_structured_data
+
+MAX_LINKEDIN_BYTES = int(os.getenv("MAX_LINKEDIN_BYTES", "786432"))  # 768KB
+LINKEDIN_TIMEOUT = float(os.getenv("LINKEDIN_TIMEOUT", "5"))
+LINKEDIN_COMPANY_URL = os.getenv("LINKEDIN_COMPANY_URL", "https://www.linkedin.com/{kind}/{slug}/")
+LINKEDIN_CACHE_SIZE = int(os.getenv("LINKEDIN_CACHE_SIZE", "2000"))
+LINKEDIN_CACHE_TTL = float(os.getenv("LINKEDIN_CACHE_TTL", "604800"))  # 7 días: tamaño/sector cambian poco
+LINKEDIN_FAIL_TTL = float(os.getenv("LINKEDIN_FAIL_TTL", "3600"))  # authwall / sin datos: reintentar en 1h
+MAX_DESCRIPTION_CHARS = 300
+
+# data-test-id -> campo (markup actual "about-us__*" y el anterior "about-us-*")
+LINKEDIN_NODES = {
+    "about-us__description": "description",
+    "about-us-description": "description",
+    "about-us__industry": "industry",
+    "about-us-industry": "industry",
+    "about-us__size": "size",
+    "about-us__headquarters": "headquarters",
+    "about-us__foundedOn": "founded",
+    "about-us__website": "website",
+    "about-us__organizationType": "organization_type",
+    "view-all-employees-cta": "employees_on_linkedin",
+}
+# clase de la cabecera -> campo
+LINKEDIN_CLASSES = {
+    "top-card-layout__title": "name",
+    "top-card-layout__first-subline": "subline",
+}
+_TARGET_FIELDS = frozenset(LINKEDIN_NODES.values()) | frozenset(LINKEDIN_CLASSES.values())
+_COMPANY_KINDS = ("company", "school", "showcase")
+_FEED_CHUNK = 16 * 1024
+
+_NUMBER = r"(\d[\d.,]*)\s*([KkMm])?"
+_RANGE_RE = re.compile(r"(\d[\d.,]*)\s*[-–]\s*(\d[\d.,]*)|(\d[\d.,]*)\s*\+")
+_FOLLOWERS_RE = re.compile(_NUMBER + r"\s*(?:followers|seguidores)", re.I)
+_EMPLOYEES_RE = re.compile(_NUMBER + r"\s*(?:employees?|empleados?|trabajadores)", re.I)
+_YEAR_RE = re.compile(r"\b(1[89]\d\d|20\d\d)\b")
+
+
+def _to_int(number: str, suffix: Optional[str] = None) -> Optional[int]:
+    """"3,456" / "3.456" -> 3456; "1,2K" / "1.2K" -> 1200."""
+    if suffix:
+        try:
+            value = float(number.replace(",", "."))
+        except ValueError:
+            return None
+        return int(value * (1_000 if suffix in "Kk" else 1_000_000))
+    digits = re.sub(r"\D", "", number)
+    return int(digits) if digits else None
+
+
+class _LinkedInCollector:
+    """Target del parser de lxml: texto de los nodos de LINKEDIN_NODES / LINKEDIN_CLASSES (el primero de cada uno)."""
+
+    def __init__(self):
+        self.texts: Dict[str, List[str]] = {}
+        self.values: Dict[str, List[str]] = {}  # texto dentro de <dd> (sin la etiqueta <dt>)
+        self._field: Optional[str] = None
+        self._depth = 0
+        self._dd = 0
+
+    def done(self) -> bool:
+        return self._field is None and len(self.texts) == len(_TARGET_FIELDS)
+
+    def start(self, tag, attrib):
+        if self._field is not None:
+            self._depth += 1
+            if tag == "dd":
+                self._dd += 1
+            return
+        field = LINKEDIN_NODES.get(attrib.get("data-test-id"))
+        if field is None and "class" in attrib:
+            for klass in attrib["class"].split():
+                field = LINKEDIN_CLASSES.get(klass)
+                if field is not None:
+                    break
+        if field is not None and field not in self.texts:
+            self._field, self._depth, self._dd = field, 0, 0
+            self.texts[field] = []
+            self.values[field] = []
+
+    def end(self, tag):
+        if self._field is None:
+            return
+        if self._depth == 0:
+            self._field = None
+            return
+        self._depth -= 1
+        if tag == "dd" and self._dd:
+            self._dd -= 1
+
+    def data(self, text):
+        if self._field is not None:
+            self.texts[self._field].append(text)
+            if self._dd:
+                self.values[self._field].append(text)
+
+    def close(self) -> Dict[str, str]:
+        out = {}
+        for field, parts in self.texts.items():
+            text = " ".join(" ".join(self.values[field] or parts).split())
+            if text:
+                out[field] = text
+        return out
+
+
+def _collect_nodes(html: str) -> Dict[str, str]:
+    collector = _LinkedInCollector()
+    parser = etree.HTMLParser(target=collector)
+    for pos in range(0, len(html), _FEED_CHUNK):
+        parser.feed(html[pos:pos + _FEED_CHUNK])
+        if collector.done():
+            break  # el resto de la página (feed de posts, empleados) no hace falta
+    return parser.close()
+
+
+def _employees(organization: Optional[dict]) -> Optional[int]:
+    value = (organization or {}).get("numberOfEmployees")
+    if isinstance(value, dict):
+        value = value.get("value", value.get("maxValue"))
+    if isinstance(value, str):
+        value = _to_int(value)
+    return value if isinstance(value, int) and value > 0 else None
+
 
 def parse_linkedin_company(html: str) -> Dict[str, any]:
     """
     Extrae información valiosa de una página de LinkedIn de empresa.
-    Optimizado para ser rápido y no sobrecargar el scraping.
+    Optimizado para ser rápido y no sobrecargar el scraping: solo los nodos
+    about-us/cabecera y el JSON-LD, no el texto de toda la página.
     """
     if not html:
         return {}
     
-    soup = BeautifulSoup(html, "lxml")
+    nodes = _collect_nodes(html)
+    organization = extract_structured_data(html).organization()
     info = {}
     
-    # Employee count (muy valioso para GTM)
-    employee_text = soup.get_text()
-    employee_match = re.search(r'(\d{1,3}(?:,\d{3})*)\s*empleados?', employee_text, re.I)
-    if not employee_match:
-        employee_match = re.search(r'(\d{1,3}(?:,\d{3})*)\s*employees?', employee_text, re.I)
+    name = nodes.get("name") or (organization or {}).get("name")
+    if isinstance(name, str) and name.strip():
+        info["name"] = name.strip()
     
-    if employee_match:
-        count_str = employee_match.group(1).replace(",", "")
-        info["employee_count"] = int(count_str)
-        info["company_size_segment"] = get_company_size_segment(int(count_str))
+    # Employee count (muy valioso para GTM): exacto del JSON-LD, si no el rango "51-200 employees"
+    employee_count = _employees(organization)
+    size = nodes.get("size")
+    upper = None
+    if size:
+        size_match = _RANGE_RE.search(size)
+        if size_match:
+            low, high, plus = size_match.groups()
+            info["employee_range"] = f"{_to_int(low)}-{_to_int(high)}" if high else f"{_to_int(plus)}+"
+            upper = _to_int(high or plus)
+        elif employee_count is None:
+            count_match = _EMPLOYEES_RE.search(size)
+            employee_count = _to_int(*count_match.groups()) if count_match else None
+    if employee_count:
+        info["employee_count"] = employee_count
+    segment = get_company_size_segment(employee_count or upper)
+    if segment:
+        info["company_size_segment"] = segment
+    employees_cta = nodes.get("employees_on_linkedin")
+    if employees_cta:
+        on_linkedin = _EMPLOYEES_RE.search(employees_cta)
+        if on_linkedin:
+            info["employees_on_linkedin"] = _to_int(*on_linkedin.groups())
     
     # Company description (solo primeras 300 chars)
-    desc_elem = soup.select_one('[data-test-id="about-us-description"]')
-    if desc_elem:
-        desc = desc_elem.get_text(strip=True)
-        info["description"] = desc[:300] + "..." if len(desc) > 300 else desc
+    desc = nodes.get("description") or (organization or {}).get("description")
+    if isinstance(desc, str) and desc.strip():
+        desc = " ".join(desc.split())
+        info["description"] = desc[:MAX_DESCRIPTION_CHARS] + "..." if len(desc) > MAX_DESCRIPTION_CHARS else desc
     
     # Industry from LinkedIn (often more accurate than our detection)
-    industry_elem = soup.select_one('[data-test-id="about-us-industry"]')
-    if industry_elem:
-        info["linkedin_industry"] = industry_elem.get_text(strip=True)
+    if nodes.get("industry"):
+        info["linkedin_industry"] = nodes["industry"]
+    
+    headquarters = nodes.get("headquarters")
+    if not headquarters and organization and isinstance(organization.get("address"), dict):
+        address = organization["address"]
+        headquarters = ", ".join(str(address[k]) for k in ("addressLocality", "addressCountry") if address.get(k))
+    if headquarters:
+        info["headquarters"] = headquarters
+    
+    founded = _YEAR_RE.search(nodes.get("founded") or str((organization or {}).get("foundingDate") or ""))
+    if founded:
+        info["founded_year"] = int(founded.group(1))
+    
+    if nodes.get("website"):
+        info["website"] = nodes["website"]
+    if nodes.get("organization_type"):
+        info["organization_type"] = nodes["organization_type"]
+    
+    followers = _FOLLOWERS_RE.search(nodes.get("subline") or "")
+    if followers:
+        info["followers"] = _to_int(*followers.groups())
     
     return info
 
+def linkedin_slug(url: str) -> Optional[Tuple[str, str]]:
+    """("company"|"school"|"showcase", slug) de una URL de página de empresa; None si no lo es (p.ej. /in/)."""
+    try:
+        parts = urlsplit(url.strip() if "://" in url else f"https://{url.strip()}")
+    except ValueError:
+        return None
+    if not (parts.hostname or "").endswith("linkedin.com"):
+        return None
+    segments = [s for s in parts.path.split("/") if s]
+    if len(segments) < 2 or segments[0].lower() not in _COMPANY_KINDS:
+        return None
+    return segments[0].lower(), unquote(segments[1]).lower()
+
 def extract_linkedin_url_from_html(html: str, domain: str) -> Optional[str]:
     """
     Busca el URL de LinkedIn de la empresa en el HTML.
     Muy útil para encontrar automáticamente el LinkedIn.
+    Links de la página primero y luego el sameAs del JSON-LD/microdata compartido.
     """
     if not html:
         return None
     
-    soup = BeautifulSoup(html, "lxml")
-    
-    # Buscar enlaces a LinkedIn
-    for a in soup.find_all("a", href=True):
-        href = a["href"].lower()
-        if "linkedin.com/company/" in href:
-            return a["href"]
-    
-    # Buscar en JSON-LD
-    for script in soup.find_all("script", type="application/ld+json"):
-        try:
-            import json
-            data = json.loads(script.string or "{}")
-            if isinstance(data, dict):
-                same_as = data.get("sameAs", [])
-                if isinstance(same_as, str):
-                    same_as = [same_as]
-                for url in same_as:
-                    if "linkedin.com/company/" in url.lower():
-                        return url
-        except:
-            continue
+    for url in chain(iter_hrefs(html), extract_structured_data(html).same_as):
+        if "linkedin.com/company/" in url.lower():
+            return url.strip()
     
     return None
 
@@ -125,4 +304,67 @@ def analyze_company_maturity_simple(employee_count: Optional[int], html: str) ->
         maturity["level"] = "Public Company"
         maturity["indicators"].append("Public company indicators")
     
-    return maturity
\ No newline at end of file
+    return maturity
+
+# ---------- Etapa del escaneo ----------
+
+class LinkedInCache:
+    """Datos por página de empresa ("kind/slug"), compartidos entre escaneos; FIFO + TTL como BoardCache."""
+
+    def __init__(self, max_size: int = LINKEDIN_CACHE_SIZE, ttl: float = LINKEDIN_CACHE_TTL,
+                 fail_ttl: float = LINKEDIN_FAIL_TTL):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.fail_ttl = fail_ttl
+        # clave -> (timestamp, datos; {} si la página no dio nada)
+        self._companies: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self.stats = {"lookups": 0, "hits": 0, "misses": 0, "fetched": 0, "empty": 0, "bytes_fetched": 0}
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Datos cacheados ({} si la página no dio nada) o None si hay que pedirla."""
+        self.stats["lookups"] += 1
+        entry = self._companies.get(key)
+        if entry is not None and time.time() - entry[0] < (self.ttl if entry[1] else self.fail_ttl):
+            self.stats["hits"] += 1
+            return dict(entry[1])
+        self.stats["misses"] += 1
+        return None
+
+    def put(self, key: str, info: Dict[str, Any], size: int) -> None:
+        self.stats["fetched"] += 1
+        self.stats["bytes_fetched"] += size
+        if not info:
+            self.stats["empty"] += 1
+        if key not in self._companies and len(self._companies) >= self.max_size:
+            self._companies.pop(next(iter(self._companies)))
+        self._companies[key] = (time.time(), dict(info))
+
+    def info(self) -> dict:
+        lookups = self.stats["lookups"]
+        return {**self.stats, "hit_ratio": round(self.stats["hits"] / lookups, 3) if lookups else 0.0,
+                "companies_cached": len(self._companies)}
+
+
+linkedin_cache = LinkedInCache()
+
+
+async def fetch_linkedin_company(url: str, respect_robots: bool = True,
+                                 timeout: float = LINKEDIN_TIMEOUT) -> Optional[Dict[str, Any]]:
+    """Datos de la página de empresa de LinkedIn (cache por slug); None si la URL no es de empresa o no hay datos."""
+    company = linkedin_slug(url)
+    if company is None:
+        return None
+    kind, slug = company
+    key = f"{kind}/{slug}"
+    info = linkedin_cache.get(key)
+    if info is None:
+        pages = await fetch_pages([LINKEDIN_COMPANY_URL.format(kind=kind, slug=slug)], respect_robots=respect_robots,
+                                  timeout=timeout, byte_cap=MAX_LINKEDIN_BYTES)
+        page = pages[0] if pages else None
+        if page is None or not page.html:
+            return None  # sin respuesta: no se cachea, el próximo escaneo lo reintenta
+        info = parse_linkedin_company(page.html)
+        linkedin_cache.put(key, info, page.size)
+    if not info:
+        return None
+    return {"url": f"https://www.linkedin.com/{kind}/{slug}/", "slug": slug, **info}
@@ -1,76 +1,279 @@
 # app/app/parsers/news.py
-from bs4 import BeautifulSoup
-from typing import List, Dict
+"""
+Noticias recientes de la empresa.
+
+1) Feeds RSS/Atom descubiertos en las páginas (<link rel="alternate">): se
+   descargan en streaming con tope de bytes, se deja de leer en cuanto han
+   llegado MAX_FEED_ENTRIES entradas y feedparser parsea ese prefijo (tolera
+   el documento cortado).
+2) Si no hay feed: heurística lineal sobre las páginas de blog/news ya
+   crawleadas (un recorrido del parser de eventos de lxml, sin find_parent).
+
+Benchmark: python -m benchmarks.news
+"""
+import os
 import re
+from typing import Dict, List, Optional, Union
+
 import httpx
+from lxml import etree
+
+from ..fetch import fetch_pages
+from ..memo import memo
+from .industry import visible_text
+
+try:
+    import feedparser
+except ImportError:  # Sin feedparser solo queda la heurística sobre el html
+    feedparser = None
+
+# Subir si cambia la salida (invalida el memo por contenido)
+NEWS_VERSION = "2"
+
+MAX_FEED_BYTES = int(os.getenv("MAX_FEED_BYTES", "262144"))  # 256KB por feed
+MAX_FEEDS = int(os.getenv("MAX_FEEDS", "2"))
+MAX_FEED_ENTRIES = 10      # Entradas que se leen de cada feed antes de cortar la descarga
+MAX_NEWS_ITEMS = 3         # recent_news: solo las 3 más recientes
+MAX_BODY_CHARS = 300
+
+CANDIDATE_PATHS = re.compile(r"/(blog|news|noticias|novedades|press|prensa|actualidad)(/|$)", re.I)
+
+
+def _text(parts: List[str]) -> str:
+    return " ".join(" ".join(parts).split())
+
+
+def _absolute(base_url: str, href: str) -> Optional[str]:
+    try:
+        url = str(httpx.URL(base_url).join(href.strip()))
+    except Exception:
+        return None
+    return url if url.startswith(("http://", "https://")) else None
+
+
+# ---------- 1) Feeds ----------
+
+class _FeedSink:
+    """Sink de fetch_page: corta la descarga cuando ya han cerrado MAX_FEED_ENTRIES items/entries."""
+
+    _CLOSING = ("</item>", "</entry>")
+
+    def __init__(self, max_entries: int = MAX_FEED_ENTRIES):
+        self.max_entries = max_entries
+        self.entries = 0
+        self._tail = None
+
+    def headers(self, headers: Dict[str, str], cookies: List[str]) -> None:
+        pass
+
+    def feed(self, chunk: Union[str, bytes]) -> bool:
+        as_bytes = isinstance(chunk, bytes)
+        closing = [c.encode() for c in self._CLOSING] if as_bytes else self._CLOSING
+        # El final del trozo anterior, por si una etiqueta de cierre queda partida;
+        # lo que ya estaba entero en ese final se contó en el trozo anterior
+        tail = chunk[:0] if self._tail is None else self._tail
+        text = tail + chunk
+        self.entries += sum(text.count(c) - tail.count(c) for c in closing)
+        self._tail = text[-(max(len(c) for c in closing) - 1):]
+        return self.entries >= self.max_entries
+
+    def close(self, document) -> None:
+        pass
+
+
+def parse_feed(document: Union[str, bytes], base_url: str, max_items: int = MAX_NEWS_ITEMS) -> List[Dict[str, str]]:
+    """Entradas de un feed RSS/Atom (posiblemente cortado) como noticias, más recientes primero."""
+    if not document or feedparser is None:
+        return []
+    return memo.memoize("news_feed", NEWS_VERSION, document,
+                        lambda: _parse_feed(document, base_url, max_items), base_url, max_items)
+
+
+def _parse_feed(document: Union[str, bytes], base_url: str, max_items: int) -> List[Dict[str, str]]:
+    entries = feedparser.parse(document).entries
+    # Si la descarga se cortó, la última entrada está a medias (link o título truncados)
+    closing = _FeedSink._CLOSING if isinstance(document, str) else [c.encode() for c in _FeedSink._CLOSING]
+    closed = sum(document.count(c) for c in closing)
+    if closed:  # 0: etiquetas con prefijo (</atom:entry>), no se puede saber
+        entries = entries[:closed]
+    dated, undated = [], []
+    for entry in entries:
+        title = " ".join((entry.get("title") or "").split())
+        url = _absolute(base_url, entry.get("link") or "") if entry.get("link") else None
+        if not title or not url:
+            continue
+        body = visible_text(entry.get("summary") or "", max_chars=MAX_BODY_CHARS, meta=False)
+        item = {"title": title, "body": body, "url": url}
+        published = entry.get("published_parsed") or entry.get("updated_parsed")
+        if published:
+            dated.append((tuple(published), len(dated), item))
+        else:
+            undated.append(item)
+    # Con fecha primero (más reciente antes); sin fecha, en el orden del feed
+    dated.sort(key=lambda d: (d[0], -d[1]), reverse=True)
+    return ([item for _, _, item in dated] + undated)[:max_items]
 
-def _text(n):
-    return " ".join((n.get_text(" ", strip=True) or "").split())
 
-CANDIDATE_PATHS = re.compile(r"/(blog|news|novedades|press|prensa)/", re.I)
+async def fetch_feed_news(
+    feed_urls: List[str],
+    respect_robots: bool = True,
+    timeout: float = 10.0,
+    max_items: int = MAX_NEWS_ITEMS,
+) -> List[Dict[str, str]]:
+    """Noticias de los primeros MAX_FEEDS feeds (descarga en paralelo, con tope y corte temprano)."""
+    if not feed_urls or feedparser is None:
+        return []
+    pages = await fetch_pages(feed_urls[:MAX_FEEDS], respect_robots=respect_robots, timeout=timeout,
+                              sink_factory=lambda u: _FeedSink(), byte_cap=MAX_FEED_BYTES)
+    items: List[Dict[str, str]] = []
+    for page in pages:
+        document = page.body if page.body is not None else page.html
+        items.extend(parse_feed(document, page.url, max_items))
+    return _dedupe(items)[:max_items]
+
+
+# ---------- 2) Heurística sobre el html ----------
+
+_BLOCKS = frozenset({"article", "section", "div", "li"})
+_HEADINGS = frozenset({"h1", "h2", "h3"})
+_HIDDEN_TAGS = frozenset({"script", "style", "template"})
+
+
+class _Block:
+    __slots__ = ("tag", "title", "body", "href", "heading_href", "emitted")
+
+    def __init__(self, tag: str):
+        self.tag = tag
+        self.title: Optional[str] = None
+        self.body: Optional[str] = None
+        self.href: Optional[str] = None           # primer link del bloque
+        self.heading_href: Optional[str] = None   # link dentro del titular
+        self.emitted = False                      # un bloque hijo ya dio la noticia
+
+
+class _NewsCollector:
+    """
+    Target del parser de lxml. Cada titular, párrafo y link se asigna al
+    bloque abierto más interno (article/section/div/li); al cerrarse, un
+    bloque con titular + párrafo (+ link si no es <article>) es una noticia,
+    y si no, pasa lo que tiene al bloque padre. Cada evento es O(1).
+    """
+
+    def __init__(self):
+        self.articles: List[tuple] = []   # (titulo, cuerpo, href) de <article>
+        self.cards: List[tuple] = []      # idem de tarjetas (section/div/li con link)
+        self._blocks: List[_Block] = []
+        self._capture: Optional[List[str]] = None   # texto del titular o párrafo abierto
+        self._capture_tag: Optional[str] = None
+        self._capture_depth = 0
+        self._in_heading = False
+        self._hidden = 0
+
+    def start(self, tag, attrib):
+        if tag in _HIDDEN_TAGS:
+            self._hidden += 1
+        if tag in _BLOCKS:
+            self._blocks.append(_Block(tag))
+            return
+        if not self._blocks:
+            return
+        block = self._blocks[-1]
+        if tag == "a":
+            href = attrib.get("href")
+            if href:
+                if block.href is None:
+                    block.href = href
+                if self._in_heading and block.heading_href is None:
+                    block.heading_href = href
+        elif self._capture is None:
+            if (tag in _HEADINGS and block.title is None) or (tag == "p" and block.body is None):
+                self._capture, self._capture_tag, self._capture_depth = [], tag, 0
+                self._in_heading = tag in _HEADINGS
+        elif tag == self._capture_tag:
+            self._capture_depth += 1
+
+    def end(self, tag):
+        if tag in _HIDDEN_TAGS:
+            self._hidden -= 1
+        if self._capture is not None and tag == self._capture_tag:
+            if self._capture_depth:
+                self._capture_depth -= 1
+            else:
+                text = _text(self._capture)
+                block = self._blocks[-1]
+                if text:
+                    if tag == "p":
+                        block.body = text
+                    else:
+                        block.title = text
+                self._capture, self._capture_tag, self._in_heading = None, None, False
+        if tag in _BLOCKS and self._blocks:
+            self._close_block(self._blocks.pop())
+
+    def _close_block(self, block: _Block) -> None:
+        parent = self._blocks[-1] if self._blocks else None
+        if block.emitted:
+            if parent is not None:
+                parent.emitted = True
+            return
+        if block.title and block.body:
+            if block.tag == "article":
+                self.articles.append((block.title, block.body, block.heading_href or block.href))
+                block.emitted = True
+            elif block.href:
+                self.cards.append((block.title, block.body, block.heading_href or block.href))
+                block.emitted = True
+        if block.emitted:
+            if parent is not None:
+                parent.emitted = True
+        elif parent is not None:
+            # Lo que falta al padre sube (titular en una tarjeta, párrafo en el contenedor...)
+            parent.title = parent.title or block.title
+            parent.body = parent.body or block.body
+            parent.href = parent.href or block.href
+            parent.heading_href = parent.heading_href or block.heading_href
+
+    def data(self, text):
+        if self._capture is not None and not self._hidden:
+            self._capture.append(text)
+
+    def close(self):
+        return self
+
 
 def extract_news_from_html(base_url: str, html: str, max_items: int = 5) -> List[Dict[str, str]]:
     """
     Extrae hasta max_items noticias internas (title + body + url) de una página que
     parezca ser blog/news/press o que tenga <article>.
     """
-    out = []
     if not html:
-        return out
+        return []
+    return memo.memoize("news_html", NEWS_VERSION, html,
+                        lambda: _extract_news_from_html(base_url, html, max_items), base_url, max_items)
 
-    soup = BeautifulSoup(html, "lxml")
 
-    # 1) Prioriza <article> con <h1>/<h2> y párrafos
-    articles = soup.find_all("article")
-    for art in articles:
-        h = art.find(["h1", "h2", "h3"])
-        if not h: 
-            continue
-        title = _text(h)
-        if not title:
-            continue
-        # cuerpo = unión de párrafos razonables
-        ps = [p for p in art.find_all("p")][:6]
-        body = _text(ps[0]) if ps else ""
-        if not body:
-            # fallback: siguiente sibling
-            sib = h.find_next("p")
-            body = _text(sib) if sib else ""
-        # url
-        a = h.find("a", href=True) or art.find("a", href=True)
-        if a and a["href"]:
-            url = str(httpx.URL(base_url).join(a["href"]))
-        else:
-            url = base_url
-
-        if title and body:
-            out.append({"title": title, "body": body, "url": url})
-        if len(out) >= max_items:
-            return out
-
-    # 2) Si no hubo <article>, intenta tarjetas típicas de blog (h2/h3 + p + a)
-    if not out:
-        cards = soup.select("section a, div a")
-        seen = set()
-        for a in cards:
-            href = a.get("href")
-            if not href or href in seen:
-                continue
-            seen.add(href)
-            # buscar heading cercano
-            h = a.find(["h1", "h2", "h3"]) or a.find_parent().find(["h1", "h2", "h3"]) if a.find_parent() else None
-            if not h:
-                continue
-            title = _text(h)
-            if not title:
-                continue
-            # párrafo cercano
-            p = a.find("p") or (a.find_parent().find("p") if a.find_parent() else None)
-            body = _text(p) if p else ""
-            url = str(httpx.URL(base_url).join(href))
-            if title and body:
-                out.append({"title": title, "body": body, "url": url})
-            if len(out) >= max_items:
-                break
-
-    return out[:max_items]
+def _extract_news_from_html(base_url: str, html: str, max_items: int) -> List[Dict[str, str]]:
+    collector = _NewsCollector()
+    parser = etree.HTMLParser(target=collector)
+    parser.feed(html)
+    parser.close()
+    # 1) Prioriza <article>; 2) si no hubo, tarjetas típicas de blog (h2/h3 + p + a)
+    out = []
+    for title, body, href in collector.articles or collector.cards:
+        url = _absolute(base_url, href) if href else base_url
+        if url:
+            out.append({"title": title, "body": body[:MAX_BODY_CHARS], "url": url})
+    return _dedupe(out)[:max_items]
+
+
+def _dedupe(items: List[Dict[str, str]]) -> List[Dict[str, str]]:
+    seen, out = set(), []
+    for item in items:
+        if item["url"] not in seen:
+            seen.add(item["url"])
+            out.append(item)
+    return out
+
+
+def is_news_page(url: str) -> bool:
+    return bool(CANDIDATE_PATHS.search(httpx.URL(url).path))
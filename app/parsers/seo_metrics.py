@@ -1,98 +1,203 @@
 # app/parsers/seo_metrics.py
-from bs4 import BeautifulSoup
-from typing import Dict, List
-import re
+"""
+Métricas SEO en una sola pasada.
 
-def extract_seo_metrics(html: str, url: str, request_time_ms: int = None) -> Dict[str, any]:
+El HTML se recorre una vez con el parser de eventos de lxml (el mismo que
+usa BeautifulSoup por debajo, pero sin construir el árbol): cada etiqueta
+actualiza los contadores al abrirse. El host base se parsea una vez por
+página y el tamaño sale de los bytes del fetch, sin recodificar el html.
+
+Si hay datos estructurados, sus tipos salen del extractor compartido
+(structured_data), que decodifica el JSON-LD una vez por página.
+SEOAccumulator agrega las métricas de todas las páginas del crawl.
+Benchmark: python -m benchmarks.seo_metrics
+"""
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+from lxml import etree
+
+from ..memo import memo
+from .structured_data import extract_structured_data
+
+# Subir si cambia la salida (invalida el memo por contenido)
+SEO_VERSION = "2"
+
+_NOT_LINK = ("#", "javascript:", "mailto:")
+
+
+def link_host(url: str) -> str:
+    """Host (netloc en minúscula) con el que se comparan los links de la página."""
+    try:
+        return urlparse(url).netloc.lower()
+    except ValueError:
+        return ""
+
+
+def classify_link(href: str, base_host: str) -> Optional[bool]:
+    """True si el link es interno, False si es externo, None si no es un link (#, javascript:, mailto:)."""
+    if href.startswith(_NOT_LINK):
+        return None
+    if href.startswith("//"):
+        # Relativo al protocolo: el host decide (antes contaba siempre como interno)
+        href = "http:" + href
+    elif href.startswith("/"):
+        return True
+    if href.startswith("http"):
+        try:
+            return urlparse(href).netloc.lower() == base_host
+        except ValueError:
+            return None
+    return True
+
+
+class _SEOCollector:
+    """Target del parser de lxml: cuenta al abrir cada etiqueta."""
+
+    def __init__(self, base_host: str):
+        self.base_host = base_host
+        self.title: Optional[List[str]] = None  # trozos de texto del primer <title>
+        self._in_title = False
+        self.meta_description: Optional[str] = None
+        self._meta_description_seen = False
+        self.structured = False
+        self.sitemap = False
+        self.h1 = self.h2 = 0
+        self.images_without_alt = 0
+        self.internal = self.external = 0
+
+    def start(self, tag, attrib):
+        if tag == "a":
+            href = attrib.get("href")
+            if href is not None:
+                internal = classify_link(href, self.base_host)
+                if internal:
+                    self.internal += 1
+                elif internal is False:
+                    self.external += 1
+        elif tag == "img":
+            if not attrib.get("alt"):
+                self.images_without_alt += 1
+        elif tag == "h1":
+            self.h1 += 1
+        elif tag == "h2":
+            self.h2 += 1
+        elif tag == "title":
+            if self.title is None:
+                self.title = []
+                self._in_title = True
+        elif tag == "meta":
+            if not self._meta_description_seen and attrib.get("name") == "description":
+                self._meta_description_seen = True  # solo cuenta el primero
+                self.meta_description = attrib.get("content")
+        elif tag == "script":
+            if attrib.get("type") == "application/ld+json":
+                self.structured = True
+        elif tag == "link":
+            if "sitemap" in (attrib.get("rel") or "").split():
+                self.sitemap = True
+        if not self.structured and ("itemtype" in attrib or "itemscope" in attrib):
+            self.structured = True
+
+    def end(self, tag):
+        if tag == "title":
+            self._in_title = False
+
+    def data(self, text):
+        if self._in_title:
+            self.title.append(text)
+
+    def close(self) -> Dict[str, any]:
+        metrics = {}
+        title = "".join(self.title) if self.title else ""
+        if title:
+            metrics["meta_title_length"] = len(title.strip())
+        if self.meta_description:
+            metrics["meta_description_length"] = len(self.meta_description.strip())
+        metrics["has_structured_data"] = self.structured
+        metrics["has_sitemap_link"] = self.sitemap
+        metrics["h1_count"] = self.h1
+        metrics["h2_count"] = self.h2
+        metrics["image_alt_missing"] = self.images_without_alt
+        metrics["internal_links_count"] = self.internal
+        metrics["external_links_count"] = self.external
+        return metrics
+
+
+def extract_seo_metrics(html: str, url: str, request_time_ms: int = None,
+                        page_bytes: int = None) -> Dict[str, any]:
     """
     Extrae métricas SEO comprehensivas y rápidas.
+    `page_bytes`: bytes descargados (FetchedPage.size); si no, se estima del html.
     """
     if not html:
         return {}
-    
-    soup = BeautifulSoup(html, "lxml")
-    metrics = {}
-    
-    # Basic SEO metrics
-    title = soup.find("title")
-    if title and title.string:
-        metrics["meta_title_length"] = len(title.string.strip())
-    
-    meta_desc = soup.find("meta", attrs={"name": "description"})
-    if meta_desc and meta_desc.get("content"):
-        metrics["meta_description_length"] = len(meta_desc["content"].strip())
-    
-    # Structured data presence
-    has_structured = bool(
-        soup.find("script", type="application/ld+json") or 
-        soup.find(attrs={"itemtype": True}) or
-        soup.find(attrs={"itemscope": True})
-    )
-    metrics["has_structured_data"] = has_structured
-    
-    # Sitemap link presence
-    sitemap_link = soup.find("link", attrs={"rel": "sitemap"})
-    metrics["has_sitemap_link"] = bool(sitemap_link)
-    
-    # Page load time (if provided)
+    # Los links internos/externos dependen del host; tamaño y tiempo de carga no entran en el memo
+    base_host = link_host(url)
+    metrics = memo.memoize("seo", SEO_VERSION, html, lambda: _extract_seo_metrics(html, base_host), base_host)
+    if metrics["has_structured_data"]:
+        # Tipos del extractor compartido (memoizado: la home ya lo decodificó para nombre y redes)
+        metrics["structured_data_types"] = extract_structured_data(html).types or None
+    if not page_bytes:
+        page_bytes = len(html.encode("utf-8"))
+    metrics["page_size_kb"] = round(page_bytes / 1024, 2)
     if request_time_ms is not None:
         metrics["page_load_time_ms"] = request_time_ms
-    
-    # Heading structure
-    h1_tags = soup.find_all("h1")
-    h2_tags = soup.find_all("h2")
-    metrics["h1_count"] = len(h1_tags)
-    metrics["h2_count"] = len(h2_tags)
-    
-    # Image optimization
-    images = soup.find_all("img")
-    images_without_alt = [img for img in images if not img.get("alt")]
-    metrics["image_alt_missing"] = len(images_without_alt)
-    
-    # Link analysis
-    all_links = soup.find_all("a", href=True)
-    internal_links = [link for link in all_links if _is_internal_link(link["href"], url)]
-    external_links = [link for link in all_links if _is_external_link(link["href"], url)]
-    
-    metrics["internal_links_count"] = len(internal_links)
-    metrics["external_links_count"] = len(external_links)
-    
-    # Page size estimation (rough)
-    page_size_bytes = len(html.encode('utf-8'))
-    metrics["page_size_kb"] = round(page_size_bytes / 1024, 2)
-    
     return metrics
 
 
-def _is_internal_link(href: str, base_url: str) -> bool:
-    """Check if link is internal to the same domain."""
-    if href.startswith('#') or href.startswith('javascript:') or href.startswith('mailto:'):
-        return False
-    if href.startswith('/'):
-        return True
-    if href.startswith('http'):
-        try:
-            from urllib.parse import urlparse
-            href_domain = urlparse(href).netloc.lower()
-            base_domain = urlparse(base_url).netloc.lower()
-            return href_domain == base_domain
-        except:
-            return False
-    return True
+def _extract_seo_metrics(html: str, base_host: str) -> Dict[str, any]:
+    parser = etree.HTMLParser(target=_SEOCollector(base_host))
+    parser.feed(html)
+    return parser.close()
 
 
-def _is_external_link(href: str, base_url: str) -> bool:
-    """Check if link is external."""
-    if href.startswith('#') or href.startswith('javascript:') or href.startswith('mailto:'):
-        return False
-    if href.startswith('/'):
-        return False
-    if href.startswith('http'):
-        try:
-            from urllib.parse import urlparse
-            href_domain = urlparse(href).netloc.lower()
-            base_domain = urlparse(base_url).netloc.lower()
-            return href_domain != base_domain
-        except:
-            return False
-    return False
\ No newline at end of file
+class SEOAccumulator:
+    """Agrega las métricas por página del crawl (home incluida) en un resumen del sitio."""
+
+    def __init__(self):
+        self.pages = 0
+        self.missing_title = 0
+        self.missing_description = 0
+        self.without_h1 = 0
+        self.multiple_h1 = 0
+        self.structured = 0
+        self.images_without_alt = 0
+        self.total_kb = 0.0
+        self.max_kb = 0.0
+
+    def add(self, metrics: Dict[str, any]) -> None:
+        if not metrics:
+            return
+        self.pages += 1
+        if not metrics.get("meta_title_length"):
+            self.missing_title += 1
+        if not metrics.get("meta_description_length"):
+            self.missing_description += 1
+        h1 = metrics.get("h1_count") or 0
+        if h1 == 0:
+            self.without_h1 += 1
+        elif h1 > 1:
+            self.multiple_h1 += 1
+        if metrics.get("has_structured_data"):
+            self.structured += 1
+        self.images_without_alt += metrics.get("image_alt_missing") or 0
+        size_kb = metrics.get("page_size_kb") or 0.0
+        self.total_kb += size_kb
+        self.max_kb = max(self.max_kb, size_kb)
+
+    def summary(self) -> Optional[Dict[str, any]]:
+        """Resumen del sitio (SiteSEOMetrics) o None si no hay páginas."""
+        if not self.pages:
+            return None
+        return {
+            "pages_analyzed": self.pages,
+            "pages_missing_title": self.missing_title,
+            "pages_missing_meta_description": self.missing_description,
+            "pages_without_h1": self.without_h1,
+            "pages_with_multiple_h1": self.multiple_h1,
+            "pages_with_structured_data": self.structured,
+            "image_alt_missing": self.images_without_alt,
+            "avg_page_size_kb": round(self.total_kb / self.pages, 2),
+            "max_page_size_kb": round(self.max_kb, 2),
+        }
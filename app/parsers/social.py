@@ -0,0 +1,188 @@
+# app/parsers/social.py
+"""
+Redes sociales de una página: un único extractor para el crawl (main) y
+para social_enhanced.
+
+Cada URL candidata (href de <a>, content de <meta>, sameAs de JSON-LD o
+microdata, vía structured_data) se parsea una vez: el host decide la
+plataforma con una tabla (sin cadenas de `in` por link) y una regla por
+plataforma valida el path. Se deja de mirar en cuanto todas las
+plataformas pedidas tienen URL.
+
+Benchmark sobre una página con miles de links: python -m benchmarks.social
+"""
+import re
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Union
+from urllib.parse import urlsplit
+
+from ..fetch import iter_hrefs
+from .structured_data import extract_structured_data
+
+# Host (o sufijo: es-la.facebook.com -> facebook.com) -> plataforma
+SOCIAL_HOSTS = {
+    "linkedin.com": "linkedin",
+    "facebook.com": "facebook", "fb.com": "facebook",
+    "twitter.com": "twitter", "x.com": "twitter",
+    "instagram.com": "instagram",
+    "youtube.com": "youtube",
+    "tiktok.com": "tiktok",
+    "github.com": "github",
+    "discord.gg": "discord", "discord.com": "discord",
+    "twitch.tv": "twitch",
+    "reddit.com": "reddit",
+    "pinterest.com": "pinterest", "pinterest.es": "pinterest",
+    "wa.me": "whatsapp", "whatsapp.com": "whatsapp",
+    "t.me": "telegram", "telegram.me": "telegram",
+    "flickr.com": "flickr",
+    "vimeo.com": "vimeo",
+    "soundcloud.com": "soundcloud",
+    "spotify.com": "spotify",
+    "medium.com": "medium",
+    "behance.net": "behance",
+    "dribbble.com": "dribbble",
+    "snapchat.com": "snapchat",
+}
+PLATFORMS = tuple(dict.fromkeys(SOCIAL_HOSTS.values()))
+
+# Palabras del path que descartan la URL: páginas legales, compartir, login
+SKIP_PATH_WORDS = frozenset({
+    "privacy", "privacidad", "terms", "condiciones", "cookies", "legal", "notices",
+    "policy", "policies", "politica", "aviso", "disclaimer",
+    "share", "sharer", "intent", "login", "oauth", "signup", "help", "ayuda", "faq",
+})
+# Primer segmento del path que nunca es un perfil
+_NOT_PROFILE = frozenset({
+    "home", "search", "hashtag", "explore", "i", "dialog", "plugins", "tr", "watch",
+    "p", "reel", "reels", "accounts", "features", "pricing", "about", "settings",
+})
+_WORD_SPLIT_RE = re.compile(r"[^a-z0-9]+")
+
+# Regla por plataforma: segmentos del path -> ¿es un perfil de la empresa?
+Rule = Callable[[List[str]], bool]
+
+
+def _profile(segments: List[str]) -> bool:
+    return bool(segments) and segments[0] not in _NOT_PROFILE
+
+
+def _linkedin(segments: List[str]) -> bool:
+    # /in/<persona> es un perfil personal, no la página de la empresa
+    return len(segments) >= 2 and segments[0] in ("company", "school", "showcase")
+
+
+def _youtube(segments: List[str]) -> bool:
+    return bool(segments) and (segments[0].startswith("@") or (len(segments) >= 2 and segments[0] in ("channel", "c", "user")))
+
+
+def _tiktok(segments: List[str]) -> bool:
+    return bool(segments) and segments[0].startswith("@")
+
+
+def _discord(segments: List[str]) -> bool:
+    # discord.gg/<código> o discord.com/invite/<código>
+    return bool(segments) and (segments[0] == "invite" and len(segments) >= 2 or segments[0] != "invite")
+
+
+def _reddit(segments: List[str]) -> bool:
+    return len(segments) >= 2 and segments[0] in ("r", "user", "u")
+
+
+def _whatsapp(segments: List[str]) -> bool:
+    return bool(segments)
+
+
+PATH_RULES: Dict[str, Rule] = {
+    "linkedin": _linkedin,
+    "youtube": _youtube,
+    "tiktok": _tiktok,
+    "discord": _discord,
+    "reddit": _reddit,
+    "whatsapp": _whatsapp,
+}
+
+
+def _platform_for_host(host: str) -> Optional[str]:
+    labels = host.split(".")
+    for i in range(len(labels) - 1):
+        platform = SOCIAL_HOSTS.get(".".join(labels[i:]))
+        if platform is not None:
+            return platform
+    return None
+
+
+def classify_social_url(url: str) -> Optional[str]:
+    """Plataforma de una URL de perfil social, si no None."""
+    url = url.strip()
+    if not url.startswith(("https://", "http://", "//")) or len(url) > 200:
+        return None
+    try:
+        parts = urlsplit(url)
+    except ValueError:
+        return None
+    if len(parts.query) > 50:
+        return None
+    platform = _platform_for_host((parts.hostname or "").lower())
+    if platform is None:
+        return None
+    path = parts.path.lower()
+    if SKIP_PATH_WORDS.intersection(_WORD_SPLIT_RE.split(path)):
+        return None
+    if not PATH_RULES.get(platform, _profile)([s for s in path.split("/") if s]):
+        return None
+    return platform
+
+
+class SocialCollector:
+    """Primera URL válida por plataforma; `add` devuelve True cuando ya están todas."""
+
+    def __init__(self, platforms: Optional[Iterable[str]] = None):
+        self.wanted = frozenset(platforms) if platforms is not None else frozenset(PLATFORMS)
+        self.found: Dict[str, str] = {}
+
+    def done(self) -> bool:
+        return self.found.keys() >= self.wanted
+
+    def add(self, url: str) -> bool:
+        platform = classify_social_url(url)
+        if platform in self.wanted:
+            self.found.setdefault(platform, url.strip())
+        return self.done()
+
+    def add_all(self, urls: Iterable[str]) -> bool:
+        for url in urls:
+            if self.add(url):
+                return True
+        return self.done()
+
+
+_META_CONTENT_RE = re.compile(r"""<meta\b[^>]*?\bcontent\s*=\s*["']([^"']*://[^"']*)["']""", re.I)
+
+
+def _meta_urls(html: str) -> Iterator[str]:
+    return (m.group(1) for m in _META_CONTENT_RE.finditer(html))
+
+
+def extract_socials(
+    html: Union[str, bytes],
+    platforms: Optional[Iterable[str]] = None,
+    meta: bool = True,
+    json_ld: bool = True,
+    encoding: str = "utf-8",
+) -> Dict[str, str]:
+    """
+    {plataforma: url} desde los links de la página y, si aún faltan
+    plataformas, desde <meta content> y el sameAs de JSON-LD.
+    Acepta el html o los bytes crudos del fetch (con su `encoding`).
+    """
+    if not html:
+        return {}
+    collector = SocialCollector(platforms)
+    if collector.add_all(iter_hrefs(html, encoding)) or not (meta or json_ld):
+        return collector.found
+    text = html.decode(encoding, errors="ignore") if isinstance(html, bytes) else html
+    if meta and collector.add_all(_meta_urls(text)):
+        return collector.found
+    if json_ld:
+        # sameAs del JSON-LD/microdata compartido (parseado una vez por página)
+        collector.add_all(extract_structured_data(html).same_as)
+    return collector.found
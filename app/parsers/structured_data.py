@@ -0,0 +1,210 @@
+# app/parsers/structured_data.py
+"""
+Datos estructurados de una página (JSON-LD + microdata) en una sola pasada.
+
+Cada bloque <script type="application/ld+json"> se localiza con una regex y
+se decodifica con json.loads una sola vez (con topes de tamaño y una
+recuperación tolerante para los bloques rotos más comunes: comentarios
+HTML, CDATA, comas finales, varios objetos seguidos). Las entidades se
+indexan por @type (incluye @graph y objetos anidados) y se sirven a todos
+los consumidores: nombre de empresa, sameAs para redes sociales, JobPosting
+para empleo, LinkedIn y el check de SEO.
+
+Acepta str o los bytes crudos del fetch: solo se decodifican los bloques.
+Memoizado por contenido. Benchmark: python -m benchmarks.structured_data
+"""
+import json
+import os
+import re
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+from ..memo import memo
+
+# Subir si cambia la salida (invalida el memo por contenido)
+STRUCTURED_DATA_VERSION = "1"
+
+MAX_JSON_LD_BLOCKS = int(os.getenv("MAX_JSON_LD_BLOCKS", "20"))
+MAX_JSON_LD_BLOCK_BYTES = int(os.getenv("MAX_JSON_LD_BLOCK_BYTES", "262144"))  # 256KB por bloque
+MAX_JSON_LD_BYTES = int(os.getenv("MAX_JSON_LD_BYTES", "1048576"))  # 1MB por página
+# Profundidad máxima al recorrer entidades anidadas
+MAX_DEPTH = 12
+
+# Tipos de schema.org que cuentan como "la empresa"
+ORGANIZATION_TYPES = frozenset({
+    "Organization", "Corporation", "LocalBusiness", "OnlineBusiness", "OnlineStore",
+    "Store", "ProfessionalService", "NGO", "EducationalOrganization", "MedicalOrganization",
+    "NewsMediaOrganization", "SportsOrganization", "GovernmentOrganization", "Airline",
+    "FinancialService", "LegalService", "Restaurant", "TravelAgency", "AutomotiveBusiness",
+})
+
+_JSON_LD = r"""<script\b[^>]*application/ld\+json[^>]*>(.*?)</script\s*>"""
+_ITEMTYPE = r"""\bitemtype\s*=\s*["']([^"']+)["']"""
+_ITEMSCOPE = r"\bitemscope\b"
+# <a>/<link>/<meta> con itemprop="sameAs" (microdata): el href/content es el perfil
+_SAME_AS_TAG = r"""<(?:a|link|meta)\b[^>]*\bitemprop\s*=\s*["']sameAs["'][^>]*>"""
+_URL_ATTR = r"""\b(?:href|content)\s*=\s*["']([^"']+)["']"""
+
+
+def _compile(pattern: str, as_bytes: bool, flags: int = re.I | re.S):
+    return re.compile(pattern.encode() if as_bytes else pattern, flags)
+
+
+# Por tipo (str/bytes): bloques JSON-LD, itemtype, itemscope, sameAs de microdata, href/content
+_PATTERNS = {
+    as_bytes: tuple(_compile(p, as_bytes) for p in (_JSON_LD, _ITEMTYPE, _ITEMSCOPE, _SAME_AS_TAG, _URL_ATTR))
+    for as_bytes in (False, True)
+}
+
+# Recuperación tolerante: envoltorios (<!-- -->, CDATA) y comas antes de } o ]
+_WRAPPER_RE = re.compile(r"<!--|-->|(?://|/\*)?\s*(?:<!\[CDATA\[|\]\]>)(?:\s*\*/)?")
+_TRAILING_COMMA_RE = re.compile(r",\s*([}\]])")
+_DECODER = json.JSONDecoder(strict=False)  # strict=False: saltos de línea crudos dentro de strings
+
+
+def _text(value: Union[str, bytes]) -> str:
+    return value.decode("utf-8", errors="replace") if isinstance(value, bytes) else value
+
+
+def loads_lenient(text: str) -> Any:
+    """json.loads del bloque; si falla, limpia los errores típicos y lee los objetos que haya seguidos."""
+    text = text.strip()
+    try:
+        return _DECODER.decode(text)
+    except ValueError:
+        pass
+    text = _TRAILING_COMMA_RE.sub(r"\1", _WRAPPER_RE.sub("", text)).strip()
+    items, pos = [], 0
+    while pos < len(text):
+        # Separadores entre objetos: espacios, ';' y ',' sueltos
+        while pos < len(text) and text[pos] in " \t\r\n;,":
+            pos += 1
+        if pos >= len(text):
+            break
+        try:
+            obj, pos = _DECODER.raw_decode(text, pos)
+        except ValueError:
+            break
+        items.append(obj)
+    if not items:
+        return None
+    return items[0] if len(items) == 1 else items
+
+
+def schema_types(entity: dict) -> List[str]:
+    """@type normalizado: "schema:Organization" / "https://schema.org/Organization" -> "Organization"."""
+    kind = entity.get("@type")
+    kinds = kind if isinstance(kind, list) else [kind]
+    return [k.rstrip("/").rsplit("/", 1)[-1].rsplit(":", 1)[-1] for k in kinds if isinstance(k, str) and k]
+
+
+def _as_urls(value) -> Iterator[str]:
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, list):
+        yield from (url for url in value if isinstance(url, str))
+
+
+class StructuredData:
+    """Entidades de la página indexadas por @type, sameAs en orden y tipos de microdata."""
+
+    def __init__(self):
+        self.blocks = 0
+        self.invalid_blocks = 0
+        self.skipped_blocks = 0  # por encima de los topes de tamaño
+        self.entities: Dict[str, List[dict]] = {}
+        self.same_as: List[str] = []
+        self.microdata_types: List[str] = []
+        self.microdata = False
+
+    @property
+    def has_structured_data(self) -> bool:
+        return bool(self.blocks or self.microdata)
+
+    @property
+    def types(self) -> List[str]:
+        return list(dict.fromkeys([*self.entities, *self.microdata_types]))
+
+    def of_type(self, *types: str) -> List[dict]:
+        """Entidades de esos tipos, en orden de aparición y sin repetir."""
+        if len(types) == 1:
+            return list(self.entities.get(types[0], ()))
+        seen, out = set(), []
+        for kind in types:
+            for entity in self.entities.get(kind, ()):
+                if id(entity) not in seen:
+                    seen.add(id(entity))
+                    out.append(entity)
+        return out
+
+    def organization(self) -> Optional[dict]:
+        """Primera Organization (o subtipo) con nombre."""
+        for entity in self.of_type(*ORGANIZATION_TYPES):
+            if isinstance(entity.get("name"), str) and entity["name"].strip():
+                return entity
+        return None
+
+    def company_name(self) -> Optional[str]:
+        org = self.organization()
+        return org["name"].strip() if org else None
+
+    def job_postings(self) -> List[dict]:
+        return self.of_type("JobPosting")
+
+    def add_block(self, data: Any) -> None:
+        for entity in self._walk(data, 0):
+            for kind in schema_types(entity):
+                bucket = self.entities.setdefault(kind, [])
+                if not bucket or bucket[-1] is not entity:
+                    bucket.append(entity)
+
+    def _walk(self, data: Any, depth: int) -> Iterator[dict]:
+        """Entidades con @type en preorden; acumula los sameAs de cualquier objeto."""
+        if depth > MAX_DEPTH:
+            return
+        if isinstance(data, list):
+            for item in data:
+                yield from self._walk(item, depth + 1)
+        elif isinstance(data, dict):
+            if "@type" in data:
+                yield data
+            self.same_as.extend(_as_urls(data.get("sameAs")))
+            for key, value in data.items():
+                if key != "sameAs" and isinstance(value, (dict, list)):
+                    yield from self._walk(value, depth + 1)
+
+
+def extract_structured_data(html: Union[str, bytes]) -> StructuredData:
+    """JSON-LD + microdata de la página, decodificados una vez y memoizados por contenido."""
+    if not html:
+        return StructuredData()
+    return memo.memoize("structured_data", STRUCTURED_DATA_VERSION, html, lambda: _extract_structured_data(html))
+
+
+def _extract_structured_data(html: Union[str, bytes]) -> StructuredData:
+    json_ld_re, itemtype_re, itemscope_re, same_as_tag_re, url_attr_re = _PATTERNS[isinstance(html, bytes)]
+    out = StructuredData()
+    budget = MAX_JSON_LD_BYTES
+    for m in json_ld_re.finditer(html):
+        size = m.end(1) - m.start(1)
+        if out.blocks + out.invalid_blocks >= MAX_JSON_LD_BLOCKS or size > MAX_JSON_LD_BLOCK_BYTES or size > budget:
+            out.skipped_blocks += 1
+            continue
+        budget -= size
+        data = loads_lenient(_text(m.group(1)))
+        if data is None:
+            out.invalid_blocks += 1
+            continue
+        out.blocks += 1
+        out.add_block(data)
+
+    # Microdata: solo tipos y sameAs (lo que usan los consumidores), sin construir el árbol
+    out.microdata = itemscope_re.search(html) is not None or itemtype_re.search(html) is not None
+    if out.microdata:
+        out.microdata_types = list(dict.fromkeys(
+            _text(t).rstrip("/").rsplit("/", 1)[-1] for t in itemtype_re.findall(html)))
+        for tag in same_as_tag_re.findall(html):
+            url = url_attr_re.search(tag)
+            if url:
+                out.same_as.append(_text(url.group(1)))
+    out.same_as = list(dict.fromkeys(url.strip() for url in out.same_as if url.strip()))
+    return out
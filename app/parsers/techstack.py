@@ -1,324 +1,279 @@
-from bs4 import BeautifulSoup
-from typing import List
-from ..schemas import TechFingerprint
-import re
-
-PATTERNS = {
-    "CMS": [
-        ("WordPress", "wp-content|wp-includes|/wp-json/|wordpress|wp_enqueue_script"),
-        ("Webflow", "webflow.css|wf-|webflow.com"),
-        ("Squarespace", "squarespace.com|sqs-"),
-        ("Wix", "wixstatic|wixsite"),
-        ("Ghost", "ghost-(sdk|content)"),
-        ("Drupal", "drupal-settings-json|/sites/default/|drupal.js"),
-        ("Joomla", "(/media/jui/|com_content)"),
-        ("Contentful", "contentful.com|cdn.contentful.com"),
-        ("Strapi", "strapi.io"),
-        ("Webflow", "assets.website-files.com"),
-        ("Sanity", "sanity.io|cdn.sanity.io"),
-        ("Prismic", "prismic.io|cdn.prismic.io"),
-        ("DatoCMS", "datocms.com"),
-        ("Craft CMS", "craft.js|craftcms"),
-    ],
-    "Page Builders": [
-        ("Elementor", "elementor|hello-elementor"),
-        ("Divi", "divi-theme|et-core"),
-        ("Beaver Builder", "fl-builder"),
-        ("Visual Composer", "js_composer|wpbakery"),
-        ("Gutenberg", "wp-block|wp-editor"),
-        ("Oxygen", "oxygen-"),
-        ("Bricks", "bricks-builder"),
-        ("Brizy", "brizy-"),
-        ("Thrive Architect", "tve_"),
-        ("Breakdance", "breakdance-"),
-    ],
-    "Ecommerce": [
-        ("Shopify", "cdn.shopify.com|/cart.js|shop_money"),
-        ("WooCommerce", "woocommerce|wc-ajax"),
-        ("BigCommerce", "cdn.bigcommerce.com"),
-        ("Magento", "mage/cookies|Magento_Cookie|var/view_preprocessed"),
-        ("PrestaShop", "prestashop"),
-        ("Vtex", "vtex.com.br|vtexcommercestable"),
-        ("Mercado Shops", "mercadoshops.com.ar"),
-        ("TiendaNube", "mitiendanube.com|tiendanube.com"),
-        ("Shopware", "shopware.com"),
-        ("Spree Commerce", "spreecommerce.org"),
-        ("nopCommerce", "nopcommerce.com"),
-        ("OpenCart", "opencart.com"),
-        ("osCommerce", "oscommerce.com"),
-    ],
-    "Payment Processors": [
-        ("Stripe", "js.stripe.com|stripe.com/v3"),
-        ("PayPal", "paypal.com/sdk|paypalobjects.com"),
-        ("Square", "squareup.com|js.squareup.com"),
-        ("Klarna", "klarna.com|js.klarna.com"),
-        ("Adyen", "adyen.com|js.adyen.com"),
-        ("Braintree", "js.braintreegateway.com"),
-        ("Razorpay", "razorpay.com"),
-        ("Mollie", "mollie.com"),
-        ("2Checkout", "2checkout.com"),
-        ("Authorize.Net", "authorize.net"),
-        ("Worldpay", "worldpay.com"),
-        ("Redsys", "redsys.es"),
-        ("Mercado Pago", "mercadopago.com"),
-    ],
-    "Analytics": [
-        ("Google Tag Manager", "GTM-|googletagmanager.com"),
-        ("Google Analytics 4", "gtag\\('config','G-|G-[A-Z0-9]{10}"),
-        ("Universal Analytics", "UA-\\d+-\\d+"),
-        ("Segment", "cdn.segment.com/analytics.js|segment.com"),
-        ("Mixpanel", "cdn.mxpnl.com|mixpanel.com"),
-        ("Amplitude", "amplitude.com|cdn.amplitude.com"),
-        ("Heap", "cdn.heapanalytics.com"),
-        ("FullStory", "fullstory.com|fs\\.js"),
-        ("Hotjar", "static.hotjar.com|hotjar"),
-        ("Adobe Analytics", "omtrdc.net|adobe.com/analytics"),
-        ("Clarity", "clarity.ms"),
-        ("Plausible", "plausible.io"),
-        ("Fathom", "cdn.usefathom.com"),
-        ("Simple Analytics", "scripts.simpleanalyticscdn.com"),
-        ("Matomo", "matomo.org|piwik.org"),
-        ("Yandex Metrica", "mc.yandex.ru"),
-    ],
-    "Marketing Automation": [
-        ("HubSpot", "js.hs-analytics.net|js.hs-scripts.com|hs-forms"),
-        ("Marketo", "munchkin.js|marketo"),
-        ("Pardot", "pi.pardot.com"),
-        ("ActiveCampaign", "activecampaign.com"),
-        ("Mailchimp", "mailchimp.com|list-manage.com"),
-        ("ConvertKit", "convertkit.com"),
-        ("Klaviyo", "klaviyo.com"),
-        ("GetResponse", "getresponse.com"),
-        ("AWeber", "aweber.com"),
-        ("Campaign Monitor", "campaignmonitor.com"),
-        ("Constant Contact", "constantcontact.com"),
-        ("MailerLite", "mailerlite.com"),
-        ("Sendinblue", "sendinblue.com"),
-        ("Drip", "d2z7bzwflv7old.cloudfront.net"),
-    ],
-    "Live Chat & Support": [
-        ("Intercom", "widget.intercom.io"),
-        ("Drift", "js.driftt.com"),
-        ("Crisp", "client.crisp.chat"),
-        ("Zendesk", "static.zdassets.com|zendesk"),
-        ("Tawk.to", "tawk.to"),
-        ("LiveChat", "livechatinc.com"),
-        ("Freshchat", "freshchat.com"),
-        ("Olark", "olark.com"),
-        ("Tidio", "tidio.co"),
-        ("Smartsupp", "smartsupp.com"),
-        ("Chaport", "chaport.com"),
-        ("Help Scout", "helpscout.net"),
-    ],
-    "CRM": [
-        ("Salesforce", "force.com|embeddedservice/"),
-        ("Zoho", "zohoforms|zohocrm"),
-        ("Freshsales", "freshsales.io"),
-        ("Pipedrive", "pipedrive.com"),
-        ("Monday.com", "monday.com"),
-        ("Airtable", "airtable.com"),
-        ("Notion", "notion.so"),
-        ("ClickUp", "clickup.com"),
-        ("Asana", "asana.com"),
-        # GoHighLevel y CRMs populares para marketing/outbound
-        ("GoHighLevel", "gohighlevel\\.com|app\\.ghl\\.com|msgsndr\\.com|[a-z0-9-]+\\.msgsndr\\.com|/widget/booking/|form_embed\\.js"),
-        ("HubSpot", "hubspot.com|hs-scripts.com|hsstatic.com|hubapi.com"),
-        ("ActiveCampaign", "activecampaign.com"),
-        ("ConvertKit", "convertkit.com"),
-        ("Mailchimp", "mailchimp.com"),
-        ("GetResponse", "getresponse.com"),
-        ("Keap", "keap.com|infusionsoft.com"),
-        ("Ontraport", "ontraport.com"),
-        ("HighLevel", "highlevel.com"),
-        ("Leadpages", "leadpages.net"),
-        ("ClickFunnels", "clickfunnels.com"),
-    ],
-    "Marketing Automation": [
-        ("Smartlead", "smartlead.ai"),
-        ("Apollo.io", "apollo.io"),
-        ("Outreach", "outreach.io"),
-        ("SalesLoft", "salesloft.com"),
-        ("Lemlist", "lemlist.com"),
-        ("Reply.io", "reply.io"),
-        ("Close.com", "close.com"),
-        ("Instantly", "instantly.ai"),
-        ("Sales Navigator", "linkedin.com/sales"),
-        ("ZoomInfo", "zoominfo.com"),
-        ("Calendly", "calendly.com"),
-        ("Acuity Scheduling", "acuityscheduling.com"),
-        ("Cal.com", "cal.com"),
-        ("Typeform", "typeform.com"),
-        ("Jotform", "jotform.com"),
-        ("Gravity Forms", "gravityforms.com"),
-    ],
-    "A/B Testing": [
-        ("Optimizely", "optimizely"),
-        ("VWO", "visualwebsiteoptimizer.com"),
-        ("Google Optimize", "googleoptimize.com"),
-        ("Unbounce", "unbounce.com"),
-        ("Kameleoon", "kameleoon.com"),
-        ("Split.io", "split.io"),
-        ("LaunchDarkly", "launchdarkly.com"),
-    ],
-    "Advertising": [
-        ("Meta Pixel", "fbevents.js|facebook.com/tr"),
-        ("LinkedIn Insight", "snap.licdn.com/li.lms-analytics"),
-        ("TikTok Pixel", "analytics.tiktok.com"),
-        ("Twitter Pixel", "static.ads-twitter.com"),
-        ("Google Ads", "googleadservices.com|google.com/ads"),
-        ("Microsoft Advertising", "clarity.ms|bing.com/ads"),
-        ("Pinterest Pixel", "s.pinimg.com"),
-        ("Snapchat Pixel", "sc-static.net"),
-        ("Amazon DSP", "amazon-adsystem.com"),
-        ("Taboola", "taboola.com"),
-        ("Outbrain", "outbrain.com"),
-        ("Criteo", "criteo.com"),
-    ],
-    "CDN & Hosting": [
-        ("Cloudflare", "cloudflare"),
-        ("Amazon CloudFront", "cloudfront.net"),
-        ("JSDelivr", "jsdelivr.net"),
-        ("UNPKG", "unpkg.com"),
-        ("KeyCDN", "keycdn.com"),
-        ("MaxCDN", "maxcdn.com"),
-        ("Fastly", "fastly.com"),
-        ("BunnyCDN", "bunnycdn.com"),
-        ("AWS", "amazonaws.com"),
-        ("Google Cloud", "gstatic.com|googleapis.com"),
-        ("Azure", "azureedge.net|azure.com"),
-        ("DigitalOcean", "digitaloceanspaces.com"),
-        ("Netlify", "netlify.com|netlify.app"),
-        ("Vercel", "vercel.app|vercel.com"),
-        ("Heroku", "herokuapp.com"),
-    ],
-    "JavaScript Frameworks": [
-        ("React", "react|_react|React"),
-        ("Vue.js", "vue.js|Vue|__VUE__"),
-        ("Angular", "angular.js|ng-|Angular"),
-        ("jQuery", "jquery|jQuery"),
-        ("Next.js", "_next/static|__NEXT_"),
-        ("Gatsby", "gatsby|__gatsby"),
-        ("Nuxt.js", "__nuxt"),
-        ("Svelte", "svelte"),
-        ("Alpine.js", "alpinejs"),
-        ("Stimulus", "stimulus"),
-        ("Ember.js", "ember"),
-        ("Backbone.js", "backbone"),
-        ("Lit", "lit-element|lit-html"),
-    ],
-    "CSS Frameworks": [
-        ("Bootstrap", "bootstrap|Bootstrap"),
-        ("Tailwind CSS", "tailwindcss|tailwind"),
-        ("Bulma", "bulma"),
-        ("Foundation", "foundation"),
-        ("Materialize", "materialize"),
-        ("Semantic UI", "semantic-ui"),
-        ("UIkit", "uikit"),
-        ("Ant Design", "antd"),
-        ("Chakra UI", "chakra-ui"),
-        ("Material-UI", "material-ui"),
-    ],
-    "Security": [
-        ("reCAPTCHA", "recaptcha|google.com/recaptcha"),
-        ("hCaptcha", "hcaptcha.com"),
-        ("Cloudflare Turnstile", "cloudflare.com/turnstile"),
-        ("Auth0", "auth0.com"),
-        ("Okta", "okta.com"),
-        ("Firebase Auth", "firebase.google.com/auth"),
-        ("Supabase Auth", "supabase.co"),
-    ],
-    "Performance": [
-        ("Lazy Loading", "loading=\"lazy\"|lazyload"),
-        ("Service Worker", "sw.js|service-worker"),
-        ("Web Vitals", "web-vitals"),
-        ("Intersection Observer", "IntersectionObserver"),
-        ("Critical CSS", "critical.css"),
-        ("Resource Hints", "dns-prefetch|preconnect|prefetch"),
-    ],
-    "Maps": [
-        ("Google Maps", "maps.googleapis.com|google.com/maps"),
-        ("Mapbox", "mapbox.com"),
-        ("OpenStreetMap", "openstreetmap.org"),
-        ("Here Maps", "here.com"),
-        ("Bing Maps", "bing.com/maps"),
-        ("MapQuest", "mapquest.com"),
-    ],
-    "Forms": [
-        ("Typeform", "typeform.com"),
-        ("JotForm", "jotform.com"),
-        ("Google Forms", "docs.google.com/forms"),
-        ("Formstack", "formstack.com"),
-        ("Wufoo", "wufoo.com"),
-        ("Gravity Forms", "gravityforms.com"),
-        ("Formidable Forms", "formidableforms.com"),
-        ("Ninja Forms", "ninjaforms.com"),
-    ],
-    "Video & Media": [
-        ("YouTube", "youtube.com|ytimg.com"),
-        ("Vimeo", "vimeo.com"),
-        ("Wistia", "wistia.com"),
-        ("JW Player", "jwplayer.com"),
-        ("Video.js", "videojs.com"),
-        ("Brightcove", "brightcove.com"),
-        ("Kaltura", "kaltura.com"),
-        ("Cloudinary", "cloudinary.com"),
-        ("ImageKit", "imagekit.io"),
-    ],
-    "Email Services": [
-        ("SendGrid", "sendgrid.com"),
-        ("Mailgun", "mailgun.com"),
-        ("Amazon SES", "amazonses.com"),
-        ("Postmark", "postmarkapp.com"),
-        ("SparkPost", "sparkpost.com"),
-        ("Mandrill", "mandrill.com"),
-    ],
-    "Social Media": [
-        ("Facebook SDK", "connect.facebook.net"),
-        ("Twitter Widgets", "platform.twitter.com"),
-        ("LinkedIn SDK", "platform.linkedin.com"),
-        ("Instagram", "instagram.com"),
-        ("Pinterest", "assets.pinterest.com"),
-        ("ShareThis", "sharethis.com"),
-        ("AddThis", "addthis.com"),
-    ],
-}
-
-def detect_tech(domain: str, html: str) -> List[dict]:
-    """
-    Detect technologies and group them by category.
-    Returns list of dict with category and tech data.
-    """
-    if not html: 
-        return []
-    
-    # Limitar HTML para performance (máximo 1MB)
-    hay = html if len(html) < 1_000_000 else html[:1_000_000]
-    
-    # Group findings by category
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+from ..fingerprint import CostProfile
+from ..fingerprint_db import get_db, headers_text
+from .data_islands import IslandFilter, strip_islands
+import os
+import random
+
+# Los fingerprints viven en app/data/fingerprints.json (ver app/fingerprint_db.py):
+# validados, precompilados en snapshot y recargables en caliente.
+
+# Tope de caracteres analizados por página (mismo que detect_tech)
+MAX_SCAN_CHARS = 1_000_000
+
+# Perfilado de coste por fingerprint sobre tráfico real: fracción de páginas
+# muestreadas (0 = apagado, 0.01 = 1%). Ranking en GET /fingerprints/profile
+PROFILE_SAMPLE_RATE = float(os.getenv("TECH_PROFILE_SAMPLE", "0"))
+tech_profile = CostProfile()
+
+# Categorías de "una sola respuesta": si las cabeceras ya las resuelven,
+# el escaneo del cuerpo las omite
+HEADER_RESOLVED_CATEGORIES = ("CMS", "Ecommerce", "CDN & Hosting", "Web Servers")
+
+
+def _group_by_category(found: Iterable[Tuple[str, str, str]]) -> List[dict]:
+    """(categoría, tool, evidencia) -> [{"category", "tools", "evidence"}, ...]"""
     found_by_category = {}
-    
-    for cat, pairs in PATTERNS.items():
-        for tool, pattern in pairs:
-            if re.search(pattern, hay, re.I):
-                if cat not in found_by_category:
-                    found_by_category[cat] = {
-                        "tools": [],
-                        "evidence": []
-                    }
-                found_by_category[cat]["tools"].append(tool)
-                found_by_category[cat]["evidence"].append(pattern)
-    
+    for cat, tool, evidence in found:
+        if cat not in found_by_category:
+            found_by_category[cat] = {
+                "tools": [],
+                "evidence": []
+            }
+        found_by_category[cat]["tools"].append(tool)
+        found_by_category[cat]["evidence"].append(evidence)
+
     # Convert to list of dicts with category info
     result = []
     for category, data in found_by_category.items():
         # Remove duplicates from tools
         unique_tools = list(dict.fromkeys(data["tools"]))
         evidence = " | ".join(data["evidence"][:3])  # Limit evidence for readability
-        
+
         result.append({
             "category": category,
             "tools": unique_tools,
             "evidence": evidence
         })
-    
+
     return result
+
+
+def _sampled_profile() -> Optional[CostProfile]:
+    if PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE:
+        return tech_profile
+    return None
+
+
+def detect_tech(domain: str, html: Union[str, bytes], skip_categories: Optional[Iterable[str]] = None,
+                profile: Optional[CostProfile] = None) -> List[dict]:
+    """
+    Detect technologies and group them by category.
+    Returns list of dict with category and tech data.
+    `skip_categories` omite categorías ya resueltas (p.ej. por cabeceras).
+    `profile` registra el coste de cada fingerprint (si no, se muestrea según TECH_PROFILE_SAMPLE).
+    """
+    if not html:
+        return []
+
+    # Sin el contenido de las data islands (__NEXT_DATA__...): JSON de la app, no fingerprints
+    html = strip_islands(html)
+    # Limitar HTML para performance (máximo 1MB)
+    hay = html if len(html) < MAX_SCAN_CHARS else html[:MAX_SCAN_CHARS]
+
+    db = get_db()
+    skip_categories = tuple(sorted(skip_categories)) if skip_categories else ()
+    return _detect_tech(db, hay, skip_categories, profile if profile is not None else _sampled_profile())
+
+
+def _detect_tech(db, hay: Union[str, bytes], skip_categories: Tuple[str, ...],
+                 profile: Optional[CostProfile]) -> List[dict]:
+    engine = db.engine
+    skip = db.indices_for(skip_categories) if skip_categories else None
+    matched = engine.scan(hay, skip, profile=profile)
+    return _group_by_category((*engine.keys[idx], engine.patterns[idx]) for idx in matched)
+
+
+def _header_matches(db, headers: Dict[str, str], cookies: List[str]) -> List[Tuple[str, str, str]]:
+    """(categoría, tool, evidencia) encontrados en cabeceras, cookies y URLs de `Link`."""
+    if not headers and not cookies:
+        return []
+    found = [
+        (*db.header_engine.keys[idx], db.header_evidence[idx])
+        for idx in db.header_engine.scan(headers_text(headers or {}, cookies or []))
+    ]
+    # Link: <https://cdn.shopify.com/...>; rel=preload -> mismos fingerprints que el HTML
+    link = (headers or {}).get("link")
+    if link:
+        found.extend(
+            (*db.engine.keys[idx], f"link: {db.engine.patterns[idx]}") for idx in db.engine.scan(link)
+        )
+    return found
+
+
+def detect_tech_from_headers(headers: Dict[str, str], cookies: List[str]) -> List[dict]:
+    """
+    Detecta tecnologías solo con la respuesta HTTP (sirve con un HEAD):
+    reglas de cabeceras/cookies + patrones de cuerpo sobre las URLs de `Link`.
+    """
+    return _group_by_category(_header_matches(get_db(), headers, cookies))
+
+
+def resolved_categories(tech: List[dict]) -> List[str]:
+    """Categorías de HEADER_RESOLVED_CATEGORIES que ya tienen alguna herramienta."""
+    return [t["category"] for t in tech if t["category"] in HEADER_RESOLVED_CATEGORIES and t["tools"]]
+
+
+class TechDetector:
+    """
+    Detección incremental a lo largo de las páginas de un escaneo.
+
+    Conserva lo ya encontrado: cada página nueva solo evalúa fingerprints aún
+    no matcheados y fuera de las categorías resueltas por cabeceras. Con
+    `target_categories` (p.ej. CRM, Marketing Automation) indica cuándo ya
+    están todas cubiertas para cortar el crawl.
+    """
+
+    def __init__(self, target_categories: Iterable[str] = ()):
+        self.db = get_db()  # misma versión de fingerprints durante todo el escaneo
+        self.target_categories = tuple(target_categories)
+        self._matched: set = set()
+        self._resolved: set = set()
+        self._found: List[Tuple[str, str, str]] = []
+        self._seen_keys: set = set()
+        # eligible/saved: fingerprints pendientes y ya resueltos al empezar cada página (no
+        # cuánto se evaluó); lo que el motor confirmó de verdad, en *_confirmations
+        self.stats = {
+            "pages_scanned": 0,
+            "fingerprints_eligible": 0,
+            "evaluations_saved": 0,
+            "literal_confirmations": 0,
+            "regex_confirmations": 0,
+        }
+
+    def _add(self, category: str, tool: str, evidence: str) -> None:
+        if (category, tool) not in self._seen_keys:
+            self._seen_keys.add((category, tool))
+            self._found.append((category, tool, evidence))
+
+    def add_headers(self, headers: Dict[str, str], cookies: List[str]) -> None:
+        """Cabeceras/cookies de una respuesta; resuelve categorías de una sola respuesta."""
+        found = _header_matches(self.db, headers, cookies)
+        for category, tool, evidence in found:
+            self._add(category, tool, evidence)
+        newly_resolved = {
+            cat for cat, _, _ in found if cat in HEADER_RESOLVED_CATEGORIES
+        } - self._resolved
+        if newly_resolved:
+            self._resolved |= newly_resolved
+            self._matched |= self.db.indices_for(newly_resolved)
+
+    def add_matches(self, found: Iterable[Tuple[str, str, str]]) -> None:
+        """(categoría, tool, evidencia) obtenidos fuera de la página (p.ej. scripts de terceros)."""
+        for category, tool, evidence in found:
+            self._add(category, tool, evidence)
+
+    def add_page(self, html: Union[str, bytes]) -> None:
+        """
+        Escanea una página completa evaluando solo los fingerprints pendientes.
+        Acepta el html o los bytes crudos del fetch (FetchedPage.body).
+        """
+        if not html:
+            return
+        html = strip_islands(html)
+        page = TechPageStream(self)
+        page.feed(html)
+        page.close(html)
+
+    def stream_page(self, may_stop: bool = True) -> IslandFilter:
+        """
+        Sink para fetch_page: detecta mientras la página se descarga (sin el blob de las data islands).
+        `may_stop=False` para páginas cuyo cuerpo usan otros extractores (la home y el crawl del
+        escaneo): se leen enteras aunque las categorías objetivo ya estén cubiertas.
+        """
+        return IslandFilter(TechPageStream(self, may_stop=may_stop))
+
+    def _count_page(self) -> None:
+        skip = len(self._matched)
+        self.stats["pages_scanned"] += 1
+        self.stats["fingerprints_eligible"] += len(self.db.engine) - skip
+        self.stats["evaluations_saved"] += skip
+
+    def _record(self, indices: Iterable[int]) -> None:
+        engine = self.db.engine
+        for idx in indices:
+            self._matched.add(idx)
+            self._add(*engine.keys[idx], engine.patterns[idx])
+
+    def targets_filled(self) -> bool:
+        """True si todas las categorías objetivo tienen al menos una herramienta."""
+        if not self.target_categories:
+            return False
+        categories = {cat for cat, _, _ in self._found}
+        return all(cat in categories for cat in self.target_categories)
+
+    def all_resolved(self) -> bool:
+        """True si ya no queda ningún fingerprint de cuerpo por evaluar."""
+        return len(self._matched) >= len(self.db.engine)
+
+    def results(self) -> List[dict]:
+        return _group_by_category(self._found)
+
+
+class TechPageStream:
+    """
+    Una página de un TechDetector procesada por trozos (sink de fetch_page),
+    en bytes crudos o str según el charset.
+
+    Los fingerprints se confirman según llegan los bytes, así la detección
+    termina junto con la descarga. Con las categorías objetivo cubiertas deja
+    de escanear; `feed` devuelve entonces True para dejar de leer el resto del
+    cuerpo, salvo con `may_stop=False` (páginas que usan otros extractores).
+    """
+
+    def __init__(self, detector: TechDetector, may_stop: bool = True):
+        self.detector = detector
+        self.may_stop = may_stop
+        self._scan = None
+        self._chars = 0
+
+    def headers(self, headers: Dict[str, str], cookies: List[str]) -> None:
+        self.detector.add_headers(headers, cookies)
+
+    def feed(self, text: Union[str, bytes]) -> bool:
+        detector = self.detector
+        if detector.targets_filled():
+            # Objetivos cubiertos: no se escanea más (el cuerpo sigue llegando con may_stop=False)
+            return self.may_stop
+        if text and self._chars < MAX_SCAN_CHARS:
+            text = text[:MAX_SCAN_CHARS - self._chars]
+            self._chars += len(text)
+            if self._scan is None:
+                detector._count_page()
+                # `_matched` es el set vivo: lo confirmado en otras páginas se salta
+                self._scan = detector.db.engine.stream(detector._matched, detector.stats, _sampled_profile())
+            detector._record(self._scan.feed(text))
+        return self.may_stop and detector.targets_filled()
+
+    def close(self, html: Union[str, bytes, None] = None) -> None:
+        if self._scan is not None:
+            self.detector._record(self._scan.finish(html[:MAX_SCAN_CHARS] if html else None))
+            self._scan = None
+
+
+if __name__ == "__main__":
+    # Perfilado sobre un corpus: python -m app.parsers.techstack pagina.html|carpeta/ ... [--top 20] [--sort time]
+    import argparse
+    import json
+    from pathlib import Path
+
+    parser = argparse.ArgumentParser(description="Coste por fingerprint sobre un corpus de HTML")
+    parser.add_argument("paths", nargs="+")
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--sort", default="time", choices=["time", "evaluations", "bytes", "per_eval"])
+    args = parser.parse_args()
+
+    files = []
+    for path in map(Path, args.paths):
+        files.extend(sorted(p for p in path.rglob("*") if p.is_file()) if path.is_dir() else [path])
+    profile = CostProfile()
+    for path in files:
+        detect_tech("", path.read_bytes(), profile=profile)
+    report = profile.report(top=args.top, sort=args.sort)
+    print(f"📄 {report['documents']} documentos | literales: {report['literal_pass']['time_ms']}ms | "
+          f"regex: {report['regex_time_ms']}ms")
+    for row in report["fingerprints"]:
+        print(f"{row['time_ms']:>9.3f}ms {row['evaluations']:>6} evals {row['us_per_eval']:>9.2f}us/eval "
+              f"hit {row['hit_rate']:>5.2f}  {' / '.join(row['key'])}: {row['pattern'][:70]}")
+    if not report["fingerprints"]:
+        print(json.dumps(report, indent=1))
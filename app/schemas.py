@@ -14,6 +14,14 @@ class ScanRequest(BaseModel):
     include_feeds: bool = False
     timeout_sec: int = 10
     return_evidence: bool = True
+    # Cortar el crawl cuando estas categorías de tech ya tienen herramientas (p.ej. ["CRM", "Marketing Automation"])
+    tech_targets: List[str] = []
+    # Descargar un prefijo de los scripts de terceros y buscar fingerprints dentro (cacheado entre dominios)
+    scan_scripts: bool = False
+    # Página de empresa de LinkedIn (company_linkedin o la detectada en el home); cacheada por slug
+    include_linkedin: bool = False
+    # Página de empleo + boards de ATS (Greenhouse, Lever, Ashby); careers_overrides lo implica
+    include_jobs: bool = False
 
     company_linkedin: Optional[AnyHttpUrl] = None
     company_name: Optional[str] = None
@@ -65,10 +73,20 @@ class TechFingerprint(BaseModel):
 # -------- GTM Intelligence (NEW)
 
 class LinkedInInfo(BaseModel):
+    url: Optional[str] = None
+    slug: Optional[str] = None
+    name: Optional[str] = None
     employee_count: Optional[int] = None
+    employee_range: Optional[str] = None  # "Company size" tal cual, p.ej. "201-500"
+    employees_on_linkedin: Optional[int] = None
     description: Optional[str] = None
     linkedin_industry: Optional[str] = None
     company_size_segment: Optional[str] = None
+    headquarters: Optional[str] = None
+    founded_year: Optional[int] = None
+    website: Optional[str] = None
+    organization_type: Optional[str] = None
+    followers: Optional[int] = None
 
 class GrowthSignals(BaseModel):
     funding_signals: List[str] = []
@@ -83,10 +101,23 @@ class CompanyMaturity(BaseModel):
     level: str = "Unknown"  # Early Startup, Scale-up, Established, Public Company
     indicators: List[str] = []
 
+class SiteSEOMetrics(BaseModel):
+    """SEO agregado de todas las páginas analizadas (home + crawl)."""
+    pages_analyzed: int = 0
+    pages_missing_title: int = 0
+    pages_missing_meta_description: int = 0
+    pages_without_h1: int = 0
+    pages_with_multiple_h1: int = 0
+    pages_with_structured_data: int = 0
+    image_alt_missing: int = 0  # Total de imágenes sin alt en todas las páginas
+    avg_page_size_kb: Optional[float] = None
+    max_page_size_kb: Optional[float] = None
+
 class SEOMetrics(BaseModel):
     meta_title_length: Optional[int] = None
     meta_description_length: Optional[int] = None
     has_structured_data: bool = False
+    structured_data_types: Optional[List[str]] = None  # @type del JSON-LD / itemtype de microdata
     has_sitemap_link: bool = False
     page_load_time_ms: Optional[int] = None  # Page load time in milliseconds
     h1_count: Optional[int] = None
@@ -95,6 +126,7 @@ class SEOMetrics(BaseModel):
     internal_links_count: Optional[int] = None
     external_links_count: Optional[int] = None
     page_size_kb: Optional[float] = None  # Page size in KB
+    site: Optional[SiteSEOMetrics] = None  # Agregado de todas las páginas crawleadas
 
 # -------- Enrichment Data (NEW)
 
@@ -132,6 +164,33 @@ class NewsItem(BaseModel):
     body: str
     url: AnyHttpUrl
 
+# -------- Jobs (página de empleo + boards de ATS)
+
+class JobPosting(BaseModel):
+    title: str
+    location: Optional[str] = None
+    employment_type: Optional[str] = None
+    department: Optional[str] = None
+    date_posted: Optional[str] = None
+    valid_through: Optional[str] = None
+    apply_url: Optional[str] = None
+    platform_hint: Optional[str] = None  # greenhouse, lever, ashby...
+    source_url: Optional[str] = None
+
+class JobsSignalsSummary(BaseModel):
+    jobs_count: int = 0
+    hiring_volume: str = "none"  # none | low (1-3) | medium (4-10) | high (>10)
+    careers_url: Optional[str] = None
+    ats_boards: List[str] = []  # "greenhouse:acme"
+    hiring_focus: List[str] = []
+    seniority_mix: Dict[str, int] = {}
+    functions_count: Dict[str, int] = {}
+    platforms: Dict[str, int] = {}
+    score: float = 0.0
+    tags: List[str] = []
+    freshness_days_p50: Optional[int] = None
+    jobs: List[JobPosting] = []  # Muestra de las ofertas (no todas)
+
 # -------- Output
 
 class ScanResponse(BaseModel):
@@ -151,6 +210,9 @@ class ScanResponse(BaseModel):
     # Optional internal data (shown conditionally)
     pages_crawled: List[str] = []
     recent_news: List[NewsItem] = []  # Only 3 most recent news
+    jobs: Optional[JobsSignalsSummary] = None  # Ofertas de la página de empleo y boards de ATS
+    linkedin: Optional[LinkedInInfo] = None  # Página de empresa de LinkedIn (include_linkedin)
+    scan_stats: Optional[Dict[str, Any]] = None  # Contadores internos del escaneo (tech, cachés...)
 
 
 class BatchScanResponse(BaseModel):
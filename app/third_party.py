@@ -0,0 +1,231 @@
+# app/third_party.py
+"""
+Fingerprints dentro de scripts de terceros.
+
+Herramientas como Intercom, HubSpot o los formularios de GoHighLevel solo se
+delatan dentro de sus bundles JS. Esta etapa (opcional, `scan_scripts`)
+descarga un prefijo acotado de los <script src> externos de la página, les
+pasa el mismo motor de fingerprints del cuerpo y cachea el resultado por URL
+para todo el proceso: los mismos bundles de CDN se repiten en miles de sitios.
+
+Cuando varias URLs distintas de un host del propio proveedor dan siempre el
+mismo resultado (p.ej. js.intercomcdn.com/<app_id>.js), el host entero queda
+resuelto y sus scripts ya no se descargan. Solo cuentan hosts que delatan a
+la herramienta por sí mismos: los CDN públicos (cdnjs, jsDelivr, unpkg...)
+sirven cualquier librería y se cachean solo por URL, igual que los
+resultados vacíos.
+"""
+import os
+import re
+import time
+import asyncio
+from typing import Dict, List, Optional, Tuple, Union
+from urllib.parse import parse_qsl, urlencode, urljoin, urlparse
+
+from .fetch import _client, fetch_page
+from .fingerprint_db import get_db
+from .util import domain_of
+
+SCRIPT_PREFIX_BYTES = int(os.getenv("SCRIPT_PREFIX_BYTES", "65536"))  # 64KB por script
+MAX_SCRIPTS_PER_PAGE = int(os.getenv("MAX_SCRIPTS_PER_PAGE", "6"))
+SCRIPT_TIMEOUT = float(os.getenv("SCRIPT_TIMEOUT", "3"))
+SCRIPT_CACHE_SIZE = int(os.getenv("SCRIPT_CACHE_SIZE", "5000"))
+SCRIPT_CACHE_TTL = float(os.getenv("SCRIPT_CACHE_TTL", "86400"))  # 24h
+# URLs distintas con el mismo resultado para dar el host por resuelto
+HOST_PROMOTE_AFTER = 3
+# CDN públicos: cualquier librería puede salir de ellos, nunca se resuelven por host
+SHARED_SCRIPT_HOSTS = frozenset({
+    "cdnjs.cloudflare.com", "cdn.jsdelivr.net", "fastly.jsdelivr.net", "unpkg.com", "ajax.googleapis.com",
+    "code.jquery.com", "stackpath.bootstrapcdn.com", "maxcdn.bootstrapcdn.com", "cdn.skypack.dev", "esm.sh",
+})
+
+# Parámetros de query que solo invalidan la cache del navegador
+CACHE_BUSTING_PARAMS = frozenset({"v", "ver", "version", "_", "t", "ts", "cb", "cachebuster", "rev", "build", "hash"})
+# Query "desnuda" de cache-busting: hash hex o timestamp (app.js?3f9a2c, app.js?1700000000)
+_BUST_VALUE_RE = re.compile(r"[0-9a-f]{6,}|\d+", re.I)
+
+_SCRIPT_SRC = r"""<script\b[^>]*?\bsrc\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'>]+))"""
+_SCRIPT_SRC_RE = re.compile(_SCRIPT_SRC, re.I)
+_SCRIPT_SRC_RE_B = re.compile(_SCRIPT_SRC.encode(), re.I)
+
+ToolKey = Tuple[str, str]  # (categoría, tool)
+
+
+def script_urls(base_url: str, html: Union[str, bytes]) -> List[str]:
+    """URLs absolutas de los <script src> de terceros, en orden y sin repetir."""
+    if not html:
+        return []
+    regex = _SCRIPT_SRC_RE_B if isinstance(html, bytes) else _SCRIPT_SRC_RE
+    own = domain_of(base_url)
+    urls: List[str] = []
+    for m in regex.finditer(html):
+        src = next((g for g in m.groups() if g), None)
+        if src is None:
+            continue
+        if isinstance(src, bytes):
+            src = src.decode("utf-8", errors="ignore")
+        url = urljoin(base_url, src.strip())
+        if not url.startswith(("http://", "https://")) or url in urls:
+            continue
+        if domain_of(url) == own:
+            continue  # los bundles propios ya los cubre el crawl
+        urls.append(url)
+    return urls
+
+
+def _url_key(url: str) -> str:
+    """
+    host + path + query sin los parámetros de cache-busting (?ver=1.2, ?v=hash,
+    ?_=1700000000, ?3f9a2c). El resto se conserva: ?id=GTM-XXX o ?account=
+    eligen el script de cada sitio.
+    """
+    parsed = urlparse(url)
+    params = sorted(
+        (name, value) for name, value in parse_qsl(parsed.query, keep_blank_values=True)
+        if name.lower() not in CACHE_BUSTING_PARAMS and not (not value and _BUST_VALUE_RE.fullmatch(name))
+    )
+    key = f"{parsed.netloc.lower()}{parsed.path}"
+    return f"{key}?{urlencode(params)}" if params else key
+
+
+def _name_key(name: str) -> str:
+    return re.sub(r"[^a-z0-9]", "", name.lower())
+
+
+def vendor_host(host: str, tools: Tuple[ToolKey, ...], engine) -> bool:
+    """
+    True si el host es del proveedor de `tools`: cada tool sale de una regla que
+    matchea el propio host (js.hs-scripts.com -> HubSpot) o su nombre está en el
+    dominio (js.intercomcdn.com -> Intercom). Nunca para resultados vacíos ni CDN públicos.
+    """
+    if not tools or host in SHARED_SCRIPT_HOSTS:
+        return False
+    own = {engine.keys[idx] for idx in engine.scan(host)}
+    label = _name_key(domain_of(f"https://{host}").split(".")[0])
+    for tool in tools:
+        name = _name_key(tool[1])
+        if tool not in own and not (len(name) >= 4 and name in label):
+            return False
+    return True
+
+
+class ScriptCache:
+    """
+    Resultados de fingerprints por script, compartidos entre dominios.
+    Guarda el hash del JSON de la base (el "version" del archivo no cambia en
+    cada edición): tras una recarga los resultados viejos cuentan como miss.
+    """
+
+    def __init__(self, max_size: int = SCRIPT_CACHE_SIZE, ttl: float = SCRIPT_CACHE_TTL):
+        self.max_size = max_size
+        self.ttl = ttl
+        # clave -> (timestamp, hash de la base, tools, bytes del prefijo)
+        self._urls: Dict[str, Tuple[float, str, Tuple[ToolKey, ...], int]] = {}
+        # host -> (timestamp, hash de la base, tools, bytes, URLs coincidentes)
+        self._hosts: Dict[str, Tuple[float, str, Tuple[ToolKey, ...], int, int]] = {}
+        self.stats = {"lookups": 0, "url_hits": 0, "host_hits": 0, "misses": 0,
+                      "fetched": 0, "bytes_fetched": 0, "bytes_saved": 0}
+
+    def _fresh(self, entry, version: str) -> bool:
+        return entry is not None and entry[1] == version and time.time() - entry[0] < self.ttl
+
+    def get(self, url: str, version: str) -> Optional[Tuple[ToolKey, ...]]:
+        self.stats["lookups"] += 1
+        entry = self._urls.get(_url_key(url))
+        if self._fresh(entry, version):
+            self.stats["url_hits"] += 1
+            self.stats["bytes_saved"] += entry[3]
+            return entry[2]
+        host = self._hosts.get(urlparse(url).netloc.lower())
+        if self._fresh(host, version) and host[4] >= HOST_PROMOTE_AFTER:
+            self.stats["host_hits"] += 1
+            self.stats["bytes_saved"] += host[3]
+            return host[2]
+        self.stats["misses"] += 1
+        return None
+
+    def put(self, url: str, version: str, tools: Tuple[ToolKey, ...], size: int,
+            vendor: bool = False) -> None:
+        """`vendor`: el host es del proveedor (vendor_host); solo entonces cuenta para resolver el host."""
+        self.stats["fetched"] += 1
+        self.stats["bytes_fetched"] += size
+        now = time.time()
+        self._store(self._urls, _url_key(url), (now, version, tools, size))
+        host_key = urlparse(url).netloc.lower()
+        if not vendor or not tools:
+            self._hosts.pop(host_key, None)  # un resultado distinto rompe la racha
+            return
+        host = self._hosts.get(host_key)
+        same = self._fresh(host, version) and host[2] == tools
+        self._store(self._hosts, host_key, (now, version, tools, size, host[4] + 1 if same else 1))
+
+    def _store(self, cache: dict, key: str, entry: tuple) -> None:
+        if key not in cache and len(cache) >= self.max_size:
+            cache.pop(next(iter(cache)))  # FIFO, como _domain_cache
+        cache[key] = entry
+
+    def info(self) -> dict:
+        served = self.stats["url_hits"] + self.stats["host_hits"]
+        lookups = self.stats["lookups"]
+        return {
+            **self.stats,
+            "hit_ratio": round(served / lookups, 3) if lookups else 0.0,
+            "urls_cached": len(self._urls),
+            "hosts_resolved": sum(1 for h in self._hosts.values() if h[4] >= HOST_PROMOTE_AFTER),
+        }
+
+
+script_cache = ScriptCache()
+
+
+async def fingerprint_scripts(
+    base_url: str,
+    html: Union[str, bytes],
+    max_scripts: int = MAX_SCRIPTS_PER_PAGE,
+) -> Tuple[List[Tuple[str, str, str]], Dict[str, int]]:
+    """
+    Devuelve ([(categoría, tool, evidencia)], stats del escaneo) para los
+    scripts de terceros de la página. Los scripts cuya URL ya matchea un
+    fingerprint se omiten: el HTML ya los delató.
+    """
+    db = get_db()
+    engine = db.engine
+    found: List[Tuple[str, str, str]] = []
+    stats = {"scripts": 0, "cache_hits": 0, "fetched": 0, "bytes_fetched": 0, "bytes_saved": 0}
+
+    pending: List[str] = []
+    for url in script_urls(base_url, html):
+        if engine.scan(url):
+            continue
+        if len(pending) + stats["cache_hits"] >= max_scripts:
+            break
+        stats["scripts"] += 1
+        saved_before = script_cache.stats["bytes_saved"]
+        tools = script_cache.get(url, db.source_hash)
+        if tools is None:
+            pending.append(url)
+            continue
+        stats["cache_hits"] += 1
+        stats["bytes_saved"] += script_cache.stats["bytes_saved"] - saved_before
+        host = urlparse(url).netloc
+        found.extend((cat, tool, f"script {host}") for cat, tool in tools)
+
+    if pending:
+        async with _client() as client:
+            pages = await asyncio.gather(*(
+                fetch_page(client, u, respect_robots=False, timeout=SCRIPT_TIMEOUT, byte_cap=SCRIPT_PREFIX_BYTES)
+                for u in pending
+            ))
+        for page in pages:
+            content = page.body if page.body is not None else page.html
+            if not content:
+                continue  # los fallos no se cachean: se reintentan en otro escaneo
+            tools = tuple(dict.fromkeys(engine.keys[idx] for idx in engine.scan(content)))
+            host = urlparse(page.url).netloc
+            script_cache.put(page.url, db.source_hash, tools, len(content),
+                             vendor=vendor_host(host.lower(), tools, engine))
+            stats["fetched"] += 1
+            stats["bytes_fetched"] += len(content)
+            found.extend((cat, tool, f"script {host}") for cat, tool in tools)
+
+    return found, stats
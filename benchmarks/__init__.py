@@ -0,0 +1,5 @@
+# benchmarks/__init__.py
+"""
+Benchmarks de los extractores contra su implementación anterior.
+No forman parte de la app ni de los tests: python -m benchmarks.<módulo>
+"""
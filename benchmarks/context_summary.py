@@ -0,0 +1,72 @@
+# benchmarks/context_summary.py
+"""Selectores en una pasada de lxml vs BeautifulSoup + select_one: python -m benchmarks.context_summary"""
+import time
+from typing import Optional
+
+from bs4 import BeautifulSoup
+
+from app.parsers.context_summary import (
+    ABOUT_SELECTORS,
+    HERO_SELECTORS,
+    _build_summary_from_sentences,
+    _clean_and_truncate,
+    _description,
+    _is_good_paragraph,
+    _is_navigation_text,
+    _split_into_sentences,
+    extract_context_summary,
+)
+
+
+def legacy(html: str, company_name: str = "", max_length: int = 200) -> Optional[str]:
+    """Implementación anterior: BeautifulSoup + un select_one por selector + get_text del documento."""
+    soup = BeautifulSoup(html, 'lxml')
+    for attrs in ({'name': 'description'}, {'property': 'og:description'}):
+        meta = soup.find('meta', attrs=attrs)
+        if meta:
+            cleaned = _description(meta.get('content', ''), max_length)
+            if cleaned:
+                return cleaned
+    for selector in ABOUT_SELECTORS + HERO_SELECTORS:
+        section = soup.select_one(selector)
+        if section:
+            text = section.get_text(separator=' ', strip=True)
+            if text and len(text) > 30:
+                summary = _build_summary_from_sentences(_split_into_sentences(text), max_length)
+                if summary:
+                    return summary
+    for p in soup.find_all('p'):
+        text = p.get_text(strip=True)
+        if _is_good_paragraph(text):
+            return _clean_and_truncate(text, max_length)
+    all_text = soup.get_text(separator=' ', strip=True)
+    for sentence in _split_into_sentences(all_text)[:10]:
+        if (len(sentence) > 40 and
+                (company_name.lower() in sentence.lower() if company_name else True) and
+                not _is_navigation_text(sentence)):
+            return _clean_and_truncate(sentence, max_length)
+    return None
+
+
+def main() -> None:
+    long = "Acme diseña y fabrica maquinaria industrial para el sector agroalimentario desde 1985"
+    # Página grande sin meta description: hay que llegar a los selectores
+    page = (
+        "<html><head><title>Acme</title></head><body><nav>"
+        + "".join(f'<li class="item"><a href="/productos/{i}">Producto {i}</a><span>Desde {i} €</span></li>' for i in range(4000))
+        + f'</nav><main><section class="intro-block"><p>{long}. Fábricas en España y México.</p></section></main></body></html>'
+    )
+    with_meta = page.replace("<title>Acme</title>", f'<meta name="description" content="{long}">')
+    runs = 5
+    for label, doc in (("sin meta", page), ("con meta", with_meta)):
+        for name, fn in (("BeautifulSoup", legacy), ("una pasada", extract_context_summary)):
+            result = fn(doc)
+            started = time.perf_counter()
+            for _ in range(runs):
+                fn(doc)
+            elapsed = (time.perf_counter() - started) / runs
+            print(f"⚡ {label} {name:>13}: {elapsed * 1000:7.1f} ms/página ({len(doc) // 1024} KB) -> {result!r:.50}")
+
+
+if __name__ == "__main__":
+    main()
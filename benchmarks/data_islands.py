@@ -0,0 +1,43 @@
+# benchmarks/data_islands.py
+"""Tech con y sin el blob de __NEXT_DATA__ y coste de leer la island: python -m benchmarks.data_islands"""
+import json
+import time
+
+from app.fingerprint_db import get_engine
+from app.memo import memo
+from app.parsers.data_islands import _extract_island_content, find_islands, island_stats, strip_islands
+
+
+def main() -> None:
+    memo.max_size = 0  # medir el trabajo real
+    # Página Next.js de ~1MB: casi todo es el blob (catálogo en pageProps)
+    catalog = {"props": {"pageProps": {
+        "page": {"title": "Acme Store", "description": "Tienda online de material de oficina y papelería para empresas."},
+        "products": [{"id": i, "name": f"Producto {i}", "slug": f"/p/{i}", "sku": f"SKU-{i:06d}",
+                      "attributes": {"color": "azul", "size": "M", "tags": ["oficina", "papel"]},
+                      "price": {"amount": i * 1.5, "currency": "EUR"}} for i in range(6000)]}}}
+    page = ('<html><head><title>Acme Store</title><script src="/_next/static/chunks/main.js"></script></head>'
+            '<body><div id="__next"><h1>Acme Store</h1></div>'
+            '<script id="__NEXT_DATA__" type="application/json">' + json.dumps(catalog) + '</script></body></html>')
+
+    engine = get_engine()
+
+    def tech(doc: str):
+        # Motor de fingerprints sobre el documento tal cual (detect_tech ya quita el blob)
+        return sorted(engine.keys[idx][1] for idx in engine.scan(doc))
+
+    runs = 5
+    for name, fn in (("tech (con blob)", lambda: tech(page)),
+                     ("tech (sin blob)", lambda: tech(strip_islands(page))),
+                     ("islands", lambda: _extract_island_content(page, find_islands(page)))):
+        result = fn()
+        started = time.perf_counter()
+        for _ in range(runs):
+            fn()
+        elapsed = (time.perf_counter() - started) / runs
+        summary = island_stats(result) if isinstance(result, dict) else result
+        print(f"⚡ {name:>15}: {elapsed * 1000:7.1f} ms/página ({len(page) // 1024} KB) -> {summary}")
+
+
+if __name__ == "__main__":
+    main()
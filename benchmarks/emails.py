@@ -0,0 +1,51 @@
+# benchmarks/emails.py
+"""Pasada anclada vs las dos regex sin ancla anteriores: python -m benchmarks.emails [pagina.html]"""
+import re
+import sys
+import time
+from typing import List, Union
+
+from app.parsers.emails import MAILTO_RE, PLAIN_RE, _extract_emails
+
+MAILTO_RE_B = re.compile(MAILTO_RE.pattern.encode(), re.I)
+PLAIN_RE_B = re.compile(PLAIN_RE.pattern.encode(), re.I)
+
+
+def legacy(html: Union[str, bytes], cap: int = 300_000) -> List[str]:
+    """Implementación anterior: dos regex sin ancla sobre los primeros 300KB."""
+    if len(html) > cap:
+        html = html[:cap]
+    mailto_re, plain_re = (MAILTO_RE_B, PLAIN_RE_B) if isinstance(html, bytes) else (MAILTO_RE, PLAIN_RE)
+    out = set()
+    for m in mailto_re.findall(html) + plain_re.findall(html):
+        out.add((m.decode("utf-8", errors="ignore") if isinstance(m, bytes) else m).strip())
+    return sorted(e for e in out if "@" in e)
+
+
+def main(raw: bytes) -> None:
+    runs = 5
+    for name, fn in (
+        ("regex (300KB)", legacy),
+        ("regex (completo)", lambda doc: legacy(doc, cap=len(doc))),
+        ("anclado (completo)", _extract_emails),
+    ):
+        result = fn(raw)
+        started = time.perf_counter()
+        for _ in range(runs):
+            fn(raw)
+        elapsed = (time.perf_counter() - started) / runs
+        print(f"⚡ {name:>18}: {elapsed * 1000:7.1f} ms/página ({len(raw) / 1024:.0f} KB) -> {result}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        with open(sys.argv[1], "rb") as f:
+            page = f.read()
+    else:
+        # Página de ~1MB: mucho texto/markup con '@' sueltos y los emails en el footer
+        block = ('<div class="card" style="width:auto" data-id="{i}"><a href="/p/{i}">Producto {i}</a>'
+                 '<p>Diseño y fabricación, envío 24h. Síguenos en @acme_{i}</p></div>\n')
+        page = ("<html><body>" + "".join(block.format(i=i) for i in range(7000))
+                + '<footer><a href="mailto:ventas@acme.es">ventas@acme.es</a> soporte [at] acme [dot] es</footer>'
+                + "</body></html>").encode("utf-8")
+    main(page)
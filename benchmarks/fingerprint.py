@@ -0,0 +1,63 @@
+# benchmarks/fingerprint.py
+"""Benchmark str vs bytes (fingerprints, emails, links): python -m benchmarks.fingerprint [pagina.html]"""
+import sys
+import time
+import tracemalloc
+
+from app.fetch import extract_internal_links
+from app.fingerprint_db import get_engine
+from app.memo import memo
+from app.parsers.emails import extract_emails
+
+
+def main() -> None:
+    memo.max_size = 0  # medir el trabajo real, no los aciertos del memo
+
+    if len(sys.argv) > 1:
+        with open(sys.argv[1], "rb") as f:
+            raw = f.read()
+    else:
+        # Página sintética: texto con acentos y emoji (fuerza str de 4 bytes/carácter)
+        block = (
+            '<div class="card"><a href="/productos/teléfono-{i}">Envío gratis 🚚 a toda España</a>'
+            '<p>Atención al cliente: soporte{i}@acme.es · Diseño, fabricación y distribución</p>'
+            '<script src="https://cdn.acme.es/app.{i}.js"></script></div>\n'
+        )
+        raw = (
+            '<html><head><script src="https://js.hs-scripts.com/123.js"></script>'
+            '<script>gtag("config", "G-XXXX")</script></head><body>'
+            + "".join(block.format(i=i) for i in range(4000))
+            + '<a href="mailto:ventas@acme.es">Ventas</a></body></html>'
+        ).encode("utf-8")
+
+    engine = get_engine()
+    base = "https://www.acme.es/"
+
+    def str_path():
+        html = raw.decode("utf-8", errors="ignore")
+        return engine.scan(html), extract_emails(html), extract_internal_links(base, html)
+
+    def bytes_path():
+        return engine.scan(raw), extract_emails(raw), extract_internal_links(base, raw)
+
+    runs = 5
+    results = {}
+    for name, fn in (("str", str_path), ("bytes", bytes_path)):
+        results[name] = fn()
+        started = time.perf_counter()
+        for _ in range(runs):
+            fn()
+        elapsed = (time.perf_counter() - started) / runs
+        tracemalloc.start()
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"{name:>5}: {elapsed * 1000:8.1f} ms/página, pico de memoria {peak / 1024:8.0f} KB")
+
+    same = results["str"] == results["bytes"]
+    print(f"📄 {len(raw) / 1024:.0f} KB, {len(results['bytes'][0])} fingerprints, "
+          f"{len(results['bytes'][1])} emails, {len(results['bytes'][2])} links, idénticos: {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+# benchmarks/growth_signals.py
+"""Un matcher vs un findall con comodines por patrón: python -m benchmarks.growth_signals"""
+import re
+import time
+from typing import Dict, List
+
+from bs4 import BeautifulSoup
+
+from app.parsers.growth_signals import HAS_AHOCORASICK, SIGNAL_GROUPS, _scan_signals
+
+
+def legacy_mentions(html: str) -> Dict[str, List[str]]:
+    """Implementación anterior: get_text + un findall con comodines por patrón."""
+    text = BeautifulSoup(html, "lxml").get_text().lower()
+    out = {}
+    for category, group in SIGNAL_GROUPS.items():
+        width = 30 if category == "urgency_signals" else 50
+        mentions = []
+        for pattern in group.patterns:
+            mentions.extend(re.findall(f'.{{0,{width}}}{pattern}.{{0,{width}}}', text, re.I))
+        if mentions:
+            out[category] = mentions[:group.limit]
+    job_count = len(re.findall(r'(developer|engineer|sales|marketing|manager)', text, re.I))
+    return out, job_count
+
+
+def main() -> None:
+    signals = (
+        "<h1>Acme</h1><p>Acme raised $12m in a Series B round led by Kibo. The new funding will accelerate hiring.</p>"
+        "<p>We are opening a new office in Lisbon.</p><ul><li>Senior developer</li><li>Sales manager</li></ul>"
+        "<p>Urgent: we need to hire ASAP due to rapid growth.</p>"
+    )
+    filler = "<p>Lorem ipsum dolor sit amet, consectetur adipiscing elit, sed do eiusmod tempor.</p>"
+    page = "<html><body>" + filler * 2000 + signals + "</body></html>"
+    runs = 3
+    for name, fn in (("findall x patrón", legacy_mentions), ("un matcher", _scan_signals)):
+        fn(page)
+        started = time.perf_counter()
+        for _ in range(runs):
+            fn(page)
+        elapsed = (time.perf_counter() - started) / runs
+        print(f"⚡ {name:>16}: {elapsed * 1000:8.1f} ms/página ({len(page) // 1024} KB, Aho-Corasick: {HAS_AHOCORASICK})")
+
+
+if __name__ == "__main__":
+    main()
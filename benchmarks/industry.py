@@ -0,0 +1,38 @@
+# benchmarks/industry.py
+"""Índice de keywords vs _score_text por industria: python -m benchmarks.industry"""
+import random
+import time
+
+from app.parsers.industry import HAS_AHOCORASICK, INDUSTRIAS, _INDEX, _score_text, keyword_collisions
+
+
+def main() -> None:
+    stats = _INDEX.normalization
+    print(f"📚 {stats['keywords']} keywords -> {stats['unique']} únicas "
+          f"({stats['accent_variants']} variantes con/sin tilde, {stats['exact_duplicates']} duplicadas)")
+    collisions = keyword_collisions(_INDEX.keywords)
+    print(f"⚠️ {len(collisions)} keywords puntúan en varias industrias:")
+    for kw, industrias in sorted(collisions.items(), key=lambda item: (-len(item[1]), item[0]))[:15]:
+        print(f"   {kw!r}: {', '.join(industrias)}")
+
+    rng = random.Random(7)
+    vocabulary = [kw for kws in INDUSTRIAS.values() for kw in kws]
+    noise = ["la", "de", "y", "the", "width:", "auto;", "<div>", "</p>", "data-", "px", "ñandú", "über", "_x"]
+    texts = [
+        " ".join(rng.choice(vocabulary) if rng.random() < 0.3 else rng.choice(noise) for _ in range(rng.randint(20, 600)))
+        for _ in range(100)
+    ]
+    started = time.perf_counter()
+    for text in texts:
+        [_score_text(text, kws) for kws in INDUSTRIAS.values()]
+    legacy = len(texts) / (time.perf_counter() - started)
+    started = time.perf_counter()
+    for text in texts:
+        _INDEX.score(text)
+    indexed = len(texts) / (time.perf_counter() - started)
+    print(f"⚡ _score_text: {legacy:,.0f} clasificaciones/s | KeywordIndex: {indexed:,.0f} clasificaciones/s "
+          f"(x{indexed / legacy:.0f}, Aho-Corasick: {HAS_AHOCORASICK})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+# benchmarks/industry_batch.py
+"""Clasificación por lotes vs texto a texto: python -m benchmarks.industry_batch [n_documentos]"""
+import random
+import sys
+import time
+
+from app.parsers.industry import INDUSTRIAS, detectar_principal_y_secundaria
+from app.parsers.industry_batch import HAS_SCIPY, detectar_principal_y_secundaria_batch
+
+
+def main(n_docs: int) -> None:
+    rng = random.Random(11)
+    vocabulary = [kw for kws in INDUSTRIAS.values() for kw in kws]
+    # Texto de página típico: palabras comunes con ~3% de keywords y algo de ruido HTML/CSS
+    common = (
+        "el la de que y en un para con su por como nuestros servicios empresa clientes contacto inicio "
+        "the of and to in is for with our services company customers about privacy cookies "
+        "width: auto; <div> px data- copyright derechos reservados equipo proyectos soluciones"
+    ).split()
+    textos = [
+        " ".join(rng.choice(vocabulary) if rng.random() < 0.03 else rng.choice(common) for _ in range(rng.randint(100, 500)))
+        for _ in range(n_docs)
+    ]
+    domains = ["zara.com" if i % 997 == 0 else "" for i in range(n_docs)]
+    print(f"numpy/scipy: {HAS_SCIPY}")
+
+    sample = min(n_docs, 2000)
+    started = time.perf_counter()
+    expected = [detectar_principal_y_secundaria(t, d) for t, d in zip(textos[:sample], domains[:sample])]
+    scalar = sample / (time.perf_counter() - started)
+
+    started = time.perf_counter()
+    got = detectar_principal_y_secundaria_batch(textos, domains)
+    elapsed = time.perf_counter() - started
+    diffs = sum(1 for a, b in zip(expected, got) if a != b)
+    print(f"⚡ texto a texto: {scalar:,.0f} docs/s | batch: {n_docs / elapsed:,.0f} docs/s "
+          f"({n_docs:,} docs en {elapsed:.1f}s), {diffs} diferencias en {sample} documentos")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
@@ -0,0 +1,66 @@
+# benchmarks/linkedin.py
+"""Nodos about-us + JSON-LD vs get_text() de la página entera: python -m benchmarks.linkedin"""
+import json
+import re
+import time
+from typing import Dict
+
+from bs4 import BeautifulSoup
+
+from app.parsers.linkedin import parse_linkedin_company
+
+
+def legacy(html: str) -> Dict[str, any]:
+    """Implementación anterior: get_text() de toda la página + regex + select_one."""
+    soup = BeautifulSoup(html, "lxml")
+    info = {}
+    text = soup.get_text()
+    match = re.search(r'(\d{1,3}(?:,\d{3})*)\s*empleados?', text, re.I) or \
+        re.search(r'(\d{1,3}(?:,\d{3})*)\s*employees?', text, re.I)
+    if match:
+        info["employee_count"] = int(match.group(1).replace(",", ""))
+    desc_elem = soup.select_one('[data-test-id="about-us-description"]')
+    if desc_elem:
+        info["description"] = desc_elem.get_text(strip=True)[:300]
+    industry_elem = soup.select_one('[data-test-id="about-us-industry"]')
+    if industry_elem:
+        info["linkedin_industry"] = industry_elem.get_text(strip=True)
+    return info
+
+
+def main() -> None:
+    # Guest view con la cabecera, about-us y un feed largo de posts detrás
+    about = "".join(
+        f'<div data-test-id="about-us__{test_id}"><dt>{label}</dt><dd>{value}</dd></div>'
+        for test_id, label, value in (("industry", "Industry", "Software Development"),
+                                      ("size", "Company size", "201-500 employees"),
+                                      ("foundedOn", "Founded", "2012"))
+    )
+    posts = "".join(
+        f'<article class="main-feed-activity-card"><p>Post {i}: estamos contratando, 12 employees nuevos este mes.</p>'
+        f'<a href="https://www.linkedin.com/posts/acme_{i}">ver</a></article>'
+        for i in range(2500)
+    )
+    page = (
+        '<html><head><title>Acme | LinkedIn</title><script type="application/ld+json">'
+        + json.dumps({"@type": "Organization", "name": "Acme",
+                      "numberOfEmployees": {"@type": "QuantitativeValue", "value": 245}})
+        + '</script></head><body><section class="top-card-layout">'
+        '<h1 class="top-card-layout__title">Acme</h1>'
+        '<h3 class="top-card-layout__first-subline">Software Development  Madrid  3,456 followers</h3></section>'
+        '<section class="about-us"><p data-test-id="about-us__description">Nóminas para pymes.</p>'
+        f'<dl>{about}</dl></section>{posts}</body></html>'
+    )
+    runs = 5
+    for name, fn in (("get_text + regex", legacy), ("nodos + JSON-LD", parse_linkedin_company)):
+        result = fn(page)
+        started = time.perf_counter()
+        for _ in range(runs):
+            fn(page)
+        elapsed = (time.perf_counter() - started) / runs
+        print(f"⚡ {name:>16}: {elapsed * 1000:7.1f} ms/página ({len(page) // 1024} KB) -> "
+              f"employee_count={result.get('employee_count')}, industria={result.get('linkedin_industry')}")
+
+
+if __name__ == "__main__":
+    main()
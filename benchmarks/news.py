@@ -0,0 +1,50 @@
+# benchmarks/news.py
+"""Heurística de noticias en una pasada vs find_parent() por link: python -m benchmarks.news"""
+import time
+from typing import Dict, List
+
+import httpx
+from bs4 import BeautifulSoup
+
+from app.parsers.news import _extract_news_from_html
+
+
+def legacy(base_url: str, html: str, max_items: int = 5) -> List[Dict[str, str]]:
+    """Tarjetas del recorrido anterior: select + find_parent().find() por cada link."""
+    def text(n):
+        return " ".join((n.get_text(" ", strip=True) or "").split())
+
+    out, seen = [], set()
+    for a in BeautifulSoup(html, "lxml").select("section a, div a"):
+        href = a.get("href")
+        if not href or href in seen:
+            continue
+        seen.add(href)
+        h = a.find(["h1", "h2", "h3"]) or a.find_parent().find(["h1", "h2", "h3"]) if a.find_parent() else None
+        p = a.find("p") or (a.find_parent().find("p") if a.find_parent() else None)
+        if h and p and text(h) and text(p):
+            out.append({"title": text(h), "body": text(p), "url": str(httpx.URL(base_url).join(href))})
+        if len(out) >= max_items:
+            break
+    return out
+
+
+def main() -> None:
+    # Blog con muchas tarjetas: el recorrido anterior hacía find_parent().find() por cada link
+    page = "<html><body><nav>" + "".join(
+        f'<div class="menu"><a href="/cat/{i}">Categoría {i}</a></div>' for i in range(3000)
+    ) + "</nav><section>" + "".join(
+        f'<div class="post"><a href="/blog/{i}"><h2>Post {i}</h2></a><p>Resumen del post {i}.</p></div>' for i in range(50)
+    ) + "</section></body></html>"
+    runs = 5
+    for name, fn in (("find_parent", legacy), ("una pasada", lambda b, h: _extract_news_from_html(b, h, 5))):
+        result = fn("https://acme.com/blog/", page)
+        started = time.perf_counter()
+        for _ in range(runs):
+            fn("https://acme.com/blog/", page)
+        elapsed = (time.perf_counter() - started) / runs
+        print(f"⚡ {name:>11}: {elapsed * 1000:7.1f} ms/página ({len(page) // 1024} KB) -> {[n['title'] for n in result]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+# benchmarks/seo_metrics.py
+"""Una pasada de lxml vs BeautifulSoup + find_all por etiqueta: python -m benchmarks.seo_metrics"""
+import time
+from typing import Dict
+from urllib.parse import urlparse
+
+from bs4 import BeautifulSoup
+
+from app.parsers.seo_metrics import _extract_seo_metrics, classify_link
+
+
+def legacy(html: str, url: str) -> Dict[str, any]:
+    """Implementación anterior: BeautifulSoup + find_all por etiqueta + urlparse de la base por link."""
+    soup = BeautifulSoup(html, "lxml")
+    metrics = {}
+    title = soup.find("title")
+    if title and title.string:
+        metrics["meta_title_length"] = len(title.string.strip())
+    meta_desc = soup.find("meta", attrs={"name": "description"})
+    if meta_desc and meta_desc.get("content"):
+        metrics["meta_description_length"] = len(meta_desc["content"].strip())
+    metrics["has_structured_data"] = bool(
+        soup.find("script", type="application/ld+json")
+        or soup.find(attrs={"itemtype": True}) or soup.find(attrs={"itemscope": True})
+    )
+    metrics["has_sitemap_link"] = bool(soup.find("link", attrs={"rel": "sitemap"}))
+    metrics["h1_count"] = len(soup.find_all("h1"))
+    metrics["h2_count"] = len(soup.find_all("h2"))
+    metrics["image_alt_missing"] = len([img for img in soup.find_all("img") if not img.get("alt")])
+    base_host = urlparse(url).netloc.lower()
+    links = [classify_link(a["href"], base_host) for a in soup.find_all("a", href=True)]
+    metrics["internal_links_count"] = links.count(True)
+    metrics["external_links_count"] = links.count(False)
+    return metrics
+
+
+def main() -> None:
+    page = (
+        '<html><head><title>Acme</title><meta name="description" content="Tienda"></head><body>'
+        + "".join(f'<li class="item"><a href="/productos/{i}?ref=menu">Producto {i}</a>'
+                  f'<img src="/img/{i}.png"><span>Desde {i} €</span></li>' for i in range(4000))
+        + '<a href="https://www.linkedin.com/company/acme">in</a></body></html>'
+    )
+    runs = 5
+    for name, fn in (("BeautifulSoup", lambda: legacy(page, "https://acme.com/")),
+                     ("una pasada", lambda: _extract_seo_metrics(page, "acme.com"))):
+        result = fn()
+        started = time.perf_counter()
+        for _ in range(runs):
+            fn()
+        elapsed = (time.perf_counter() - started) / runs
+        print(f"⚡ {name:>13}: {elapsed * 1000:7.1f} ms/página ({len(page) // 1024} KB) -> "
+              f"{result['internal_links_count']} internos, {result['image_alt_missing']} sin alt")
+
+
+if __name__ == "__main__":
+    main()
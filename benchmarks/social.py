@@ -0,0 +1,52 @@
+# benchmarks/social.py
+"""Host -> plataforma vs BeautifulSoup + cadena de `in` por link: python -m benchmarks.social"""
+import time
+from typing import Dict
+
+from bs4 import BeautifulSoup
+
+from app.parsers.social import extract_socials
+
+
+def legacy(html: str) -> Dict[str, str]:
+    """Recorrido anterior: BeautifulSoup + lista de exclusión + cadena de `in` por link."""
+    out = {}
+    for link in BeautifulSoup(html, "lxml").find_all("a", href=True):
+        href_lower = link["href"].strip().lower()
+        if any(skip in href_lower for skip in (
+            "privacy", "privacidad", "terms", "condiciones", "cookies", "legal", "contact", "contacto",
+            "notices", "policy", "politica", "about/legal", "support", "help", "ayuda", "faq", "aviso",
+            "disclaimer", "share", "login", "oauth", "auth", "intent",
+        )):
+            continue
+        for needle, platform in (("linkedin.com/company", "linkedin"), ("facebook.com", "facebook"),
+                                 ("twitter.com", "twitter"), ("x.com", "twitter"), ("instagram.com", "instagram"),
+                                 ("youtube.com", "youtube"), ("tiktok.com", "tiktok"), ("github.com", "github"),
+                                 ("discord.gg", "discord"), ("pinterest.com", "pinterest"), ("vimeo.com", "vimeo")):
+            if needle in href_lower:
+                out.setdefault(platform, link["href"])
+                break
+    return out
+
+
+def main() -> None:
+    # Página con muchos links (menús, listados de producto) y las redes en el footer
+    page = (
+        "<html><body>"
+        + "".join(f'<li><a class="nav-item" href="/productos/categoria-{i}/item-{i}?ref=menu">Producto {i}</a></li>'
+                  for i in range(5000))
+        + '<footer><a href="https://www.linkedin.com/company/acme">in</a><a href="https://twitter.com/acme">tw</a>'
+          '<a href="https://www.instagram.com/acme">ig</a></footer></body></html>'
+    )
+    runs = 5
+    for name, fn in (("BeautifulSoup + in", legacy), ("host -> plataforma", extract_socials)):
+        result = fn(page)
+        started = time.perf_counter()
+        for _ in range(runs):
+            fn(page)
+        elapsed = (time.perf_counter() - started) / runs
+        print(f"⚡ {name:>18}: {elapsed * 1000:7.1f} ms/página ({page.count('<a ')} links) -> {sorted(result)}")
+
+
+if __name__ == "__main__":
+    main()
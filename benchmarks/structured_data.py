@@ -0,0 +1,49 @@
+# benchmarks/structured_data.py
+"""Una decodificación por página vs un json.loads por consumidor: python -m benchmarks.structured_data"""
+import json
+import re
+import time
+
+from app.parsers.structured_data import _JSON_LD, _extract_structured_data, extract_structured_data
+
+
+def walk(data):
+    if isinstance(data, list):
+        for item in data:
+            yield from walk(item)
+    elif isinstance(data, dict):
+        yield data
+        for value in data.values():
+            if isinstance(value, (dict, list)):
+                yield from walk(value)
+
+
+def main() -> None:
+    # Página de producto con un bloque grande (catálogo) y la Organization
+    offers = [{"@type": "Product", "name": f"Producto {i}", "offers": {"@type": "Offer", "price": i}} for i in range(3000)]
+    page = ("<html><head><script type='application/ld+json'>"
+            + json.dumps({"@type": "Organization", "name": "Acme", "sameAs": ["https://www.linkedin.com/company/acme"]})
+            + "</script><script type='application/ld+json'>" + json.dumps({"@graph": offers}) + "</script></head>"
+            + "<body>" + "<p>texto</p>" * 5000 + "</body></html>")
+    legacy_re = re.compile(_JSON_LD, re.I | re.S)
+
+    def legacy():
+        # Antes: social (sameAs), jobs (JobPosting) y linkedin hacían cada uno su finditer + json.loads + recorrido
+        for _ in range(3):
+            for m in legacy_re.finditer(page):
+                for _entity in walk(json.loads(m.group(1))):
+                    pass
+
+    runs = 5
+    for name, fn in (("3 consumidores", legacy), ("una pasada", lambda: _extract_structured_data(page)),
+                     ("memo", lambda: extract_structured_data(page))):
+        fn()
+        started = time.perf_counter()
+        for _ in range(runs):
+            fn()
+        elapsed = (time.perf_counter() - started) / runs
+        print(f"⚡ {name:>14}: {elapsed * 1000:7.1f} ms/página ({len(page) // 1024} KB)")
+
+
+if __name__ == "__main__":
+    main()
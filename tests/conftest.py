@@ -0,0 +1,66 @@
+# tests/conftest.py
+"""Fixtures compartidas: servidor HTTP local que sirve respuestas grabadas."""
+import http.server
+import threading
+from typing import Dict, List, Tuple, Union
+
+import pytest
+
+Response = Union[str, bytes, Tuple[int, str, Union[str, bytes]]]
+
+
+class StandIn:
+    """Servidor en 127.0.0.1 (puerto libre): ruta -> cuerpo o (status, content-type, cuerpo)."""
+
+    def __init__(self, routes: Dict[str, Response]):
+        self.routes = routes
+        self.requests: List[str] = []
+        stand_in = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def do_GET(self):
+                stand_in.requests.append(self.path)
+                status, content_type, body = stand_in.response(self.path)
+                data = body.encode() if isinstance(body, str) else body
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                try:
+                    self.wfile.write(data)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass  # el cliente cortó la descarga
+
+            def log_message(self, *args):
+                pass
+
+        self.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def response(self, path: str) -> Tuple[int, str, Union[str, bytes]]:
+        found = self.routes.get(path, self.routes.get(path.split("?")[0]))
+        if found is None:
+            return 404, "text/plain", "not found"
+        if isinstance(found, tuple):
+            return found
+        return 200, "text/html; charset=utf-8", found
+
+    def close(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def stand_in():
+    """Crea servidores locales con `stand_in(routes)`; se cierran al terminar el test."""
+    servers: List[StandIn] = []
+
+    def start(routes: Dict[str, Response]) -> StandIn:
+        server = StandIn(routes)
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.close()
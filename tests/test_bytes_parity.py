@@ -0,0 +1,66 @@
+# tests/test_bytes_parity.py
+"""Matchers sobre los bytes crudos del fetch: mismo resultado que sobre el str decodificado."""
+import asyncio
+
+import pytest
+
+from app.fetch import _ascii_compatible, discover_feeds_from_html, extract_internal_links, fetch_pages
+from app.fingerprint_db import get_engine
+from app.parsers.emails import extract_emails
+from app.parsers.social import extract_socials
+
+BASE = "https://www.acme.es/"
+PAGE = (
+    '<html><head><link rel="alternate" type="application/rss+xml" href="/feed/noticias-año.xml">'
+    '<script src="https://js.hs-scripts.com/123.js"></script><script>gtag("config", "G-ABCDEF1234")</script></head>'
+    '<body><a href="/productos/teléfono-1">Envío gratis a toda España</a>'
+    '<a href="/about?x=1&amp;y=2">Quiénes somos</a><a href="https://www.acme.es/contacto">Contacto</a>'
+    '<a href="https://www.linkedin.com/company/acme-españa/">LinkedIn</a>'
+    '<a href="https://twitter.com/acme">X</a>'
+    '<p>Atención al cliente: soporte@acme.es · Diseño y fabricación</p>'
+    '<a href="mailto:ventas@acme.es">Ventas</a></body></html>'
+)
+
+
+@pytest.mark.parametrize("encoding", ["utf-8", "latin-1", "cp1252"])
+def test_bytes_match_str(encoding):
+    raw = PAGE.encode(encoding)
+    assert _ascii_compatible(encoding)
+    assert get_engine().scan(raw) == get_engine().scan(PAGE)
+    assert extract_emails(raw) == extract_emails(PAGE)
+    assert extract_internal_links(BASE, raw, encoding=encoding) == extract_internal_links(BASE, PAGE)
+    assert discover_feeds_from_html(BASE, raw, encoding) == discover_feeds_from_html(BASE, PAGE)
+    assert extract_socials(raw, encoding=encoding) == extract_socials(PAGE)
+
+
+def test_latin1_hrefs_keep_accents():
+    links = extract_internal_links(BASE, PAGE.encode("latin-1"), encoding="latin-1")
+    assert "https://www.acme.es/productos/tel%C3%A9fono-1" in links
+
+
+@pytest.mark.parametrize("encoding, compatible", [
+    ("utf-8", True), ("ISO-8859-1", True), ("windows-1252", True), ("koi8-r", True),
+    # Multibyte heredados: un carácter puede contener bytes ASCII
+    ("shift_jis", False), ("gbk", False), ("big5", False), ("euc-kr", False),
+    # ASCII codificado de otra forma o con escapes de estado
+    ("utf-16", False), ("utf-7", False), ("cp037", False), ("iso2022_jp", False),
+    ("no-existe", False),
+])
+def test_ascii_compatible(encoding, compatible):
+    assert _ascii_compatible(encoding) is compatible
+
+
+def fetch(server, path):
+    return asyncio.run(fetch_pages([server.url + path], respect_robots=False, timeout=3))[0]
+
+
+def test_fetch_exposes_body_and_charset(stand_in):
+    server = stand_in({
+        "/latin": (200, "text/html; charset=iso-8859-1", PAGE.encode("latin-1")),
+        "/sjis": (200, "text/html; charset=shift_jis", "<p>会社概要 soporte@acme.es</p>".encode("shift_jis")),
+    })
+    latin = fetch(server, "/latin")
+    assert latin.body == PAGE.encode("latin-1") and latin.encoding == "iso-8859-1"
+    assert extract_internal_links(BASE, latin.body, encoding=latin.encoding) == extract_internal_links(BASE, latin.html)
+    sjis = fetch(server, "/sjis")
+    assert sjis.body is None and sjis.html == "<p>会社概要 soporte@acme.es</p>"
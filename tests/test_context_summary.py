@@ -0,0 +1,52 @@
+# tests/test_context_summary.py
+"""Resumen de contexto: prioridad meta > selectores about/hero/main > párrafo > islands > texto visible."""
+import json
+
+import pytest
+
+from app.parsers.context_summary import extract_context_summary
+
+LONG = "Acme diseña y fabrica maquinaria industrial para el sector agroalimentario desde 1985"
+KEY = "fabrica maquinaria industrial"
+
+# (html, texto que debe salir, texto que no debe salir)
+CASES = [
+    (f'<head><meta name="description" content="{LONG}"><meta property="og:description" content="otra"></head>',
+     KEY, "otra"),
+    # Meta description demasiado corta: gana og:description
+    (f'<meta name="description" content="corta"><meta property="og:description" content="{LONG}">', KEY, "corta"),
+    (f'<meta name="description" content="日本語の説明文がここにありますよね">'
+     f'<section class="hero"><h1>Hola</h1><p>{LONG}. Más de 500 clientes en 30 países.</p></section>', KEY, None),
+    # About antes que hero; el texto de los <script> no cuenta
+    (f'<div class="about-us"><script>var x = "no cuenta";</script><p>{LONG}</p><p>Segunda frase larga del bloque.</p></div>'
+     f'<section class="hero">Otro texto de hero que no debería salir primero</section>', "Segunda frase", "no cuenta"),
+    (f'<div class="mt-about"><span>corto</span></div><div id="about-block"><p>{LONG}</p></div>', KEY, "corto"),
+    (f'<main><div><p>Menu home about contact login</p><p>{LONG}</p></div></main>', KEY, "Menu"),
+    (f'<div class="content"><p>breve</p></div><div class="content"><h2>t</h2><p>{LONG} con más detalle.</p></div>',
+     "detalle", "breve"),
+    (f'<nav><p>Home About Contact</p></nav><article><p>Usamos cookies para mejorar tu experiencia en nuestra web y más</p>'
+     f'<p>{LONG} &amp; distribuye en toda Europa.</p></article>', "toda Europa", "cookies"),
+    (f'<body><div>Bienvenidos</div><div>{LONG}. Acme tiene sede en Valencia y oficinas en Madrid.</div></body>',
+     KEY, None),
+]
+
+
+@pytest.mark.parametrize("html, expected, excluded", CASES)
+@pytest.mark.parametrize("company", ["", "Acme"])
+def test_summary_source(html, expected, excluded, company):
+    summary = extract_context_summary(html, company)
+    assert summary and expected in summary
+    assert excluded is None or excluded not in summary
+    assert len(summary) <= 200
+
+
+def test_no_summary_for_short_text():
+    assert extract_context_summary("<body><div>Texto corto</div></body>") is None
+    assert extract_context_summary("") is None
+
+
+def test_spa_uses_island_description():
+    data = {"props": {"pageProps": {"page": {"title": "Acme", "description": LONG}}}}
+    html = f'<div id="__next"></div><script id="__NEXT_DATA__" type="application/json">{json.dumps(data)}</script>'
+    summary = extract_context_summary(html)
+    assert summary and KEY in summary
@@ -0,0 +1,93 @@
+# tests/test_cost_profile.py
+"""Perfil de coste por fingerprint: muestreo, ranking y GET/DELETE /fingerprints/profile."""
+import pytest
+from fastapi.testclient import TestClient
+
+from app.fingerprint import CostProfile
+from app.parsers import techstack
+from app.parsers.techstack import TechDetector, detect_tech
+
+PAGE = ('<script src="https://js.hs-scripts.com/123.js"></script>'
+        '<script>gtag("config", "G-ABCDEF1234"); var ua = "UA-1234-1";</script>')
+
+
+def synthetic() -> CostProfile:
+    profile = CostProfile()
+    profile.documents = 4
+    # lenta pero poco evaluada / rápida y muy evaluada / muchos bytes
+    for _ in range(2):
+        profile.record_regex(("A", "slow"), "s", 5_000_000, 100, hit=True)
+    for _ in range(10):
+        profile.record_regex(("A", "often"), "o", 100_000, 100, hit=False)
+    profile.record_regex(("B", "big"), "b", 2_000_000, 1_000_000, hit=False)
+    profile.record_literal_hit(("C", "pure"), "p")
+    profile.record_literals(3_000_000, 5000)
+    return profile
+
+
+def names(report):
+    return [row["key"][1] for row in report["fingerprints"]]
+
+
+@pytest.mark.parametrize("sort, order", [
+    ("time", ["slow", "big", "often", "pure"]),
+    ("evaluations", ["often", "slow", "big", "pure"]),
+    ("bytes", ["big", "often", "slow", "pure"]),
+    ("per_eval", ["slow", "big", "often", "pure"]),
+    ("desconocido", ["slow", "big", "often", "pure"]),  # cae en time
+])
+def test_report_sort_keys(sort, order):
+    assert names(synthetic().report(top=0, sort=sort)) == order
+
+
+def test_report_rows_and_totals():
+    report = synthetic().report(top=2)
+    assert names(report) == ["slow", "big"]
+    slow = report["fingerprints"][0]
+    assert slow == {"key": ["A", "slow"], "pattern": "s", "evaluations": 2, "matches": 2, "time_ms": 10.0,
+                    "us_per_eval": 5000.0, "bytes_scanned": 200, "hit_rate": 0.5}
+    assert report["documents"] == 4 and report["regex_time_ms"] == 13.0
+    assert report["literal_pass"] == {"calls": 1, "ns": 3_000_000, "bytes": 5000, "time_ms": 3.0}
+    pure = synthetic().report(top=0)["fingerprints"][-1]
+    assert (pure["evaluations"], pure["matches"], pure["us_per_eval"]) == (0, 1, 0.0)
+
+
+def test_detect_tech_profile_counts_documents():
+    profile = CostProfile()
+    detect_tech("acme.es", PAGE, profile=profile)
+    detect_tech("acme.es", PAGE.encode(), profile=profile)
+    report = profile.report(top=0)
+    assert report["documents"] == 2 and report["literal_pass"]["calls"] == 2
+    assert {tuple(row["key"]) for row in report["fingerprints"]} >= {("Marketing Automation", "HubSpot")}
+
+
+@pytest.mark.parametrize("rate, draw, sampled", [(0, 0.0, False), (1, 0.99, True), (0.01, 0.005, True),
+                                                 (0.01, 0.5, False)])
+def test_sampling(monkeypatch, rate, draw, sampled):
+    monkeypatch.setattr(techstack, "PROFILE_SAMPLE_RATE", rate)
+    monkeypatch.setattr(techstack.random, "random", lambda: draw)
+    assert (techstack._sampled_profile() is techstack.tech_profile) is sampled
+
+
+@pytest.fixture
+def sampled_everything(monkeypatch):
+    monkeypatch.setattr(techstack, "PROFILE_SAMPLE_RATE", 1.0)
+    techstack.tech_profile.reset()
+    yield techstack.tech_profile
+    techstack.tech_profile.reset()
+
+
+def test_profile_endpoint(sampled_everything):
+    from app.main import app
+
+    detector = TechDetector()
+    detector.add_page(PAGE)
+    detector.add_page(PAGE.replace("123", "456"))
+    client = TestClient(app)
+    body = client.get("/fingerprints/profile", params={"top": 1, "sort": "evaluations"}).json()
+    assert body["documents"] == 2 and len(body["fingerprints"]) == 1
+    assert body["fingerprints"][0]["evaluations"] == max(
+        row[0] for row in sampled_everything.patterns.values())
+    assert client.delete("/fingerprints/profile").json() == {"ok": True}
+    body = client.get("/fingerprints/profile").json()
+    assert body["documents"] == 0 and body["fingerprints"] == []
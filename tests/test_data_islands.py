@@ -0,0 +1,96 @@
+# tests/test_data_islands.py
+"""Data islands de SPA: contenido bajo demanda y filtro por trozos que quita el blob."""
+import json
+
+import pytest
+
+from app.parsers.data_islands import IslandFilter, extract_island_content, find_islands, island_text, strip_islands
+
+NEXT_DATA = {
+    "props": {"pageProps": {
+        "page": {"title": "Acme — Software de nóminas",
+                 "seoDescription": "Acme automatiza las nóminas y la gestión de RRHH para pymes en España.",
+                 "blocks": [{"heading": "Nóminas en minutos", "body": "<p>texto</p>", "cta": {"href": "/demo"}},
+                            {"heading": "Integraciones", "link": {"url": "https://acme.es/integraciones"}}]},
+        "nav": [{"label": "Precios", "href": "/precios"}, {"label": "Blog", "href": "/blog"}],
+        "head": [{"name": "description", "content": "Software de nóminas y RRHH en la nube para pymes."}],
+    }},
+    "page": "/", "buildId": "abc123",
+}
+# Nuxt 3 (devalue): tabla plana, los objetos apuntan a índices
+NUXT3 = [{"data": 1}, {"title": 2, "description": 3, "path": 4}, "Clínica Dental Sonrisa",
+         "Implantes, ortodoncia invisible y odontología general en Valencia.", "/tratamientos"]
+NEXT_PAGE = ('<html><head><script src="/_next/static/chunks/main.js"></script></head><body><div id="__next"></div>'
+             '<script id="__NEXT_DATA__" type="application/json">' + json.dumps(NEXT_DATA, ensure_ascii=False)
+             + '</script></body></html>')
+
+CASES = [
+    (NEXT_PAGE,
+     {"frameworks": ["next"], "titles": ["Acme — Software de nóminas", "Nóminas en minutos", "Integraciones"],
+      "descriptions": ["Acme automatiza las nóminas y la gestión de RRHH para pymes en España.",
+                       "Software de nóminas y RRHH en la nube para pymes."],
+      "links": ["/demo", "https://acme.es/integraciones", "/precios", "/blog"]}),
+    ('<div id="__nuxt"></div><script type="application/json" id="__NUXT_DATA__" data-ssr="true">'
+     + json.dumps(NUXT3, ensure_ascii=False) + '</script>',
+     {"frameworks": ["nuxt"], "titles": ["Clínica Dental Sonrisa"],
+      "descriptions": ["Implantes, ortodoncia invisible y odontología general en Valencia."], "links": ["/tratamientos"]}),
+    # Nuxt 2: función JS, no JSON -> fallback por clave
+    ('<script>window.__NUXT__=(function(a,b){return {layout:"default",data:[{title:"Acme Logística",'
+     'description:"Transporte refrigerado y almacenaje para alimentación en toda Europa.",path:"\\u002Fservicios"}]}}(null,1));</script>',
+     {"frameworks": ["nuxt"], "titles": ["Acme Logística"],
+      "descriptions": ["Transporte refrigerado y almacenaje para alimentación en toda Europa."], "links": ["/servicios"]}),
+    # "__NEXT_DATA__" fuera de una etiqueta <script> no es una island
+    ("<p>Usamos __NEXT_DATA__ y window.__NUXT__ en el blog</p>", None),
+]
+
+
+@pytest.mark.parametrize("html, expected", CASES)
+def test_extract_island_content(html, expected):
+    got = extract_island_content(html)
+    if got is not None:
+        got = {k: got[k] for k in ("frameworks", "titles", "descriptions", "links")}
+    assert got == expected
+
+
+def test_strip_keeps_marker_and_drops_blob():
+    stripped = strip_islands(NEXT_PAGE.encode())
+    assert b"__NEXT_DATA__" in stripped and b"buildId" not in stripped
+    assert strip_islands(CASES[-1][0]) == CASES[-1][0]
+    assert find_islands(CASES[-1][0]) == []
+
+
+def test_island_text():
+    text = island_text(extract_island_content(CASES[1][0]))
+    assert "Clínica Dental Sonrisa" in text and "ortodoncia" in text
+    assert island_text(None) == ""
+
+
+class Collect:
+    """Sink que guarda lo que le llega (como TechPageStream, sin detectar nada)."""
+
+    def __init__(self):
+        self.parts, self.closed = [], None
+
+    def headers(self, headers, cookies):
+        pass
+
+    def feed(self, chunk):
+        self.parts.append(chunk)
+        return False
+
+    def close(self, doc=None):
+        self.closed = doc
+
+
+@pytest.mark.parametrize("html", [html for html, _ in CASES])
+@pytest.mark.parametrize("as_bytes", [False, True])
+@pytest.mark.parametrize("size", [1, 7, 64, 4096])
+def test_island_filter_matches_strip(html, as_bytes, size):
+    doc = html.encode() if as_bytes else html
+    sink = Collect()
+    filt = IslandFilter(sink)
+    for i in range(0, len(doc), size):
+        filt.feed(doc[i:i + size])
+    filt.close(doc)
+    assert doc[:0].join(sink.parts) == strip_islands(doc)
+    assert sink.closed == strip_islands(doc)
@@ -0,0 +1,31 @@
+# tests/test_emails.py
+"""Emails en una pasada anclada en los '@' (str y bytes crudos)."""
+import pytest
+
+from app.parsers.emails import extract_emails
+
+CASES = {
+    'Escríbenos a <a href="mailto:ventas@acme.es?subject=Hola">ventas@acme.es</a>': ["ventas@acme.es"],
+    "info [at] acme [dot] com | soporte(at)acme.es": ["info@acme.com", "soporte@acme.es"],
+    "rrhh&#64;acme.es y prensa&#x40;acme.es y legal&commat;acme.es": ["legal@acme.es", "prensa@acme.es", "rrhh@acme.es"],
+    '<a href="mailto:hola%40acme.io">': ["hola@acme.io"],
+    "contacto@acme.com. Fin": ["contacto@acme.com"],
+    "a@b.com@c.org test@acme.com user@example.com": ["a@b.com"],
+    "logo@2x.png @twitter usuario@ sin.dominio@x": [],
+    # Extensiones de assets (retina, bundles) no son TLD
+    '<img src="/img/icon@3x.WEBP"> <link href="app@1.2.min.css"> ventas@acme.es': ["ventas@acme.es"],
+    "jquery@3.7.1.js hero@2x.jpeg rrhh@acme.jobs": ["rrhh@acme.jobs"],
+    "": [],
+}
+
+
+@pytest.mark.parametrize("text, expected", CASES.items())
+def test_extract_emails(text, expected):
+    assert extract_emails(text) == expected
+    assert extract_emails(text.encode()) == expected
+
+
+def test_footer_email_beyond_300kb():
+    page = "<p>@acme_1 relleno</p>" * 20000 + '<a href="mailto:ventas@acme.es">ventas</a>'
+    assert len(page) > 300_000
+    assert extract_emails(page) == ["ventas@acme.es"]
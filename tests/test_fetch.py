@@ -0,0 +1,61 @@
+# tests/test_fetch.py
+"""Lectura con tope y sinks de fetch_page."""
+import asyncio
+from typing import List
+
+from app.fetch import _read_capped
+
+
+class Recorded:
+    """Respuesta grabada en trozos (lo que _read_capped usa de httpx.Response)."""
+
+    def __init__(self, chunks: List[bytes], encoding: str = "utf-8"):
+        self.chunks = chunks
+        self.encoding = encoding
+
+    async def aiter_bytes(self):
+        for chunk in self.chunks:
+            yield chunk
+
+
+class Sink:
+    def __init__(self, stop_after: int = 0):
+        self.fed = []
+        self.stop_after = stop_after
+
+    def feed(self, text) -> bool:
+        self.fed.append(text)
+        return bool(self.stop_after) and len(self.fed) >= self.stop_after
+
+
+def read(resp, cap, sink=None):
+    return asyncio.run(_read_capped(resp, cap, sink))
+
+
+def test_sink_never_gets_more_than_the_cap():
+    sink = Sink()
+    html, body, size = read(Recorded([b"a" * 600, b"b" * 600, b"c" * 600]), 1000, sink)
+    assert size == 1000 and body == b"a" * 600 + b"b" * 400
+    assert b"".join(sink.fed) == body
+
+
+def test_sink_stop_ends_the_read():
+    sink = Sink(stop_after=1)
+    html, body, size = read(Recorded([b"<p>uno</p>", b"<p>dos</p>"]), 1000, sink)
+    assert sink.fed == [b"<p>uno</p>"] and html == "<p>uno</p>"
+
+
+def test_decoder_flushed_at_eof():
+    # utf-7 retiene el último carácter hasta el final del documento
+    sink = Sink()
+    html, body, size = read(Recorded([b"a+IK", b"w"], encoding="utf-7"), 1000, sink)
+    assert body is None and html == "a€"
+    assert "".join(sink.fed) == "a€"
+
+
+def test_utf16_chunks_split_mid_character():
+    data = "<p>Envío €</p>".encode("utf-16")
+    sink = Sink()
+    html, body, size = read(Recorded([data[i:i + 3] for i in range(0, len(data), 3)], encoding="utf-16"), 1000, sink)
+    assert body is None and html == "<p>Envío €</p>"
+    assert "".join(sink.fed) == html
@@ -0,0 +1,56 @@
+# tests/test_fingerprint.py
+"""Motor de fingerprints: literales requeridos y paridad con la regex."""
+import re
+
+import pytest
+
+from app.fingerprint import FingerprintEngine, required_literals
+from app.fingerprint_db import get_db
+
+
+@pytest.mark.parametrize("pattern, literals, pure", [
+    (r"js\.hs-scripts\.com", ["js.hs-scripts.com"], True),
+    (r"gtag\(|googletagmanager", ["gtag(", "googletagmanager"], True),
+    (r"cdn\.shopify\.com/s/files/\d+", ["cdn.shopify.com/s/files/"], False),
+    (r"wp-(content|includes)", ["wp-"], False),
+    # Escapes por código: el literal es el carácter, no los dígitos hex
+    (r"\x41cme\.js", ["acme.js"], True),
+    (r"\u0041cme-widget", ["acme-widget"], True),
+    (r"café-widget", ["café-widget"], True),
+    (r"\x2ejs-lib", [".js-lib"], True),
+    # Sin literal fiable: se escanean siempre con la regex
+    (r"(acme)\1-widget", None, False),
+    (r"\N{LATIN SMALL LETTER E WITH ACUTE}-widget", None, False),
+])
+def test_required_literals(pattern, literals, pure):
+    assert required_literals(pattern) == (literals, pure if literals else False)
+
+
+ESCAPED = [
+    ("acme", r"\x41cme\.js"),
+    ("acme-loader", r"\u0041cme-loader\.[0-9a-f]+\.js"),
+    ("cafe", r"café-widget"),
+    ("backref", r"(tag)=\1"),
+]
+PAGES = [
+    '<script src="/static/ACME.js"></script>',
+    '<script src="https://cdn.acme.io/acme-loader.3f9a.js"></script>',
+    "<div>café-widget</div>",
+    "<i data-x='tag=tag'></i>",
+    "<p>nada por aquí</p>",
+]
+
+
+@pytest.mark.parametrize("page", PAGES)
+def test_escaped_patterns_match_like_the_regex(page):
+    engine = FingerprintEngine(ESCAPED)
+    expected = [i for i, (_, p) in enumerate(ESCAPED) if re.search(p, page, re.I)]
+    assert engine.scan(page) == expected
+    assert engine.scan(page.encode("utf-8")) == expected
+
+
+def test_db_patterns_match_like_the_regex():
+    engine = get_db().engine
+    page = "".join(f"<p>{p}</p>" for p in ["js.hs-scripts.com/1.js", "gtag('config')", "wp-content/themes"])
+    expected = [i for i, p in enumerate(engine.patterns) if re.search(p, page, re.I)]
+    assert engine.scan(page) == expected
@@ -0,0 +1,157 @@
+# tests/test_fingerprint_db.py
+"""Base de fingerprints: validación, snapshot y recarga en caliente."""
+import json
+import os
+import pickle
+
+import pytest
+
+from app import fingerprint_db
+from app.fingerprint_db import (
+    FingerprintDBError, SNAPSHOT_FORMAT, build_db, lint_pattern, load_db, reload_db, validate_fingerprints,
+)
+
+
+def source(*entries, version="1"):
+    return {"version": version, "fingerprints": list(entries)}
+
+
+def dump(data) -> bytes:
+    return json.dumps(data).encode()
+
+
+HUBSPOT = {"category": "CRM", "tool": "HubSpot", "pattern": r"js\.hs-scripts\.com"}
+STRIPE = {"category": "Payments", "tool": "Stripe", "pattern": r"js\.stripe\.com"}
+
+
+def test_valid_source():
+    errors, warnings = validate_fingerprints(source(HUBSPOT, STRIPE))
+    assert errors == [] and warnings == []
+
+
+def test_duplicate_category_tool_rejected():
+    errors, _ = validate_fingerprints(source(HUBSPOT, STRIPE, {**HUBSPOT, "pattern": "hubspot"}))
+    assert errors == ["fingerprints[2]: duplicado de fingerprints[0] (CRM / HubSpot)"]
+
+
+def test_same_tool_in_other_category_allowed():
+    errors, _ = validate_fingerprints(source(HUBSPOT, {**HUBSPOT, "category": "Marketing Automation"}))
+    assert errors == []
+
+
+def test_regex_compile_error():
+    errors, _ = validate_fingerprints(source({"category": "CRM", "tool": "Roto", "pattern": "roto(crm"}))
+    assert len(errors) == 1 and errors[0].startswith("fingerprints[0] (Roto): regex inválida")
+
+
+def test_header_regex_is_linted():
+    entry = {"category": "CDN & Hosting", "tool": "Acme CDN", "headers": {"server": "(a+)+"}}
+    errors, _ = validate_fingerprints(source(entry))
+    assert errors == ["fingerprints[0] (Acme CDN): cuantificadores anidados (backtracking catastrófico)"]
+
+
+@pytest.mark.parametrize("pattern", [r"(a+)+b", r"(\w*)*x", r"(x+){2,}", r"(?:ab+)*c"])
+def test_nested_quantifier_lint(pattern):
+    errors, _ = lint_pattern(pattern)
+    assert errors == ["cuantificadores anidados (backtracking catastrófico)"]
+
+
+@pytest.mark.parametrize("pattern", [r"(ab)+c", r"(a|b)*", r"wp-(content|includes)", r"a+b+"])
+def test_bounded_groups_pass_lint(pattern):
+    assert lint_pattern(pattern) == ([], [])
+
+
+def test_adjacent_wildcards_and_warnings():
+    assert lint_pattern(r"foo.*.*bar")[0] == ["comodines no acotados consecutivos (backtracking catastrófico)"]
+    assert lint_pattern(r".*acme")[1] == ["comodín inicial: escanea toda la página por cada posición"]
+    assert lint_pattern(r"js.stripe.com")[1] == ["punto sin escapar en host (matchea cualquier carácter)"]
+
+
+def test_build_db_raises_with_all_errors():
+    with pytest.raises(FingerprintDBError) as exc:
+        build_db(dump(source(HUBSPOT, HUBSPOT, {"category": "CRM", "tool": "Roto", "pattern": "("})), "h")
+    assert len(exc.value.errors) == 2
+    with pytest.raises(FingerprintDBError, match="JSON inválido"):
+        build_db(b"{", "h")
+
+
+@pytest.fixture
+def db_files(tmp_path):
+    path, snapshot = tmp_path / "fingerprints.json", tmp_path / "fingerprints.pkl"
+    path.write_bytes(dump(source(HUBSPOT)))
+    return str(path), str(snapshot)
+
+
+def test_snapshot_written_and_reused(db_files, monkeypatch):
+    path, snapshot = db_files
+    first = load_db(path, snapshot)
+    assert os.path.exists(snapshot)
+    monkeypatch.setattr(fingerprint_db, "build_db", lambda *a: pytest.fail("debería cargar el snapshot"))
+    again = load_db(path, snapshot)
+    assert again.source_hash == first.source_hash and len(again.engine) == 1
+
+
+def test_snapshot_invalidated_by_source_hash(db_files):
+    path, snapshot = db_files
+    load_db(path, snapshot)
+    # Mismo "version", contenido distinto: manda el hash, no el número de versión
+    with open(path, "wb") as f:
+        f.write(dump(source(HUBSPOT, STRIPE)))
+    db = load_db(path, snapshot)
+    assert len(db.engine) == 2
+    with open(snapshot, "rb") as f:
+        assert pickle.load(f)["source_hash"] == db.source_hash
+
+
+def test_snapshot_invalidated_by_format(db_files, monkeypatch):
+    path, snapshot = db_files
+    load_db(path, snapshot)
+    monkeypatch.setattr(fingerprint_db, "SNAPSHOT_FORMAT", SNAPSHOT_FORMAT + 1)
+    built = []
+    real_build = fingerprint_db.build_db
+    monkeypatch.setattr(fingerprint_db, "build_db", lambda *a: built.append(1) or real_build(*a))
+    load_db(path, snapshot)
+    assert built == [1]
+    with open(snapshot, "rb") as f:
+        assert pickle.load(f)["format"] == SNAPSHOT_FORMAT + 1
+
+
+@pytest.fixture
+def live_db(db_files, monkeypatch):
+    """Base "global" apuntando a un archivo temporal, sin versión cargada."""
+    path, snapshot = db_files
+    monkeypatch.setattr(fingerprint_db, "FINGERPRINTS_PATH", path)
+    monkeypatch.setattr(fingerprint_db, "FINGERPRINTS_SNAPSHOT", snapshot)
+    monkeypatch.setattr(fingerprint_db, "_current", None)
+    monkeypatch.setattr(fingerprint_db, "_source_mtime", None)
+    return path
+
+
+def rewrite(path: str, data, bump: float = 10) -> None:
+    mtime = os.stat(path).st_mtime
+    with open(path, "wb") as f:
+        f.write(dump(data))
+    os.utime(path, (mtime + bump, mtime + bump))
+
+
+def test_hot_reload_on_mtime_change(live_db):
+    first = reload_db()
+    assert reload_db() is first  # sin cambios en disco
+    rewrite(live_db, source(HUBSPOT, STRIPE))
+    second = reload_db()
+    assert second is not first and len(second.engine) == 2
+    assert second.version == first.version and second.source_hash != first.source_hash
+
+
+def test_invalid_reload_keeps_previous(live_db):
+    first = reload_db()
+    rewrite(live_db, source(HUBSPOT, HUBSPOT))
+    assert reload_db() is first
+    # El archivo roto no se reintenta en cada comprobación
+    assert fingerprint_db._source_mtime == os.stat(live_db).st_mtime
+
+
+def test_invalid_first_load_raises(live_db):
+    rewrite(live_db, {"version": "1", "fingerprints": []})
+    with pytest.raises(FingerprintDBError):
+        reload_db()
@@ -0,0 +1,65 @@
+# tests/test_growth_signals.py
+"""Señales de crecimiento y urgencia: un matcher para todos los patrones, snippets de frase completa."""
+import pytest
+
+from app.parsers.growth_signals import (
+    JOB_ROLES,
+    SIGNAL_GROUPS,
+    SignalMatcher,
+    _MATCHER,
+    _scan_signals,
+    detect_growth_signals,
+    detect_urgency_indicators,
+    literal_prefixes,
+)
+from app.parsers.industry import visible_text
+
+FUNDING = ("<h1>Acme</h1><p>Acme raised $12m in a Series B round led by Kibo. The new funding will accelerate hiring.</p>"
+           "<p>We are opening a new office in Lisbon.</p><script>var funding = 1;</script>")
+ALLIANCE = ("<p>Anunciamos una alianza con Iberdrola. Nuestra financiación crecerá.</p>"
+            "<p>Lanzamiento del nuevo producto en beta.</p>")
+HIRING = ("<ul><li>Senior developer</li><li>Sales manager</li><li>Marketing engineer</li></ul>"
+          "<p>Urgent: we need to hire ASAP due to rapid growth.</p>")
+QUIET = "<p>Sobre nosotros. Empresa familiar desde 1950.</p>"
+
+
+@pytest.mark.parametrize("html, snippets, job_mentions", [
+    (FUNDING, {
+        "funding_signals": ["acme acme raised $12m in a series b round led by kibo.", "the new funding will accelerate hiring."],
+        "growth_mentions": ["we are opening a new office in lisbon."],
+    }, 0),
+    (ALLIANCE, {
+        "partnership_signals": ["anunciamos una alianza con iberdrola."],
+        "funding_signals": ["nuestra financiación crecerá."],
+        "product_launches": ["lanzamiento del nuevo producto en beta."],
+    }, 0),
+    (HIRING, {
+        "urgency_signals": ["senior developer sales manager marketing engineer urgent: we need to hire asap due to rapid growth."],
+    }, 5),
+    (QUIET, {}, 0),
+])
+def test_scan_signals(html, snippets, job_mentions):
+    assert _scan_signals(html) == {"snippets": snippets, "job_mentions": job_mentions}
+
+
+def test_growth_and_urgency_split():
+    assert set(detect_growth_signals(FUNDING, "https://acme.com")) == {"funding_signals", "growth_mentions"}
+    urgency = detect_urgency_indicators(HIRING)
+    assert urgency["high_hiring_volume"] == "~5 job-related mentions found"
+    assert "urgency_signals" in urgency
+    assert detect_growth_signals("", "https://acme.com") == {} and detect_urgency_indicators(QUIET) == {}
+
+
+@pytest.mark.parametrize("pattern, prefixes", [
+    ("financiaci[oó]n", ["financiacion", "financiación"]),
+    ("new office", ["new office"]),
+])
+def test_literal_prefixes(pattern, prefixes):
+    assert sorted(literal_prefixes(pattern)) == sorted(prefixes)
+
+
+def test_same_matches_without_automaton():
+    text = visible_text(FUNDING + ALLIANCE + HIRING + QUIET, meta=False).lower()
+    plain = SignalMatcher(SIGNAL_GROUPS, JOB_ROLES)
+    plain._automaton = None
+    assert plain.matches(text) == _MATCHER.matches(text)
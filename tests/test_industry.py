@@ -0,0 +1,63 @@
+# tests/test_industry.py
+"""Índice de keywords de industria: mismo resultado que el recorrido por keyword (_score_text)."""
+import random
+
+import pytest
+
+from app.parsers import industry
+from app.parsers.industry import INDUSTRIAS, _INDEX, _TechMask, _score_text, fold_accents
+
+FIXTURES = [
+    "Hospital y clínica con urgencias 24h, cirugía y cuidados intensivos para pacientes",
+    "Concesionario Toyota y Ford: taller mecánico, cambio de aceite y neumáticos. Car dealership",
+    "<div style=\"width: auto; margin-left: auto\" data-id=\"3\">auto</div> venta de autos y cars",
+    "Supermercado online: productos frescos, alimentación saludable y entrega a domicilio",
+    "Software as a service: cloud platform, API, data analytics and machine learning for enterprise",
+    "Tienda online de moda y calzado, ropa de mujer, zapatos y accesorios. Envío gratis",
+    "Bufete de abogados especializado en derecho mercantil, laboral y fiscal",
+    "Hotel boutique en la playa, reservas de vuelos y paquetes turísticos",
+    "Agencia de marketing digital, SEO, publicidad y redes sociales",
+    "Banco online: cuentas, hipotecas, préstamos y tarjetas de crédito",
+    "Constructora e inmobiliaria: obra nueva, reformas y venta de pisos",
+    "motor motor motor battery engine app app api data <script>var data = {}</script>",
+    "",
+    "e-commerce ecommerce e-commerce platform shop shop store stores",
+    # Términos técnicos justo en el borde de la ventana de ±50 caracteres
+    "px" + "x" * 48 + " auto " + "y" * 49 + "css",
+    "px" + "x" * 49 + " auto " + "y" * 50 + "css auto",
+    "data-" + " " * 46 + "data" + " " * 45 + "data-id data",
+]
+
+
+def random_corpus(size: int = 100):
+    rng = random.Random(7)
+    vocabulary = [kw for kws in INDUSTRIAS.values() for kw in kws]
+    noise = ["la", "de", "y", "the", "width:", "auto;", "<div>", "</p>", "data-", "px", "ñandú", "über", "_x"]
+    return [
+        " ".join(rng.choice(vocabulary) if rng.random() < 0.3 else rng.choice(noise)
+                 for _ in range(rng.randint(20, 600)))
+        for _ in range(size)
+    ]
+
+
+CORPUS = FIXTURES + random_corpus()
+
+
+@pytest.mark.parametrize("text", CORPUS)
+def test_index_matches_per_keyword_scoring(text):
+    expected = [_score_text(fold_accents(text), kws) for kws in _INDEX.keywords.values()]
+    assert _INDEX.score(text) == expected
+
+
+@pytest.mark.skipif(industry._TECH_AUTOMATON is None, reason="pyahocorasick no instalado")
+@pytest.mark.parametrize("text", CORPUS)
+def test_tech_mask_same_with_and_without_automaton(text):
+    low = fold_accents(text)
+    with_ac, plain = _TechMask(low, industry._TECH_AUTOMATON), _TechMask(low)
+    assert (with_ac._starts, with_ac._min_end) == (plain._starts, plain._min_end)
+
+
+def test_normalization_keeps_every_keyword():
+    stats = _INDEX.normalization
+    assert stats["unique"] <= stats["keywords"]
+    assert set(_INDEX.keywords) == set(INDUSTRIAS)
@@ -0,0 +1,81 @@
+# tests/test_industry_accumulator.py
+"""IndustryAccumulator: scores sumados página a página con PAGE_WEIGHTS."""
+import pytest
+
+from app.parsers.industry import _INDEX, PAGE_WEIGHTS, IndustryAccumulator, detectar_industrias, page_kind
+from app.util import PRIORITY_KEYWORDS
+
+SALUD = "Salud (Hospitales y Clínicas)"
+BANCA = "Servicios Financieros (Banca)"
+HOSPITAL = "Hospital y clínica con urgencias 24h, cirugía y cuidados intensivos para pacientes"
+BANCO = "Banco online: cuentas, hipotecas, préstamos y tarjetas de crédito"
+
+
+def score_of(text: str, industria: str) -> int:
+    return _INDEX.score(text)[_INDEX.industries.index(industria)][0]
+
+
+@pytest.mark.parametrize("url, kind", [
+    ("https://acme.es", "home"),
+    ("https://acme.es/", "home"),
+    ("https://acme.es/quienes-somos", "about"),
+    ("https://acme.es/es/productos/camas", "product"),
+    ("https://acme.es/empleo", "careers"),
+    ("https://acme.es/blog/post-1", "blog"),
+    ("https://acme.es/contacto", "other"),  # crm_pages no tiene peso propio
+])
+def test_page_kind(url, kind):
+    assert page_kind(url) == kind
+
+
+def test_every_weighted_kind_is_a_priority_bucket():
+    assert set(PAGE_WEIGHTS) - {"home"} <= set(PRIORITY_KEYWORDS)
+
+
+@pytest.mark.parametrize("url", ["https://acme.es/", "https://acme.es/nosotros",
+                                 "https://acme.es/blog/x", "https://acme.es/contacto"])
+def test_page_weight_applied(url):
+    acc = IndustryAccumulator()
+    acc.add_page(url, f"<p>{HOSPITAL}</p>")
+    expected = int(score_of(HOSPITAL, SALUD) * PAGE_WEIGHTS.get(page_kind(url), 1.0))
+    top = acc.results(top_k=1)[0]
+    assert (top["industria"], top["score"]) == (SALUD, expected)
+    assert acc.pages == {page_kind(url): 1}
+
+
+def test_single_unweighted_text_matches_detectar_industrias():
+    acc = IndustryAccumulator()
+    acc.add_text(HOSPITAL)
+    assert acc.results() == detectar_industrias(HOSPITAL)
+
+
+def test_pages_aggregate_and_reorder():
+    acc = IndustryAccumulator()
+    acc.add_page("https://acme.es/", f"<p>{BANCO}</p>")
+    assert acc.principal_y_secundaria() == (BANCA, None)
+    # Dos páginas "about" (peso 2) de hospital superan al home bancario
+    acc.add_page("https://acme.es/nosotros", f"<p>{HOSPITAL}</p>")
+    acc.add_page("https://acme.es/empresa", f"<title>x</title><p>{HOSPITAL}</p>")
+    principal, secundaria = acc.principal_y_secundaria()
+    assert (principal, secundaria) == (SALUD, BANCA)
+    top = acc.results(top_k=1)[0]
+    assert top["score"] == int(2 * 2.0 * score_of(HOSPITAL, SALUD))
+    # Keywords sin duplicar aunque aparezcan en varias páginas
+    assert len(top["keywords"]) == len(set(top["keywords"]))
+    assert acc.pages == {"home": 1, "about": 2}
+
+
+def test_invisible_markup_and_empty_pages_do_not_score():
+    acc = IndustryAccumulator()
+    acc.add_page("https://acme.es/", f"<script>var t = '{HOSPITAL}';</script><style>.a{{}}</style>")
+    acc.add_text("   ")
+    assert acc.results() == [] and acc.principal_y_secundaria() == (None, None)
+    assert acc.pages == {"home": 1}
+
+
+def test_known_domain_skips_scoring():
+    acc = IndustryAccumulator("bbva.com")
+    acc.add_page("https://bbva.com/", f"<p>{HOSPITAL}</p>")
+    acc.add_text(HOSPITAL, 2.0)
+    assert acc.results() == detectar_industrias(HOSPITAL, "bbva.com")
+    assert acc.pages == {"home": 1}
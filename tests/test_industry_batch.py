@@ -0,0 +1,24 @@
+# tests/test_industry_batch.py
+"""Clasificación por lotes: idéntica a detectar_principal_y_secundaria texto a texto."""
+import random
+
+from app.parsers.industry import INDUSTRIAS, detectar_principal_y_secundaria
+from app.parsers.industry_batch import detectar_principal_y_secundaria_batch
+
+
+def test_batch_matches_scalar():
+    rng = random.Random(11)
+    vocabulary = [kw for kws in INDUSTRIAS.values() for kw in kws]
+    common = (
+        "el la de que y en un para con su por como nuestros servicios empresa clientes contacto inicio "
+        "the of and to in is for with our services company customers about privacy cookies "
+        "width: auto; <div> px data- copyright derechos reservados equipo proyectos soluciones"
+    ).split()
+    textos = [
+        " ".join(rng.choice(vocabulary) if rng.random() < 0.03 else rng.choice(common)
+                 for _ in range(rng.randint(100, 500)))
+        for _ in range(300)
+    ] + ["", "hospital clínica urgencias"]
+    domains = ["zara.com" if i % 97 == 0 else "" for i in range(len(textos))]
+    expected = [detectar_principal_y_secundaria(t, d) for t, d in zip(textos, domains)]
+    assert detectar_principal_y_secundaria_batch(textos, domains) == expected
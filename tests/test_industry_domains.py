@@ -0,0 +1,61 @@
+# tests/test_industry_domains.py
+"""Reglas de industria por dominio (app/data/industry_domains.json)."""
+import json
+
+import pytest
+
+from app.parsers.industry import DOMAIN_RULES, INDUSTRIAS, detectar_industrias
+from app.parsers.industry_domains import DomainRulesError, load_domain_rules, validate_domain_rules
+
+BANCA = "Servicios Financieros (Banca)"
+
+
+@pytest.mark.parametrize("domain, expected", [
+    ("santander.com", (BANCA, "domain_mapping")),
+    ("https://www.iberdrola.es/hogar", ("Utilities (Luz, Agua, Gas)", "domain_mapping")),
+    ("tienda.zara.com", ("Consumo, Moda y Lifestyle", "domain_mapping")),
+    ("santanderconsumer.es", (BANCA, "domain_rule")),
+    ("santander-consumer.es", (BANCA, "domain_rule")),
+    ("grupo-mediaset.it", ("Medios, Publicidad y Marketing", "domain_rule")),
+    ("evo.es", (BANCA, "domain_rule")),
+    ("carrefour.fr", ("Supermercados y Retail Alimentario", "domain_rule")),
+    ("evolution.com", None),  # marca corta: solo segmento completo
+    ("devops.io", None),
+    ("zarautz.eus", None),
+    ("ejemplo.com", None),
+    ("", None),
+])
+def test_match(domain, expected):
+    assert DOMAIN_RULES.match(domain) == expected
+
+
+def test_known_domain_short_circuits_keywords():
+    assert detectar_industrias("hospital clínica urgencias", "bbva.com") == [
+        {"industria": BANCA, "score": 15, "keywords": ["domain_mapping"]}
+    ]
+    assert detectar_industrias("hospital clínica urgencias", "ejemplo.com")[0]["industria"] == \
+        "Salud (Hospitales y Clínicas)"
+
+
+def test_shipped_rules_are_valid():
+    assert DOMAIN_RULES.domains and DOMAIN_RULES.brands
+
+
+def test_validate_reports_each_problem():
+    errors = validate_domain_rules(
+        {"version": "x", "domains": {"A.com": "Nada"}, "brands": {"Deportes": ["x", "x"]}}, ["Deportes"])
+    assert len(errors) == 3, errors
+    assert validate_domain_rules({"domains": {}}, []) == ["falta 'version'"]
+
+
+def test_load_custom_file(tmp_path):
+    path = tmp_path / "rules.json"
+    path.write_text(json.dumps({"version": "t", "domains": {"acme.es": BANCA}, "brands": {BANCA: ["acmebank"]}}))
+    rules = load_domain_rules(INDUSTRIAS, str(path))
+    assert rules.match("www.acme.es") == (BANCA, "domain_mapping")
+    assert rules.match("acmebank-online.com") == (BANCA, "domain_rule")
+    path.write_text(json.dumps({"version": "t", "domains": {"acme.es": "Inventada"}}))
+    with pytest.raises(DomainRulesError):
+        load_domain_rules(INDUSTRIAS, str(path))
+    with pytest.raises(DomainRulesError):
+        load_domain_rules(INDUSTRIAS, str(tmp_path / "no-existe.json"))
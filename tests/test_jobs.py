@@ -0,0 +1,113 @@
+# tests/test_jobs.py
+"""Etapa de empleo contra un servidor local con respuestas grabadas de cada ATS."""
+import asyncio
+import json
+
+import pytest
+
+from app.parsers import jobs
+from app.parsers.jobs import ATS_BOARDS, BoardCache, collect_jobs, find_ats_boards, hiring_volume, parse_job_jsonld
+
+RECORDED = {
+    "/gh/acme": {"jobs": [
+        {"id": 4012, "title": "Senior Backend Engineer", "location": {"name": "Madrid"},
+         "absolute_url": "https://boards.greenhouse.io/acme/jobs/4012",
+         "updated_at": "2025-10-01T10:00:00-04:00", "first_published": "2025-09-20T09:00:00-04:00"},
+        {"id": 4013, "title": "Account Executive", "location": {"name": "Remote"},
+         "absolute_url": "https://boards.greenhouse.io/acme/jobs/4013", "updated_at": "2025-10-02T10:00:00-04:00"},
+    ], "meta": {"total": 2}},
+    "/lever/acme": [
+        {"id": "a1", "text": "Head of Marketing", "hostedUrl": "https://jobs.lever.co/acme/a1",
+         "createdAt": 1759300000000,
+         "categories": {"commitment": "Full-time", "department": "Marketing", "location": "Barcelona"}},
+    ],
+    "/ashby/acme": {"apiVersion": "1", "jobs": [
+        {"title": "Customer Success Manager", "location": "Valencia", "department": "CS",
+         "employmentType": "FullTime", "publishedAt": "2025-10-05T08:00:00Z",
+         "jobUrl": "https://jobs.ashbyhq.com/acme/x1", "isListed": True},
+        {"title": "Oculta", "isListed": False},
+    ]},
+}
+HOME = '<a href="/careers">Trabaja con nosotros</a><a href="https://jobs.lever.co/acme">Lever</a>'
+CAREERS = (
+    '<h1>Careers</h1><script type="application/ld+json">{"@context": "https://schema.org", "@graph": ['
+    '{"@type": "JobPosting", "title": "Senior Backend Engineer", "datePosted": "2025-09-20",'
+    ' "employmentType": ["FULL_TIME"], "jobLocation": {"address": {"addressLocality": "Madrid"}}},'
+    '{"@type": "JobPosting", "title": "Data Analyst", "datePosted": "2025-10-10",'
+    ' "jobLocation": [{"address": {"addressLocality": "Sevilla"}}]}]}</script>'
+    '<script src="https://boards.greenhouse.io/embed/job_board/js?for=acme"></script>'
+    '<iframe src="https://jobs.ashbyhq.com/acme/embed"></iframe>'
+)
+
+
+def serve(stand_in, monkeypatch, **extra):
+    """Web con página de empleo + APIs de los ATS grabadas; cache de boards vacía."""
+    routes = {path: (200, "application/json", json.dumps(data)) for path, data in RECORDED.items()}
+    routes["/careers"] = CAREERS
+    routes.update({f"/{path}": body for path, body in extra.items()})
+    server = stand_in(routes)
+    for name, prefix in (("greenhouse", "gh"), ("lever", "lever"), ("ashby", "ashby")):
+        monkeypatch.setitem(ATS_BOARDS, name, ATS_BOARDS[name]._replace(endpoint=f"{server.url}/{prefix}/{{token}}"))
+    monkeypatch.setattr(jobs, "board_cache", BoardCache())
+    return server
+
+
+@pytest.fixture
+def ats(stand_in, monkeypatch):
+    return serve(stand_in, monkeypatch)
+
+
+def scan(server, respect_robots=False):
+    return asyncio.run(collect_jobs(HOME, links=[f"{server.url}/careers", f"{server.url}/about"],
+                                    respect_robots=respect_robots, timeout=3))
+
+
+def test_collect_jobs_from_careers_and_boards(ats):
+    summary = scan(ats)
+    assert sorted(job["title"] for job in summary["jobs"]) == [
+        "Account Executive", "Customer Success Manager", "Data Analyst", "Head of Marketing", "Senior Backend Engineer"]
+    assert summary["ats_boards"] == ["lever:acme", "greenhouse:acme", "ashby:acme"]
+    assert summary["hiring_volume"] == "medium"
+    assert summary["careers_url"] == f"{ats.url}/careers"
+
+
+def test_boards_come_from_cache_on_rescan(ats):
+    first = scan(ats)
+    fetched = len(ats.requests)
+    second = scan(ats)
+    # La página de empleo se vuelve a pedir, los boards salen de la cache
+    assert ats.requests[fetched:] == ["/careers"]
+    assert second == first
+    assert jobs.board_cache.info()["hits"] == 3
+
+
+def test_only_boards_read_are_reported(ats, monkeypatch):
+    monkeypatch.setattr(jobs, "MAX_ATS_BOARDS", 2)
+    summary = scan(ats)
+    # Ashby queda fuera del tope: ni se pide ni aparece en ats_boards
+    assert summary["ats_boards"] == ["lever:acme", "greenhouse:acme"]
+    assert "/ashby/acme" not in ats.requests
+    assert "Customer Success Manager" not in [job["title"] for job in summary["jobs"]]
+
+
+def test_board_apis_respect_robots(stand_in, monkeypatch):
+    server = serve(stand_in, monkeypatch, **{"robots.txt": "User-agent: *\nDisallow: /gh/\n"})
+    summary = scan(server, respect_robots=True)
+    assert "/gh/acme" not in server.requests
+    assert summary["ats_boards"] == ["lever:acme", "ashby:acme"]
+    assert "Account Executive" not in [job["title"] for job in summary["jobs"]]
+
+
+def test_find_ats_boards():
+    assert find_ats_boards(HOME + CAREERS) == [("greenhouse", "acme"), ("lever", "acme"), ("ashby", "acme")]
+    assert find_ats_boards("<p>sin boards</p>") == []
+
+
+def test_parse_job_jsonld():
+    postings = parse_job_jsonld("https://acme.com/careers", CAREERS)
+    assert [(p.title, p.location) for p in postings] == [("Senior Backend Engineer", "Madrid"), ("Data Analyst", "Sevilla")]
+
+
+@pytest.mark.parametrize("count, volume", [(0, "none"), (1, "low"), (5, "medium")])
+def test_hiring_volume(count, volume):
+    assert hiring_volume(count) == volume
@@ -0,0 +1,101 @@
+# tests/test_linkedin.py
+"""Etapa de LinkedIn contra un servidor local con páginas de empresa grabadas (guest view)."""
+import asyncio
+import json
+
+import pytest
+
+from app.parsers import linkedin
+from app.parsers.linkedin import LinkedInCache, fetch_linkedin_company, get_company_size_segment, linkedin_slug, parse_linkedin_company
+
+
+def about(test_id: str, label: str, value: str) -> str:
+    return f'<div data-test-id="{test_id}"><dt>{label}</dt><dd>{value}</dd></div>'
+
+
+POSTS = "".join(
+    f'<article class="main-feed-activity-card"><p>Post {i}: estamos contratando, 12 employees nuevos este mes, '
+    f'gracias a nuestros 1.200 seguidores.</p><a href="https://www.linkedin.com/posts/acme_{i}">ver</a></article>'
+    for i in range(2500)
+)
+ACME = (
+    '<html><head><title>Acme | LinkedIn</title><script type="application/ld+json">'
+    + json.dumps({"@context": "http://schema.org", "@type": "Organization", "name": "Acme",
+                  "description": "Acme automatiza las nóminas de las pymes.",
+                  "numberOfEmployees": {"@type": "QuantitativeValue", "value": 245},
+                  "address": {"@type": "PostalAddress", "addressLocality": "Madrid", "addressCountry": "ES"},
+                  "sameAs": "https://acme.es"})
+    + '</script></head><body><section class="top-card-layout">'
+    '<h1 class="top-card-layout__title font-sans">Acme</h1>'
+    '<h4 class="top-card-layout__second-subline">Nóminas para pymes</h4>'
+    '<h3 class="top-card-layout__first-subline">Software Development  Madrid, Comunidad de Madrid  3,456 followers</h3>'
+    '<a data-test-id="view-all-employees-cta" href="#">View all 187 employees</a></section>'
+    '<section class="about-us"><p data-test-id="about-us__description">Acme automatiza las nóminas y la gestión '
+    'de RRHH para más de 2.000 pymes en España y Portugal.<br>Fundada en Madrid.</p><dl>'
+    + about("about-us__website", "Website", "https://acme.es")
+    + about("about-us__industry", "Industry", "Software Development")
+    + about("about-us__size", "Company size", "201-500 employees")
+    + about("about-us__headquarters", "Headquarters", "Madrid, Comunidad de Madrid")
+    + about("about-us__organizationType", "Type", "Privately Held")
+    + about("about-us__foundedOn", "Founded", "2012")
+    + '</dl></section>' + POSTS + '</body></html>'
+)
+AUTHWALL = '<html><head><title>Sign Up | LinkedIn</title></head><body><form class="authwall-join-form"></form></body></html>'
+
+EXPECTED = {
+    "url": "https://www.linkedin.com/company/acme/", "slug": "acme", "name": "Acme",
+    "employee_range": "201-500", "employee_count": 245, "company_size_segment": "Large (201-1000)",
+    "employees_on_linkedin": 187,
+    "description": "Acme automatiza las nóminas y la gestión de RRHH para más de 2.000 pymes en España y Portugal. Fundada en Madrid.",
+    "linkedin_industry": "Software Development", "headquarters": "Madrid, Comunidad de Madrid",
+    "founded_year": 2012, "website": "https://acme.es", "organization_type": "Privately Held", "followers": 3456,
+}
+
+
+@pytest.fixture
+def guest_pages(stand_in, monkeypatch):
+    """Páginas de empresa grabadas y un authwall; cache por slug vacía."""
+    server = stand_in({"/company/acme/": ACME, "/company/ghost/": AUTHWALL})
+    monkeypatch.setattr(linkedin, "LINKEDIN_COMPANY_URL", f"{server.url}/{{kind}}/{{slug}}/")
+    monkeypatch.setattr(linkedin, "linkedin_cache", LinkedInCache())
+    return server
+
+
+def scan(url: str):
+    return asyncio.run(fetch_linkedin_company(url, respect_robots=False, timeout=3))
+
+
+def test_company_page(guest_pages):
+    assert scan("https://es.linkedin.com/company/Acme/about/?trk=x") == EXPECTED
+
+
+def test_cached_per_slug(guest_pages):
+    first = scan("https://es.linkedin.com/company/Acme/about/?trk=x")
+    assert scan("linkedin.com/company/acme") == first  # mismo slug: desde la cache
+    assert scan("https://www.linkedin.com/company/ghost") is None  # authwall: cacheado vacío
+    assert scan("https://www.linkedin.com/company/ghost/") is None
+    assert scan("https://www.linkedin.com/in/someone") is None  # perfil personal: sin petición
+    assert guest_pages.requests == ["/company/acme/", "/company/ghost/"]
+    assert linkedin.linkedin_cache.info()["hits"] == 2
+
+
+def test_parse_ignores_posts():
+    # Los "12 employees" de los posts no cuentan: el tamaño sale de about-us y del JSON-LD
+    info = parse_linkedin_company(ACME)
+    assert info["employee_count"] == 245 and info["employee_range"] == "201-500"
+    assert parse_linkedin_company(AUTHWALL) == {}
+
+
+@pytest.mark.parametrize("url, expected", [
+    ("https://es.linkedin.com/company/Acme/about/?trk=x", ("company", "acme")),
+    ("linkedin.com/company/acme", ("company", "acme")),
+    ("https://www.linkedin.com/in/someone", None),
+    ("https://acme.es/", None),
+])
+def test_linkedin_slug(url, expected):
+    assert linkedin_slug(url) == expected
+
+
+@pytest.mark.parametrize("count, segment", [(None, None), (245, "Large (201-1000)")])
+def test_company_size_segment(count, segment):
+    assert get_company_size_segment(count) == segment
@@ -0,0 +1,101 @@
+# tests/test_memo.py
+"""Memo por hash de contenido: LRU, copias aisladas, persistencia y versión."""
+import pickle
+
+from app import memo as memo_module
+from app.memo import MemoCache, content_hash
+
+
+def counting(result):
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return result
+    return compute, calls
+
+
+def test_hit_skips_compute():
+    cache = MemoCache(max_size=10, path="")
+    compute, calls = counting({"a": 1})
+    assert cache.memoize("x", "1", "<p>hola</p>", compute) == {"a": 1}
+    assert cache.memoize("x", "1", "<p>hola</p>", compute) == {"a": 1}
+    assert len(calls) == 1
+    assert cache.info()["hits"] == 1 and cache.info()["misses"] == 1
+
+
+def test_version_extra_and_type_change_the_key():
+    cache = MemoCache(max_size=10, path="")
+    compute, calls = counting([1])
+    cache.memoize("x", "1", "doc", compute)
+    cache.memoize("x", "2", "doc", compute)  # extractor nuevo: no reutiliza
+    cache.memoize("y", "1", "doc", compute)
+    cache.memoize("x", "1", "doc", compute, ("CMS",))
+    cache.memoize("x", "1", b"doc", compute)
+    assert len(calls) == 5
+    assert content_hash("doc") != content_hash(b"doc")
+
+
+def test_lru_eviction_keeps_recent():
+    cache = MemoCache(max_size=2, path="")
+    compute, calls = counting(0)
+    cache.memoize("x", "1", "a", compute)
+    cache.memoize("x", "1", "b", compute)
+    cache.memoize("x", "1", "a", compute)  # "a" pasa a ser la más reciente
+    cache.memoize("x", "1", "c", compute)  # sale "b"
+    assert cache.stats["evictions"] == 1 and len(calls) == 3
+    cache.memoize("x", "1", "a", compute)
+    assert len(calls) == 3
+    cache.memoize("x", "1", "b", compute)
+    assert len(calls) == 4
+
+
+def test_results_are_copied_in_and_out():
+    cache = MemoCache(max_size=10, path="")
+    first = cache.memoize("x", "1", "doc", lambda: {"tools": ["HubSpot"]})
+    first["tools"].append("mutado")
+    second = cache.memoize("x", "1", "doc", lambda: None)
+    assert second == {"tools": ["HubSpot"]}
+    second["tools"].clear()
+    assert cache.memoize("x", "1", "doc", lambda: None) == {"tools": ["HubSpot"]}
+
+
+def test_disabled_and_empty_content_always_compute():
+    compute, calls = counting(1)
+    off = MemoCache(max_size=0, path="")
+    off.memoize("x", "1", "doc", compute)
+    off.memoize("x", "1", "doc", compute)
+    MemoCache(max_size=10, path="").memoize("x", "1", "", compute)
+    assert len(calls) == 3 and off.info()["entries"] == 0
+
+
+def test_persisted_and_reloaded(tmp_path):
+    path = str(tmp_path / "memo.pkl")
+    cache = MemoCache(max_size=10, path=path)
+    cache.memoize("x", "1", "a", lambda: "A")
+    cache.memoize("x", "1", "b", lambda: "B")
+    assert cache.save()
+    again = MemoCache(max_size=1, path=path)  # al cargar se recorta al tamaño
+    assert again.info()["entries"] == 1
+    assert again.memoize("x", "1", "b", lambda: "nuevo") == "B"
+
+
+def test_save_every_n_puts(tmp_path, monkeypatch):
+    path = tmp_path / "memo.pkl"
+    monkeypatch.setattr(memo_module, "MEMO_SAVE_EVERY", 2)
+    cache = MemoCache(max_size=10, path=str(path))
+    cache.memoize("x", "1", "a", lambda: "A")
+    assert not path.exists()
+    cache.memoize("x", "1", "b", lambda: "B")
+    assert path.exists()
+
+
+def test_other_format_or_broken_file_ignored(tmp_path):
+    path = tmp_path / "memo.pkl"
+    key = ("x", "1", content_hash("a"))
+    path.write_bytes(pickle.dumps({"format": memo_module.MEMO_FORMAT + 1, "entries": [(key, ("viejo", 0.0))]}))
+    cache = MemoCache(max_size=10, path=str(path))
+    assert cache.info()["entries"] == 0
+    assert cache.memoize("x", "1", "a", lambda: "A") == "A"
+    path.write_bytes(b"no es un pickle")
+    assert not MemoCache(max_size=10, path=str(path)).load()
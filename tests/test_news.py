@@ -0,0 +1,98 @@
+# tests/test_news.py
+"""Noticias: feeds RSS/Atom con corte temprano y heurística de una pasada sobre el html."""
+import asyncio
+
+import pytest
+
+from app.parsers.news import (
+    _FeedSink,
+    extract_news_from_html,
+    feedparser,
+    fetch_feed_news,
+    is_news_page,
+    parse_feed,
+)
+
+BLOG = (
+    '<main><article><h2><a href="/blog/lanzamiento">Lanzamos Acme 2.0</a></h2>'
+    '<p>Nueva versión con <b>IA</b> integrada.</p><script>var x = "<p>no</p>";</script></article>'
+    '<article><h2>Sin párrafo</h2></article>'
+    '<article><h3>Ronda de financiación</h3><div><p>Cerramos una serie A de 10M.</p></div>'
+    '<a href="https://acme.com/blog/serie-a">Leer</a></article></main>'
+)
+CARDS = (
+    '<section><ul>'
+    '<li class="card"><a href="/news/1"><h3>Nueva oficina</h3></a><p>Abrimos en Madrid.</p></li>'
+    '<li class="card"><h3>Premio</h3><p>Ganamos el premio X.</p><a href="/news/2">más</a></li>'
+    '<li class="card"><h3>Sin link</h3><p>Texto sin enlace</p></li>'
+    '</ul></section>'
+)
+FEED = (
+    b'<?xml version="1.0"?><rss version="2.0"><channel><title>Acme</title>'
+    b'<item><title>Antigua</title><link>/blog/antigua</link><description>&lt;p&gt;Hola&lt;/p&gt;</description>'
+    b'<pubDate>Mon, 06 Oct 2025 10:00:00 +0000</pubDate></item>'
+    b'<item><title>Reciente</title><link>https://acme.com/blog/reciente</link>'
+    b'<pubDate>Wed, 15 Oct 2025 10:00:00 +0000</pubDate></item>'
+    b'<item><title>Cortada</title><link>https://acme.com/blog/cort'
+)
+FEED_ITEMS = [
+    {"title": "Reciente", "body": "", "url": "https://acme.com/blog/reciente"},
+    {"title": "Antigua", "body": "Hola", "url": "https://acme.com/blog/antigua"},
+]
+
+needs_feedparser = pytest.mark.skipif(feedparser is None, reason="feedparser no instalado")
+
+
+@pytest.mark.parametrize("html, expected", [
+    (BLOG, [
+        {"title": "Lanzamos Acme 2.0", "body": "Nueva versión con IA integrada.", "url": "https://acme.com/blog/lanzamiento"},
+        {"title": "Ronda de financiación", "body": "Cerramos una serie A de 10M.", "url": "https://acme.com/blog/serie-a"},
+    ]),
+    (CARDS, [
+        {"title": "Nueva oficina", "body": "Abrimos en Madrid.", "url": "https://acme.com/news/1"},
+        {"title": "Premio", "body": "Ganamos el premio X.", "url": "https://acme.com/news/2"},
+    ]),
+    ("<p>Sin noticias</p>", []),
+])
+def test_extract_news_from_html(html, expected):
+    assert extract_news_from_html("https://acme.com/blog/", html) == expected
+
+
+def test_feed_sink_stops_after_max_entries():
+    sink = _FeedSink(max_entries=2)
+    assert not sink.feed(FEED[:150])
+    assert sink.feed(FEED[150:])
+
+
+@pytest.mark.parametrize("chunks, expected", [
+    # Trozo que acaba justo en el cierre: el final arrastrado no vuelve a contarlo
+    (["<item>a</item>", "<item>b</item>"], 2),
+    ([b"<item>a</item>", b"x", b"<entry>b</entry>"], 2),
+    # Etiquetas partidas entre trozos, incluida la más larga a falta del ">"
+    (["<item>a</it", "em><entry>b</entry", ">"], 2),
+    (["<entry>a</", "entry>", "</item>", "</item>"], 3),
+])
+def test_feed_sink_counts_each_closing_once(chunks, expected):
+    sink = _FeedSink(max_entries=100)
+    for chunk in chunks:
+        sink.feed(chunk)
+    assert sink.entries == expected
+
+
+@needs_feedparser
+def test_parse_truncated_feed_newest_first():
+    assert parse_feed(FEED, "https://acme.com/feed", 3) == FEED_ITEMS
+
+
+@needs_feedparser
+def test_fetch_feed_news(stand_in):
+    server = stand_in({"/feed": (200, "application/rss+xml", FEED), "/atom": (404, "text/plain", "no")})
+    items = asyncio.run(fetch_feed_news([server.url + "/feed", server.url + "/atom"], respect_robots=False, timeout=5))
+    assert [item["title"] for item in items] == ["Reciente", "Antigua"]
+    assert items[1]["url"] == server.url + "/blog/antigua"
+
+
+def test_is_news_page():
+    assert is_news_page("https://acme.com/blog/")
+    assert is_news_page("https://acme.com/es/noticias/2025")
+    assert not is_news_page("https://acme.com/precios")
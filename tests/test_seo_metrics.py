@@ -0,0 +1,56 @@
+# tests/test_seo_metrics.py
+"""Métricas SEO en una pasada del parser de eventos de lxml."""
+import pytest
+
+from app.parsers.seo_metrics import SEOAccumulator, classify_link, extract_seo_metrics
+
+ZERO = {"has_structured_data": False, "has_sitemap_link": False, "h1_count": 0, "h2_count": 0,
+        "image_alt_missing": 0, "internal_links_count": 0, "external_links_count": 0}
+
+CASES = [
+    ('<html><head><title> Acme &amp; Co </title><meta name="description" content=" Hola "></head>'
+     '<body><h1>a</h1><h2>b</h2><h2>c</h2><img src="x" alt=""><img src="y" alt="y">'
+     '<a href="/p">p</a><a href="#top">t</a><a href="https://acme.com/x">x</a>'
+     '<a href="https://otra.com">o</a><a href="rel">r</a><a href="mailto:a@acme.com">m</a><a>sin href</a>'
+     '<link rel="alternate sitemap" href="/sitemap.xml"></body></html>',
+     {**ZERO, "meta_title_length": 9, "meta_description_length": 4, "has_sitemap_link": True, "h1_count": 1,
+      "h2_count": 2, "image_alt_missing": 1, "internal_links_count": 3, "external_links_count": 1}),
+    # Solo cuenta la primera meta description y el primer <title> (no el del SVG)
+    ('<title></title><meta name="description"><meta name="description" content="segunda">'
+     '<div itemscope itemtype="https://schema.org/Organization"></div><svg><title>icono</title></svg>',
+     {**ZERO, "has_structured_data": True, "structured_data_types": ["Organization"]}),
+    ('<script type="application/ld+json">{"@type": "Organization"}</script><h1>x</h1><h1>y</h1>',
+     {**ZERO, "has_structured_data": True, "structured_data_types": ["Organization"], "h1_count": 2}),
+    # Links dentro de comentarios y de scripts no cuentan
+    ('<p>sin etiquetas SEO</p><!-- <a href="/comentado">no</a> --><script>var a = "<a href=\'/x\'>";</script>',
+     ZERO),
+]
+
+
+@pytest.mark.parametrize("html, expected", CASES)
+def test_extract_seo_metrics(html, expected):
+    got = extract_seo_metrics(html, "https://acme.com/", request_time_ms=120, page_bytes=2048)
+    assert got == {**expected, "page_size_kb": 2.0, "page_load_time_ms": 120}
+
+
+@pytest.mark.parametrize("href, internal", [
+    ("/p", True), ("rel", True), ("https://acme.com/x", True), ("//acme.com/x", True),
+    ("https://otra.com", False), ("//cdn.otra.com/x", False),
+    ("#top", None), ("javascript:void(0)", None), ("mailto:a@acme.com", None),
+])
+def test_classify_link(href, internal):
+    assert classify_link(href, "acme.com") is internal
+
+
+def test_site_accumulator():
+    site = SEOAccumulator()
+    assert site.summary() is None
+    for html, _ in CASES:
+        site.add(extract_seo_metrics(html, "https://acme.com/", page_bytes=2048))
+    site.add({})
+    summary = site.summary()
+    assert summary["pages_analyzed"] == len(CASES)
+    assert summary["avg_page_size_kb"] == summary["max_page_size_kb"] == 2.0
+    assert summary["pages_with_structured_data"] == 2
+    assert summary["pages_missing_title"] == 3
+    assert summary["pages_with_multiple_h1"] == 1
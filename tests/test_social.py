@@ -0,0 +1,39 @@
+# tests/test_social.py
+"""Redes sociales: host -> plataforma y regla de path por plataforma (str y bytes)."""
+import pytest
+
+from app.parsers.social import extract_socials
+
+CASES = [
+    ('<a href="https://www.linkedin.com/in/ceo">CEO</a><a href="https://es.linkedin.com/company/acme/">Acme</a>',
+     {"linkedin": "https://es.linkedin.com/company/acme/"}),
+    # Perfil personal sin página de empresa: no es la red de la empresa
+    ('<a href="https://www.linkedin.com/in/ceo">CEO</a><a href="https://www.linkedin.com/school/">s</a>', {}),
+    ('<a href="https://www.facebook.com/sharer/sharer.php?u=x">s</a><a href="https://es-la.facebook.com/acme">f</a>',
+     {"facebook": "https://es-la.facebook.com/acme"}),
+    ('<a href="https://twitter.com/intent/tweet?text=hola">t</a><a href="https://x.com/acme">x</a>',
+     {"twitter": "https://x.com/acme"}),
+    ('<a href="https://www.youtube.com/watch?v=1">v</a><a href="https://youtube.com/@acme">c</a>',
+     {"youtube": "https://youtube.com/@acme"}),
+    ('<a href="https://instagram.com/p/abc">post</a><a href="/privacy">p</a><a href="https://wa.me/34600000000">w</a>',
+     {"whatsapp": "https://wa.me/34600000000"}),
+    ('<a href="https://www.tiktok.com/@acme">t</a><a href="https://facebook.com/">home</a><a href="https://netflix.com/acme">n</a>',
+     {"tiktok": "https://www.tiktok.com/@acme"}),
+    ('<meta property="og:see_also" content="https://www.instagram.com/acme/">'
+     '<script type="application/ld+json">{"@graph": [{"@type": "Organization", "sameAs": '
+     '["https://github.com/acme", "https://www.facebook.com/acme.es"]}]}</script>',
+     {"instagram": "https://www.instagram.com/acme/", "github": "https://github.com/acme",
+      "facebook": "https://www.facebook.com/acme.es"}),
+    ("", {}),
+]
+
+
+@pytest.mark.parametrize("html, expected", CASES)
+def test_extract_socials(html, expected):
+    assert extract_socials(html) == expected
+    assert extract_socials(html.encode()) == expected
+
+
+def test_only_requested_platforms():
+    html = CASES[-2][0]
+    assert extract_socials(html, ["github"]) == {"github": "https://github.com/acme"}
@@ -0,0 +1,58 @@
+# tests/test_structured_data.py
+"""JSON-LD + microdata decodificados una vez por página, con recuperación de bloques rotos."""
+import json
+
+import pytest
+
+from app.parsers.structured_data import MAX_JSON_LD_BLOCKS, extract_structured_data, loads_lenient
+
+CASES = [
+    # @graph con Organization y WebSite; sameAs del objeto anidado
+    ('<script type="application/ld+json">{"@context": "https://schema.org", "@graph": ['
+     '{"@type": "WebSite", "name": "Acme Web", "publisher": {"@id": "#org"}},'
+     '{"@type": ["Organization", "Corporation"], "@id": "#org", "name": " Acme S.L. ",'
+     ' "sameAs": ["https://www.linkedin.com/company/acme", "https://x.com/acme"]}]}</script>',
+     {"company": "Acme S.L.", "types": ["WebSite", "Organization", "Corporation"],
+      "same_as": ["https://www.linkedin.com/company/acme", "https://x.com/acme"], "jobs": 0}),
+    # Bloque roto: comentario HTML, coma final y salto de línea crudo en un string
+    ('<script type="application/ld+json"><!-- {"@type": "LocalBusiness", "name": "Bar\nPepe",'
+     ' "sameAs": "https://facebook.com/barpepe",} --></script>',
+     {"company": "Bar\nPepe", "types": ["LocalBusiness"], "same_as": ["https://facebook.com/barpepe"], "jobs": 0}),
+    # Varios objetos seguidos en un bloque + CDATA; JobPosting con hiringOrganization
+    ('<script type="application/ld+json">//<![CDATA[\n{"@type": "JobPosting", "title": "Backend",'
+     ' "hiringOrganization": {"@type": "Organization", "name": "Acme"}}\n'
+     '{"@type": "schema:JobPosting", "title": "Ventas"}\n//]]></script>',
+     {"company": "Acme", "types": ["JobPosting", "Organization"], "same_as": [], "jobs": 2}),
+    # Microdata y JSON inválido
+    ('<div itemscope itemtype="https://schema.org/Organization"><span itemprop="name">Acme</span>'
+     '<link itemprop="sameAs" href="https://github.com/acme"></div>'
+     '<script type="application/ld+json">{no es json</script>',
+     {"company": None, "types": ["Organization"], "same_as": ["https://github.com/acme"], "jobs": 0}),
+    ("<p>sin datos</p>", {"company": None, "types": [], "same_as": [], "jobs": 0}),
+]
+
+
+@pytest.mark.parametrize("html, expected", CASES)
+@pytest.mark.parametrize("as_bytes", [False, True])
+def test_extract_structured_data(html, expected, as_bytes):
+    sd = extract_structured_data(html.encode() if as_bytes else html)
+    got = {"company": sd.company_name(), "types": sd.types, "same_as": sd.same_as, "jobs": len(sd.job_postings())}
+    assert got == expected
+
+
+def test_invalid_and_empty_blocks():
+    assert extract_structured_data(CASES[3][0]).invalid_blocks == 1
+    assert not extract_structured_data("<p>x</p>").has_structured_data
+
+
+def test_block_limit():
+    block = '<script type="application/ld+json">{"@type": "Thing"}</script>'
+    sd = extract_structured_data(block * (MAX_JSON_LD_BLOCKS + 3))
+    assert sd.blocks == MAX_JSON_LD_BLOCKS and sd.skipped_blocks == 3
+
+
+def test_loads_lenient():
+    assert loads_lenient('{"a": [1, 2,],}') == {"a": [1, 2]}
+    assert loads_lenient('<!-- {"a": 1} {"b": 2} -->') == [{"a": 1}, {"b": 2}]
+    assert loads_lenient(json.dumps({"t": "línea\n"}).replace("\\n", "\n")) == {"t": "línea\n"}
+    assert loads_lenient("{no es json") is None
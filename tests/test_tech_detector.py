@@ -0,0 +1,71 @@
+# tests/test_tech_detector.py
+"""TechDetector: detección incremental entre páginas y sus estadísticas."""
+from app.parsers.techstack import TechDetector, detect_tech
+
+HOME = '<script src="https://js.hs-scripts.com/123.js"></script><p>Inicio</p>'
+PRICING = ('<script src="https://js.hs-scripts.com/123.js"></script>'
+           '<script src="https://js.stripe.com/v3"></script><p>Precios</p>')
+
+
+def tools(tech):
+    return {t["category"]: t["tools"] for t in tech}
+
+
+def test_pages_accumulate_and_skip_matched():
+    detector = TechDetector()
+    detector.add_page(HOME)
+    after_home = dict(detector.stats)
+    detector.add_page(PRICING)
+    found = tools(detector.results())
+    assert found["Marketing Automation"] == ["HubSpot"]
+    assert found["Payment Processors"] == ["Stripe"]
+    stats = detector.stats
+    assert stats["pages_scanned"] == 2
+    # HubSpot ya estaba confirmado: la segunda página no lo vuelve a contar
+    assert stats["literal_confirmations"] - after_home["literal_confirmations"] == 1
+    assert stats["evaluations_saved"] - after_home["evaluations_saved"] == after_home["literal_confirmations"]
+
+
+def test_eligible_plus_saved_covers_engine_per_page():
+    detector = TechDetector()
+    for page in (HOME, PRICING, HOME):
+        detector.add_page(page)
+    stats = detector.stats
+    assert stats["fingerprints_eligible"] + stats["evaluations_saved"] == 3 * len(detector.db.engine)
+
+
+def test_same_result_as_detect_tech_on_each_page():
+    detector = TechDetector()
+    detector.add_page(HOME.encode())
+    detector.add_page(PRICING)
+    merged = {}
+    for page in (HOME, PRICING):
+        for cat, names in tools(detect_tech("acme.es", page)).items():
+            merged.setdefault(cat, [])
+            merged[cat] += [n for n in names if n not in merged[cat]]
+    assert tools(detector.results()) == merged
+
+
+def test_external_matches_deduplicated():
+    detector = TechDetector()
+    detector.add_page(HOME)
+    before = tools(detector.results())
+    detector.add_matches([("Marketing Automation", "HubSpot", "script: hs-scripts"),
+                          ("Analytics", "Segment", "script: analytics.js")])
+    assert tools(detector.results()) == {**before, "Analytics": ["Segment"]}
+
+
+def test_targets_filled():
+    assert not TechDetector().targets_filled()
+    detector = TechDetector(target_categories=["Marketing Automation", "Payment Processors"])
+    detector.add_page(HOME)
+    assert not detector.targets_filled()
+    detector.add_page(PRICING)
+    assert detector.targets_filled()
+    assert not detector.all_resolved()
+
+
+def test_empty_page_not_counted():
+    detector = TechDetector()
+    detector.add_page("")
+    assert detector.stats["pages_scanned"] == 0 and detector.results() == []
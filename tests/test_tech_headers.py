@@ -0,0 +1,64 @@
+# tests/test_tech_headers.py
+"""Detección por cabeceras, cookies y `Link`, y categorías resueltas antes del cuerpo."""
+import pytest
+
+from app.parsers.techstack import TechDetector, detect_tech, detect_tech_from_headers, resolved_categories
+
+
+def tools(tech):
+    return {t["category"]: t["tools"] for t in tech}
+
+
+@pytest.mark.parametrize("headers, cookies, expected", [
+    ({"Server": "nginx/1.25.3", "X-Powered-By": "PHP/8.2"}, [], {"Web Servers": ["Nginx", "PHP"]}),
+    # Cabecera de presencia (regla ''): cualquier valor vale
+    ({"x-wf-region": "us-east-1"}, [], {"CMS": ["Webflow"]}),
+    ({"X-Served-By": "cache-mad2200091-MAD"}, [], {"CDN & Hosting": ["Fastly"]}),
+    ({}, ["hubspotutk"], {"Marketing Automation": ["HubSpot"]}),
+    ({}, ["_shopify_y", "PHPSESSID"], {"Ecommerce": ["Shopify"], "Web Servers": ["PHP"]}),
+    # El valor de una cabecera no cuenta bajo otro nombre; la cookie tiene que ser exacta
+    ({"x-custom": "nginx"}, [], {}),
+    ({}, ["hubspotutk_backup"], {}),
+    ({}, [], {}),
+])
+def test_header_and_cookie_rules(headers, cookies, expected):
+    assert tools(detect_tech_from_headers(headers, cookies)) == expected
+
+
+def test_link_header_uses_body_fingerprints():
+    link = '<https://cdn.shopify.com/s/files/1/app.js>; rel=preload; as=script'
+    tech = detect_tech_from_headers({"link": link}, [])
+    assert tools(tech) == {"Ecommerce": ["Shopify"]}
+    assert tech[0]["evidence"].startswith("link: ")
+
+
+def test_resolved_categories_only_single_answer():
+    tech = detect_tech_from_headers({"server": "cloudflare", "x-wix-request-id": "1"}, ["hubspotutk"])
+    assert sorted(resolved_categories(tech)) == ["CDN & Hosting", "CMS"]
+
+
+PAGE = ('<link rel="stylesheet" href="/wp-content/themes/acme/style.css">'
+        '<script src="https://js.hs-scripts.com/123.js"></script>')
+
+
+def test_detector_skips_categories_resolved_by_headers():
+    detector = TechDetector()
+    detector.add_headers({"x-wix-request-id": "1"}, [])
+    detector.add_page(PAGE)
+    found = tools(detector.results())
+    # CMS resuelto por cabeceras: el wp-content del cuerpo ya no se evalúa
+    assert found["CMS"] == ["Wix"]
+    assert found["Marketing Automation"] == ["HubSpot"]
+    assert detector.stats["evaluations_saved"] >= len(detector.db.category_index["CMS"])
+
+
+def test_detector_keeps_body_scan_for_other_categories():
+    detector = TechDetector()
+    detector.add_headers({}, ["_hjid"])  # Analytics no es de una sola respuesta
+    detector.add_page('<script>gtag("js"); var id = "GTM-ABC123";</script>')
+    assert tools(detector.results())["Analytics"] == ["Hotjar", "Google Tag Manager"]
+
+
+def test_detect_tech_skip_categories():
+    assert "CMS" in tools(detect_tech("acme.es", PAGE))
+    assert "CMS" not in tools(detect_tech("acme.es", PAGE, skip_categories=["CMS"]))
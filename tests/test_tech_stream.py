@@ -0,0 +1,53 @@
+# tests/test_tech_stream.py
+"""Detección de tech por trozos durante la descarga y corte con tech_targets."""
+import asyncio
+
+from app.fetch import fetch_pages
+from app.parsers.techstack import TechDetector
+
+TARGETS = ["CRM", "Marketing Automation"]
+PAGE = (
+    '<html><head><title>Acme</title><script src="https://js.hs-scripts.com/123.js"></script></head><body>'
+    + "".join(f"<p>Producto {i} con una descripción larga para rellenar</p>" for i in range(4000))
+    + '<footer><a href="mailto:ventas@acme.es">ventas@acme.es</a></footer></body></html>'
+)
+
+
+def fetch(url: str, detector: TechDetector, may_stop: bool):
+    pages = asyncio.run(fetch_pages([url], respect_robots=False, timeout=5,
+                                    sink_factory=lambda _: detector.stream_page(may_stop=may_stop)))
+    return pages[0]
+
+
+def test_targets_stop_extra_pages_early(stand_in):
+    server = stand_in({"/": PAGE})
+    detector = TechDetector(target_categories=TARGETS)
+    page = fetch(server.url + "/", detector, may_stop=True)
+    assert detector.targets_filled()
+    assert page.size < len(PAGE.encode())
+
+
+def test_home_is_read_whole_with_targets_filled(stand_in):
+    server = stand_in({"/": PAGE})
+    detector = TechDetector(target_categories=TARGETS)
+    page = fetch(server.url + "/", detector, may_stop=False)
+    assert detector.targets_filled()
+    assert page.size == len(PAGE.encode())
+    assert "ventas@acme.es" in page.html
+
+
+def test_stream_without_targets_never_stops():
+    stream = TechDetector().stream_page()
+    assert stream.feed(PAGE.encode()) is False
+
+
+def test_filled_targets_stop_scanning_not_reading():
+    detector = TechDetector(target_categories=TARGETS)
+    detector.add_page(PAGE)
+    assert detector.targets_filled() and detector.stats["pages_scanned"] == 1
+    # Otra página del crawl: se lee entera (la usan otros extractores) pero ya no se escanea
+    stream = detector.stream_page(may_stop=False)
+    assert stream.feed(b'<script src="https://js.stripe.com/v3"></script>') is False
+    stream.close(b"")
+    assert detector.stats["pages_scanned"] == 1
+    assert "Payment Processors" not in {t["category"] for t in detector.results()}
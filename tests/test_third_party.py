@@ -0,0 +1,104 @@
+# tests/test_third_party.py
+"""Cache de fingerprints de scripts de terceros: por URL y, solo en hosts del proveedor, por host."""
+import asyncio
+import copy
+
+import pytest
+
+from app import third_party
+from app.fingerprint_db import get_db
+from app.third_party import HOST_PROMOTE_AFTER, ScriptCache, _url_key, vendor_host
+
+JQUERY = (("JavaScript Frameworks", "jQuery"),)
+INTERCOM = (("Live Chat & Support", "Intercom"),)
+HUBSPOT = (("Marketing Automation", "HubSpot"), ("CRM", "HubSpot"))
+
+
+def fill(cache: ScriptCache, urls, tools, vendor: bool) -> None:
+    for url in urls:
+        cache.put(url, "v1", tools, 1000, vendor=vendor)
+
+
+def test_vendor_host():
+    engine = get_db().engine
+    assert vendor_host("js.hs-scripts.com", HUBSPOT, engine)  # la regla matchea el host
+    assert vendor_host("js.intercomcdn.com", INTERCOM, engine)  # el nombre está en el dominio
+    assert not vendor_host("cdnjs.cloudflare.com", JQUERY, engine)
+    assert not vendor_host("cdnjs.cloudflare.com", (("CDN & Hosting", "Cloudflare"),), engine)  # CDN público
+    assert not vendor_host("js.intercomcdn.com", (), engine)
+
+
+def test_shared_cdn_is_cached_per_url_only():
+    cache = ScriptCache()
+    urls = [f"https://cdnjs.cloudflare.com/ajax/libs/jquery/3.{v}.0/jquery.min.js" for v in range(HOST_PROMOTE_AFTER)]
+    fill(cache, urls, JQUERY, vendor=False)
+    assert cache.get(urls[0] + "?ver=2", "v1") == JQUERY
+    assert cache.get("https://cdnjs.cloudflare.com/ajax/libs/lodash.js/4.17.21/lodash.min.js", "v1") is None
+    assert cache.info()["hosts_resolved"] == 0
+
+
+def test_empty_results_never_resolve_a_host():
+    cache = ScriptCache()
+    urls = [f"https://static.vendor.io/lib{i}.js" for i in range(HOST_PROMOTE_AFTER + 1)]
+    fill(cache, urls, (), vendor=True)
+    assert cache.get(urls[0], "v1") == ()
+    assert cache.get("https://static.vendor.io/widget.js", "v1") is None
+
+
+def test_vendor_host_is_resolved_after_repeated_results():
+    cache = ScriptCache()
+    urls = [f"https://js.intercomcdn.com/app{i}.js" for i in range(HOST_PROMOTE_AFTER)]
+    fill(cache, urls[:-1], INTERCOM, vendor=True)
+    assert cache.get("https://js.intercomcdn.com/otra.js", "v1") is None
+    fill(cache, urls[-1:], INTERCOM, vendor=True)
+    assert cache.get("https://js.intercomcdn.com/otra.js", "v1") == INTERCOM
+    assert cache.get("https://js.intercomcdn.com/otra.js", "v2") is None  # otra versión de la base
+    # Un resultado distinto en el host rompe la racha
+    cache.put("https://js.intercomcdn.com/raro.js", "v1", (), 10)
+    assert cache.get("https://js.intercomcdn.com/otra.js", "v1") is None
+
+
+def test_put_existing_key_does_not_evict():
+    cache = ScriptCache(max_size=2)
+    cache.put("https://a.example/x.js", "v1", (), 10)
+    cache.put("https://b.example/y.js", "v1", (), 10)
+    cache.put("https://b.example/y.js?v=2", "v1", JQUERY, 10)  # misma clave (sin query)
+    assert cache.get("https://a.example/x.js", "v1") == ()
+    assert cache.get("https://b.example/y.js", "v1") == JQUERY
+    cache.put("https://c.example/z.js", "v1", (), 10)
+    assert cache.get("https://a.example/x.js", "v1") is None  # FIFO: sale la más antigua
+
+
+@pytest.mark.parametrize("url, key", [
+    ("https://CDN.acme.io/app.js?ver=6.4", "cdn.acme.io/app.js"),
+    ("https://cdn.acme.io/app.js?v=3f9a&_=1700000000", "cdn.acme.io/app.js"),
+    ("https://cdn.acme.io/app.js?3f9a2cde", "cdn.acme.io/app.js"),
+    ("https://www.googletagmanager.com/gtm.js?id=GTM-ABC123", "www.googletagmanager.com/gtm.js?id=GTM-ABC123"),
+    ("https://widget.acme.io/loader.js?ver=2&account=77&region=eu", "widget.acme.io/loader.js?account=77&region=eu"),
+])
+def test_url_key_drops_only_cache_busting(url, key):
+    assert _url_key(url) == key
+
+
+def test_query_selected_scripts_do_not_share_an_entry():
+    cache = ScriptCache()
+    cache.put("https://www.googletagmanager.com/gtm.js?id=GTM-AAA", "v1", HUBSPOT, 1000)
+    assert cache.get("https://www.googletagmanager.com/gtm.js?id=GTM-BBB", "v1") is None
+    assert cache.get("https://www.googletagmanager.com/gtm.js?id=GTM-AAA&v=2", "v1") == HUBSPOT
+
+
+def test_reload_with_same_version_invalidates(stand_in, monkeypatch):
+    server = stand_in({"/widget.js": 'load("https://js.hs-scripts.com/123.js")'})
+    html = f'<script src="{server.url}/widget.js"></script>'
+    db = copy.copy(third_party.get_db())
+    monkeypatch.setattr(third_party, "get_db", lambda: db)
+    monkeypatch.setattr(third_party, "script_cache", ScriptCache())
+
+    def scan():
+        return asyncio.run(third_party.fingerprint_scripts("https://www.acme.es/", html))[1]
+
+    assert scan()["fetched"] == 1
+    assert scan()["cache_hits"] == 1
+    # Recarga en caliente: mismo "version", JSON distinto
+    db.source_hash = "otro"
+    assert scan()["fetched"] == 1 and len(server.requests) == 2